@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark the local file index against rg and the Python search fallback on a synthetic tree."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tools.file_index import FileIndex
+from tools.operator import SearchFilesTool
+
+_WORDS = "invoice report meeting budget draft photo travel notes summary project receipt contract".split()
+
+
+def _build_tree(root: Path, files: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for number in range(files):
+        folder = root / f"d{number % 100:02d}" / f"s{number % 1000 // 100}"
+        folder.mkdir(parents=True, exist_ok=True)
+        words = " ".join(rng.choice(_WORDS) for _ in range(40))
+        marker = "needle-7f3a\n" if number % 5000 == 0 else ""
+        if number % 10 == 9:
+            (folder / f"f{number}.bin").write_bytes(b"\0" + bytes(rng.getrandbits(8) for _ in range(64)))
+        else:
+            (folder / f"f{number}.txt").write_text(f"{words}\n{marker}{words}\n")
+
+
+def _timed(label: str, fn) -> object:
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - started) * 1000:10.1f} ms")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--query", default="needle-7f3a")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="eyra-file-index-") as scratch:
+        root = Path(scratch) / "tree"
+        _timed(f"create {args.files} files", lambda: _build_tree(root, args.files, args.seed))
+        index = FileIndex(Path(scratch) / "index.sqlite3", (root,), rescan_seconds=3600)
+        tool = SearchFilesTool(allowed_roots=(root,), default_path=root)
+
+        _timed("index build", lambda: index.refresh(root))
+        _timed("rescan, nothing changed", lambda: index.refresh(root))
+        hits = _timed("indexed search", lambda: index.search(root, args.query, 200))
+        _timed("indexed search, short query", lambda: index.search(root, "zz", 200))
+        _timed("folder listing", lambda: index.list_folder(root / "d00" / "s0"))
+        if shutil.which("rg"):
+            _timed("rg search", lambda: tool._rg(root, args.query, 200))
+        fallback = _timed("python fallback search", lambda: tool._python_search(root, args.query, 200))
+        index.close()
+
+    expected = len(fallback.content.splitlines()) if fallback.content != "No matches." else 0
+    if len(hits) != expected:
+        print(f"index found {len(hits)} matches, fallback found {expected}", file=sys.stderr)
+        return 1
+    print(f"matches: {len(hits)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Measure DurableJobStore write throughput in records/sec, batched versus one commit per record."""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.jobs import DurableJobStore, JobStatus
+
+
+def _per_record_commits(path: Path, job_id: str, records: int) -> None:
+    """The previous write path: one INSERT and one commit for every log line."""
+    conn = sqlite3.connect(path, timeout=30)
+    for number in range(records):
+        conn.execute(
+            "INSERT INTO job_logs (job_id, timestamp, level, message, data) VALUES (?, ?, 'info', ?, '{}')",
+            (job_id, time.time(), f"progress {number}"),
+        )
+        conn.commit()
+    conn.close()
+
+
+def _batched(store: DurableJobStore, job_id: str, records: int) -> float:
+    """Queue ``records`` writes and return the seconds the caller spent submitting them."""
+    started = time.perf_counter()
+    for number in range(records):
+        if number % 10 == 0:
+            store.update_job(job_id, status=JobStatus.RUNNING, current_step=f"step {number}")
+        else:
+            store.record_log(job_id, f"progress {number}", data={"event": "progress"})
+    return time.perf_counter() - started
+
+
+def _report(label: str, records: int, seconds: float) -> None:
+    print(f"{label:<34} {records / seconds:12,.0f} records/s  ({seconds * 1000:8.1f} ms)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="eyra-job-bench-") as scratch:
+        legacy_path = Path(scratch) / "legacy.sqlite3"
+        legacy = DurableJobStore(legacy_path)
+        job = legacy.create_job(title="Bench", original_user_input="bench", source_frontend="bench")
+        legacy.close()
+        started = time.perf_counter()
+        _per_record_commits(legacy_path, job.id, args.records)
+        _report("one commit per record", args.records, time.perf_counter() - started)
+
+        store = DurableJobStore(Path(scratch) / "batched.sqlite3")
+        job = store.create_job(title="Bench", original_user_input="bench", source_frontend="bench")
+        store.flush()
+        started = time.perf_counter()
+        submit_seconds = _batched(store, job.id, args.records)
+        store.flush()
+        total_seconds = time.perf_counter() - started
+        _report("batched, caller time", args.records, submit_seconds)
+        _report("batched, until committed", args.records, total_seconds)
+        logs = len(store.list_logs(job.id, limit=args.records))
+        store.close()
+
+    expected = args.records - (args.records + 9) // 10
+    if logs != expected:
+        print(f"expected {expected} committed log lines, found {logs}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Compare the old per-pattern regex redaction with Eyra's shared redaction engine."""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.connectors.runner import redact_output, redact_output_stream
+
+_LEGACY_PATTERNS = (
+    re.compile(r"(?i)(api[_-]?key|token|secret|password)([\"'\s:=]+)([^\s,}]+)"),
+    re.compile(r"sk-[A-Za-z0-9_-]{16,}"),
+    re.compile(r"(?i)(token=)[^&\s]+"),
+    re.compile(r"Bearer\s+[A-Za-z0-9_\-./+=]{16,}"),
+)
+
+
+def _legacy_replace(match: re.Match) -> str:
+    if match.lastindex and match.lastindex >= 2:
+        return f"{match.group(1)}{match.group(2)}[REDACTED]"
+    if match.lastindex == 1:
+        return f"{match.group(1)}[REDACTED]"
+    return "[REDACTED]"
+
+
+def _legacy_redact(text: str) -> str:
+    for pattern in _LEGACY_PATTERNS:
+        text = pattern.sub(_legacy_replace, text)
+    text = re.sub(r"/Users/[^/\s]+", "~/[user]", text)
+    text = re.sub(r"(?:/private)?/var/folders/[^\s,}\"']+", "~/[temp]", text)
+    return re.sub(r"/tmp/[^\s,}\"']+", "~/[temp]", text)
+
+
+def _payloads(size: int) -> dict[str, str]:
+    clean = "INFO build step finished in 12ms; 42 files unchanged, cache warm.\n"
+    mixed = (
+        'INFO request {"user": "alice", "api_key": "abc123def456"} served\n'
+        "DEBUG wrote /Users/alice/project/out.json and /tmp/build-7/log.txt\n"
+        "WARN retry with Bearer abcdefghijklmnopqrstuvwxyz0123 after 500\n"
+        + clean * 6
+    )
+    return {name: (line * (size // len(line) + 1))[:size] for name, line in (("clean", clean), ("mixed", mixed))}
+
+
+def _time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000, help="payload size in characters")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    def streamed(text: str) -> str:
+        return "".join(redact_output_stream(text[i : i + 8192] for i in range(0, len(text), 8192)))
+
+    for name, text in _payloads(args.size).items():
+        if _legacy_redact(text) != redact_output(text):
+            print(f"{name}: engine output differs from multi-pass output", file=sys.stderr)
+            return 1
+        legacy = _time(_legacy_redact, text, args.repeat)
+        engine = _time(redact_output, text, args.repeat)
+        stream = _time(streamed, text, args.repeat)
+        print(
+            f"{name:>5} {len(text):>8} chars  multi-pass {legacy:7.2f} ms  "
+            f"engine {engine:7.2f} ms  streamed {stream:7.2f} ms  ({legacy / max(engine, 1e-6):.1f}x)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
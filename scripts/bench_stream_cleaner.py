@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Stream think-heavy model output through StreamCleaner at several chunk sizes."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from clients.ai_client import _SPECIAL_TOKENS, THINK_END, THINK_START, StreamCleaner
+
+_CHUNK_SIZES = (1, 16, 256, 4096)
+
+
+class _LegacyCleaner:
+    """The previous fixed-tail cleaner, kept here as the comparison baseline.
+
+    It strips special tokens per emitted piece, so small chunks can leak a
+    token split across pieces; only its timing is compared.
+    """
+
+    _TAIL = 13
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._in_think = False
+
+    def feed(self, chunk: str) -> str:
+        self._buf += chunk
+        out_parts: list[str] = []
+        while self._buf:
+            tag = "</think>" if self._in_think else "<think>"
+            index = self._buf.find(tag)
+            if index == -1:
+                safe = max(0, len(self._buf) - self._TAIL)
+                out_parts.append(self._buf[:safe])
+                self._buf = self._buf[safe:]
+                break
+            out_parts.append(self._buf[:index])
+            out_parts.append(THINK_END if self._in_think else THINK_START)
+            self._buf = self._buf[index + len(tag):]
+            self._in_think = not self._in_think
+        return _strip(("".join(out_parts)))
+
+    def flush(self) -> str:
+        result = self._buf + (THINK_END if self._in_think else "")
+        self._buf, self._in_think = "", False
+        return _strip(result)
+
+
+def _strip(text: str) -> str:
+    for token in _SPECIAL_TOKENS:
+        text = text.replace(token, "")
+    return text
+
+
+def _payload(size: int) -> str:
+    block = (
+        "<think>" + "Let me check the file list, then compare sizes and dates. " * 12 + "</think>"
+        "The largest file is report.pdf at 4.2 MB.<|im_end|>\n"
+    )
+    return (block * (size // len(block) + 1))[:size]
+
+
+def _legacy_run(text: str, size: int) -> str:
+    cleaner = _LegacyCleaner()
+    result = ""
+    for i in range(0, len(text), size):
+        result += cleaner.feed(text[i : i + size])
+    return result + cleaner.flush()
+
+
+def _run(text: str, size: int) -> str:
+    cleaner = StreamCleaner()
+    parts = [cleaner.feed(text[i : i + size]) for i in range(0, len(text), size)]
+    parts.append(cleaner.flush())
+    return "".join(parts)
+
+
+def _time(fn, *args) -> tuple[float, str]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000, help="payload size in characters")
+    args = parser.parse_args()
+
+    text = _payload(args.size)
+    expected = _legacy_run(text, len(text))
+    for size in _CHUNK_SIZES:
+        legacy_ms, _ = _time(_legacy_run, text, size)
+        engine_ms, result = _time(_run, text, size)
+        if result != expected:
+            print(f"chunk {size}: cleaner output differs from cleaning the whole text", file=sys.stderr)
+            return 1
+        print(f"chunk {size:>5}  legacy {legacy_ms:9.1f} ms  cleaner {engine_ms:9.1f} ms  ({legacy_ms / max(engine_ms, 1e-6):.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark Silero VAD startup time, resident memory, and per-frame latency for each VAD backend."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+FRAME_SAMPLES = 512
+SAMPLE_RATE = 16000
+
+
+def _rss_mb() -> float:
+    """Current resident set size, falling back to the peak where /proc is not available."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _audio(frames: int, seed: int):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames * FRAME_SAMPLES) / SAMPLE_RATE
+    voiced = sum(np.sin(2 * np.pi * f * t) / (n + 1) for n, f in enumerate((150, 300, 450, 900, 1200)))
+    # Alternating one-second bursts of voiced sound and quiet noise, so both VAD branches are exercised.
+    on = (t.astype(int) % 2 == 0).astype(np.float32)
+    return (0.3 * voiced * on + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def _child(backend: str, frames: int, seed: int) -> None:
+    """Run one backend in this fresh process and print its measurements as JSON."""
+    import numpy as np
+
+    baseline = _rss_mb()
+    started = time.perf_counter()
+    from runtime.vad import VADIterator, load_vad_model
+
+    model = load_vad_model(backend)
+    model(np.zeros(FRAME_SAMPLES, dtype=np.float32), SAMPLE_RATE)
+    startup = time.perf_counter() - started
+    loaded = _rss_mb()
+
+    audio = _audio(frames, seed)
+    vad = VADIterator(model, threshold=0.5, sampling_rate=SAMPLE_RATE, min_silence_duration_ms=300, speech_pad_ms=50)
+    timings = np.empty(frames)
+    events = 0
+    for index in range(frames):
+        frame = audio[index * FRAME_SAMPLES : (index + 1) * FRAME_SAMPLES]
+        began = time.perf_counter()
+        events += vad(frame) is not None
+        timings[index] = time.perf_counter() - began
+    print(
+        json.dumps(
+            {
+                "startup_ms": startup * 1000,
+                "baseline_mb": baseline,
+                "loaded_mb": loaded,
+                "after_mb": _rss_mb(),
+                "p50_us": float(np.percentile(timings, 50)) * 1e6,
+                "p99_us": float(np.percentile(timings, 99)) * 1e6,
+                "events": events,
+                "torch_loaded": "torch" in sys.modules,
+            }
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--backend", action="append", choices=("onnxruntime", "torch"))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--child", choices=("onnxruntime", "torch"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.frames, args.seed)
+        return 0
+
+    print(f"{'backend':<12} {'startup':>10} {'RSS +load':>10} {'RSS total':>10} {'p50/frame':>10} {'p99/frame':>10}")
+    results = {}
+    for backend in args.backend or ["onnxruntime", "torch"]:
+        command = [sys.executable, __file__, "--child", backend, "--frames", str(args.frames), "--seed", str(args.seed)]
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode != 0:
+            reason = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+            print(f"{backend:<12} unavailable: {reason}")
+            continue
+        result = results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{backend:<12} {result['startup_ms']:8.0f} ms {result['loaded_mb'] - result['baseline_mb']:7.1f} MB "
+            f"{result['after_mb']:7.1f} MB {result['p50_us']:7.0f} us {result['p99_us']:7.0f} us"
+        )
+
+    if results.get("onnxruntime", {}).get("torch_loaded"):
+        print("the onnxruntime backend imported torch", file=sys.stderr)
+        return 1
+    events = {result["events"] for result in results.values()}
+    if len(events) > 1:
+        print(f"backends disagree on speech events: {sorted(events)}", file=sys.stderr)
+        return 1
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
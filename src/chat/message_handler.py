@@ -8,20 +8,26 @@ the same deterministic scorer for internal controller prompts. Images are
 provided by controller-owned flows or tools, not captured here.
 """
 
+import asyncio
+import inspect
 import logging
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Coroutine
 
 from chat.complexity_scorer import ComplexityLevel, ComplexityScorer
+from chat.prompt_prefix import PROMPT_PREFIX_TRACKER
 from chat.session_state import InteractionStyle, QualityMode
+from chat.tool_summaries import TOOL_OUTPUT_SUMMARIES
 from clients.ai_client import AIClient
 from clients.base_client import BaseAIClient
 from runtime.memory.files import instruction_context_messages
 from runtime.memory.service import MemoryService
 from runtime.routing.types import ExecutionClass, RoutingDecision
 from tools.registry import ToolRegistry
-from utils.image_history import manage_message_history
+from utils.image_history import ToolSummarizer, manage_message_history
 from utils.mock_client import MockAIClient
 from utils.settings import Settings
+from utils.stage_timings import StageTimings, use_stage_timings
 
 logger = logging.getLogger(__name__)
 
@@ -142,16 +148,44 @@ def _apply_style_prompt(
     return system_messages + context
 
 
-async def _build_context(
-    context: list[dict],
+def _history_token_budget(settings: Settings, routing_decision: RoutingDecision | None) -> int:
+    """History share of the selected model's context window, or of CONTEXT_WINDOW_TOKENS when unknown."""
+    window = routing_decision.context_window if routing_decision is not None else 0
+    if window <= 0:
+        window = max(1, settings.CONTEXT_WINDOW_TOKENS)
+    return int(window * settings.HISTORY_CONTEXT_SHARE)
+
+
+def _tool_summarizer(settings: Settings) -> ToolSummarizer | None:
+    # A summary arriving mid-session would rewrite an old message, so stable-prefix mode keeps excerpts.
+    if not settings.HISTORY_TOOL_SUMMARIES or settings.PROMPT_PREFIX_STABLE:
+        return None
+    model_name = settings.SIMPLE_MODEL or settings.MODEL
+    return lambda content: TOOL_OUTPUT_SUMMARIES.lookup(
+        content,
+        lambda: get_ai_client(model_name, settings),
+        model_name,
+    )
+
+
+async def _system_context(
     style: InteractionStyle,
     current_goal: str | None,
     settings: Settings,
 ) -> list[dict]:
-    """Build compact system context in priority order."""
+    """Build compact system context in priority order.
+
+    Instruction files are read on a worker thread while the memory context is
+    fetched, so neither waits on the other. With PROMPT_PREFIX_STABLE the
+    memory facts are the session snapshot, keeping the prefix byte-stable.
+    """
+    instructions, memory = await asyncio.gather(
+        asyncio.to_thread(instruction_context_messages, settings),
+        MemoryService(settings).memory_context_messages(pinned=settings.PROMPT_PREFIX_STABLE),
+    )
     prompt = _STYLE_PROMPTS.get(style)
     system_messages = [{"role": "system", "content": prompt}] if prompt else []
-    system_messages.extend(instruction_context_messages(settings))
+    system_messages.extend(instructions)
     if current_goal and current_goal.strip():
         goal = " ".join(current_goal.split())
         if len(goal) > 1000:
@@ -163,8 +197,73 @@ async def _build_context(
                 f"{goal}"
             ),
         })
-    system_messages.extend(await MemoryService(settings).memory_context_messages())
-    return system_messages + context
+    system_messages.extend(memory)
+    return system_messages
+
+
+async def _timed(timings: StageTimings, stage: str, coro):
+    timings.start(stage)
+    try:
+        return await coro
+    finally:
+        timings.stop(stage)
+
+
+@asynccontextmanager
+async def routing_started(
+    routing: Coroutine[object, object, RoutingDecision],
+) -> AsyncIterator[asyncio.Task[RoutingDecision]]:
+    """
+    Run the router as a task for the length of the block.
+
+    Starting it before the model semaphore lets routing overlap the wait for a
+    model slot. A turn that returns early or fails cancels the task, so the
+    router never outlives the turn or leaves a coroutine un-awaited.
+    """
+    task = asyncio.ensure_future(routing)
+    try:
+        yield task
+    finally:
+        if not task.done():
+            task.cancel()
+        # Nobody awaits a route abandoned by a failed turn; keep its outcome from being logged.
+        task.add_done_callback(_consume_route)
+
+
+def _consume_route(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+async def _route(
+    text_content: str,
+    messages: list[dict],
+    complexity_scorer: ComplexityScorer,
+    settings: Settings,
+    quality_mode: QualityMode,
+    routing_decision: RoutingDecision | Awaitable[RoutingDecision] | None,
+) -> tuple[RoutingDecision | None, str | None, bool]:
+    """Routing decision, model name, and costly-tool exposure for this turn."""
+    if inspect.isawaitable(routing_decision):
+        routing_decision = await routing_decision
+    if routing_decision is not None:
+        return routing_decision, routing_decision.selected_model, True
+    if settings.COMPLEXITY_ROUTING_ENABLED:
+        response = await complexity_scorer.score_complexity(text_content, messages=messages)
+        logger.debug("Complexity: %s (%.2f)", response.classification, response.confidence)
+        is_complex = _include_costly_from_effort(
+            tiered_model_routing_enabled=True,
+            quality_mode=quality_mode,
+            complexity_level=response.classification,
+        )
+        return None, select_model(response.classification, settings, quality_mode), is_complex
+    logger.debug("Complexity routing disabled, using: %s", settings.MODEL)
+    is_complex = _include_costly_from_effort(
+        tiered_model_routing_enabled=False,
+        quality_mode=quality_mode,
+        complexity_level=None,
+    )
+    return None, settings.MODEL, is_complex
 
 
 async def process_task_stream(
@@ -177,7 +276,8 @@ async def process_task_stream(
     tool_registry: ToolRegistry | None = None,
     current_goal: str | None = None,
     require_tools: bool = False,
-    routing_decision: RoutingDecision | None = None,
+    routing_decision: RoutingDecision | Awaitable[RoutingDecision] | None = None,
+    raise_errors: bool = False,
 ) -> AsyncGenerator[str, None]:
     """
     Score complexity, select a model, and stream the response.
@@ -185,6 +285,11 @@ async def process_task_stream(
     A RoutingDecision is the normal user-facing path and decides the model,
     required tool use, and allowlist. Internal controller prompts can still use
     the same deterministic complexity scorer without exposing policy toggles.
+    Callers may pass the routing as a task from ``routing_started``, so the
+    router runs while instruction files and memory context are read. Per-stage timings are
+    logged when the first token arrives. A backend failure is streamed as an
+    apology, or raised when ``raise_errors`` is set, for callers that keep the
+    reply.
     """
     if messages is None:
         messages = []
@@ -195,14 +300,23 @@ async def process_task_stream(
         yield "Error: Settings instance required."
         return
 
+    timings = StageTimings()
+    use_stage_timings(timings)
     try:
+        (routing_decision, model_name, is_complex), system_context = await asyncio.gather(
+            _timed(
+                timings,
+                "route",
+                _route(text_content, messages, complexity_scorer, settings, quality_mode, routing_decision),
+            ),
+            _timed(timings, "context", _system_context(interaction_style, current_goal, settings)),
+        )
+
         allowed_tool_names = None
         if routing_decision is not None:
-            if routing_decision.selected_model is None:
+            if model_name is None:
                 yield routing_decision.fallback_plan.on_model_missing
                 return
-            model_name = routing_decision.selected_model
-            is_complex = True
             allowed_tool_names = routing_decision.tool_policy.allowed_tool_names
             require_tools = routing_decision.require_tools
             if routing_decision.execution_class == ExecutionClass.TEXT_CHAT and not require_tools:
@@ -210,51 +324,50 @@ async def process_task_stream(
             if require_tools and tool_registry and not allowed_tool_names:
                 yield routing_decision.fallback_plan.on_capability_missing
                 return
-        elif settings.COMPLEXITY_ROUTING_ENABLED:
-            response = await complexity_scorer.score_complexity(text_content, messages=messages)
-            logger.debug("Complexity: %s (%.2f)", response.classification, response.confidence)
-            model_name = select_model(response.classification, settings, quality_mode)
-            is_complex = _include_costly_from_effort(
-                tiered_model_routing_enabled=True,
-                quality_mode=quality_mode,
-                complexity_level=response.classification,
-            )
-        else:
-            model_name = settings.MODEL
-            is_complex = _include_costly_from_effort(
-                tiered_model_routing_enabled=False,
-                quality_mode=quality_mode,
-                complexity_level=None,
-            )
-            logger.debug("Complexity routing disabled, using: %s", model_name)
 
         logger.debug("Model: %s", model_name)
 
         client = get_ai_client(model_name, settings)
-        context = await _build_context(
-            manage_message_history(messages),
-            interaction_style,
-            current_goal,
-            settings,
+        context = system_context + manage_message_history(
+            messages,
+            block_turns=settings.PROMPT_HISTORY_BLOCK_TURNS if settings.PROMPT_PREFIX_STABLE else 1,
+            token_budget=_history_token_budget(settings, routing_decision),
+            summarize=_tool_summarizer(settings),
         )
+        reused_tokens, prompt_tokens = PROMPT_PREFIX_TRACKER.observe(model_name, context)
 
+        timings.start("connect")
         if tool_registry:
-            async for chunk in client.stream_with_tools(
+            stream = client.stream_with_tools(
                 context, model_name=model_name, tools=tool_registry, include_costly=is_complex,
                 history=messages,
                 tool_timeout_seconds=settings.TOOL_TIMEOUT_SECONDS,
                 max_tool_rounds=settings.MAX_WORKER_TOOL_STEPS,
                 require_tools=require_tools,
                 allowed_tool_names=allowed_tool_names,
-            ):
-                yield chunk
+                max_parallel_tools=settings.MAX_PARALLEL_TOOL_CALLS,
+            )
         else:
-            async for chunk in client.generate_completion_stream(context, model_name=model_name):
-                yield chunk
+            stream = client.generate_completion_stream(context, model_name=model_name)
+        async for chunk in stream:
+            if "first_token" not in timings.durations:
+                timings.stop("first_token")
+                logger.info(
+                    "Turn timings model=%s %s prefix_reuse=%d/%d",
+                    model_name,
+                    timings.summary(),
+                    reused_tokens,
+                    prompt_tokens,
+                )
+            yield chunk
 
     except Exception as e:
         logger.error("Stream task failed: %s", e, exc_info=True)
+        if raise_errors:
+            raise
         yield "Something went wrong. Please try again."
+    finally:
+        use_stage_timings(None)
 
 
 async def close_all_clients():
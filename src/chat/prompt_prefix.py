@@ -0,0 +1,61 @@
+"""
+Prompt Prefix Reuse
+
+Measures how much of each model's prompt matches the prompt sent on the
+previous turn. Local backends (Ollama, llama.cpp, vLLM) reuse their KV cache
+for a shared prefix, so this is the part of the prompt they do not have to
+re-evaluate. Token counts are estimated from characters; no tokenizer runs.
+"""
+
+import json
+import os
+from typing import Any
+
+from utils.token_budget import estimate_tokens
+
+
+def render_prompt(messages: list[dict]) -> str:
+    """Serialize messages in send order so equal prompts produce equal text."""
+    return json.dumps(messages, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class PromptPrefixTracker:
+    def __init__(self) -> None:
+        self._last_prompt: dict[str, str] = {}
+        self.turns = 0
+        self.last_reused_tokens = 0
+        self.last_prompt_tokens = 0
+        self.reused_tokens = 0
+        self.prompt_tokens = 0
+
+    def observe(self, model_name: str, messages: list[dict]) -> tuple[int, int]:
+        """Record a prompt and return (reused, total) estimated tokens versus the model's previous prompt."""
+        rendered = render_prompt(messages)
+        previous = self._last_prompt.get(model_name, "")
+        shared = len(os.path.commonprefix([previous, rendered])) if previous else 0
+        self._last_prompt[model_name] = rendered
+        reused, total = estimate_tokens(shared), estimate_tokens(len(rendered))
+        self.turns += 1
+        self.last_reused_tokens, self.last_prompt_tokens = reused, total
+        self.reused_tokens += reused
+        self.prompt_tokens += total
+        return reused, total
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "lastReusedTokens": self.last_reused_tokens,
+            "lastPromptTokens": self.last_prompt_tokens,
+            "reuseRate": round(self.reused_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._last_prompt.clear()
+        self.turns = 0
+        self.last_reused_tokens = 0
+        self.last_prompt_tokens = 0
+        self.reused_tokens = 0
+        self.prompt_tokens = 0
+
+
+PROMPT_PREFIX_TRACKER = PromptPrefixTracker()
@@ -0,0 +1,87 @@
+"""
+Tool Output Summaries
+
+Background summaries of long tool outputs for history compaction. A turn never
+waits on a summary: the first time an old tool output is compacted it gets a
+short excerpt, a SIMPLE_MODEL summary is requested in the background, and later
+turns reuse the cached summary.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Callable
+
+from clients.base_client import BaseAIClient
+
+logger = logging.getLogger(__name__)
+
+_MAX_ENTRIES = 256
+_SUMMARY_INPUT_CHARS = 12_000
+_SUMMARY_MAX_CHARS = 600
+_SUMMARY_PROMPT = (
+    "Summarize this tool output for a conversation history in at most three short sentences. "
+    "Keep names, numbers, paths, and errors. Reply with the summary only."
+)
+
+
+class ToolOutputSummaries:
+    def __init__(self) -> None:
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def lookup(self, content: str, client_factory: Callable[[], BaseAIClient], model_name: str) -> str | None:
+        """Return the cached summary, or None after scheduling one in the background."""
+        key = hashlib.sha256(content.encode("utf-8", "replace")).hexdigest()
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+            return summary
+        if key not in self._pending:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            task = loop.create_task(self._summarize(key, content, client_factory, model_name))
+            self._pending[key] = task
+            task.add_done_callback(lambda _task, key=key: self._pending.pop(key, None))
+        return None
+
+    async def _summarize(
+        self,
+        key: str,
+        content: str,
+        client_factory: Callable[[], BaseAIClient],
+        model_name: str,
+    ) -> None:
+        try:
+            response = await client_factory().generate_completion(
+                [
+                    {"role": "system", "content": _SUMMARY_PROMPT},
+                    {"role": "user", "content": content[:_SUMMARY_INPUT_CHARS]},
+                ],
+                model_name=model_name,
+            )
+        except Exception as e:
+            logger.debug("Tool output summary failed: %s", e)
+            return
+        summary = " ".join(str(response.get("content") or "").split())[:_SUMMARY_MAX_CHARS]
+        if not summary:
+            return
+        self._summaries[key] = summary
+        while len(self._summaries) > _MAX_ENTRIES:
+            self._summaries.popitem(last=False)
+
+    async def wait_pending(self) -> None:
+        if self._pending:
+            await asyncio.gather(*list(self._pending.values()), return_exceptions=True)
+
+    def clear(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+        self._summaries.clear()
+
+
+TOOL_OUTPUT_SUMMARIES = ToolOutputSummaries()
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import logging
 import re
@@ -10,6 +9,7 @@ from clients.base_client import BaseAIClient
 from tools.base import ToolResult
 from tools.registry import ToolRegistry
 from utils.settings import Settings
+from utils.stage_timings import mark_stage
 
 logger = logging.getLogger(__name__)
 
@@ -74,55 +74,71 @@ class StreamCleaner:
     markers and stripping special tokens that local servers sometimes leak.
 
     Think content is passed through (not suppressed) so the renderer can
-    display it with distinct styling while excluding it from history."""
+    display it with distinct styling while excluding it from history.
 
-    # Tail buffer: must be >= the longest tag or special token that could be
-    # split across chunks.  Longest is "<|endoftext|>" (13 chars).
-    _TAIL = 13
+    Each chunk is scanned once. The only text held between chunks is a
+    suffix that could still grow into a tag or special token, so memory
+    stays bounded and output is not delayed behind a fixed tail."""
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+    _OUTSIDE = re.compile("|".join(re.escape(t) for t in (_OPEN, *_SPECIAL_TOKENS)))
+    _INSIDE = re.compile("|".join(re.escape(t) for t in (_CLOSE, *_SPECIAL_TOKENS)))
+    _MARKERS = (_OPEN, _CLOSE, *_SPECIAL_TOKENS)
+    _MAX_MARKER = max(len(m) for m in _MARKERS)
 
     def __init__(self) -> None:
-        self._buf = ""
+        self._pending = ""
         self._in_think = False
 
     def feed(self, chunk: str) -> str:
-        self._buf += chunk
+        if not self._pending:
+            if "<" not in chunk:
+                # Every tag and token starts with "<"; most chunks pass straight through.
+                return chunk
+            text = chunk
+        else:
+            text = self._pending + chunk
         out_parts: list[str] = []
-
-        while self._buf:
-            if self._in_think:
-                end = self._buf.find("</think>")
-                if end == -1:
-                    # Stream think content; hold tail for split </think>.
-                    safe = max(0, len(self._buf) - self._TAIL)
-                    out_parts.append(self._buf[:safe])
-                    self._buf = self._buf[safe:]
-                    break
-                out_parts.append(self._buf[:end])
-                out_parts.append(THINK_END)
-                self._buf = self._buf[end + 8:]
-                self._in_think = False
-            else:
-                start = self._buf.find("<think>")
-                if start == -1:
-                    safe = max(0, len(self._buf) - self._TAIL)
-                    out_parts.append(self._buf[:safe])
-                    self._buf = self._buf[safe:]
-                    break
-                out_parts.append(self._buf[:start])
+        position = 0
+        while True:
+            pattern = self._INSIDE if self._in_think else self._OUTSIDE
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            out_parts.append(text[position:match.start()])
+            marker = match.group()
+            if marker == self._OPEN:
                 out_parts.append(THINK_START)
-                self._buf = self._buf[start + 7:]
                 self._in_think = True
-
-        return _strip_tokens("".join(out_parts))
+            elif marker == self._CLOSE:
+                out_parts.append(THINK_END)
+                self._in_think = False
+            position = match.end()
+        hold = self._partial_marker_start(text, position)
+        out_parts.append(text[position:hold])
+        self._pending = text[hold:]
+        return "".join(out_parts)
+
+    def _partial_marker_start(self, text: str, position: int) -> int:
+        """Index where a trailing, still-incomplete tag or token begins (len(text) if none)."""
+        search_from = max(position, len(text) - self._MAX_MARKER + 1)
+        index = text.find("<", search_from)
+        while index != -1:
+            tail = text[index:]
+            if any(marker.startswith(tail) for marker in self._MARKERS):
+                return index
+            index = text.find("<", index + 1)
+        return len(text)
 
     def flush(self) -> str:
         """Drain remaining buffer at end of stream."""
-        result = self._buf
+        result = self._pending
         if self._in_think:
             result += THINK_END
             self._in_think = False
-        self._buf = ""
-        return _strip_tokens(result)
+        self._pending = ""
+        return result
 
 
 def _parse_text_tool_calls(content: str) -> list[dict] | None:
@@ -191,10 +207,8 @@ class AIClient(BaseAIClient):
         model_name: str | None = None,
         **kwargs,
     ) -> dict:
-        result = ""
-        async for chunk in self.generate_completion_stream(messages, model_name=model_name):
-            result += chunk
-        return {"content": _strip_sentinels(result)}
+        parts = [chunk async for chunk in self.generate_completion_stream(messages, model_name=model_name)]
+        return {"content": _strip_sentinels("".join(parts))}
 
     async def generate_completion_with_image(
         self,
@@ -203,12 +217,11 @@ class AIClient(BaseAIClient):
         model_name: str | None = None,
         **kwargs,
     ) -> dict:
-        result = ""
-        async for chunk in self.generate_completion_with_image_stream(
-            messages, image_base64, model_name=model_name
-        ):
-            result += chunk
-        return {"content": _strip_sentinels(result)}
+        parts = [
+            chunk
+            async for chunk in self.generate_completion_with_image_stream(messages, image_base64, model_name=model_name)
+        ]
+        return {"content": _strip_sentinels("".join(parts))}
 
     async def generate_completion_stream(
         self,
@@ -222,6 +235,7 @@ class AIClient(BaseAIClient):
             messages=messages,
             stream=True,
         )
+        mark_stage("connect")
 
         async def _raw():
             async for chunk in stream:
@@ -290,6 +304,7 @@ class AIClient(BaseAIClient):
         max_tool_rounds: int = 5,
         require_tools: bool = False,
         allowed_tool_names: set[str] | frozenset[str] | None = None,
+        max_parallel_tools: int = 1,
     ) -> AsyncGenerator[str, None]:
         openai_tools = tools.to_openai_tools(
             include_costly=include_costly,
@@ -313,7 +328,7 @@ class AIClient(BaseAIClient):
         allowed_set = set(allowed_tool_names) if allowed_tool_names is not None else None
 
         for _ in range(max(1, max_tool_rounds)):
-            accumulated_content = ""
+            content_parts: list[str] = []
             tool_calls_raw: dict[int, dict] = {}
             _content_buffer = ""
             _suppress_content = False
@@ -330,6 +345,7 @@ class AIClient(BaseAIClient):
                     temperature=0.0,
                     stream=True,
                 )
+                mark_stage("connect")
             except Exception as e:
                 if _is_tools_unsupported_error(e):
                     self._native_tools_supported = False
@@ -353,7 +369,7 @@ class AIClient(BaseAIClient):
                 delta = choice.delta
 
                 if delta.content:
-                    accumulated_content += delta.content
+                    content_parts.append(delta.content)
 
                     if not _buffer_flushed:
                         _content_buffer += delta.content
@@ -382,6 +398,8 @@ class AIClient(BaseAIClient):
                         if tc.function and tc.function.arguments:
                             tool_calls_raw[idx]["arguments"] += tc.function.arguments
 
+            accumulated_content = "".join(content_parts)
+
             # If we never hit the threshold, decide now
             if not _buffer_flushed and _content_buffer:
                 _buffer_flushed = True
@@ -465,22 +483,24 @@ class AIClient(BaseAIClient):
             if history is not None:
                 history.append(assistant_msg)
 
-            # Execute each tool and append results (tool messages first, then any images)
-            pending_images: list[dict] = []
-            for tc in normalized_tool_calls:
+            # Execute the round's tools (read-only ones concurrently) and append
+            # results in call order: tool messages first, then any images.
+            results: dict[int, ToolResult] = {}
+            runnable: list[int] = []
+            for index, tc in enumerate(normalized_tool_calls):
                 if allowed_set is not None and tc["name"] not in allowed_set:
-                    result = ToolResult(content=f"Tool '{tc['name']}' is not allowed for this request.")
+                    results[index] = ToolResult(content=f"Tool '{tc['name']}' is not allowed for this request.")
                 else:
-                    try:
-                        result = await asyncio.wait_for(
-                            tools.execute(tc["name"], tc["arguments"]),
-                            timeout=max(1, tool_timeout_seconds),
-                        )
-                    except asyncio.TimeoutError:
-                        logger.error("Tool '%s' timed out after %ss", tc["name"], tool_timeout_seconds)
-                        result = ToolResult(
-                            content=f"Tool '{tc['name']}' timed out after {tool_timeout_seconds} seconds."
-                        )
+                    runnable.append(index)
+            executed = await tools.execute_calls(
+                [(normalized_tool_calls[index]["name"], normalized_tool_calls[index]["arguments"]) for index in runnable],
+                timeout_seconds=tool_timeout_seconds,
+                max_parallel=max_parallel_tools,
+            )
+            results.update(zip(runnable, executed))
+            pending_images: list[dict] = []
+            for index, tc in enumerate(normalized_tool_calls):
+                result = results[index]
                 tool_msg = {
                     "role": "tool",
                     "tool_call_id": tc["id"],
@@ -104,6 +104,7 @@ class BaseAIClient(ABC):
         max_tool_rounds: int = 5,
         require_tools: bool = False,
         allowed_tool_names: set[str] | frozenset[str] | None = None,
+        max_parallel_tools: int = 1,
     ) -> AsyncGenerator[str, None]:
         """
         Stream a completion with optional tool-calling support.
@@ -117,6 +118,7 @@ class BaseAIClient(ABC):
             tools: Registry of available tools.
             include_costly: If False, only lightweight tools are sent to the model.
             allowed_tool_names: Optional policy allowlist for model-visible tools.
+            max_parallel_tools: Read-only tool calls from one round that may run at once.
 
         Yields:
             str: Chunks of the final completion response.
@@ -11,11 +11,6 @@ import os
 import warnings
 from pathlib import Path
 
-from chat.complexity_scorer import ComplexityScorer
-from chat.message_handler import close_all_clients, get_used_model_names
-from runtime.live_session import LiveSession
-from runtime.models import LiveRuntimeState
-from runtime.preflight import PreflightManager
 from utils.settings import Settings
 from utils.theme import NC, RED, YELLOW
 
@@ -52,6 +47,17 @@ def _file_handler_for(log_file: Path, formatter: logging.Formatter) -> logging.H
 
 
 async def main() -> None:
+    # The runtime is imported here, not at module level: PDF extraction workers are
+    # spawned processes that import this module, and must not load the voice stack.
+    from chat.complexity_scorer import ComplexityScorer
+    from chat.message_handler import close_all_clients, get_used_model_names
+    from runtime.live_session import LiveSession
+    from runtime.memory.cache import MEMORY_CONTEXT_CACHE
+    from runtime.memory.mcp_client import close_memory_sessions
+    from runtime.models import LiveRuntimeState
+    from runtime.preflight import PreflightManager
+    from tools.mcp_stdio import close_mcp_sessions
+
     log_format = "[%(asctime)s] %(levelname)s - %(message)s"
     log_datefmt = "%Y-%m-%d %H:%M:%S"
     formatter = logging.Formatter(log_format, datefmt=log_datefmt)
@@ -109,11 +115,16 @@ async def main() -> None:
         complexity_scorer=scorer,
     )
 
+    if settings.MEMORY_ENABLED:
+        MEMORY_CONTEXT_CACHE.persist_stats()
     try:
         await session.run()
     finally:
+        MEMORY_CONTEXT_CACHE.save_stats(force=True)
         await PreflightManager.unload_models(settings, get_used_model_names())
         await close_all_clients()
+        await close_memory_sessions()
+        await close_mcp_sessions()
         logger.info("Session ended.")
 
 
@@ -11,6 +11,7 @@ import subprocess
 import sys
 import tempfile
 import textwrap
+import time
 import urllib.error
 import urllib.request
 import zipfile
@@ -1345,6 +1346,7 @@ def _check_typed_command_path(tmp_path: Path) -> str:
             return "Typed local command path handled /status without model routing."
         finally:
             if session is not None:
+                asyncio.run(session._file_triggers.stop())
                 asyncio.run(session.task_manager.shutdown())
                 asyncio.run(session._browser_session.close())
                 session.trigger_store.close()
@@ -1784,25 +1786,29 @@ async def _check_live_session_job_and_trigger_contracts(report: CertificationRep
                     raise RuntimeError("Retry did not replay the deterministic file job successfully.")
                 return "Failed deterministic file job retried from its original request."
 
+            async def watched_trigger(prefix: str):
+                trigger = next(
+                    (row for row in session.trigger_store.list_triggers() if row.original_request.startswith(prefix)),
+                    None,
+                )
+                # New triggers reach the monitor through store notifications on the next loop iteration.
+                for _ in range(100):
+                    if trigger is not None and trigger.id in session._file_triggers.pending():
+                        return trigger
+                    await asyncio.sleep(0.01)
+                raise RuntimeError(f"File trigger for {prefix!r} is not being watched.")
+
             async def trigger_fire() -> str:
                 source = root / "Downloads" / "trigger-cert.txt"
                 destination = root / "Documents" / "trigger-cert.txt"
                 await session._handle_user_input("When trigger-cert.txt appears in my Downloads, move it to Documents.")
-                task = session.task_manager.latest_active_task()
-                if task is None:
-                    raise RuntimeError("File trigger did not create a background task.")
+                trigger = await watched_trigger("When trigger-cert")
+                if session.task_manager.latest_active_task() is not None:
+                    raise RuntimeError("Waiting file trigger took a background task slot.")
                 source.write_text("trigger me")
-                await session.task_manager.wait_for_task(task.id)
-                trigger = next(
-                    (
-                        row
-                        for row in session.trigger_store.list_triggers()
-                        if row.original_request.startswith("When trigger-cert")
-                    ),
-                    None,
-                )
-                if trigger is None or session.trigger_store.get_trigger(trigger.id).status != TriggerStatus.COMPLETED:
-                    raise RuntimeError("File trigger did not complete.")
+                status = await _wait_for_trigger_status(session.trigger_store, trigger.id)
+                if status != TriggerStatus.COMPLETED:
+                    raise RuntimeError(f"File trigger did not complete: {status}.")
                 if source.exists() or destination.read_text() != "trigger me":
                     raise RuntimeError("File trigger did not move the created file.")
                 return "File-appears trigger fired once and moved the file."
@@ -1811,31 +1817,29 @@ async def _check_live_session_job_and_trigger_contracts(report: CertificationRep
                 paused_source = root / "Downloads" / "paused-cert.txt"
                 paused_destination = root / "Documents" / "paused-cert.txt"
                 await session._handle_user_input("When paused-cert.txt appears in my Downloads, move it to Documents.")
-                paused_task = session.task_manager.latest_active_task()
-                paused_trigger = session.trigger_store.list_triggers()[0]
-                if paused_task is None:
-                    raise RuntimeError("Paused trigger did not create a background task.")
+                paused_trigger = await watched_trigger("When paused-cert")
                 await session._handle_command(f"/trigger pause {paused_trigger.id}")
                 paused_source.write_text("wait")
                 await asyncio.sleep(0.05)
                 if paused_destination.exists():
                     raise RuntimeError("Paused trigger fired before resume.")
                 await session._handle_command(f"/trigger resume {paused_trigger.id}")
-                await session.task_manager.wait_for_task(paused_task.id)
+                if await _wait_for_trigger_status(session.trigger_store, paused_trigger.id) != TriggerStatus.COMPLETED:
+                    raise RuntimeError("Resumed trigger did not complete.")
                 if paused_source.exists() or paused_destination.read_text() != "wait":
                     raise RuntimeError("Resumed trigger did not fire.")
 
                 cancelled_source = root / "Downloads" / "cancelled-cert.txt"
                 cancelled_destination = root / "Documents" / "cancelled-cert.txt"
                 await session._handle_user_input("When cancelled-cert.txt appears in my Downloads, move it to Documents.")
-                cancelled_task = session.task_manager.latest_active_task()
-                cancelled_trigger = session.trigger_store.list_triggers()[0]
-                if cancelled_task is None:
-                    raise RuntimeError("Cancelled trigger did not create a background task.")
+                cancelled_trigger = await watched_trigger("When cancelled-cert")
                 await session._handle_command(f"/trigger cancel {cancelled_trigger.id}")
                 cancelled_source.write_text("no move")
-                await session.task_manager.wait_for_task(cancelled_task.id)
-                if cancelled_destination.exists():
+                deadline = time.monotonic() + 5
+                while cancelled_trigger.id in session._file_triggers.pending() and time.monotonic() < deadline:
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(0.05)
+                if cancelled_trigger.id in session._file_triggers.pending() or cancelled_destination.exists():
                     raise RuntimeError("Cancelled trigger still fired.")
                 restored = session.trigger_store.get_trigger(cancelled_trigger.id)
                 if restored is None or restored.status != TriggerStatus.CANCELLED:
@@ -1852,12 +1856,24 @@ async def _check_live_session_job_and_trigger_contracts(report: CertificationRep
             )
         finally:
             if session is not None:
+                await session._file_triggers.stop()
                 await session.task_manager.shutdown()
                 await session._browser_session.close()
                 session.trigger_store.close()
                 session.job_store.close()
 
 
+async def _wait_for_trigger_status(store: TriggerStore, trigger_id: str, timeout: float = 5.0) -> TriggerStatus | None:
+    """Wait for a file trigger to finish; the status it ended in, or None if it is still waiting."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        trigger = store.get_trigger(trigger_id)
+        if trigger is not None and trigger.status in (TriggerStatus.COMPLETED, TriggerStatus.FAILED):
+            return trigger.status
+        await asyncio.sleep(0.01)
+    return None
+
+
 def _build_certification_session(tmp_path: Path):
     from chat.complexity_scorer import ComplexityScorer
     from runtime.live_session import LiveSession
@@ -2682,7 +2698,7 @@ async def _check_task_control(report: CertificationReport, store: DurableJobStor
         memory_count >= 1
         and store_count >= 1
         and not manager.list_tasks(include_recent=True)
-        and not any(job.status in terminal_jobs for job in store.list_jobs(limit=100))
+        and not any(job.status in terminal_jobs for job in store.list_job_summaries(limit=100).items)
     ):
         report.add("clear_completed", "passed", "Completed, failed, and cancelled task rows were cleared.")
     else:
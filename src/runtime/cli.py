@@ -17,15 +17,19 @@ import subprocess
 import sys
 import webbrowser
 from dataclasses import asdict, dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from runtime.examples import render_examples
 from runtime.memory import ensure_instruction_files
+from runtime.memory.cache import load_stats as load_memory_cache_stats
+from runtime.memory.cache import request_reload as request_memory_reload
 from runtime.memory.service import MemoryService
 from runtime.preflight import PreflightManager
 from runtime.service import service_paths, service_status, start_service, stop_service, web_url_with_token
 from runtime.settings_catalog import get_setting, setting_specs, settings_snapshot, write_setting
+from runtime.whisper_client import format_stats, load_stats
 from utils.settings import Settings
 
 
@@ -103,6 +107,16 @@ def cli(argv: list[str] | None = None) -> int:
     memory_forget = memory_subcommands.add_parser("forget", help="Forget a matching memory fact.")
     memory_forget.add_argument("query", nargs="+")
 
+    jobs = subcommands.add_parser("jobs", help="Search archived job logs and ledger entries, or compact the job store.")
+    jobs.add_argument("--json", action="store_true", help="Print machine-readable job output.")
+    jobs_subcommands = jobs.add_subparsers(dest="jobs_action")
+    jobs_archive = jobs_subcommands.add_parser("archive", help="Search archived job logs and ledger entries.")
+    jobs_archive.add_argument("--job", default="", help="Only rows for this job id.")
+    jobs_archive.add_argument("--kind", choices=("log", "operation"), help="Only logs or only ledger entries.")
+    jobs_archive.add_argument("--grep", default="", help="Case-insensitive text the row must contain.")
+    jobs_archive.add_argument("--limit", type=int, default=50, help="Newest rows to show.")
+    jobs_subcommands.add_parser("compact", help="Archive rows past retention and reclaim space now; converts older stores.")
+
     update = subcommands.add_parser("update", help="Explain the correct update command for this install.")
     update.add_argument("--json", action="store_true", help="Print machine-readable update guidance.")
 
@@ -131,7 +145,9 @@ def cli(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
     if args.command is None:
         return _run_live_session()
-    if args.command in {"start", "stop", "restart", "menu", "status", "open", "logs", "service", "settings", "memory"}:
+    if args.command in {
+        "start", "stop", "restart", "menu", "status", "open", "logs", "service", "settings", "memory", "jobs",
+    }:
         return _handle_simple_command(args)
     if args.command == "web":
         from web.server import run
@@ -229,6 +245,8 @@ def _handle_simple_command(args) -> int:
         return _handle_settings_command(args)
     if args.command == "memory":
         return _handle_memory_command(args)
+    if args.command == "jobs":
+        return _handle_jobs_command(args)
     if args.command == "logs":
         return _emit(_logs(open_folder=args.open), json_output=args.json)
     if args.command == "menu":
@@ -290,6 +308,20 @@ def _handle_memory_command(args) -> int:
             status = _run_async(service.status())
             ready = "ready" if status["ready"] else "needs setup" if status["enabled"] else "off"
             message = f"Eyra memory is {ready}.\nPath: {status['path']}"
+            connection = status.get("connection") or {}
+            if connection.get("state"):
+                message += f"\nServer: {connection['state']}, {connection.get('restarts', 0)} restarts"
+            # The cache lives in the running Eyra; this process only sees the counters it last saved.
+            cache = load_memory_cache_stats()
+            status["contextCache"] = cache
+            if cache:
+                saved = datetime.fromtimestamp(float(cache.get("updatedAt", 0))).strftime("%H:%M:%S")
+                message += (
+                    f"\nContext cache (Eyra pid {cache.get('pid')}, saved {saved}): "
+                    f"{cache.get('hits', 0)} hits, {cache.get('misses', 0)} misses"
+                )
+            else:
+                message += "\nContext cache: no running Eyra has saved stats yet."
             if status.get("error"):
                 message += f"\n{status['error']}"
             return _emit(CommandResult(True, message, {"memory": status}), json_output=json_output)
@@ -317,13 +349,70 @@ def _handle_memory_command(args) -> int:
             status = _run_async(service.status())
             return _emit(CommandResult(True, status["path"], {"memory": {"path": status["path"]}}), json_output=json_output)
         if action == "reload":
-            status = _run_async(service.status())
-            return _emit(CommandResult(True, "Memory context will reload on the next turn.", {"memory": status}), json_output=json_output)
+            request_memory_reload()
+            return _emit(
+                CommandResult(True, "Running Eyra sessions will reload memory context on their next turn.", {"memory": {"reload": True}}),
+                json_output=json_output,
+            )
     except Exception as exc:
         return _emit(CommandResult(False, f"Memory error: {exc}", {}), json_output=json_output)
     return _emit(CommandResult(False, f"Unknown memory action: {action}", {}), json_output=json_output)
 
 
+def _handle_jobs_command(args) -> int:
+    from runtime.job_retention import JobArchive, RetentionPolicy
+    from runtime.jobs import DurableJobStore
+
+    settings = Settings.load_from_env()
+    policy = RetentionPolicy.from_settings(settings)
+    action = args.jobs_action or "archive"
+    json_output = bool(args.json)
+    if action == "archive":
+        archive = JobArchive(policy.archive_path)
+        rows = archive.search(
+            kind=getattr(args, "kind", None),
+            job_id=getattr(args, "job", ""),
+            text=getattr(args, "grep", ""),
+            limit=getattr(args, "limit", 50),
+        )
+        lines = [_format_archived_row(row) for row in rows] or ["No archived job rows match."]
+        return _emit(
+            CommandResult(True, "\n".join(lines), {"archive": str(archive.path), "rows": rows}),
+            json_output=json_output,
+        )
+    if action == "compact":
+        store = DurableJobStore(settings.JOB_STORE_PATH)
+        try:
+            archive = JobArchive(policy.archive_path)
+            converted = store.convert_to_incremental_vacuum()
+            totals = {"archivedLogs": 0, "archivedOperations": 0, "reclaimedPages": 0, "converted": converted}
+            while True:
+                result = store.compact(policy, archive)
+                totals["archivedLogs"] += result.archived_logs
+                totals["archivedOperations"] += result.archived_operations
+                totals["reclaimedPages"] += result.reclaimed_pages
+                if not result.more:
+                    break
+        finally:
+            store.close()
+        message = (
+            f"Archived {totals['archivedLogs']} log rows and {totals['archivedOperations']} ledger rows; "
+            f"reclaimed {totals['reclaimedPages']} pages."
+        )
+        if converted:
+            message = f"Converted the job store to incremental vacuum. {message}"
+        return _emit(CommandResult(True, message, totals), json_output=json_output)
+    return _emit(CommandResult(False, f"Unknown jobs action: {action}", {}), json_output=json_output)
+
+
+def _format_archived_row(row: dict[str, Any]) -> str:
+    when = datetime.fromtimestamp(float(row.get("timestamp") or 0)).strftime("%Y-%m-%d %H:%M:%S")
+    if row.get("kind") == "operation":
+        outcome = "ok" if row.get("success") else f"failed: {row.get('error') or 'unknown'}"
+        return f"{when} {row.get('job_id')} op {row.get('capability')} {row.get('target')} ({outcome})"
+    return f"{when} {row.get('job_id')} {row.get('level')}: {row.get('message')}"
+
+
 def _emit(result: CommandResult, *, json_output: bool) -> int:
     if json_output:
         print(json.dumps({"ok": result.ok, "message": result.message, **result.data}, indent=2, sort_keys=True))
@@ -358,6 +447,7 @@ async def _doctor(settings_override: Settings | None = None) -> CommandResult:
         "preflight": _preflight_summary(preflight, preflight_error),
         "microphones": _microphone_summary(),
         "memory": memory_status,
+        "localWhisperClient": load_stats(),
         "recentErrors": _recent_errors(),
     }
     voice_requested = settings.LIVE_LISTENING_ENABLED or settings.LIVE_SPEECH_ENABLED
@@ -466,6 +556,8 @@ def _format_doctor(data: dict[str, Any], ok: bool) -> str:
         lines.append("Local Whisper: disabled")
     else:
         lines.append(f"Local Whisper: {'ready' if wh.get('available') else 'not ready'}")
+    if data.get("localWhisperClient"):
+        lines.append(f"Local Whisper requests: {format_stats(data['localWhisperClient'])}")
     lines.append(f"Microphones: {data['microphones']['inputDeviceCount']} input device(s)")
     lines.append(f"Screen capture: {'ready' if preflight.get('screenCaptureAvailable') else 'not ready'}")
     memory = data.get("memory", {})
@@ -1136,6 +1228,7 @@ def _paths(settings: Settings | None = None) -> dict[str, str]:
         "dataDir": str(home / ".local" / "share" / "eyra"),
         "logDir": str(home / "Library" / "Logs" / "Eyra"),
         "jobStore": _redact_path(settings.JOB_STORE_PATH),
+        "jobArchive": _redact_path(settings.JOB_ARCHIVE_PATH),
         "triggerStore": _redact_path(settings.TRIGGER_STORE_PATH),
         "externalAgentConfig": _redact_path(settings.EXTERNAL_AGENT_CONFIG_PATH),
         "mcpConfig": _redact_path(settings.MCP_CONFIG_PATH),
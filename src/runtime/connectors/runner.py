@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import json
-import re
 import sys
 import time
 from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
@@ -22,14 +22,25 @@ from runtime.connectors.types import (
 )
 from runtime.jobs import DurableJobStore, JobStatus, RiskLevel
 from tools.approval import ApprovalManager, approval_required_message
-
-_SECRET_PATTERNS = (
-    re.compile(r"(?i)(api[_-]?key|token|secret|password)([\"'\s:=]+)([^\s,}]+)"),
-    re.compile(r"sk-[A-Za-z0-9_-]{16,}"),
-    re.compile(r"(?i)(token=)[^&\s]+"),
-    re.compile(r"Bearer\s+[A-Za-z0-9_\-./+=]{16,}"),
+from utils.redaction import (
+    Redactor,
+    bearer_rule,
+    home_path_rule,
+    openai_key_rule,
+    secret_assignment_rule,
+    temp_path_rule,
+    token_query_rule,
 )
 
+_OUTPUT_REDACTOR = Redactor((
+    secret_assignment_rule(r"([^\s,}]+)"),
+    openai_key_rule(16),
+    token_query_rule(),
+    bearer_rule(16),
+    home_path_rule(stop=r"/\s"),
+    temp_path_rule("/var/folders/"),
+))
+
 
 class ConnectorRunner:
     """Run connector jobs with approval, timeout, output caps, and cancellation."""
@@ -335,20 +346,12 @@ class _ApprovalResult:
 
 
 def redact_output(text: str) -> str:
-    redacted = text
-    for pattern in _SECRET_PATTERNS:
-        redacted = pattern.sub(lambda match: _redact_match(match), redacted)
-    redacted = re.sub(r"/Users/[^/\s]+", "~/[user]", redacted)
-    redacted = re.sub(r"(?:/private)?/var/folders/[^\s,}\"']+", "~/[temp]", redacted)
-    return re.sub(r"/tmp/[^\s,}\"']+", "~/[temp]", redacted)
+    return _OUTPUT_REDACTOR.redact(text)
 
 
-def _redact_match(match: re.Match) -> str:
-    if match.lastindex and match.lastindex >= 2:
-        return f"{match.group(1)}{match.group(2)}[REDACTED]"
-    if match.lastindex == 1:
-        return f"{match.group(1)}[REDACTED]"
-    return "[REDACTED]"
+def redact_output_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """Redact connector output incrementally, for stdout read in chunks."""
+    return _OUTPUT_REDACTOR.stream(chunks)
 
 
 def _job_risk(manifest: ConnectorManifest) -> RiskLevel:
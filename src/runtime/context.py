@@ -18,8 +18,8 @@ def build_context_snapshot(
     cwd: str | None = None,
 ) -> dict:
     """Collect local, non-continuous context for reference resolution."""
-    jobs = job_store.list_jobs(limit=5)
-    operations = job_store.list_operations(limit=5)
+    jobs = job_store.list_job_summaries(limit=5).items
+    operations = job_store.list_operation_summaries(limit=5).items
     return {
         "currentGoal": state.current_goal,
         "cwd": redact_semantic_text(cwd or os.getcwd()),
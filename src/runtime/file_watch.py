@@ -0,0 +1,361 @@
+"""
+File Watching
+
+One watcher thread serves every file trigger in the process. On Linux it uses
+inotify, with one kernel watch per parent directory shared by every watched
+path in that directory, so it sleeps until something changes there. A path is
+ready once it exists and has settled: at once after the writer closes it or
+it is moved into place, otherwise after ``SETTLE_SECONDS`` without changes.
+
+Without inotify (other platforms, or a directory that does not exist yet) the
+same thread stats the affected paths every ``poll_seconds`` and treats a file
+as settled when its size and mtime match across two polls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last change before a file that was not closed or moved in counts as settled.
+SETTLE_SECONDS = 0.05
+DEFAULT_POLL_SECONDS = 0.5
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+# Event kinds after which a file is complete without waiting for a quiet period.
+_FINISHED = _IN_CLOSE_WRITE | _IN_MOVED_TO
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_BYTES = 64 * 1024
+
+
+class _Inotify:
+    """Minimal ctypes binding for the inotify calls the watcher needs."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._libc = libc
+        self.fd = fd
+
+    def add(self, directory: Path) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(directory))
+        return wd
+
+    def remove(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> list[tuple[int, int, str]]:
+        """Pending ``(wd, mask, name)`` events; empty when nothing is queued."""
+        try:
+            data = os.read(self.fd, _READ_BYTES)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        with suppress(OSError):
+            os.close(self.fd)
+
+
+class FileWatch:
+    """One registration for a path; ``wait`` returns True once the file is ready."""
+
+    def __init__(self, watcher: FileWatcher, path: Path, poll_seconds: float, loop: asyncio.AbstractEventLoop):
+        self.watcher = watcher
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._ready = False
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds; False on timeout or after ``wake``."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        ready, self._ready = self._ready, False
+        return ready
+
+    def wake(self) -> None:
+        """Make a pending or the next ``wait`` return False; safe to call from any thread."""
+        self._signal(False)
+
+    def rearm(self) -> None:
+        """Check the path again, for when a ready signal was ignored."""
+        self.watcher.check(self.path)
+
+    def close(self) -> None:
+        self.watcher.unwatch(self)
+
+    def __enter__(self) -> FileWatch:
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def _signal(self, ready: bool) -> None:
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._deliver, ready)
+
+    def _deliver(self, ready: bool) -> None:
+        self._ready = self._ready or ready
+        self._event.set()
+
+
+class FileWatcher:
+    """Shared watcher thread; inotify on Linux, polling elsewhere."""
+
+    def __init__(self, *, use_inotify: bool = True, settle_seconds: float = SETTLE_SECONDS):
+        self.settle_seconds = settle_seconds
+        self._inotify: _Inotify | None = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable, file triggers will poll: %s", e)
+        self._lock = threading.Lock()
+        self._watches: dict[Path, set[FileWatch]] = {}
+        # Parent directory -> inotify watch descriptor, and back.
+        self._directories: dict[Path, int] = {}
+        self._descriptors: dict[int, Path] = {}
+        # Paths whose directory has no inotify watch and must be polled.
+        self._polled: set[Path] = set()
+        # Path -> (when to check, size and mtime seen when the check was scheduled).
+        self._checks: dict[Path, tuple[float, tuple[int, int] | None]] = {}
+        self._next_poll = 0.0
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def watch(self, path: str | Path, *, poll_seconds: float = DEFAULT_POLL_SECONDS) -> FileWatch:
+        """Start watching ``path`` for the calling event loop; use as a context manager."""
+        target = Path(path).expanduser()
+        watch = FileWatch(self, target, max(0.01, poll_seconds), asyncio.get_running_loop())
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("File watcher is closed.")
+            first = target not in self._watches
+            self._watches.setdefault(target, set()).add(watch)
+            if first and not self._add_directory(target.parent):
+                self._polled.add(target)
+            self._schedule(target, self.settle_seconds if target not in self._polled else watch.poll_seconds)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="eyra-file-watcher", daemon=True)
+                self._thread.start()
+        self._nudge()
+        return watch
+
+    def unwatch(self, watch: FileWatch) -> None:
+        with self._lock:
+            watches = self._watches.get(watch.path)
+            if watches is None or watch not in watches:
+                return
+            watches.discard(watch)
+            if watches:
+                return
+            del self._watches[watch.path]
+            self._polled.discard(watch.path)
+            self._checks.pop(watch.path, None)
+            directory = watch.path.parent
+            if self._inotify is not None and directory in self._directories:
+                if not any(path.parent == directory for path in self._watches):
+                    wd = self._directories.pop(directory)
+                    self._descriptors.pop(wd, None)
+                    with suppress(OSError):
+                        self._inotify.remove(wd)
+
+    def check(self, path: str | Path) -> None:
+        """Schedule a settle check for ``path`` as if it had just changed."""
+        target = Path(path).expanduser()
+        with self._lock:
+            if target in self._watches:
+                self._schedule(target, 0.0)
+        self._nudge()
+
+    def watched_paths(self) -> list[Path]:
+        with self._lock:
+            return sorted(self._watches)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._nudge()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        if self._inotify is not None:
+            self._inotify.close()
+        for fd in (self._wake_read, self._wake_write):
+            with suppress(OSError):
+                os.close(fd)
+
+    def _add_directory(self, directory: Path) -> bool:
+        """Watch ``directory`` with inotify; False when it must be polled instead."""
+        if self._inotify is None:
+            return False
+        if directory in self._directories:
+            return True
+        try:
+            wd = self._inotify.add(directory)
+        except OSError:
+            return False
+        self._directories[directory] = wd
+        self._descriptors[wd] = directory
+        return True
+
+    def _schedule(self, path: Path, delay: float) -> None:
+        self._checks[path] = (time.monotonic() + delay, _stat_key(path))
+
+    def _nudge(self) -> None:
+        with suppress(OSError):
+            os.write(self._wake_write, b"\0")
+
+    def _poll_seconds(self) -> float | None:
+        polled = [watch.poll_seconds for path in self._polled for watch in self._watches.get(path, ())]
+        return min(polled) if polled else None
+
+    def _timeout(self) -> float | None:
+        now = time.monotonic()
+        deadlines = [due for due, _key in self._checks.values()]
+        if self._polled:
+            deadlines.append(self._next_poll)
+        return max(0.0, min(deadlines) - now) if deadlines else None
+
+    def _run(self) -> None:
+        fds = [self._wake_read] + ([self._inotify.fd] if self._inotify is not None else [])
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                timeout = self._timeout()
+            try:
+                readable, _, _ = select.select(fds, [], [], timeout)
+            except (OSError, ValueError):
+                return
+            if self._wake_read in readable:
+                with suppress(OSError):
+                    while os.read(self._wake_read, 4096):
+                        pass
+            ready: list[FileWatch] = []
+            with self._lock:
+                if self._closed:
+                    return
+                if self._inotify is not None and self._inotify.fd in readable:
+                    self._handle_events(self._inotify.read())
+                self._poll_due()
+                ready = self._run_checks()
+            for watch in ready:
+                watch._signal(True)
+
+    def _handle_events(self, events: list[tuple[int, int, str]]) -> None:
+        for wd, mask, name in events:
+            if mask & _IN_Q_OVERFLOW:
+                for path in self._watches:
+                    self._schedule(path, 0.0)
+                continue
+            directory = self._descriptors.get(wd)
+            if directory is None:
+                continue
+            if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                # The directory is gone; poll its paths until it comes back.
+                self._descriptors.pop(wd, None)
+                self._directories.pop(directory, None)
+                self._polled.update(path for path in self._watches if path.parent == directory)
+                continue
+            path = directory / name
+            if path in self._watches:
+                self._schedule(path, 0.0 if mask & _FINISHED else self.settle_seconds)
+
+    def _poll_due(self) -> None:
+        if not self._polled or time.monotonic() < self._next_poll:
+            return
+        interval = self._poll_seconds() or DEFAULT_POLL_SECONDS
+        self._next_poll = time.monotonic() + interval
+        for path in list(self._polled):
+            if self._add_directory(path.parent):
+                self._polled.discard(path)
+                self._schedule(path, self.settle_seconds)
+            elif path not in self._checks and path.exists():
+                self._schedule(path, interval)
+
+    def _run_checks(self) -> list[FileWatch]:
+        now = time.monotonic()
+        ready: list[FileWatch] = []
+        for path, (due, previous) in list(self._checks.items()):
+            if due > now:
+                continue
+            current = _stat_key(path)
+            if current is None:
+                del self._checks[path]
+            elif current == previous:
+                del self._checks[path]
+                ready.extend(self._watches.get(path, ()))
+            else:
+                delay = self._poll_seconds() if path in self._polled else self.settle_seconds
+                self._schedule(path, delay or self.settle_seconds)
+        return ready
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+_shared_watcher: FileWatcher | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_file_watcher() -> FileWatcher:
+    """The process-wide watcher used by file triggers."""
+    global _shared_watcher
+    with _shared_lock:
+        if _shared_watcher is None:
+            _shared_watcher = FileWatcher()
+        return _shared_watcher
@@ -3,6 +3,7 @@
 from runtime.history.protocol import ProtocolHistory
 from runtime.history.redaction import redact_semantic_text, semantic_history_entry
 from runtime.history.store import (
+    SemanticEntry,
     SemanticHistory,
     build_semantic_history,
     sanitize_semantic_entries,
@@ -27,6 +28,7 @@ __all__ = [
     "ProtocolHistory",
     "RedactionPolicy",
     "RouteSummary",
+    "SemanticEntry",
     "SemanticHistory",
     "SemanticTurn",
     "ToolUseSummary",
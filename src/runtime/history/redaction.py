@@ -3,16 +3,24 @@
 from __future__ import annotations
 
 import json
-import re
+from functools import lru_cache
 from typing import Any
 
 from runtime.history.types import DataClass, PrivacyBoundary, RedactionPolicy, SemanticTurn, ToolUseSummary
-
-_SECRET_RE = re.compile(r"(?i)(api[_-]?key|token|secret|password)([\"'\s:=]+)([^\s,}\"']+)")
-_OPENAI_KEY_RE = re.compile(r"sk-[A-Za-z0-9_-]{12,}")
-_BEARER_RE = re.compile(r"Bearer\s+[A-Za-z0-9_\-./+=]{12,}")
-_HOME_RE = re.compile(r"/Users/[^/\s,}\"']+")
-_TEMP_RE = re.compile(r"(?:/private)?/var/[^\s,}\"']+|/tmp/[^\s,}\"']+")
+from utils.redaction import (
+    Redactor,
+    bearer_rule,
+    home_path_rule,
+    openai_key_rule,
+    secret_assignment_rule,
+    temp_path_rule,
+)
+
+_SECRET_RULES = (
+    secret_assignment_rule(r"([^\s,}\"']+)"),
+    openai_key_rule(12, "[REDACTED_KEY]"),
+    bearer_rule(12, "Bearer [REDACTED]"),
+)
 _OMIT_HINTS = {
     "clipboard": DataClass.OMITTED_CLIPBOARD,
     "pdf": DataClass.OMITTED_PDF_TEXT,
@@ -23,20 +31,23 @@ _OMIT_HINTS = {
 def redact_semantic_text(text: str, policy: RedactionPolicy | None = None) -> str:
     """Redact secrets and local paths from user-visible history text."""
     policy = policy or RedactionPolicy()
-    redacted = text
-    if policy.redact_secrets:
-        redacted = _SECRET_RE.sub(lambda match: f"{match.group(1)}{match.group(2)}[REDACTED]", redacted)
-        redacted = _OPENAI_KEY_RE.sub("[REDACTED_KEY]", redacted)
-        redacted = _BEARER_RE.sub("Bearer [REDACTED]", redacted)
-    if policy.redact_local_paths:
-        redacted = _HOME_RE.sub("~/[user]", redacted)
-    if policy.redact_temp_paths:
-        redacted = _TEMP_RE.sub("~/[temp]", redacted)
+    redactor = _semantic_redactor(policy.redact_secrets, policy.redact_local_paths, policy.redact_temp_paths)
+    redacted = redactor.redact(text)
     if len(redacted) > policy.max_text_chars:
         return redacted[: policy.max_text_chars - 20].rstrip() + "\n[summary clipped]"
     return redacted
 
 
+@lru_cache(maxsize=8)
+def _semantic_redactor(secrets: bool, local_paths: bool, temp_paths: bool) -> Redactor:
+    rules = list(_SECRET_RULES) if secrets else []
+    if local_paths:
+        rules.append(home_path_rule())
+    if temp_paths:
+        rules.append(temp_path_rule())
+    return Redactor(rules)
+
+
 def semantic_history_entry(
     message: dict[str, Any],
     policy: RedactionPolicy | None = None,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -12,35 +13,107 @@ _VALID_PROTOCOL_CONTEXT_ROLES = {"user", "assistant"}
 _SEMANTIC_ONLY_KEYS = {"privacy", "toolCalls", "route", "jobs", "connectors", "metadata"}
 
 
+class SemanticEntry(dict):
+    """Read-only semantic entry shared by every snapshot of the log.
+
+    Readers get the same object until the message changes, so they must copy
+    (``dict(entry)``) before editing. The sanitized and protocol-context forms
+    are derived once and cached on the entry.
+    """
+
+    __slots__ = ("_safe", "_protocol")
+
+    def _read_only(self, *_args, **_kwargs):
+        raise TypeError("Semantic history entries are shared and read-only; copy with dict(entry).")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> dict[str, Any]:
+        return copy.deepcopy(dict(self), memo)
+
+
+@dataclass(frozen=True)
+class _LogRecord:
+    message: dict[str, Any]
+    tool_name: str
+    turn: SemanticTurn
+    entry: SemanticEntry
+
+
 @dataclass
 class SemanticHistory:
-    """Typed redacted turns for user-visible and durable runtime surfaces."""
+    """Typed redacted turns for user-visible and durable runtime surfaces.
+
+    Each protocol message is redacted once. Rebuilding after an insert reuses
+    the stored turn for every message object it has already seen, and readers
+    share one copy-on-write snapshot until the log changes.
+    """
 
     turns: list[SemanticTurn] = field(default_factory=list)
     policy: RedactionPolicy = field(default_factory=RedactionPolicy)
     tool_name_by_id: dict[str, str] = field(default_factory=dict)
+    _records: dict[int, _LogRecord] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _entries: list[SemanticEntry] = field(default_factory=list, init=False, repr=False, compare=False)
+    _snapshot: tuple[SemanticEntry, ...] | None = field(default=None, init=False, repr=False, compare=False)
 
     def append_from_protocol(self, message: dict[str, Any]) -> None:
         self._remember_tool_calls(message)
-        self.turns.append(
-            semantic_turn_from_protocol(message, policy=self.policy, tool_name_by_id=self.tool_name_by_id)
-        )
+        record = self._record_for(message)
+        self.turns.append(record.turn)
+        self._entries.append(record.entry)
+        self._snapshot = None
 
     def rebuild_from_protocol(self, messages: list[dict[str, Any]]) -> None:
+        previous = self._records
+        self._records = {}
         self.turns = []
+        self._entries = []
+        self._snapshot = None
         self.tool_name_by_id = {}
         for message in messages:
-            self.append_from_protocol(message)
+            self._remember_tool_calls(message)
+            record = self._record_for(message, previous=previous)
+            self.turns.append(record.turn)
+            self._entries.append(record.entry)
 
     def clear(self) -> None:
         self.turns.clear()
         self.tool_name_by_id.clear()
+        self._records.clear()
+        self._entries.clear()
+        self._snapshot = None
+
+    def snapshot(self) -> tuple[SemanticEntry, ...]:
+        """Return the current entries as a shared, read-only tuple."""
+        if self._snapshot is None or len(self._snapshot) != len(self.turns):
+            if len(self._entries) != len(self.turns):
+                self._entries = [SemanticEntry(turn.to_dict()) for turn in self.turns]
+            self._snapshot = tuple(self._entries)
+        return self._snapshot
 
     def recent(self, limit: int = 10) -> list[dict[str, Any]]:
-        return [turn.to_dict() for turn in self.turns[-max(1, limit) :]]
+        return list(self.snapshot()[-max(1, limit) :])
 
     def to_list(self) -> list[dict[str, Any]]:
-        return [turn.to_dict() for turn in self.turns]
+        return list(self.snapshot())
+
+    def _record_for(self, message: dict[str, Any], previous: dict[int, _LogRecord] | None = None) -> _LogRecord:
+        tool_name = ""
+        if message.get("role") == "tool":
+            tool_name = self.tool_name_by_id.get(str(message.get("tool_call_id", "")), "")
+        cached = (previous if previous is not None else self._records).get(id(message))
+        if cached is None or cached.message is not message or cached.tool_name != tool_name:
+            turn = semantic_turn_from_protocol(message, policy=self.policy, tool_name_by_id=self.tool_name_by_id)
+            cached = _LogRecord(message=message, tool_name=tool_name, turn=turn, entry=SemanticEntry(turn.to_dict()))
+        self._records[id(message)] = cached
+        return cached
 
     def _remember_tool_calls(self, message: dict[str, Any]) -> None:
         calls = message.get("tool_calls") or []
@@ -66,7 +139,7 @@ def build_semantic_history(messages: list[dict[str, Any]], *, max_messages: int
 def sanitize_semantic_entries(entries: list[dict[str, Any]], *, max_messages: int = 10) -> list[dict[str, Any]]:
     """Return bounded semantic entries with only known safe fields."""
     semantic_entries = entries if _looks_like_semantic_history(entries) else build_semantic_history(entries, max_messages=max_messages)
-    return [_sanitize_semantic_entry(entry) for entry in semantic_entries[-max(1, max_messages) :]]
+    return [_safe_entry(entry) for entry in semantic_entries[-max(1, max_messages) :]]
 
 
 def semantic_history_to_protocol_context(
@@ -77,23 +150,48 @@ def semantic_history_to_protocol_context(
     """Adapt safe semantic history into valid chat-protocol context messages."""
     messages: list[dict[str, str]] = []
     for entry in sanitize_semantic_entries(semantic_entries, max_messages=max_messages):
-        role = str(entry.get("role", "assistant")).lower()
-        if role == "tool":
-            role = "assistant"
-        if role not in _VALID_PROTOCOL_CONTEXT_ROLES:
-            role = "assistant"
-        content = redact_semantic_text(str(entry.get("content", ""))).strip()
-        tool_names = _tool_names(entry.get("toolCalls"))
-        if tool_names:
-            tool_summary = f"[tools: {', '.join(tool_names)}]"
-            content = f"{content}\n{tool_summary}".strip() if content else tool_summary
-        if not content and str(entry.get("role", "")).lower() == "tool":
-            content = "[tool result omitted]"
-        if content:
-            messages.append({"role": role, "content": content})
+        message = _protocol_message(entry)
+        if message is not None:
+            messages.append(dict(message))
     return messages
 
 
+def _safe_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    if not isinstance(entry, SemanticEntry):
+        return _sanitize_semantic_entry(entry)
+    try:
+        return entry._safe
+    except AttributeError:
+        entry._safe = SemanticEntry(_sanitize_semantic_entry(entry))
+        return entry._safe
+
+
+def _protocol_message(entry: dict[str, Any]) -> dict[str, str] | None:
+    if isinstance(entry, SemanticEntry):
+        try:
+            return entry._protocol
+        except AttributeError:
+            entry._protocol = _build_protocol_message(entry)
+            return entry._protocol
+    return _build_protocol_message(entry)
+
+
+def _build_protocol_message(entry: dict[str, Any]) -> dict[str, str] | None:
+    role = str(entry.get("role", "assistant")).lower()
+    if role == "tool":
+        role = "assistant"
+    if role not in _VALID_PROTOCOL_CONTEXT_ROLES:
+        role = "assistant"
+    content = redact_semantic_text(str(entry.get("content", ""))).strip()
+    tool_names = _tool_names(entry.get("toolCalls"))
+    if tool_names:
+        tool_summary = f"[tools: {', '.join(tool_names)}]"
+        content = f"{content}\n{tool_summary}".strip() if content else tool_summary
+    if not content and str(entry.get("role", "")).lower() == "tool":
+        content = "[tool result omitted]"
+    return {"role": role, "content": content} if content else None
+
+
 def _looks_like_semantic_history(entries: list[dict[str, Any]]) -> bool:
     return any(isinstance(entry, dict) and bool(_SEMANTIC_ONLY_KEYS.intersection(entry)) for entry in entries)
 
@@ -0,0 +1,203 @@
+"""
+Job Retention
+
+Retention for ``job_logs`` and ``operation_ledger``. Rows older than the age
+limit, logs beyond the per-job count, and the oldest rows while the store is
+over its size budget move to compressed, append-only archive segments
+(gzipped JSON lines). Archived rows stay queryable through ``JobArchive`` and
+``eyra jobs archive``.
+
+``JobCompactor`` runs on a background thread and only works while the store
+has been idle. Each pass archives a bounded batch of rows, reclaims a bounded
+number of free pages with an incremental vacuum, and checkpoints the WAL.
+Stores created before incremental vacuum are converted only by
+``eyra jobs compact``, since the full VACUUM that takes blocks the store.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from runtime.jobs import DurableJobStore
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_KINDS = ("log", "operation")
+# The store must be this quiet before a compaction pass starts.
+IDLE_SECONDS = 10.0
+# Seconds between passes once nothing is left to archive.
+COMPACT_INTERVAL_SECONDS = 300.0
+
+
+def _number(settings: Any, name: str, default: float) -> float:
+    value = getattr(settings, name, default)
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits past which log and ledger rows are archived; 0 disables a limit."""
+
+    max_age_days: float = 30.0
+    max_logs_per_job: int = 2000
+    max_bytes: int = 256 * 1024 * 1024
+    archive_path: str = "~/.local/share/eyra/job-archive"
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> RetentionPolicy:
+        archive_path = getattr(settings, "JOB_ARCHIVE_PATH", cls.archive_path)
+        return cls(
+            max_age_days=float(_number(settings, "JOB_RETENTION_DAYS", cls.max_age_days)),
+            max_logs_per_job=int(_number(settings, "JOB_LOG_MAX_PER_JOB", cls.max_logs_per_job)),
+            max_bytes=int(_number(settings, "JOB_STORE_MAX_MB", cls.max_bytes // (1024 * 1024)) * 1024 * 1024),
+            archive_path=archive_path if isinstance(archive_path, str) and archive_path else cls.archive_path,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days > 0 or self.max_logs_per_job > 0 or self.max_bytes > 0
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    archived_logs: int = 0
+    archived_operations: int = 0
+    reclaimed_pages: int = 0
+    # True when rows past retention are still left for the next pass.
+    more: bool = False
+
+
+class JobArchive:
+    """Append-only directory of gzipped JSON-lines segments holding archived rows."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def append(self, records: list[dict[str, Any]]) -> Path | None:
+        """Write ``records`` as a new segment; the segment is complete on disk before this returns."""
+        if not records:
+            return None
+        self.path.mkdir(parents=True, exist_ok=True)
+        with suppress(OSError):
+            self.path.chmod(0o700)
+        with self._lock:
+            self._sequence += 1
+            name = f"jobs-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self._sequence:06d}.jsonl.gz"
+        segment = self.path / name
+        partial = segment.with_name(f".{name}.partial")
+        payload = "".join(json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n" for record in records)
+        with open(partial, "wb") as handle:
+            handle.write(gzip.compress(payload.encode("utf-8")))
+            handle.flush()
+            os.fsync(handle.fileno())
+        with suppress(OSError):
+            partial.chmod(0o600)
+        os.replace(partial, segment)
+        return segment
+
+    def segments(self) -> list[Path]:
+        if not self.path.is_dir():
+            return []
+        return sorted(self.path.glob("jobs-*.jsonl.gz"))
+
+    def records(self, *, kind: str | None = None, job_id: str | None = None) -> Iterator[dict[str, Any]]:
+        """Archived rows in archive order; a row archived twice by an interrupted pass is yielded once."""
+        seen: set[tuple[str, Any]] = set()
+        for segment in self.segments():
+            try:
+                with gzip.open(segment, "rt", encoding="utf-8") as handle:
+                    lines = list(handle)
+            except (OSError, EOFError) as e:
+                logger.warning("Skipping unreadable job archive segment %s: %s", segment.name, e)
+                continue
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if kind and record.get("kind") != kind:
+                    continue
+                if job_id and record.get("job_id") != job_id:
+                    continue
+                key = (record.get("kind"), record.get("id"))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield record
+
+    def search(
+        self,
+        *,
+        kind: str | None = None,
+        job_id: str | None = None,
+        text: str = "",
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """The newest ``limit`` archived rows matching the filters, oldest first."""
+        needle = text.lower()
+        matches: list[dict[str, Any]] = []
+        for record in self.records(kind=kind, job_id=job_id):
+            if needle and needle not in json.dumps(record, sort_keys=True).lower():
+                continue
+            matches.append(record)
+        return matches[-max(1, int(limit)) :]
+
+
+class JobCompactor:
+    """Background thread that enforces a retention policy while the store is idle."""
+
+    def __init__(
+        self,
+        store: DurableJobStore,
+        policy: RetentionPolicy,
+        archive: JobArchive | None = None,
+        *,
+        idle_seconds: float = IDLE_SECONDS,
+        interval_seconds: float = COMPACT_INTERVAL_SECONDS,
+    ):
+        self.store = store
+        self.policy = policy
+        self.archive = archive or JobArchive(policy.archive_path)
+        self.idle_seconds = idle_seconds
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None and self.policy.enabled:
+            self._thread = threading.Thread(target=self._run, name="eyra-job-compactor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def run_once(self) -> CompactionResult:
+        return self.store.compact(self.policy, self.archive)
+
+    def _run(self) -> None:
+        next_pass = 0.0
+        while not self._stop.wait(min(self.idle_seconds, 1.0)):
+            if time.monotonic() < next_pass or self.store.idle_seconds() < self.idle_seconds:
+                continue
+            try:
+                result = self.run_once()
+            except Exception:
+                logger.exception("Job store compaction failed")
+                result = CompactionResult()
+            next_pass = 0.0 if result.more else time.monotonic() + self.interval_seconds
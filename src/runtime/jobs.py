@@ -1,18 +1,45 @@
-"""Durable local job state and operation ledger."""
+"""Durable local job state and operation ledger.
+
+Writes are queued and committed by a background writer thread, so callers on
+the event loop never wait on SQLite's fsync. The writer groups whatever is
+queued into one transaction every few milliseconds, or sooner once a batch
+fills. Reads see queued job changes immediately. List reads and terminal job
+updates wait for the queue to drain first, so a completed, failed, or
+cancelled status is on disk when ``update_job`` returns.
+
+Listings that only show a few columns use the summary projections
+(``list_job_summaries``, ``list_operation_summaries``). They page newest first
+with an opaque keyset cursor and skip the JSON columns they do not need.
+"""
 
 from __future__ import annotations
 
 import json
+import logging
 import sqlite3
 import threading
 import time
 import uuid
-from contextlib import suppress
-from dataclasses import dataclass, field
+import weakref
+from collections.abc import Callable
+from contextlib import closing, suppress
+from dataclasses import asdict, dataclass, field, replace
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+from runtime.job_retention import CompactionResult, JobArchive, JobCompactor, RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+# How long the writer waits for more writes before committing a batch.
+WRITE_BATCH_SECONDS = 0.005
+WRITE_BATCH_SIZE = 256
+# Rows one compaction pass may archive, and free pages one pass may release.
+COMPACT_BATCH_ROWS = 2000
+_VACUUM_PAGES = 512
+
 
 class JobStatus(str, Enum):
     """Durable job lifecycle states."""
@@ -103,10 +130,189 @@ class OperationLedgerEntry:
     error: str | None = None
 
 
+@dataclass
+class JobSummary:
+    """Listing projection of a job; read from the covering index, no JSON columns."""
+
+    id: str
+    title: str
+    status: JobStatus
+    source_frontend: str
+    priority: int
+    created_at: float
+    updated_at: float
+    completed_at: float | None = None
+
+
+@dataclass
+class OperationSummary:
+    """Listing projection of a ledger entry; action and undo JSON are decoded on first access."""
+
+    id: str
+    job_id: str
+    capability: str
+    target: str
+    risk_level: RiskLevel
+    timestamp: float
+    success: bool
+    normalized_action_json: str = field(default="{}", repr=False)
+    undo_json: str = field(default="{}", repr=False)
+
+    @cached_property
+    def normalized_action(self) -> dict[str, Any]:
+        return _load_json(self.normalized_action_json, {})
+
+    @cached_property
+    def undo(self) -> dict[str, Any]:
+        return _load_json(self.undo_json, {})
+
+
+@dataclass
+class ListPage:
+    """One page of a keyset listing; pass ``next_cursor`` back to get the next page."""
+
+    items: list[Any]
+    next_cursor: str | None = None
+
+
+def _load_json(value: str, fallback: Any) -> Any:
+    try:
+        return json.loads(value)
+    except (TypeError, json.JSONDecodeError):
+        return fallback
+
+
+def _encode_cursor(position: float, row_id: str) -> str:
+    return f"{position!r}/{row_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[float, str]:
+    position, separator, row_id = cursor.partition("/")
+    try:
+        if not separator or not row_id:
+            raise ValueError(cursor)
+        return float(position), row_id
+    except ValueError:
+        raise ValueError("Invalid listing cursor.") from None
+
+
+_TERMINAL_JOB_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+
+@dataclass
+class _Write:
+    sql: str
+    params: tuple[Any, ...]
+    on_commit: Callable[[int | None], None] | None = None
+
+
+class _WriteBehind:
+    """Commits queued statements in batches on a background thread."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock, *, batch_seconds: float, batch_size: int):
+        self._conn = conn
+        self._lock = lock
+        self._batch_seconds = max(0.0, batch_seconds)
+        self._batch_size = max(1, batch_size)
+        self._cond = threading.Condition()
+        self._queue: list[_Write] = []
+        self.last_submit = time.monotonic()
+        self._submitted = 0
+        self._committed = 0
+        self._flush_waiters = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, write: _Write) -> None:
+        with self._cond:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot write to a closed job store.")
+            self._queue.append(write)
+            self.last_submit = time.monotonic()
+            self._submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="eyra-job-writer", daemon=True)
+                self._thread.start()
+            if len(self._queue) >= self._batch_size:
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every write submitted so far is committed."""
+        with self._cond:
+            target = self._submitted
+            if self._committed >= target:
+                return
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._committed < target:
+                    self._cond.wait()
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                deadline = time.monotonic() + self._batch_seconds
+                while len(self._queue) < self._batch_size and not self._closed and not self._flush_waiters:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[: self._batch_size]
+                del self._queue[: self._batch_size]
+            row_ids = self._commit(batch)
+            for write, row_id in zip(batch, row_ids, strict=True):
+                if write.on_commit is not None:
+                    try:
+                        write.on_commit(row_id)
+                    except Exception:
+                        logger.exception("Job store commit callback failed")
+            with self._cond:
+                self._committed += len(batch)
+                self._cond.notify_all()
+
+    def _commit(self, batch: list[_Write]) -> list[int | None]:
+        with self._lock:
+            try:
+                with self._conn:
+                    return [self._conn.execute(write.sql, write.params).lastrowid for write in batch]
+            except sqlite3.Error as e:
+                logger.warning("Job store batch of %d writes failed (%s); retrying one at a time", len(batch), e)
+            row_ids: list[int | None] = []
+            for write in batch:
+                try:
+                    with self._conn:
+                        row_ids.append(self._conn.execute(write.sql, write.params).lastrowid)
+                except sqlite3.Error as e:
+                    logger.error("Job store dropped a write that failed: %s", e)
+                    row_ids.append(None)
+            return row_ids
+
+
 class DurableJobStore:
     """SQLite-backed local store for jobs, logs, and operation ledger entries."""
 
-    def __init__(self, path: str | Path):
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        batch_seconds: float = WRITE_BATCH_SECONDS,
+        batch_size: int = WRITE_BATCH_SIZE,
+        retention: RetentionPolicy | None = None,
+    ):
         self.path = Path(path).expanduser()
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
@@ -114,7 +320,23 @@ class DurableJobStore:
         with suppress(OSError):
             self.path.chmod(0o600)
         self._lock = threading.RLock()
+        # Job records whose latest change is still queued; reads prefer these.
+        self._pending_jobs: dict[str, JobRecord] = {}
         self._migrate()
+        self._writer = _WriteBehind(self._conn, self._lock, batch_seconds=batch_seconds, batch_size=batch_size)
+        # Stores that are never closed still commit their queue at interpreter exit.
+        self._finalizer = weakref.finalize(self, self._writer.close)
+        self._compactor = JobCompactor(self, retention) if retention is not None else None
+        if self._compactor is not None:
+            self._compactor.start()
+
+    def flush(self) -> None:
+        """Wait until every queued job, log, and ledger write is committed."""
+        self._writer.flush()
+
+    def idle_seconds(self) -> float:
+        """Seconds since the last write was queued."""
+        return time.monotonic() - self._writer.last_submit
 
     def create_job(
         self,
@@ -149,35 +371,68 @@ class DurableJobStore:
             risk_level=risk_level,
             required_capabilities=list(required_capabilities or []),
         )
-        with self._lock:
-            self._conn.execute(
-                """
-                INSERT INTO jobs (
-                    id, title, original_user_input, source_frontend, status, priority, created_at, updated_at,
-                    completed_at, parent_id, normalized_task_spec, current_plan, current_step, artifacts,
-                    approvals, final_result, error, cancellation_requested, rollback, risk_level,
-                    required_capabilities, used_capabilities, affected_targets
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                self._job_values(record),
+        self._queue_job(
+            record,
+            """
+            INSERT INTO jobs (
+                id, title, original_user_input, source_frontend, status, priority, created_at, updated_at,
+                completed_at, parent_id, normalized_task_spec, current_plan, current_step, artifacts,
+                approvals, final_result, error, cancellation_requested, rollback, risk_level,
+                required_capabilities, used_capabilities, affected_targets
             )
-            self._conn.commit()
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            self._job_values(record),
+        )
         return record
 
     def get_job(self, job_id: str) -> JobRecord | None:
         with self._lock:
+            pending = self._pending_jobs.get(job_id)
+            if pending is not None:
+                return replace(pending)
             row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
         return self._job_from_row(row) if row is not None else None
 
     def list_jobs(self, limit: int = 50) -> list[JobRecord]:
+        self.flush()
         with self._lock:
             rows = self._conn.execute(
-                "SELECT * FROM jobs ORDER BY updated_at DESC LIMIT ?",
+                "SELECT * FROM jobs ORDER BY updated_at DESC, id DESC LIMIT ?",
                 (max(1, int(limit)),),
             ).fetchall()
         return [self._job_from_row(row) for row in rows]
 
+    def list_job_summaries(self, limit: int = 50, *, cursor: str | None = None) -> ListPage:
+        """Job summaries, most recently updated first, one page at a time.
+
+        Raises ``ValueError`` for a cursor this store did not hand out.
+        """
+        limit = max(1, int(limit))
+        where, params = self._keyset("updated_at", cursor)
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, status, source_frontend, priority, created_at, updated_at, completed_at "
+                f"FROM jobs {where} ORDER BY updated_at DESC, id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        items = [
+            JobSummary(
+                id=row["id"],
+                title=row["title"],
+                status=JobStatus(row["status"]),
+                source_frontend=row["source_frontend"],
+                priority=int(row["priority"]),
+                created_at=float(row["created_at"]),
+                updated_at=float(row["updated_at"]),
+                completed_at=row["completed_at"],
+            )
+            for row in rows[:limit]
+        ]
+        more = len(rows) > limit
+        return ListPage(items, _encode_cursor(items[-1].updated_at, items[-1].id) if more else None)
+
     def update_job(
         self,
         job_id: str,
@@ -220,20 +475,21 @@ class DurableJobStore:
                 "affected_targets": existing.affected_targets if affected_targets is None else list(affected_targets),
             }
         )
-        with self._lock:
-            self._conn.execute(
-                """
-                UPDATE jobs SET
-                    title = ?, original_user_input = ?, source_frontend = ?, status = ?, priority = ?,
-                    created_at = ?, updated_at = ?, completed_at = ?, parent_id = ?, normalized_task_spec = ?,
-                    current_plan = ?, current_step = ?, artifacts = ?, approvals = ?, final_result = ?,
-                    error = ?, cancellation_requested = ?, rollback = ?, risk_level = ?,
-                    required_capabilities = ?, used_capabilities = ?, affected_targets = ?
-                WHERE id = ?
-                """,
-                (*self._job_values(updated)[1:], updated.id),
-            )
-            self._conn.commit()
+        self._queue_job(
+            updated,
+            """
+            UPDATE jobs SET
+                title = ?, original_user_input = ?, source_frontend = ?, status = ?, priority = ?,
+                created_at = ?, updated_at = ?, completed_at = ?, parent_id = ?, normalized_task_spec = ?,
+                current_plan = ?, current_step = ?, artifacts = ?, approvals = ?, final_result = ?,
+                error = ?, cancellation_requested = ?, rollback = ?, risk_level = ?,
+                required_capabilities = ?, used_capabilities = ?, affected_targets = ?
+            WHERE id = ?
+            """,
+            (*self._job_values(updated)[1:], updated.id),
+        )
+        if status in _TERMINAL_JOB_STATUSES:
+            self.flush()
         return updated
 
     def record_log(
@@ -244,17 +500,23 @@ class DurableJobStore:
         level: str = "info",
         data: dict[str, Any] | None = None,
     ) -> JobLogEntry:
-        timestamp = time.time()
-        with self._lock:
-            cursor = self._conn.execute(
+        """Queue a log line; the entry's ``id`` is 0 until the write is committed."""
+        entry = JobLogEntry(id=0, job_id=job_id, timestamp=time.time(), level=level, message=message, data=data or {})
+
+        def assign_id(row_id: int | None) -> None:
+            entry.id = int(row_id or 0)
+
+        self._writer.submit(
+            _Write(
                 "INSERT INTO job_logs (job_id, timestamp, level, message, data) VALUES (?, ?, ?, ?, ?)",
-                (job_id, timestamp, level, message, self._dump(data or {})),
+                (job_id, entry.timestamp, level, message, self._dump(entry.data)),
+                assign_id,
             )
-            self._conn.commit()
-            log_id = int(cursor.lastrowid)
-        return JobLogEntry(id=log_id, job_id=job_id, timestamp=timestamp, level=level, message=message, data=data or {})
+        )
+        return entry
 
     def list_logs(self, job_id: str, limit: int = 100) -> list[JobLogEntry]:
+        self.flush()
         with self._lock:
             rows = self._conn.execute(
                 "SELECT * FROM job_logs WHERE job_id = ? ORDER BY id ASC LIMIT ?",
@@ -294,8 +556,8 @@ class DurableJobStore:
             approval_id=approval_id,
             error=error,
         )
-        with self._lock:
-            self._conn.execute(
+        self._writer.submit(
+            _Write(
                 """
                 INSERT INTO operation_ledger (
                     id, job_id, user_request, normalized_action, capability, target, before_state, after_state,
@@ -320,10 +582,11 @@ class DurableJobStore:
                     entry.error,
                 ),
             )
-            self._conn.commit()
+        )
         return entry
 
     def list_operations(self, job_id: str | None = None, limit: int = 100) -> list[OperationLedgerEntry]:
+        self.flush()
         with self._lock:
             if job_id:
                 rows = self._conn.execute(
@@ -337,9 +600,47 @@ class DurableJobStore:
                 ).fetchall()
         return [self._operation_from_row(row) for row in rows]
 
+    def list_operation_summaries(self, limit: int = 100, *, cursor: str | None = None) -> ListPage:
+        """Ledger summaries, newest first, one page at a time; before and after state are never read.
+
+        Raises ``ValueError`` for a cursor this store did not hand out.
+        """
+        limit = max(1, int(limit))
+        where, params = self._keyset("timestamp", cursor)
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, job_id, capability, target, risk_level, timestamp, success, normalized_action, undo "
+                f"FROM operation_ledger {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        items = [
+            OperationSummary(
+                id=row["id"],
+                job_id=row["job_id"],
+                capability=row["capability"],
+                target=row["target"],
+                risk_level=RiskLevel(row["risk_level"]),
+                timestamp=float(row["timestamp"]),
+                success=bool(row["success"]),
+                normalized_action_json=row["normalized_action"],
+                undo_json=row["undo"],
+            )
+            for row in rows[:limit]
+        ]
+        more = len(rows) > limit
+        return ListPage(items, _encode_cursor(items[-1].timestamp, items[-1].id) if more else None)
+
+    @staticmethod
+    def _keyset(column: str, cursor: str | None) -> tuple[str, tuple[Any, ...]]:
+        if not cursor:
+            return "", ()
+        return f"WHERE ({column}, id) < (?, ?)", _decode_cursor(cursor)
+
     def clear_terminal_jobs(self) -> int:
         """Delete completed, failed, and cancelled jobs plus their logs and ledger entries."""
         terminal_statuses = (JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value)
+        self.flush()
         with self._lock:
             rows = self._conn.execute(
                 "SELECT id FROM jobs WHERE status IN (?, ?, ?)",
@@ -353,17 +654,169 @@ class DurableJobStore:
             self._conn.commit()
         return len(job_ids)
 
+    def compact(
+        self,
+        policy: RetentionPolicy,
+        archive: JobArchive,
+        *,
+        max_rows: int = COMPACT_BATCH_ROWS,
+    ) -> CompactionResult:
+        """Archive one bounded batch of log and ledger rows past retention, then reclaim space.
+
+        Rows are selected on a separate WAL reader and written to an archive
+        segment before they are deleted, so an interrupted pass can archive a
+        row twice but never loses one. The store lock is held only for the
+        delete transaction; reads and queued writes carry on while the segment
+        is compressed and synced.
+        """
+        self.flush()
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            conn.row_factory = sqlite3.Row
+            logs, operations, over_budget = self._rows_past_retention(conn, policy, max(1, max_rows))
+            if logs or operations:
+                archive.append(
+                    [{"kind": "log", **asdict(self._log_from_row(row))} for row in logs]
+                    + [{"kind": "operation", **asdict(self._operation_from_row(row))} for row in operations]
+                )
+                with self._lock, self._conn:
+                    self._conn.executemany("DELETE FROM job_logs WHERE id = ?", [(row["id"],) for row in logs])
+                    self._conn.executemany(
+                        "DELETE FROM operation_ledger WHERE id = ?",
+                        [(row["id"],) for row in operations],
+                    )
+            archived = len(logs) + len(operations)
+            more = archived >= max_rows or (over_budget and archived > 0)
+            reclaimed = self._reclaim_space(conn, checkpoint="PASSIVE" if more else "TRUNCATE")
+        return CompactionResult(len(logs), len(operations), reclaimed, more)
+
+    def convert_to_incremental_vacuum(self) -> bool:
+        """Switch a store created before incremental vacuum over with one full VACUUM; False if already done.
+
+        The VACUUM rewrites the whole database and blocks every reader and
+        writer while it runs, so it only happens when asked for
+        (``eyra jobs compact``), never from the background compactor.
+        """
+        self.flush()
+        with self._lock:
+            if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return True
+
     def close(self) -> None:
+        """Commit queued writes, stop the writer, and close the database."""
+        if self._compactor is not None:
+            self._compactor.stop()
+        self._finalizer()
         with self._lock:
             self._conn.close()
 
+    def _rows_past_retention(
+        self,
+        conn: sqlite3.Connection,
+        policy: RetentionPolicy,
+        max_rows: int,
+    ) -> tuple[list[sqlite3.Row], list[sqlite3.Row], bool]:
+        logs: dict[int, sqlite3.Row] = {}
+        operations: dict[str, sqlite3.Row] = {}
+
+        def room() -> int:
+            return max_rows - len(logs) - len(operations)
+
+        if policy.max_age_days > 0:
+            cutoff = time.time() - policy.max_age_days * 86400
+            for row in conn.execute(
+                "SELECT * FROM job_logs WHERE timestamp < ? ORDER BY timestamp, id LIMIT ?", (cutoff, room())
+            ):
+                logs[row["id"]] = row
+            if room() > 0:
+                for row in conn.execute(
+                    "SELECT * FROM operation_ledger WHERE timestamp < ? ORDER BY timestamp LIMIT ?", (cutoff, room())
+                ):
+                    operations[row["id"]] = row
+
+        if policy.max_logs_per_job > 0 and room() > 0:
+            crowded = conn.execute(
+                "SELECT job_id, COUNT(*) AS total FROM job_logs GROUP BY job_id HAVING total > ?",
+                (policy.max_logs_per_job,),
+            ).fetchall()
+            for job in crowded:
+                if room() <= 0:
+                    break
+                excess = job["total"] - policy.max_logs_per_job
+                for row in conn.execute(
+                    "SELECT * FROM job_logs WHERE job_id = ? ORDER BY id ASC LIMIT ?",
+                    (job["job_id"], excess),
+                ).fetchall():
+                    if room() <= 0:
+                        break
+                    logs.setdefault(row["id"], row)
+
+        over_budget = False
+        if policy.max_bytes > 0 and room() > 0:
+            live_bytes = self._live_bytes(conn)
+            over_budget = live_bytes > policy.max_bytes
+            if over_budget:
+                rows = sum(
+                    conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("job_logs", "operation_ledger")
+                )
+                # Page-level cost per row, so small rows padded out to full pages still count fully.
+                row_bytes = max(1, live_bytes // max(1, rows))
+                wanted = min(room(), -(-(live_bytes - policy.max_bytes) // row_bytes))
+                for table, selected in (("job_logs", logs), ("operation_ledger", operations)):
+                    order = "id" if table == "job_logs" else "timestamp"
+                    oldest = conn.execute(f"SELECT * FROM {table} ORDER BY {order} ASC LIMIT ?", (max_rows,)).fetchall()
+                    for row in oldest:
+                        if wanted <= 0:
+                            break
+                        if row["id"] not in selected:
+                            selected[row["id"]] = row
+                            wanted -= 1
+        return list(logs.values()), list(operations.values()), over_budget
+
+    def _live_bytes(self, conn: sqlite3.Connection | None = None) -> int:
+        conn = conn or self._conn
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    @staticmethod
+    def _reclaim_space(conn: sqlite3.Connection, *, checkpoint: str) -> int:
+        """Release free pages to the filesystem a bounded step at a time, then checkpoint the WAL.
+
+        Runs on the compaction connection; SQLite's own locking orders it with
+        the writer. Stores created before incremental vacuum keep their free
+        pages until ``convert_to_incremental_vacuum`` is run.
+        """
+        free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            conn.execute(f"PRAGMA incremental_vacuum({_VACUUM_PAGES})").fetchall()
+        free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute(f"PRAGMA wal_checkpoint({checkpoint})").fetchall()
+        return max(0, free_before - free_after)
+
+    def _queue_job(self, record: JobRecord, sql: str, params: tuple[Any, ...]) -> None:
+        def committed(_row_id: int | None) -> None:
+            with self._lock:
+                if self._pending_jobs.get(record.id) is record:
+                    del self._pending_jobs[record.id]
+
+        with self._lock:
+            self._pending_jobs[record.id] = record
+        self._writer.submit(_Write(sql, params, committed))
+
     def _migrate(self) -> None:
         with self._lock:
             self._conn.executescript(
                 """
+                PRAGMA auto_vacuum = INCREMENTAL;
                 PRAGMA journal_mode = WAL;
                 PRAGMA busy_timeout = 30000;
-                PRAGMA user_version = 1;
+                PRAGMA user_version = 3;
 
                 CREATE TABLE IF NOT EXISTS jobs (
                     id TEXT PRIMARY KEY,
@@ -419,12 +872,17 @@ class DurableJobStore:
 
                 CREATE INDEX IF NOT EXISTS idx_jobs_status_updated
                     ON jobs(status, updated_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_jobs_summary
+                    ON jobs(updated_at DESC, id DESC, status, title, source_frontend, priority, created_at, completed_at);
                 CREATE INDEX IF NOT EXISTS idx_job_logs_job_id_id
                     ON job_logs(job_id, id ASC);
+                CREATE INDEX IF NOT EXISTS idx_job_logs_timestamp
+                    ON job_logs(timestamp ASC);
                 CREATE INDEX IF NOT EXISTS idx_operation_ledger_job_id_timestamp
                     ON operation_ledger(job_id, timestamp ASC);
-                CREATE INDEX IF NOT EXISTS idx_operation_ledger_timestamp
-                    ON operation_ledger(timestamp DESC);
+                DROP INDEX IF EXISTS idx_operation_ledger_timestamp;
+                CREATE INDEX IF NOT EXISTS idx_operation_ledger_timestamp_id
+                    ON operation_ledger(timestamp DESC, id DESC);
                 """
             )
             self._conn.commit()
@@ -435,10 +893,7 @@ class DurableJobStore:
 
     @staticmethod
     def _load(value: str, fallback: Any) -> Any:
-        try:
-            return json.loads(value)
-        except (TypeError, json.JSONDecodeError):
-            return fallback
+        return _load_json(value, fallback)
 
     def _job_values(self, record: JobRecord) -> tuple[Any, ...]:
         return (
@@ -6,6 +6,7 @@ import logging
 import re
 import secrets
 import time
+from collections.abc import Awaitable
 from datetime import datetime
 from pathlib import Path
 
@@ -13,7 +14,8 @@ from prompt_toolkit import PromptSession
 from prompt_toolkit.formatted_text import ANSI
 
 from chat.complexity_scorer import ComplexityScorer
-from chat.message_handler import process_task_stream
+from chat.message_handler import process_task_stream, routing_started
+from chat.prompt_prefix import PROMPT_PREFIX_TRACKER
 from chat.session_state import InteractionStyle, QualityMode
 from clients.ai_client import THINK_END, THINK_START
 from runtime.capabilities import build_capability_snapshot, format_capability_answer
@@ -32,10 +34,12 @@ from runtime.intents import (
     should_background_task,
     task_title,
 )
+from runtime.job_retention import RetentionPolicy
 from runtime.jobs import DurableJobStore, JobStatus, RiskLevel
 from runtime.memory.service import MemoryService
 from runtime.models import LiveRuntimeState, PreflightResult, RuntimeStatus
 from runtime.operator_loop import build_file_move_operator_loop
+from runtime.pdf_summary import pdf_chunk_chars, summarize_pdf
 from runtime.planner import plan_task
 from runtime.preflight import PreflightManager
 from runtime.routing.model_registry import worker_model_settings
@@ -53,11 +57,16 @@ from runtime.status_presenter import (
 )
 from runtime.tasks import BackgroundTask, BackgroundTaskManager, TaskStatus
 from runtime.tooling import build_tool_registry
-from runtime.triggers import TriggerStatus, TriggerStore, wait_for_file_ready
+from runtime.trigger_scheduler import FileTriggerMonitor, TriggerScheduler, format_interval, start_reminder_task
+from runtime.triggers import TriggerRecord, TriggerStatus, TriggerStore
 from runtime.vision import analyze_screen
 from runtime.voice_diagnostics import VoiceDiagnostics
+from runtime.whisper_client import shared_whisper_client
 from tools.approval import ApprovalManager
 from tools.browser import BrowserSession
+from tools.file_index import open_file_index
+from tools.filesystem import parse_allowed_roots
+from tools.pdf import pdf_header_path
 from tools.registry import ToolRegistry
 from tools.system_info import format_system_info_for_query
 from utils.settings import Settings
@@ -101,6 +110,11 @@ def _settings_str(settings: Settings, name: str, default: str = "") -> str:
     return value if isinstance(value, str) else default
 
 
+def _print_partial_transcript(text: str) -> None:
+    """Show the rolling streaming transcript on the line the final one replaces."""
+    print(f"\r\033[2K  {DIM}(voice) {text}…{NC}", end="", flush=True)
+
+
 def _asr_phrase_variants(text: str) -> set[str]:
     """Return short command phrases embedded in one noisy ASR transcript."""
     words = re.findall(r"[a-z0-9']+", text.lower())
@@ -123,6 +137,7 @@ class LiveSession:
         self.preflight = preflight
         self.state = state
         self.scorer = complexity_scorer
+        streaming_voice = _settings_bool(settings, "VOICE_STREAMING_ENABLED", False)
         self.speech = SpeechController(
             state,
             cooldown_ms=settings.SPEECH_COOLDOWN_MS,
@@ -131,6 +146,9 @@ class LiveSession:
             input_device=_settings_str(settings, "VOICE_INPUT_DEVICE", "") or None,
             sample_rate=_settings_int(settings, "VOICE_SAMPLE_RATE", 16000),
             max_duration_seconds=_settings_int(settings, "VOICE_MAX_DURATION_SECONDS", 300),
+            stream_chunk_ms=_settings_int(settings, "VOICE_STREAMING_CHUNK_MS", 2000) if streaming_voice else 0,
+            vad_backend=_settings_str(settings, "VOICE_VAD_BACKEND", "onnxruntime"),
+            on_partial_transcript=_print_partial_transcript if streaming_voice else None,
         )
         self.quality_mode = QualityMode.BALANCED
         self._prompt = PromptSession()
@@ -155,7 +173,10 @@ class LiveSession:
         self._pending_options: dict | None = None
         self._dictation = DictationState()
         self._hands_free_mode = _settings_bool(settings, "HANDS_FREE_MODE", False)
-        self.job_store = DurableJobStore(_settings_str(settings, "JOB_STORE_PATH", "~/.local/share/eyra/jobs.sqlite3"))
+        self.job_store = DurableJobStore(
+            _settings_str(settings, "JOB_STORE_PATH", "~/.local/share/eyra/jobs.sqlite3"),
+            retention=RetentionPolicy.from_settings(settings),
+        )
         self.connector_registry = ConnectorRegistry.from_settings(
             settings,
             approvals=self.approvals,
@@ -164,6 +185,26 @@ class LiveSession:
         self.trigger_store = TriggerStore(
             _settings_str(settings, "TRIGGER_STORE_PATH", "~/.local/share/eyra/triggers.sqlite3")
         )
+        self._trigger_scheduler = TriggerScheduler(
+            self.trigger_store,
+            lambda fire: start_reminder_task(self.task_manager, fire),
+            catch_up=_settings_str(settings, "TRIGGER_CATCH_UP", "once"),
+        )
+        self._file_triggers = FileTriggerMonitor(
+            self.trigger_store,
+            self._start_file_trigger_task,
+            timeout_seconds=_settings_float(settings, "TRIGGER_TIMEOUT_SECONDS", 300.0),
+            poll_seconds=_settings_float(settings, "TRIGGER_CHECK_INTERVAL_SECONDS", 0.5),
+        )
+        self._file_index = (
+            open_file_index(
+                _settings_str(settings, "FILE_INDEX_PATH", "~/.local/share/eyra/file_index.sqlite3"),
+                parse_allowed_roots(_settings_str(settings, "FILESYSTEM_ALLOWED_PATHS")),
+                rescan_seconds=_settings_float(settings, "FILE_INDEX_RESCAN_SECONDS", 60.0),
+            )
+            if _settings_bool(settings, "FILE_INDEX_ENABLED", False)
+            else None
+        )
         self.task_manager = BackgroundTaskManager(
             max_concurrent=_settings_int(settings, "MAX_BACKGROUND_TASKS", 2),
             task_timeout_seconds=_settings_int(settings, "TASK_TIMEOUT_SECONDS", 300),
@@ -185,6 +226,8 @@ class LiveSession:
         """Main entry point. Runs until quit."""
         self.state.current_status = RuntimeStatus.IDLE
         render_header(self.state, self.settings)
+        self._trigger_scheduler.start()
+        self._file_triggers.start()
         if _settings_bool(self.settings, "WEB_UI_ENABLED", False):
             self._start_embedded_web_ui()
 
@@ -214,6 +257,9 @@ class LiveSession:
                 self._web_handle.runtime.close()
                 self._web_handle.close()
             await self._browser_session.close()
+            await self._trigger_scheduler.stop()
+            await self._file_triggers.stop()
+            await shared_whisper_client().aclose()
             self.trigger_store.close()
             self.job_store.close()
             print("\n  Goodbye.\n")
@@ -485,6 +531,12 @@ class LiveSession:
             arg = lower_parts[1] if len(lower_parts) > 1 else ""
             if arg == "last":
                 print(self._indent(format_route_trace(self.state.last_route_trace)))
+                prefix = PROMPT_PREFIX_TRACKER.stats()
+                if prefix["turns"]:
+                    print(
+                        f"  prompt prefix reuse: {prefix['lastReusedTokens']}/{prefix['lastPromptTokens']} "
+                        f"tokens last turn, {prefix['reuseRate']:.0%} overall"
+                    )
             else:
                 print("  Usage: /route last")
             return True
@@ -865,6 +917,8 @@ class LiveSession:
                 status = await self.memory_service.status()
                 ready = "ready" if status["ready"] else "needs setup" if status["enabled"] else "off"
                 print(f"  Memory is {ready}. Path: {status['path']}")
+                cache = status.get("contextCache") or {}
+                print(f"  Context cache: {cache.get('hits', 0)} hits, {cache.get('misses', 0)} misses")
                 if status.get("error"):
                     print(f"  {status['error']}")
                 return
@@ -896,6 +950,7 @@ class LiveSession:
                 return
             if action == "reload":
                 self.memory_service = MemoryService(self.settings)
+                self.memory_service.reload_context()
                 print_status_change("Memory context reloaded")
                 return
         except Exception as exc:
@@ -985,21 +1040,23 @@ class LiveSession:
             print_status_change(f"Task {task.id} accepted: {task.title}")
             return
 
-        routing_decision = await self._route_decision(
+        # Routed while waiting for a model slot and reading instructions and memory.
+        routing = self._route_decision(
             text,
             quality_mode=quality,
             interaction_style=interaction_style,
             source=self._source_for_interaction(interaction_style),
             is_worker=False,
         )
-        await self._stream_response(
-            text_content=text,
-            quality_mode=quality,
-            interaction_style=interaction_style,
-            routing_decision=routing_decision,
-            messages=conversation_snapshot,
-            user_message=user_message,
-        )
+        async with routing_started(routing) as routing_decision:
+            await self._stream_response(
+                text_content=text,
+                quality_mode=quality,
+                interaction_style=interaction_style,
+                routing_decision=routing_decision,
+                messages=conversation_snapshot,
+                user_message=user_message,
+            )
 
     async def _handle_dictation_input(self, text: str) -> bool:
         command = dictation_command(text)
@@ -1394,21 +1451,8 @@ class LiveSession:
                 action={"type": "notify", "message": message},
                 original_request=text,
             )
-            task = self.task_manager.create_task(
-                title=trigger.title,
-                original_request=text,
-                worker=lambda task: self._run_recurring_timer_trigger(task, trigger.id),
-                used_tools=False,
-                normalized_task_spec={
-                    "task_type": "trigger.timer.recurring_reminder",
-                    "trigger_id": trigger.id,
-                    "message": message,
-                    "interval_seconds": interval_seconds,
-                    "next_fire_at": next_fire_at,
-                },
-                risk_level=RiskLevel.READ_ONLY,
-            )
-            print_status_change(f"Recurring reminder {trigger.id} created as task {task.id}")
+            self._trigger_scheduler.start()
+            print_status_change(f"Recurring reminder {trigger.id} repeats every {format_interval(interval_seconds)}")
             return True
 
         reminder_match = re.fullmatch(
@@ -1428,20 +1472,8 @@ class LiveSession:
                 action={"type": "notify", "message": message},
                 original_request=text,
             )
-            task = self.task_manager.create_task(
-                title=trigger.title,
-                original_request=text,
-                worker=lambda task: self._run_timer_trigger(task, trigger.id),
-                used_tools=False,
-                normalized_task_spec={
-                    "task_type": "trigger.timer.reminder",
-                    "trigger_id": trigger.id,
-                    "message": message,
-                    "fire_at": fire_at,
-                },
-                risk_level=RiskLevel.READ_ONLY,
-            )
-            print_status_change(f"Reminder {trigger.id} created as task {task.id}")
+            self._trigger_scheduler.start()
+            print_status_change(f"Reminder {trigger.id} set for {time.strftime('%H:%M:%S', time.localtime(fire_at))}")
             return True
 
         trigger_match = re.fullmatch(
@@ -1462,95 +1494,25 @@ class LiveSession:
             action={"type": "file.move", "destination": destination},
             original_request=text,
         )
-        task = self.task_manager.create_task(
+        self._file_triggers.start()
+        print_status_change(f"Trigger {trigger.id} is watching {source}")
+        return True
+
+    def _start_file_trigger_task(self, trigger: TriggerRecord) -> None:
+        self.task_manager.create_task(
             title=trigger.title,
-            original_request=text,
-            worker=lambda task: self._run_file_exists_trigger(task, trigger.id),
+            original_request=trigger.original_request,
+            worker=lambda task: self._run_file_trigger_action(task, trigger.id),
             required_filesystem=True,
             used_tools=True,
         )
-        print_status_change(f"Trigger {trigger.id} created as task {task.id}")
-        return True
 
-    async def _run_timer_trigger(self, task: BackgroundTask, trigger_id: str) -> str:
-        trigger = self.trigger_store.get_trigger(trigger_id)
-        if trigger is None:
-            return "Trigger was not found."
-        fire_at = float(trigger.condition.get("fire_at", 0.0))
-        message = str(trigger.action.get("message", "")).strip()
-        if trigger.action.get("type") != "notify" or not message or fire_at <= 0:
-            error = "Reminder trigger action is not supported."
-            self.trigger_store.mark_failed(trigger_id, error)
-            raise RuntimeError(error)
-
-        interval_seconds = max(0.01, _settings_float(self.settings, "TRIGGER_CHECK_INTERVAL_SECONDS", 0.5))
-        task.mark_progress(f"Waiting for reminder {trigger_id}")
-        while time.time() < fire_at:
-            if task.cancellation_requested:
-                self.trigger_store.mark_cancelled(trigger_id)
-                return "Reminder cancelled."
-            current = self.trigger_store.get_trigger(trigger_id)
-            if current is None:
-                raise RuntimeError("Reminder trigger was deleted.")
-            if current.status == TriggerStatus.CANCELLED:
-                return "Reminder cancelled."
-            if current.status == TriggerStatus.PAUSED:
-                task.mark_progress(f"Paused reminder {trigger_id}")
-                await asyncio.sleep(interval_seconds)
-                continue
-            await asyncio.sleep(min(interval_seconds, max(0.0, fire_at - time.time())))
-
-        current = self.trigger_store.get_trigger(trigger_id)
-        if current is not None and current.status == TriggerStatus.CANCELLED:
-            return "Reminder cancelled."
-        self.trigger_store.mark_completed(trigger_id)
-        task.mark_progress(f"Reminder fired: {message}")
-        return f"Reminder: {message}"
-
-    async def _run_recurring_timer_trigger(self, task: BackgroundTask, trigger_id: str) -> str:
-        trigger = self.trigger_store.get_trigger(trigger_id)
-        if trigger is None:
-            return "Trigger was not found."
-        message = str(trigger.action.get("message", "")).strip()
-        interval_seconds = float(trigger.condition.get("interval_seconds", 0.0))
-        next_fire_at = float(trigger.condition.get("next_fire_at", 0.0))
-        if trigger.action.get("type") != "notify" or not message or interval_seconds <= 0 or next_fire_at <= 0:
-            error = "Recurring reminder trigger action is not supported."
-            self.trigger_store.mark_failed(trigger_id, error)
-            raise RuntimeError(error)
-
-        check_interval = max(0.01, _settings_float(self.settings, "TRIGGER_CHECK_INTERVAL_SECONDS", 0.5))
-        timeout_seconds = max(interval_seconds, _settings_float(self.settings, "TRIGGER_TIMEOUT_SECONDS", 300.0))
-        deadline = time.monotonic() + timeout_seconds
-        task.mark_progress(f"Waiting for recurring reminder {trigger_id}")
-        while time.monotonic() < deadline:
-            if task.cancellation_requested:
-                self.trigger_store.mark_cancelled(trigger_id)
-                return "Recurring reminder cancelled."
-            current = self.trigger_store.get_trigger(trigger_id)
-            if current is None:
-                raise RuntimeError("Recurring reminder trigger was deleted.")
-            if current.status == TriggerStatus.CANCELLED:
-                return "Recurring reminder cancelled."
-            if current.status == TriggerStatus.PAUSED:
-                task.mark_progress(f"Paused recurring reminder {trigger_id}")
-                await asyncio.sleep(check_interval)
-                continue
-            next_fire_at = float(current.condition.get("next_fire_at", next_fire_at))
-            if time.time() >= next_fire_at:
-                fired_at = time.time()
-                next_fire_at = fired_at + interval_seconds
-                self.trigger_store.record_recurring_fire(trigger_id, last_fire_at=fired_at, next_fire_at=next_fire_at)
-                task.mark_progress(f"Recurring reminder fired: {message}")
-            await asyncio.sleep(min(check_interval, max(0.0, next_fire_at - time.time())))
-
-        self.trigger_store.mark_cancelled(trigger_id)
-        return "Recurring reminder reached its local timeout and stopped."
-
-    async def _run_file_exists_trigger(self, task: BackgroundTask, trigger_id: str) -> str:
+    async def _run_file_trigger_action(self, task: BackgroundTask, trigger_id: str) -> str:
         trigger = self.trigger_store.get_trigger(trigger_id)
         if trigger is None:
             return "Trigger was not found."
+        if trigger.status != TriggerStatus.ACTIVE:
+            return f"Trigger is {trigger.status.value}."
         source = str(trigger.condition.get("path", ""))
         destination = str(trigger.action.get("destination", ""))
         if trigger.action.get("type") != "file.move" or not source or not destination:
@@ -1558,59 +1520,34 @@ class LiveSession:
             self.trigger_store.mark_failed(trigger_id, message)
             raise RuntimeError(message)
 
-        timeout_seconds = max(1.0, _settings_float(self.settings, "TRIGGER_TIMEOUT_SECONDS", 300.0))
-        interval_seconds = max(0.01, _settings_float(self.settings, "TRIGGER_CHECK_INTERVAL_SECONDS", 0.5))
-        deadline = time.monotonic() + timeout_seconds
-        task.mark_progress(f"Waiting for {source}")
+        task.mark_progress(f"Moving {source}")
         try:
-            while time.monotonic() < deadline:
-                if task.cancellation_requested:
-                    self.trigger_store.mark_cancelled(trigger_id)
-                    return "Trigger cancelled."
-                current = self.trigger_store.get_trigger(trigger_id)
-                if current is None:
-                    raise RuntimeError("Trigger was deleted.")
-                if current.status == TriggerStatus.CANCELLED:
-                    return "Trigger cancelled."
-                if current.status == TriggerStatus.PAUSED:
-                    task.mark_progress(f"Paused trigger {trigger_id}")
-                    await asyncio.sleep(interval_seconds)
-                    continue
-                if Path(source).expanduser().exists():
-                    if not await wait_for_file_ready(source, settle_seconds=interval_seconds):
-                        await asyncio.sleep(interval_seconds)
-                        continue
-                    move_result = await self._tool_registry.execute(
-                        "move_path",
-                        json.dumps({"source": source, "destination": destination, "overwrite": False}),
-                    )
-                    success = move_result.content.startswith("Moved:")
-                    self.job_store.record_operation(
-                        job_id=task.id,
-                        user_request=trigger.original_request,
-                        normalized_action={"type": "trigger.file.move", "trigger_id": trigger.id},
-                        capability="filesystem.trigger",
-                        target=destination,
-                        before_state={"source": source, "destination": destination},
-                        after_state={"source": source, "destination": destination},
-                        risk_level=RiskLevel.LOW_RISK_CHANGE,
-                        success=success,
-                        undo={"type": "file.move", "source": destination, "destination": source} if success else {},
-                        error=None if success else move_result.content,
-                    )
-                    if success:
-                        self.trigger_store.mark_completed(trigger_id)
-                        return move_result.content
-                    self.trigger_store.mark_failed(trigger_id, move_result.content)
-                    raise RuntimeError(move_result.content)
-                await asyncio.sleep(interval_seconds)
+            move_result = await self._tool_registry.execute(
+                "move_path",
+                json.dumps({"source": source, "destination": destination, "overwrite": False}),
+            )
         except asyncio.CancelledError:
             self.trigger_store.mark_cancelled(trigger_id)
             raise
-
-        message = f"Trigger timed out after {int(timeout_seconds)} seconds."
-        self.trigger_store.mark_failed(trigger_id, message)
-        raise RuntimeError(message)
+        success = move_result.content.startswith("Moved:")
+        self.job_store.record_operation(
+            job_id=task.id,
+            user_request=trigger.original_request,
+            normalized_action={"type": "trigger.file.move", "trigger_id": trigger.id},
+            capability="filesystem.trigger",
+            target=destination,
+            before_state={"source": source, "destination": destination},
+            after_state={"source": source, "destination": destination},
+            risk_level=RiskLevel.LOW_RISK_CHANGE,
+            success=success,
+            undo={"type": "file.move", "source": destination, "destination": source} if success else {},
+            error=None if success else move_result.content,
+        )
+        if success:
+            self.trigger_store.mark_completed(trigger_id)
+            return move_result.content
+        self.trigger_store.mark_failed(trigger_id, move_result.content)
+        raise RuntimeError(move_result.content)
 
     async def _handle_direct_filesystem_intent(self, text: str) -> bool:
         """Handle common safe file requests deterministically before asking a model.
@@ -1948,10 +1885,14 @@ class LiveSession:
 
     def _find_named_folder_candidates(self, folder: str, query: str) -> list[Path]:
         folder_path = Path(self._path_in_named_folder(folder, "")).expanduser()
-        try:
-            children = list(folder_path.iterdir())
-        except OSError:
-            return []
+        indexed = self._file_index.list_folder(folder_path) if self._file_index else None
+        if indexed is not None:
+            children = [entry.path for entry in indexed]
+        else:
+            try:
+                children = list(folder_path.iterdir())
+            except OSError:
+                return []
         needle = query.lower().strip()
         return sorted(
             (child for child in children if needle and needle in child.name.lower()),
@@ -1960,6 +1901,9 @@ class LiveSession:
 
     def _latest_file_in_named_folder(self, folder: str) -> Path | None:
         folder_path = Path(self._path_in_named_folder(folder, "")).expanduser()
+        indexed = self._file_index.recent_files(folder_path, limit=1) if self._file_index else None
+        if indexed is not None:
+            return indexed[0].path if indexed else None
         try:
             files = [child for child in folder_path.iterdir() if child.is_file()]
         except OSError:
@@ -2117,7 +2061,7 @@ class LiveSession:
         )
 
     def _print_recent_operations(self) -> None:
-        operations = self.job_store.list_operations(limit=8)
+        operations = self.job_store.list_operation_summaries(limit=8).items
         print()
         print("  Recent changes")
         if not operations:
@@ -2204,7 +2148,9 @@ class LiveSession:
             print(f"  Could not {'approve' if approve else 'reject'} {approval.id}.")
 
     async def _undo_last_reversible_operation(self) -> None:
-        operations = [entry for entry in self.job_store.list_operations(limit=20) if entry.success and entry.undo]
+        operations = [
+            entry for entry in self.job_store.list_operation_summaries(limit=20).items if entry.success and entry.undo
+        ]
         if not operations:
             print("  No reversible operation to undo.")
             return
@@ -2392,32 +2338,45 @@ class LiveSession:
         if "No extractable text found" in extracted.content or extracted.content.startswith(("Access denied:", "Not a file:", "Not a PDF file:", "Could not read PDF")):
             return extracted.content
 
+        resolved = pdf_header_path(extracted.content)
+        if resolved is None:
+            return extracted.content
+
         task.mark_progress("Summarizing extracted PDF text")
         worker_settings = worker_model_settings(self.settings)
 
-        prompt = (
-            "Summarize the PDF for the user's request. Be concise, factual, and do not ask for a follow-up. "
-            "If the user asked for a focus area, answer that focus directly.\n\n"
-            f"User request: {text_content}\n\n"
-            f"Extracted local PDF text:\n{extracted.content[:50000]}"
-        )
-        result = ""
-        async with self._model_semaphore:
-            async for chunk in process_task_stream(
-                text_content=prompt,
-                complexity_scorer=self.scorer,
-                settings=worker_settings,
-                messages=[{"role": "user", "content": prompt}],
-                quality_mode=quality_mode,
-                interaction_style=interaction_style,
-                tool_registry=None,
-                current_goal=self.state.current_goal,
-                require_tools=False,
-            ):
-                result += chunk
-                if len(result) > 120 and task.progress_summary == "Summarizing extracted PDF text":
-                    task.mark_progress("Preparing final answer")
-        if result.strip():
+        async def complete(prompt: str) -> str:
+            parts: list[str] = []
+            async with self._model_semaphore:
+                async for chunk in process_task_stream(
+                    text_content=prompt,
+                    complexity_scorer=self.scorer,
+                    settings=worker_settings,
+                    messages=[{"role": "user", "content": prompt}],
+                    quality_mode=quality_mode,
+                    interaction_style=interaction_style,
+                    tool_registry=None,
+                    current_goal=self.state.current_goal,
+                    require_tools=False,
+                    raise_errors=True,
+                ):
+                    parts.append(chunk)
+            return "".join(parts)
+
+        try:
+            result = await summarize_pdf(
+                resolved,
+                text_content,
+                complete,
+                model=worker_settings.MODEL,
+                chunk_chars=pdf_chunk_chars(worker_settings),
+                concurrency=_settings_int(self.settings, "MODEL_CONCURRENCY", 1),
+                progress=task.mark_progress,
+            )
+        except Exception as e:
+            logger.warning("PDF summary failed: %s", e)
+            result = ""
+        if result:
             return result
         return self._fallback_pdf_summary(extracted.content)
 
@@ -2453,7 +2412,7 @@ class LiveSession:
         text_content: str,
         quality_mode: QualityMode = QualityMode.BALANCED,
         interaction_style: InteractionStyle = InteractionStyle.TEXT,
-        routing_decision: RoutingDecision | None = None,
+        routing_decision: RoutingDecision | Awaitable[RoutingDecision] | None = None,
         messages: list[dict] | None = None,
         user_message: dict | None = None,
     ):
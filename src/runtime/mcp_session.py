@@ -0,0 +1,431 @@
+"""
+MCP Stdio Sessions
+
+One supervised, long-lived stdio connection per MCP server, shared by the
+memory client and the opt-in MCP tools. Requests are multiplexed over one
+process and routed back by JSON-RPC id. A crashed server restarts on the next
+request, an unused one stops after ``idle_seconds``, and a server whose event
+loop shuts down is terminated with it.
+
+``max_in_flight`` bounds concurrent requests; a limited number may wait for a
+slot and the rest fail fast instead of piling up. Messages are framed with
+``Content-Length`` headers, or one JSON object per line for the MCP SDK's
+line-delimited transport.
+
+``McpSessionPool`` keeps one session per event loop and server key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+FRAMINGS = ("content-length", "lines")
+# Requests allowed to wait for a slot, as a multiple of max_in_flight.
+_QUEUE_FACTOR = 4
+_STDERR_TAIL_BYTES = 4096
+
+
+class StdioMcpSession:
+    """Supervised stdio MCP client for one server process.
+
+    Subclasses can react to server notifications through ``_notification``
+    and to the process going away through ``_process_closed``.
+    """
+
+    def __init__(
+        self,
+        server: dict[str, Any],
+        *,
+        label: str = "MCP server",
+        framing: str = "content-length",
+        protocol_version: str = "2024-11-05",
+        timeout: int | float = 20,
+        idle_seconds: float = 300.0,
+        max_in_flight: int | None = None,
+    ):
+        if framing not in FRAMINGS:
+            raise ValueError(f"Unknown MCP framing: {framing}")
+        self.server = server
+        self.label = label
+        self.framing = framing
+        self.protocol_version = protocol_version
+        self.timeout = timeout
+        self.idle_seconds = idle_seconds
+        self.max_in_flight = max(1, int(max_in_flight)) if max_in_flight else None
+        self.proc: asyncio.subprocess.Process | None = None
+        self.state = "stopped"
+        self.restarts = 0
+        self.requests = 0
+        self.idle_shutdowns = 0
+        self.last_error = ""
+        self.started_at: float | None = None
+        self._next_id = 1
+        self._pending: dict[int, asyncio.Future] = {}
+        self._slots = asyncio.Semaphore(self.max_in_flight) if self.max_in_flight else None
+        self._waiting = 0
+        self._in_flight = 0
+        self._reader_task: asyncio.Task | None = None
+        self._stderr_task: asyncio.Task | None = None
+        self._stderr_tail = b""
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._idle_task: asyncio.Task | None = None
+        self._start_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._closing = False
+
+    @staticmethod
+    def stopped_status(idle_seconds: float) -> dict[str, Any]:
+        return {
+            "state": "stopped",
+            "pid": None,
+            "restarts": 0,
+            "requests": 0,
+            "inFlight": 0,
+            "idleShutdowns": 0,
+            "idleTimeoutSeconds": idle_seconds,
+            "uptimeSeconds": 0.0,
+            "lastError": "",
+        }
+
+    def status(self) -> dict[str, Any]:
+        running = self._is_running()
+        return {
+            "state": self.state,
+            "pid": self.proc.pid if running and self.proc else None,
+            "restarts": self.restarts,
+            "requests": self.requests,
+            "inFlight": self._in_flight,
+            "idleShutdowns": self.idle_shutdowns,
+            "idleTimeoutSeconds": self.idle_seconds,
+            "uptimeSeconds": round(time.monotonic() - self.started_at, 3) if running and self.started_at else 0.0,
+            "lastError": self.last_error,
+        }
+
+    async def request(self, method: str, params: dict[str, Any] | None = None, *, timeout: int | float | None = None) -> Any:
+        if self._slots is not None and self._waiting >= self.max_in_flight * _QUEUE_FACTOR:
+            raise RuntimeError("server is busy; too many MCP requests are already waiting.")
+        self._cancel_idle_shutdown()
+        self._waiting += 1
+        try:
+            if self._slots is not None:
+                await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            for attempt in range(2):
+                await self._ensure_running(timeout)
+                try:
+                    return await self._request(method, params, timeout=timeout)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The server died between requests; nothing was delivered, so one retry is safe.
+                    self._mark_crashed(f"{self.label} closed its input pipe.")
+                    if attempt:
+                        raise
+        finally:
+            self._in_flight -= 1
+            self.requests += 1
+            if self._slots is not None:
+                self._slots.release()
+            self._schedule_idle_shutdown()
+
+    async def notify(self, method: str, params: dict[str, Any]) -> None:
+        await self._write({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def close(self) -> None:
+        self._cancel_idle_shutdown()
+        self._closing = True
+        try:
+            await self._close_process()
+        finally:
+            self._closing = False
+        self.state = "stopped"
+
+    def _notification(self, method: str, params: dict[str, Any]) -> None:
+        """Handle a server notification; the base session ignores them."""
+
+    def _process_closed(self) -> None:
+        """Called whenever the server process goes away."""
+
+    async def _request(self, method: str, params: dict[str, Any] | None, *, timeout: int | float | None = None) -> Any:
+        msg_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        try:
+            await self._write({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params or {}})
+            response = await asyncio.wait_for(future, timeout=timeout if timeout is not None else self.timeout)
+        finally:
+            self._pending.pop(msg_id, None)
+        if "error" in response:
+            raise RuntimeError(json.dumps(response["error"]))
+        return response.get("result")
+
+    def _is_running(self) -> bool:
+        return (
+            self.proc is not None
+            and self.proc.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
+
+    async def _ensure_running(self, timeout: int | float | None) -> None:
+        if self._is_running():
+            return
+        async with self._start_lock:
+            if self._is_running():
+                return
+            if self.proc is not None:
+                await self._close_process()
+            if self.state == "crashed":
+                self.restarts += 1
+                logger.debug("Restarting %s after: %s", self.label, self.last_error)
+            await self._start(timeout)
+
+    async def _start(self, timeout: int | float | None) -> None:
+        command = self.server.get("command")
+        args = self.server.get("args", [])
+        if not command:
+            raise ValueError(f"{self.label} command is missing.")
+        env = None
+        if self.server.get("env"):
+            env = {**os.environ, **{str(k): str(v) for k, v in self.server["env"].items()}}
+        self.state = "starting"
+        self._stderr_tail = b""
+        try:
+            self.proc = await asyncio.create_subprocess_exec(
+                str(command),
+                *[str(arg) for arg in args],
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            self._reader_task = asyncio.create_task(self._read_loop(self.proc))
+            self._stderr_task = asyncio.create_task(self._drain_stderr(self.proc))
+            await self._request(
+                "initialize",
+                {
+                    "protocolVersion": self.protocol_version,
+                    "capabilities": {},
+                    "clientInfo": {"name": "eyra", "version": "1"},
+                },
+                timeout=timeout,
+            )
+            await self.notify("notifications/initialized", {})
+        except BaseException as exc:
+            self._mark_crashed(str(exc) or exc.__class__.__name__)
+            await self._close_process()
+            raise
+        self.state = "ready"
+        self.last_error = ""
+        self.started_at = time.monotonic()
+
+    async def _write(self, payload: dict[str, Any]) -> None:
+        if not self.proc or not self.proc.stdin:
+            raise RuntimeError(f"{self.label} is not running.")
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        if self.framing == "lines":
+            frame = raw + b"\n"
+        else:
+            frame = f"Content-Length: {len(raw)}\r\n\r\n".encode() + raw
+        async with self._write_lock:
+            self.proc.stdin.write(frame)
+            await self.proc.stdin.drain()
+
+    async def _read_loop(self, proc: asyncio.subprocess.Process) -> None:
+        try:
+            while (message := await self._read(proc)) is not None:
+                await self._dispatch(message)
+        except asyncio.CancelledError:
+            # The owning event loop is shutting down; never leave the server orphaned.
+            await _terminate_process(proc)
+            raise
+        except Exception as exc:
+            error = RuntimeError(f"{self.label} sent an unreadable message: {exc}")
+        else:
+            if self._stderr_task is not None:
+                with contextlib.suppress(asyncio.TimeoutError, asyncio.CancelledError):
+                    await asyncio.wait_for(asyncio.shield(self._stderr_task), timeout=0.1)
+            stderr = self._stderr_tail.decode(errors="replace").strip()
+            error = RuntimeError(f"{self.label} exited before responding. {stderr}".strip())
+        if not self._closing:
+            self._mark_crashed(str(error))
+        self._process_closed()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _dispatch(self, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        if method is None:
+            future = self._pending.get(message.get("id"))
+            if future is not None and not future.done():
+                future.set_result(message)
+            return
+        if "id" not in message:
+            self._notification(method, message.get("params") or {})
+            return
+        # Server-initiated requests: answer pings, decline everything else.
+        if method == "ping":
+            await self._write({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+        else:
+            await self._write({
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": f"Method not supported by Eyra: {method}"},
+            })
+
+    async def _read(self, proc: asyncio.subprocess.Process) -> dict[str, Any] | None:
+        assert proc.stdout is not None
+        if self.framing == "lines":
+            while True:
+                line = await proc.stdout.readline()
+                if not line:
+                    return None
+                try:
+                    message = json.loads(line.decode())
+                except ValueError:
+                    continue
+                if isinstance(message, dict):
+                    return message
+        headers: dict[str, str] = {}
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                return None
+            if line in (b"\r\n", b"\n"):
+                break
+            key, value = line.decode().split(":", 1)
+            headers[key.lower()] = value.strip()
+        length = int(headers.get("content-length", "0"))
+        body = await proc.stdout.readexactly(length)
+        message = json.loads(body)
+        return message if isinstance(message, dict) else {}
+
+    async def _drain_stderr(self, proc: asyncio.subprocess.Process) -> None:
+        if proc.stderr is None:
+            return
+        with contextlib.suppress(Exception):
+            while chunk := await proc.stderr.read(4096):
+                self._stderr_tail = (self._stderr_tail + chunk)[-_STDERR_TAIL_BYTES:]
+
+    def _mark_crashed(self, error: str) -> None:
+        self.state = "crashed"
+        self.last_error = " ".join(error.split())[:500]
+
+    def _schedule_idle_shutdown(self) -> None:
+        if self._in_flight or self._waiting or self.proc is None:
+            return
+        self._cancel_idle_shutdown()
+        self._idle_handle = asyncio.get_running_loop().call_later(max(0.0, self.idle_seconds), self._idle_expired)
+
+    def _cancel_idle_shutdown(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _idle_expired(self) -> None:
+        self._idle_handle = None
+        if self._in_flight or self._waiting or not self._is_running():
+            return
+        self.idle_shutdowns += 1
+        self._idle_task = asyncio.create_task(self.close())
+
+    async def _close_process(self) -> None:
+        proc = self.proc
+        reader, stderr_task = self._reader_task, self._stderr_task
+        self.proc = None
+        self._reader_task = None
+        self._stderr_task = None
+        self._process_closed()
+        if proc is not None:
+            await _terminate_process(proc)
+        for task in (reader, stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+
+
+async def _terminate_process(proc: asyncio.subprocess.Process) -> None:
+    if proc.stdin is not None:
+        with contextlib.suppress(Exception):
+            proc.stdin.close()
+        with contextlib.suppress(Exception):
+            await proc.stdin.wait_closed()
+    if proc.returncode is None:
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=0.2)
+        except asyncio.TimeoutError:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+
+
+def server_key(server: dict[str, Any]) -> tuple:
+    """Hashable identity of a server launch config."""
+    env = server.get("env") or {}
+    return (
+        str(server.get("command", "")),
+        tuple(str(arg) for arg in server.get("args", [])),
+        tuple(sorted((str(k), str(v)) for k, v in env.items())),
+    )
+
+
+SessionT = TypeVar("SessionT", bound=StdioMcpSession)
+
+
+class McpSessionPool(Generic[SessionT]):
+    """Long-lived sessions per event loop and key; sessions of closed loops are dropped."""
+
+    def __init__(self):
+        self._sessions: dict[asyncio.AbstractEventLoop, dict[tuple, SessionT]] = {}
+
+    def get(self, key: tuple) -> SessionT | None:
+        """Session for ``key`` on the running event loop, if one was started."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return self._sessions.get(loop, {}).get(key)
+
+    async def session(
+        self,
+        key: tuple,
+        factory: Callable[[], SessionT],
+        *,
+        replaces: Callable[[tuple], bool] | None = None,
+    ) -> SessionT:
+        """Session for ``key``, created with ``factory`` after closing any it ``replaces``."""
+        loop = asyncio.get_running_loop()
+        for other in [item for item in self._sessions if item.is_closed()]:
+            self._sessions.pop(other, None)
+        sessions = self._sessions.setdefault(loop, {})
+        session = sessions.get(key)
+        if session is None:
+            if replaces is not None:
+                for stale_key in [item for item in sessions if replaces(item)]:
+                    with contextlib.suppress(Exception):
+                        await sessions.pop(stale_key).close()
+            session = sessions[key] = factory()
+        return session
+
+    async def close(self) -> None:
+        """Stop every session started on the running event loop."""
+        sessions = self._sessions.pop(asyncio.get_running_loop(), {})
+        for session in sessions.values():
+            with contextlib.suppress(Exception):
+                await session.close()
@@ -0,0 +1,180 @@
+"""In-process cache for compact memory context.
+
+Memory only changes through Eyra's own writes or through edits to the memory
+file, so the compact context is cached per settings and revalidated against
+the file's mtime and size before each turn. Prompt-prefix stability mode pins
+one snapshot per session instead, so the prompt prefix stays byte-identical
+until the user reloads memory.
+
+The cache lives in the running Eyra process, so ``eyra memory`` reaches it
+through files. The runtime that owns memory saves its counters to
+``STATS_PATH``, where ``eyra memory status`` reads them. ``eyra memory
+reload`` rewrites ``RELOAD_PATH``, and every running cache drops its entries
+and session snapshots before serving context once it sees the new marker.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+STATS_PATH = Path.home() / ".local" / "share" / "eyra" / "memory-cache-stats.json"
+RELOAD_PATH = Path.home() / ".local" / "share" / "eyra" / "memory-reload"
+# Minimum seconds between two writes of the stats file.
+STATS_SAVE_SECONDS = 10.0
+_UNSEEN = object()
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    signature: tuple[int, int] | None
+    version: int
+    text: str
+
+
+class MemoryContextCache:
+    def __init__(self) -> None:
+        self._entries: dict[tuple, _CacheEntry] = {}
+        self._versions: dict[str, int] = {}
+        self._pins: dict[tuple, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stats_path: Path | None = None
+        self._saved_at = 0.0
+        self._reload_marker: object = _UNSEEN
+
+    def persist_stats(self, path: str | Path | None = None) -> None:
+        """Save this process's counters for ``eyra memory status``; called by the runtime that owns memory."""
+        self.stats_path = Path(path or STATS_PATH).expanduser()
+        self.save_stats(force=True)
+
+    def save_stats(self, *, force: bool = False) -> None:
+        """Write the counters to ``stats_path``, at most every ``STATS_SAVE_SECONDS`` unless forced."""
+        if self.stats_path is None:
+            return
+        now = time.monotonic()
+        if not force and self._saved_at and now - self._saved_at < STATS_SAVE_SECONDS:
+            return
+        self._saved_at = now
+        partial = self.stats_path.with_name(f".{self.stats_path.name}.{os.getpid()}.partial")
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            partial.write_text(json.dumps({**self.stats(), "updatedAt": time.time(), "pid": os.getpid()}, sort_keys=True))
+            os.replace(partial, self.stats_path)
+        except OSError as e:
+            logger.debug("Could not save memory cache stats: %s", e)
+
+    def lookup(self, key: tuple, path: str | Path) -> tuple[str | None, tuple[tuple[int, int] | None, int]]:
+        """Return the cached text, or None plus the token to store a fresh result under."""
+        self._check_reload()
+        token = (_file_signature(path), self._versions.get(_path_key(path), 0))
+        entry = self._entries.get(key)
+        if entry is not None and (entry.signature, entry.version) == token:
+            self.hits += 1
+            self.save_stats()
+            return entry.text, token
+        self.misses += 1
+        self.save_stats()
+        return None, token
+
+    def store(self, key: tuple, token: tuple[tuple[int, int] | None, int], text: str) -> None:
+        signature, version = token
+        self._entries[key] = _CacheEntry(signature=signature, version=version, text=text)
+
+    def invalidate(self, path: str | Path) -> None:
+        """Drop cached context for a memory file after Eyra writes to it."""
+        path_key = _path_key(path)
+        self._versions[path_key] = self._versions.get(path_key, 0) + 1
+        self.invalidations += 1
+
+    def pinned(self, key: tuple) -> str | None:
+        self._check_reload()
+        return self._pins.get(key)
+
+    def pin(self, key: tuple, text: str) -> None:
+        self._pins[key] = text
+
+    def unpin(self, path: str | Path) -> None:
+        """Release session snapshots for a memory file; keys start with the file path."""
+        path_key = _path_key(path)
+        for key in [key for key in self._pins if key and key[0] == path_key]:
+            del self._pins[key]
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "pinned": len(self._pins),
+            "hitRate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._versions.clear()
+        self._pins.clear()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._reload_marker = _UNSEEN
+
+    def _check_reload(self) -> None:
+        """Drop everything once another process has asked for a reload."""
+        marker = _read_marker(RELOAD_PATH)
+        if marker == self._reload_marker:
+            return
+        if self._reload_marker is not _UNSEEN:
+            self._entries.clear()
+            self._pins.clear()
+            self.invalidations += 1
+        self._reload_marker = marker
+
+
+def request_reload(path: str | Path | None = None) -> None:
+    """Ask every running Eyra process to read the memory file again on its next turn."""
+    target = Path(path or RELOAD_PATH).expanduser()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{target.name}.{os.getpid()}.partial")
+    partial.write_text(f"{time.time_ns()} {os.getpid()}\n")
+    os.replace(partial, target)
+
+
+def load_stats(path: str | Path | None = None) -> dict[str, Any] | None:
+    """The counters last saved by a running Eyra, or None when none were saved."""
+    try:
+        data = json.loads(Path(path or STATS_PATH).expanduser().read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _read_marker(path: Path) -> str | None:
+    try:
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def _path_key(path: str | Path) -> str:
+    return str(Path(path).expanduser())
+
+
+def _file_signature(path: str | Path) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(Path(path).expanduser())
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+MEMORY_CONTEXT_CACHE = MemoryContextCache()
@@ -2,17 +2,18 @@
 
 from __future__ import annotations
 
-import asyncio
-import contextlib
 import json
-import os
 import shlex
 import shutil
 from pathlib import Path
 from typing import Any
 
+from runtime.mcp_session import McpSessionPool, StdioMcpSession, server_key
 from utils.settings import Settings
 
+# One long-lived memory server per event loop and resolved server config.
+_SESSIONS: McpSessionPool[StdioMcpSession] = McpSessionPool()
+
 
 class MemoryMcpClient:
     def __init__(self, settings: Settings):
@@ -37,103 +38,49 @@ class MemoryMcpClient:
 
     async def call_tool(self, name: str, arguments: dict[str, Any] | None = None, *, timeout: int | None = None) -> str:
         session_timeout = timeout if timeout is not None else max(5, int(self.settings.TOOL_TIMEOUT_SECONDS))
-        async with _LineMcpSession(self.server_config(), timeout=session_timeout) as session:
-            result = await session.request("tools/call", {"name": name, "arguments": arguments or {}})
-        return _result_text(result)
-
-
-class _LineMcpSession:
-    """MCP stdio client for the current line-delimited SDK transport."""
-
-    def __init__(self, server: dict[str, Any], timeout: int = 20):
-        self.server = server
-        self.timeout = timeout
-        self.proc: asyncio.subprocess.Process | None = None
-        self._next_id = 1
-
-    async def __aenter__(self):
-        command = self.server.get("command")
-        args = self.server.get("args", [])
-        if not command:
-            raise ValueError("Memory MCP command is missing.")
-        env = None
-        if self.server.get("env"):
-            env = {**os.environ, **{str(k): str(v) for k, v in self.server["env"].items()}}
-        self.proc = await asyncio.create_subprocess_exec(
-            str(command),
-            *[str(arg) for arg in args],
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=env,
+        session = await _shared_session(
+            self.server_config(),
+            timeout=max(5, int(self.settings.TOOL_TIMEOUT_SECONDS)),
+            idle_seconds=float(self.settings.MEMORY_MCP_IDLE_SECONDS),
         )
-        await self.request(
-            "initialize",
-            {
-                "protocolVersion": "2025-11-25",
-                "capabilities": {},
-                "clientInfo": {"name": "eyra", "version": "1"},
-            },
+        result = await session.request(
+            "tools/call",
+            {"name": name, "arguments": arguments or {}},
+            timeout=session_timeout,
         )
-        await self.notify("notifications/initialized", {})
-        return self
-
-    async def __aexit__(self, *_):
-        await self._close_process()
-
-    async def notify(self, method: str, params: dict[str, Any]) -> None:
-        await self._write({"jsonrpc": "2.0", "method": method, "params": params})
-
-    async def request(self, method: str, params: dict[str, Any] | None = None) -> Any:
-        msg_id = self._next_id
-        self._next_id += 1
-        await self._write({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params or {}})
-        while True:
-            response = await asyncio.wait_for(self._read(), timeout=self.timeout)
-            if response.get("id") != msg_id:
-                continue
-            if "error" in response:
-                raise RuntimeError(json.dumps(response["error"]))
-            return response.get("result")
-
-    async def _write(self, payload: dict[str, Any]) -> None:
-        if not self.proc or not self.proc.stdin:
-            raise RuntimeError("Memory MCP process is not running.")
-        self.proc.stdin.write((json.dumps(payload, separators=(",", ":")) + "\n").encode())
-        await self.proc.stdin.drain()
-
-    async def _read(self) -> dict[str, Any]:
-        if not self.proc or not self.proc.stdout:
-            raise RuntimeError("Memory MCP process is not running.")
-        line = await self.proc.stdout.readline()
-        if not line:
-            stderr = ""
-            if self.proc.stderr:
-                with contextlib.suppress(asyncio.TimeoutError):
-                    stderr = (await asyncio.wait_for(self.proc.stderr.read(), timeout=0.1)).decode(errors="replace")
-            raise RuntimeError(f"Memory MCP server exited before responding. {stderr}".strip())
-        return json.loads(line.decode())
-
-    async def _close_process(self) -> None:
-        proc = self.proc
-        if proc is None:
-            return
-        if proc.stdin is not None:
-            with contextlib.suppress(Exception):
-                proc.stdin.close()
-            with contextlib.suppress(Exception):
-                await proc.stdin.wait_closed()
-        if proc.returncode is None:
-            try:
-                await asyncio.wait_for(proc.wait(), timeout=0.2)
-            except asyncio.TimeoutError:
-                proc.terminate()
-                try:
-                    await asyncio.wait_for(proc.wait(), timeout=2)
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    await proc.wait()
-        self.proc = None
+        return _result_text(result)
+
+    def connection_status(self) -> dict[str, Any]:
+        """Health of the shared memory server for the current event loop."""
+        try:
+            session = _SESSIONS.get(server_key(self.server_config()))
+        except FileNotFoundError:
+            session = None
+        if session is None:
+            return StdioMcpSession.stopped_status(float(self.settings.MEMORY_MCP_IDLE_SECONDS))
+        return session.status()
+
+
+async def _shared_session(server: dict[str, Any], *, timeout: int, idle_seconds: float) -> StdioMcpSession:
+    session = await _SESSIONS.session(
+        server_key(server),
+        lambda: StdioMcpSession(
+            server,
+            label="Memory MCP server",
+            framing="lines",
+            protocol_version="2025-11-25",
+            timeout=timeout,
+            idle_seconds=idle_seconds,
+        ),
+    )
+    session.timeout = timeout
+    session.idle_seconds = idle_seconds
+    return session
+
+
+async def close_memory_sessions() -> None:
+    """Stop every memory server started on the running event loop."""
+    await _SESSIONS.close()
 
 
 def _resolve_command(command: str, args: list[str]) -> tuple[str, list[str]]:
@@ -6,6 +6,7 @@ import re
 from pathlib import Path
 from typing import Any
 
+from runtime.memory.cache import MEMORY_CONTEXT_CACHE
 from runtime.memory.compression import compact_text, key_for_text, section_for_text
 from runtime.memory.files import instruction_context_messages, load_instruction_files
 from runtime.memory.mcp_client import MemoryMcpClient, parse_json_text
@@ -32,10 +33,12 @@ class MemoryService:
             "commandAvailable": bool(availability["available"]),
             "contextAvailable": bool(health["contextAvailable"]),
             "health": health["state"],
+            "connection": self.client.connection_status(),
+            "contextCache": MEMORY_CONTEXT_CACHE.stats(),
             "command": availability["command"],
             "commandArgs": availability["args"],
             "error": health["error"] or availability["error"],
-            "path": str(Path(self.settings.MEMORY_PATH).expanduser()),
+            "path": self._memory_path(),
             "contextMaxChars": self.settings.MEMORY_CONTEXT_MAX_CHARS,
             "factMaxChars": self.settings.MEMORY_FACT_MAX_CHARS,
             "instructionFiles": [
@@ -89,13 +92,39 @@ class MemoryService:
     async def show(self, *, max_chars: int | None = None, format: str = "compact") -> str:
         if not self.settings.MEMORY_ENABLED:
             return "Memory is off."
-        return await self.client.call_tool(
-            "memory_context",
-            {
-                "format": format,
-                "maxChars": max_chars or self.settings.MEMORY_CONTEXT_MAX_CHARS,
-            },
+        limit = max_chars or self.settings.MEMORY_CONTEXT_MAX_CHARS
+        key = (
+            self._memory_path(),
+            self.settings.MEMORY_MCP_COMMAND,
+            self.settings.MEMORY_MCP_ARGS,
+            limit,
+            format,
         )
+        cached, token = MEMORY_CONTEXT_CACHE.lookup(key, self._memory_path())
+        if cached is not None:
+            return cached
+        text = await self.client.call_tool("memory_context", {"format": format, "maxChars": limit})
+        MEMORY_CONTEXT_CACHE.store(key, token, text)
+        return text
+
+    def invalidate_context_cache(self) -> None:
+        MEMORY_CONTEXT_CACHE.invalidate(self._memory_path())
+
+    def reload_context(self) -> None:
+        """Drop cached and session-pinned memory context so the next turn reads the file again."""
+        MEMORY_CONTEXT_CACHE.unpin(self._memory_path())
+        self.invalidate_context_cache()
+
+    async def _pinned_context(self) -> str:
+        key = (self._memory_path(), self.settings.MEMORY_CONTEXT_MAX_CHARS)
+        text = MEMORY_CONTEXT_CACHE.pinned(key)
+        if text is None:
+            text = await self.show(max_chars=self.settings.MEMORY_CONTEXT_MAX_CHARS, format="compact")
+            MEMORY_CONTEXT_CACHE.pin(key, text)
+        return text
+
+    def _memory_path(self) -> str:
+        return str(Path(self.settings.MEMORY_PATH).expanduser())
 
     async def remember(self, text: str, *, section: str | None = None) -> str:
         if not self.settings.MEMORY_ENABLED:
@@ -108,16 +137,19 @@ class MemoryService:
             return "I did not save that because there was no durable fact to store."
         target_section = section or section_for_text(value)
         key = key_for_text(value)
-        return await self.client.call_tool(
-            "memory",
-            {
-                "command": "upsert",
-                "section": target_section,
-                "key": key,
-                "value": value,
-                "source": "eyra",
-            },
-        )
+        try:
+            return await self.client.call_tool(
+                "memory",
+                {
+                    "command": "upsert",
+                    "section": target_section,
+                    "key": key,
+                    "value": value,
+                    "source": "eyra",
+                },
+            )
+        finally:
+            self.invalidate_context_cache()
 
     async def forget(self, query: str) -> str:
         if not self.settings.MEMORY_ENABLED:
@@ -134,7 +166,10 @@ class MemoryService:
         if match is None:
             return f"No matching memory found for: {query}"
         section, line, rendered = match
-        result = await self.client.call_tool("memory", {"command": "remove", "section": section, "line": line})
+        try:
+            result = await self.client.call_tool("memory", {"command": "remove", "section": section, "line": line})
+        finally:
+            self.invalidate_context_cache()
         return f"{result}\nForgot: {rendered}"
 
     async def context_messages(self) -> list[dict[str, str]]:
@@ -142,13 +177,17 @@ class MemoryService:
         messages.extend(await self.memory_context_messages())
         return messages
 
-    async def memory_context_messages(self) -> list[dict[str, str]]:
+    async def memory_context_messages(self, *, pinned: bool = False) -> list[dict[str, str]]:
+        """Return compact memory as a system message; pinned reuses the first snapshot of the session."""
         if not self.settings.MEMORY_ENABLED or self.settings.USE_MOCK_CLIENT:
             return []
         if not self.client.availability()["available"]:
             return []
         try:
-            text = await self.show(max_chars=self.settings.MEMORY_CONTEXT_MAX_CHARS, format="compact")
+            if pinned:
+                text = await self._pinned_context()
+            else:
+                text = await self.show(max_chars=self.settings.MEMORY_CONTEXT_MAX_CHARS, format="compact")
         except Exception:
             return []
         if text and not text.startswith("No memories stored yet"):
@@ -0,0 +1,177 @@
+"""
+Microphone Capture
+
+Callback-driven capture into a preallocated ring buffer. PortAudio calls the
+stream callback on its own thread with each block of samples. The callback
+copies the block into the ring as int16 PCM and wakes the reader. After the
+stream starts nothing is allocated per frame, and ``reset`` lets the same
+ring serve the next recording.
+
+The reader walks the ring one frame at a time by absolute frame index.
+``frame`` returns a view into the ring, not a copy. ``vad_frame`` scales a
+frame to float32 into one reusable frame-sized buffer, so the VAD input
+costs one frame of memory rather than a float32 mirror of the whole ring. A
+frame range, such as a whole utterance, is copied out in one slice with
+``extract``. The ring holds a fixed number of frames, so memory is bounded
+by the longest recording. A reader that falls too far behind skips ahead to
+the oldest frame that is still safe to read and counts the frames it lost.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+import numpy as np
+import sounddevice as sd
+
+logger = logging.getLogger(__name__)
+
+# Frames the writer stays clear of ahead of the reader, so a view being scored is not overwritten.
+_LAP_GUARD_FRAMES = 2
+
+
+class FrameRing:
+    """Fixed-size ring of int16 samples, with one float32 frame buffer for the VAD."""
+
+    def __init__(self, capacity: int, frame_samples: int):
+        self.capacity = max(_LAP_GUARD_FRAMES + 1, capacity)
+        self.frame_samples = frame_samples
+        self.samples = np.zeros(self.capacity * frame_samples, dtype=np.int16)
+        # The frame last returned by ``vad_frame``, scaled to [-1, 1].
+        self.scaled = np.zeros(frame_samples, dtype=np.float32)
+        # Samples written since the start; only the writer changes it, after the copy is complete.
+        self.written = 0
+
+    def reset(self) -> None:
+        """Start over at frame 0; call only while no stream is writing."""
+        self.written = 0
+
+    @property
+    def frames_written(self) -> int:
+        """Complete frames written so far."""
+        return self.written // self.frame_samples
+
+    @property
+    def oldest(self) -> int:
+        """Index of the oldest frame that is still held and safe to read."""
+        return max(0, self.frames_written - self.capacity + _LAP_GUARD_FRAMES)
+
+    def write(self, block: np.ndarray) -> None:
+        size = len(self.samples)
+        count = len(block)
+        if count > size:
+            self.written += count - size
+            block = block[-size:]
+            count = size
+        start = self.written % size
+        first = min(count, size - start)
+        self.samples[start : start + first] = block[:first]
+        if first < count:
+            self.samples[: count - first] = block[first:]
+        self.written += count
+
+    def frame(self, index: int) -> np.ndarray:
+        start = (index % self.capacity) * self.frame_samples
+        return self.samples[start : start + self.frame_samples]
+
+    def vad_frame(self, index: int) -> np.ndarray:
+        """The frame scaled to float32, in a buffer the next call overwrites."""
+        self.scaled[:] = self.frame(index)
+        self.scaled *= 1.0 / 32768.0
+        return self.scaled
+
+    def extract(self, start: int, stop: int) -> np.ndarray:
+        """A copy of frames ``start`` up to ``stop``; frames already overwritten are left out."""
+        # A partly written frame has already overwritten the start of the slot it shares.
+        start = max(start, -(-self.written // self.frame_samples) - self.capacity)
+        if stop <= start:
+            return np.zeros(0, dtype=np.int16)
+        first = (start % self.capacity) * self.frame_samples
+        last = first + (stop - start) * self.frame_samples
+        if last <= len(self.samples):
+            return self.samples[first:last].copy()
+        return np.concatenate((self.samples[first:], self.samples[: last - len(self.samples)]))
+
+
+class MicCapture:
+    """Microphone stream that fills a ``FrameRing`` from the PortAudio callback."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int,
+        frame_samples: int,
+        capacity_frames: int,
+        device: str | int | None = None,
+        channels: int = 1,
+        dtype: str = "int16",
+    ):
+        self.sample_rate = sample_rate
+        self.frame_samples = frame_samples
+        self.device = device
+        self.channels = channels
+        self.dtype = dtype
+        self.ring = FrameRing(capacity_frames, frame_samples)
+        self.next_frame = 0
+        # Blocks PortAudio flagged as overflowed, and frames the reader skipped because it fell behind.
+        self.overflows = 0
+        self.dropped = 0
+        self._ready = threading.Event()
+
+    def reset(self) -> None:
+        """Reuse the ring for a new recording; call only while no stream is running."""
+        self.ring.reset()
+        self.next_frame = 0
+        self.overflows = 0
+        self.dropped = 0
+        self._ready.clear()
+
+    def stream(self) -> sd.InputStream:
+        """The input stream to run capture in; use it as a context manager."""
+        return sd.InputStream(
+            samplerate=self.sample_rate,
+            device=self.device,
+            channels=self.channels,
+            dtype=self.dtype,
+            blocksize=self.frame_samples,
+            callback=self._callback,
+        )
+
+    @property
+    def backlog(self) -> int:
+        """Complete frames the reader has not reached yet."""
+        return self.ring.frames_written - self.next_frame
+
+    def next(self, timeout: float) -> int | None:
+        """Index of the next complete frame, waiting up to ``timeout`` seconds; None on timeout."""
+        while self.ring.frames_written <= self.next_frame:
+            self._ready.clear()
+            if self.ring.frames_written > self.next_frame:
+                break
+            if not self._ready.wait(timeout):
+                return None
+        oldest = self.ring.oldest
+        if self.next_frame < oldest:
+            self.dropped += oldest - self.next_frame
+            logger.debug("Voice capture fell behind; skipped %d frames", oldest - self.next_frame)
+            self.next_frame = oldest
+        index = self.next_frame
+        self.next_frame += 1
+        return index
+
+    def frame(self, index: int) -> np.ndarray:
+        return self.ring.frame(index)
+
+    def vad_frame(self, index: int) -> np.ndarray:
+        """The frame scaled to float32, valid until the next call."""
+        return self.ring.vad_frame(index)
+
+    def extract(self, start: int, stop: int) -> np.ndarray:
+        return self.ring.extract(start, stop)
+
+    def _callback(self, indata: np.ndarray, _frames: int, _time, status) -> None:
+        if status:
+            self.overflows += 1
+        self.ring.write(indata[:, 0] if indata.ndim > 1 else indata)
+        self._ready.set()
@@ -37,6 +37,8 @@ class PreflightResult:
     tool_capability_checked_models: list[str] = field(default_factory=list)
     vision_capable_models: list[str] = field(default_factory=list)
     vision_capability_checked_models: list[str] = field(default_factory=list)
+    # Context window per model as reported by the backend (Ollama /api/show).
+    model_context_lengths: dict[str, int] = field(default_factory=dict)
 
 
 @dataclass
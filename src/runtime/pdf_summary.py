@@ -0,0 +1,244 @@
+"""
+PDF Summaries
+
+Map-reduce summaries for PDFs longer than one worker prompt. Extracted pages
+are grouped into chunks sized to the model's context window, and each chunk is
+summarized as soon as its pages are extracted, with up to MODEL_CONCURRENCY
+calls in flight. Partial summaries are merged in rounds until they fit one
+prompt, and that last pass answers the user's request.
+
+Chunk and merge summaries do not depend on the request, so they are cached by
+model and input text; a follow-up question about the same PDF only pays for
+the final pass.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from tools.pdf import PDF_TEXT_CACHE, PdfTextCache
+from utils.settings import Settings
+from utils.token_budget import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+Complete = Callable[[str], Awaitable[str]]
+
+# Share of the context window one chunk may fill; the rest is prompt and reply.
+_CHUNK_WINDOW_SHARE = 0.5
+_MIN_CHUNK_CHARS = 2_000
+_MAX_CHUNK_CHARS = 50_000
+_MAX_CACHED_SUMMARIES = 512
+# Used in place of a chunk summary when the model returns nothing.
+_EMPTY_SUMMARY_EXCERPT_CHARS = 800
+
+_CHUNK_PROMPT = (
+    "Summarize this part of a PDF in a few short paragraphs or bullets. Keep names, numbers, dates, "
+    "decisions, and section titles. Reply with the summary only.\n\n{label}:\n{text}"
+)
+_MERGE_PROMPT = (
+    "Merge these partial summaries of consecutive parts of one PDF into a single summary. "
+    "Keep names, numbers, dates, and decisions; drop repetition. Reply with the summary only.\n\n{text}"
+)
+_ANSWER_PROMPT = (
+    "Summarize the PDF for the user's request. Be concise, factual, and do not ask for a follow-up. "
+    "If the user asked for a focus area, answer that focus directly.\n\n"
+    "User request: {request}\n\n{source}:\n{text}"
+)
+
+
+@dataclass(frozen=True)
+class PdfChunk:
+    first_page: int
+    last_page: int
+    text: str
+
+    @property
+    def label(self) -> str:
+        if self.first_page == self.last_page:
+            return f"Page {self.first_page}"
+        return f"Pages {self.first_page}-{self.last_page}"
+
+
+def pdf_chunk_chars(settings: Settings) -> int:
+    """Characters of page text per chunk for the configured context window."""
+    window = max(1, settings.CONTEXT_WINDOW_TOKENS)
+    chars = int(window * CHARS_PER_TOKEN * _CHUNK_WINDOW_SHARE)
+    return max(_MIN_CHUNK_CHARS, min(chars, _MAX_CHUNK_CHARS))
+
+
+def chunk_pages(pages: Iterable[tuple[int, str]], max_chars: int) -> Iterator[PdfChunk]:
+    """Group consecutive pages into chunks of at most ``max_chars``; long pages are split."""
+    first = last = 0
+    parts: list[str] = []
+    size = 0
+    for number, text in pages:
+        if not text:
+            continue
+        block = f"[Page {number}]\n{text}"
+        if parts and size + len(block) + 2 > max_chars:
+            yield PdfChunk(first, last, "\n\n".join(parts))
+            parts, size = [], 0
+        while len(block) > max_chars:
+            yield PdfChunk(number, number, block[:max_chars])
+            block = f"[Page {number}, continued]\n{block[max_chars:]}"
+        if not parts:
+            first = number
+        parts.append(block)
+        size += len(block) + 2
+        last = number
+    if parts:
+        yield PdfChunk(first, last, "\n\n".join(parts))
+
+
+class PdfSummaryCache:
+    """Request-independent chunk and merge summaries, keyed by model and input text."""
+
+    def __init__(self, max_entries: int = _MAX_CACHED_SUMMARIES):
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+        self._max_entries = max_entries
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8", "replace")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+        return summary
+
+    def put(self, key: str, summary: str) -> None:
+        self._summaries[key] = summary
+        self._summaries.move_to_end(key)
+        while len(self._summaries) > self._max_entries:
+            self._summaries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._summaries.clear()
+
+
+PDF_SUMMARIES = PdfSummaryCache()
+
+
+async def summarize_pdf(
+    path: Path,
+    request: str,
+    complete: Complete,
+    *,
+    model: str,
+    chunk_chars: int,
+    concurrency: int = 1,
+    progress: Callable[[str], None] | None = None,
+    pages: PdfTextCache | None = None,
+    cache: PdfSummaryCache | None = None,
+) -> str:
+    """Answer ``request`` about the whole PDF at ``path``; empty when the model returned nothing.
+
+    ``complete`` sends one prompt to the worker model and returns the reply. It
+    must raise when the backend fails, so an error reply is never cached as a
+    summary; the error propagates to the caller. Short PDFs take a single pass
+    over the extracted text.
+    """
+    pages = pages or PDF_TEXT_CACHE
+    cache = cache or PDF_SUMMARIES
+    report = progress or (lambda _summary: None)
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def summarize(prompt: str, fallback: str) -> str:
+        key = cache.key(model, prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        async with limit:
+            summary = (await complete(prompt)).strip()
+        if not summary:
+            return fallback
+        cache.put(key, summary)
+        return summary
+
+    chunks: list[PdfChunk] = []
+    summaries: list[asyncio.Task[str]] = []
+    done = 0
+
+    def start(chunk: PdfChunk) -> None:
+        prompt = _CHUNK_PROMPT.format(label=chunk.label, text=chunk.text)
+        task = asyncio.ensure_future(summarize(prompt, chunk.text[:_EMPTY_SUMMARY_EXCERPT_CHARS]))
+        task.add_done_callback(count_done)
+        summaries.append(task)
+
+    def count_done(_task: asyncio.Task) -> None:
+        nonlocal done
+        done += 1
+        report(f"Summarized {done} of {len(chunks)} PDF parts")
+
+    iterator = chunk_pages(pages.pages(path, parallel=True), chunk_chars)
+    try:
+        while (chunk := await asyncio.to_thread(next, iterator, None)) is not None:
+            chunks.append(chunk)
+            # A PDF that fits one chunk is answered directly, so summarizing starts with the second chunk.
+            if len(chunks) == 2:
+                report("Summarizing PDF in parts")
+                start(chunks[0])
+            if len(chunks) >= 2:
+                start(chunk)
+        partials = await asyncio.gather(*summaries)
+    finally:
+        for task in summaries:
+            task.cancel()
+
+    if not chunks:
+        return ""
+    if len(chunks) == 1:
+        report("Preparing final answer")
+        prompt = _ANSWER_PROMPT.format(request=request, source="Extracted local PDF text", text=chunks[0].text)
+        return (await complete(prompt)).strip()
+
+    labelled = [
+        PdfChunk(chunk.first_page, chunk.last_page, summary) for chunk, summary in zip(chunks, partials, strict=True)
+    ]
+    while len(labelled) > 1 and _joined_length(labelled) > chunk_chars:
+        report(f"Merging {len(labelled)} PDF part summaries")
+        groups = _merge_groups(labelled, chunk_chars)
+        merged = await asyncio.gather(
+            *(summarize(_MERGE_PROMPT.format(text=_join(group)), _join(group)[:chunk_chars]) for group in groups)
+        )
+        labelled = [
+            PdfChunk(group[0].first_page, group[-1].last_page, summary)
+            for group, summary in zip(groups, merged, strict=True)
+        ]
+
+    report("Preparing final answer")
+    source = "Summaries of the PDF's parts, in page order"
+    prompt = _ANSWER_PROMPT.format(request=request, source=source, text=_join(labelled))
+    return (await complete(prompt)).strip()
+
+
+def _join(chunks: list[PdfChunk]) -> str:
+    return "\n\n".join(f"{chunk.label}:\n{chunk.text}" for chunk in chunks)
+
+
+def _joined_length(chunks: list[PdfChunk]) -> int:
+    return len(_join(chunks))
+
+
+def _merge_groups(chunks: list[PdfChunk], max_chars: int) -> list[list[PdfChunk]]:
+    """Consecutive groups that each fit ``max_chars``; every group has at least two summaries."""
+    groups: list[list[PdfChunk]] = []
+    current: list[PdfChunk] = []
+    for chunk in chunks:
+        if len(current) >= 2 and _joined_length([*current, chunk]) > max_chars:
+            groups.append(current)
+            current = []
+        current.append(chunk)
+    if len(current) == 1 and groups:
+        groups[-1].append(current[0])
+    elif current:
+        groups.append(current)
+    return groups
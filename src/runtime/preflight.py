@@ -37,6 +37,18 @@ def _fail(msg: str):
     print(f"  {RED}✗{NC} {msg}")
 
 
+def _context_length_from_show(info: dict) -> int | None:
+    """Return a model's context window from an Ollama /api/show reply, preferring a Modelfile num_ctx."""
+    for line in str(info.get("parameters") or "").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0] == "num_ctx" and parts[1].isdigit():
+            return int(parts[1])
+    for key, value in (info.get("model_info") or {}).items():
+        if key.endswith(".context_length") and isinstance(value, int) and value > 0:
+            return value
+    return None
+
+
 class PreflightManager:
     def __init__(self, settings: Settings):
         self.settings = settings
@@ -178,10 +190,14 @@ class PreflightManager:
                 resp = await client.post(f"{base}/api/show", json={"model": model})
             if resp.status_code != 200:
                 return
-            capabilities = set(resp.json().get("capabilities") or [])
+            info = resp.json()
+            capabilities = set(info.get("capabilities") or [])
         except Exception as e:
             logger.debug("Could not inspect Ollama model capabilities for %s: %s", model, e)
             return
+        context_length = _context_length_from_show(info)
+        if context_length:
+            result.model_context_lengths[model] = context_length
         result.tool_capability_checked_models.append(model)
         result.vision_capability_checked_models.append(model)
         if capabilities and "tools" not in capabilities:
@@ -64,6 +64,12 @@ class ModelRegistry:
             source=source,
         )
 
+    def context_length(self, name: str | None) -> int:
+        """Token window to budget prompts for: the backend's reported window, capped by CONTEXT_WINDOW_TOKENS."""
+        configured = max(1, self.settings.CONTEXT_WINDOW_TOKENS)
+        reported = self.preflight.model_context_lengths.get(name or "")
+        return min(reported, configured) if reported else configured
+
     def select_model(
         self,
         *,
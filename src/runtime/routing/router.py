@@ -96,6 +96,7 @@ class RuntimeRouter:
             require_tools=Capability.NATIVE_TOOLS in required_capabilities,
             fallback_plan=fallback_plan,
             trace=trace,
+            context_window=model_registry.context_length(selected_model),
         )
 
     def _execution_class(self, envelope: RequestEnvelope, connector_registry: ConnectorRegistry | None = None) -> ExecutionClass:
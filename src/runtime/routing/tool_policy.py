@@ -254,6 +254,24 @@ def metadata_for_tool(tool: BaseTool) -> ToolMetadata:
     )
 
 
+_PARALLEL_SAFE_RISK_TIERS = {RiskTier.NONE, RiskTier.LOW_READ_ONLY, RiskTier.PRIVATE_READ}
+
+
+def is_parallel_safe(meta: ToolMetadata) -> bool:
+    """Return True when a tool call may overlap other calls in the same model round.
+
+    Only local reads qualify. Anything that mutates state, needs approval, or
+    reaches the network keeps its place in the call order.
+    """
+    return (
+        meta.risk_tier in _PARALLEL_SAFE_RISK_TIERS
+        and not meta.mutates_state
+        and not meta.destructive
+        and not meta.requires_approval
+        and not meta.network_access
+    )
+
+
 def route_tool_policy(
     *,
     execution_class: ExecutionClass,
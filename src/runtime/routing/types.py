@@ -178,3 +178,5 @@ class RoutingDecision:
     require_tools: bool
     fallback_plan: FallbackPlan
     trace: RoutingTrace
+    # Prompt token window of the selected model; 0 means unknown.
+    context_window: int = 0
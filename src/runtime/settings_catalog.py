@@ -36,6 +36,7 @@ SETTING_SPECS: tuple[SettingSpec, ...] = (
     SettingSpec("LIVE_SPEECH_ENABLED", "Speech output", "Speak Eyra's answers aloud when Local Whisper is ready.", "Voice", "true", True, "Text-to-speech is local by default.", value_type="bool", allowed_values=("true", "false")),
     SettingSpec("VOICE_INPUT_DEVICE", "Microphone", "Optional microphone device index or name. Empty means the system default.", "Voice", "", True, "Only affects local microphone capture."),
     SettingSpec("VOICE_VAD_THRESHOLD", "Voice sensitivity", "Speech detection threshold from 0.0 to 1.0. Higher is stricter.", "Voice", "0.15", True, "Only affects local speech detection.", value_type="float"),
+    SettingSpec("VOICE_STREAMING_ENABLED", "Streaming transcription", "Transcribe speech in segments while you are still talking, so replies start sooner.", "Voice", "false", True, "Segments go to the same local Local Whisper service as full utterances.", value_type="bool", allowed_values=("true", "false")),
     SettingSpec("FILESYSTEM_ALLOWED_PATHS", "Allowed folders", "Folders Eyra may read or write when file tools are used.", "Folders", "~/Documents,~/Desktop,~/Downloads,/tmp", True, "Controls local filesystem access."),
     SettingSpec("FILESYSTEM_DEFAULT_PATH", "Default folder", "Where relative file requests start.", "Folders", "~/Documents", True, "Controls local filesystem access."),
     SettingSpec("WEB_UI_ENABLED", "Web UI", "Start the local browser interface when Eyra starts.", "Web UI", "false", True, "The Web UI binds locally by default and keeps token auth on.", value_type="bool", allowed_values=("true", "false")),
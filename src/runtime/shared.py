@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from chat.complexity_scorer import ComplexityScorer
 from runtime.connectors.registry import ConnectorRegistry
 from runtime.history import ProtocolHistory, SemanticHistory
+from runtime.job_retention import RetentionPolicy
 from runtime.jobs import DurableJobStore
 from runtime.models import PreflightResult
 from runtime.tasks import BackgroundTaskManager, TaskEventCallback
@@ -55,7 +56,7 @@ class RuntimeSharedState:
         browser_session = BrowserSession()
         approvals = ApprovalManager()
         registry = build_tool_registry(settings, browser_session=browser_session, approval_manager=approvals)
-        job_store = DurableJobStore(settings.JOB_STORE_PATH)
+        job_store = DurableJobStore(settings.JOB_STORE_PATH, retention=RetentionPolicy.from_settings(settings))
         trigger_store = TriggerStore(settings.TRIGGER_STORE_PATH)
         task_manager = BackgroundTaskManager(
             max_concurrent=max(1, int(settings.MAX_BACKGROUND_TASKS)),
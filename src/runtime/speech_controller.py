@@ -7,6 +7,7 @@ import difflib
 import logging
 import re
 import time
+from collections.abc import Callable
 
 from runtime.models import LiveRuntimeState
 
@@ -23,6 +24,9 @@ class SpeechController:
         input_device: str | int | None = None,
         sample_rate: int = 16000,
         max_duration_seconds: int = 300,
+        stream_chunk_ms: int = 0,
+        vad_backend: str = "onnxruntime",
+        on_partial_transcript: Callable[[str], None] | None = None,
     ):
         self.state = state
         self.cooldown_s = cooldown_ms / 1000.0
@@ -31,6 +35,9 @@ class SpeechController:
         self._input_device = input_device
         self._sample_rate = sample_rate
         self._max_duration_seconds = max_duration_seconds
+        self._stream_chunk_ms = stream_chunk_ms
+        self._vad_backend = vad_backend
+        self._on_partial_transcript = on_partial_transcript
         self._speaking_proc: asyncio.subprocess.Process | None = None
         self._voice_input = None
 
@@ -48,6 +55,8 @@ class SpeechController:
                 input_device=self._input_device,
                 sample_rate=self._sample_rate,
                 max_duration_s=self._max_duration_seconds,
+                stream_chunk_ms=self._stream_chunk_ms,
+                vad_backend=self._vad_backend,
             )
         except Exception as e:
             logger.debug("Voice input initialization failed: %s", e)
@@ -153,8 +162,9 @@ class SpeechController:
         if voice_input is None:
             return None
 
+        partial = {"on_partial": self._on_partial_transcript} if self._on_partial_transcript else {}
         if not self.is_speaking:
-            return await voice_input.listen()
+            return await voice_input.listen(**partial)
 
         loop = asyncio.get_running_loop()
         interrupt_requested = False
@@ -170,7 +180,7 @@ class SpeechController:
             except RuntimeError:
                 logger.debug("Could not schedule speech interruption; event loop is closed")
 
-        text = await voice_input.listen(on_speech_start=interrupt_on_user_speech)
+        text = await voice_input.listen(on_speech_start=interrupt_on_user_speech, **partial)
         if interrupt_future is not None:
             try:
                 await asyncio.wrap_future(interrupt_future)
@@ -15,6 +15,7 @@ from tools.browser import (
     WebSearchTool,
 )
 from tools.clipboard import ClipboardTool
+from tools.file_index import FileIndex, open_file_index
 from tools.filesystem import (
     AppendFileTool,
     CompareFilesTool,
@@ -86,6 +87,19 @@ from tools.weather import WeatherTool
 from utils.settings import Settings
 
 
+def _settings_number(settings: Settings, name: str, default: float) -> float:
+    value = getattr(settings, name, default)
+    return value if isinstance(value, (float, int)) and not isinstance(value, bool) else default
+
+
+def _file_index(settings: Settings, fs_roots: tuple[Path, ...]) -> FileIndex | None:
+    """The shared file index, only when the settings hold real values that enable it."""
+    path = getattr(settings, "FILE_INDEX_PATH", "")
+    if getattr(settings, "FILE_INDEX_ENABLED", False) is not True or not isinstance(path, str) or not path:
+        return None
+    return open_file_index(path, fs_roots, rescan_seconds=_settings_number(settings, "FILE_INDEX_RESCAN_SECONDS", 60.0))
+
+
 def build_tool_registry(
     settings: Settings,
     browser_session: BrowserSession | None = None,
@@ -178,7 +192,14 @@ def build_tool_registry(
     if settings.OS_TOOLS_ENABLED:
         registry.register(RunCommandTool(allowed_roots=fs_roots, default_path=fs_default, approval_manager=approval_manager))
         registry.register(FileInfoTool(allowed_roots=fs_roots, default_path=fs_default))
-        registry.register(SearchFilesTool(allowed_roots=fs_roots, default_path=fs_default))
+        registry.register(
+            SearchFilesTool(
+                allowed_roots=fs_roots,
+                default_path=fs_default,
+                file_index=_file_index(settings, fs_roots),
+                deadline_seconds=_settings_number(settings, "TOOL_TIMEOUT_SECONDS", 30) * 0.8,
+            )
+        )
         registry.register(ListProcessesTool())
         registry.register(GetSystemSnapshotTool())
         registry.register(GetAccessibilityTreeTool())
@@ -238,7 +259,20 @@ def build_tool_registry(
         )
 
     if settings.MCP_TOOLS_ENABLED:
-        registry.register(ListMcpTools(config_path=settings.MCP_CONFIG_PATH))
-        registry.register(CallMcpTool(config_path=settings.MCP_CONFIG_PATH, approval_manager=approval_manager))
+        registry.register(
+            ListMcpTools(
+                config_path=settings.MCP_CONFIG_PATH,
+                keepalive_seconds=settings.MCP_KEEPALIVE_SECONDS,
+                max_in_flight=settings.MCP_MAX_IN_FLIGHT,
+            )
+        )
+        registry.register(
+            CallMcpTool(
+                config_path=settings.MCP_CONFIG_PATH,
+                approval_manager=approval_manager,
+                keepalive_seconds=settings.MCP_KEEPALIVE_SECONDS,
+                max_in_flight=settings.MCP_MAX_IN_FLIGHT,
+            )
+        )
 
     return registry
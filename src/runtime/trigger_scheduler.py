@@ -0,0 +1,375 @@
+"""
+Trigger Scheduler
+
+One scheduler per trigger store runs every one-time and recurring reminder.
+It keeps a heap of ``(deadline, trigger id)`` and sleeps until the earliest
+deadline or until the store reports a change, so a pending reminder holds no
+background task slot. A task starts only when a reminder fires.
+
+Active reminders are reloaded from the store when the scheduler starts, so
+they survive restarts. A fire that is more than ``LATE_GRACE_SECONDS`` late
+was missed, usually because Eyra was not running, and ``TRIGGER_CATCH_UP``
+decides what happens:
+
+- ``once``: fire once now, then continue on the original schedule.
+- ``all``: fire every missed occurrence, up to ``MAX_CATCH_UP_FIRES``.
+- ``skip``: drop missed fires; a missed one-time reminder fails.
+
+Several runtimes may share one trigger store. A fire is claimed with a
+conditional update that only applies while the stored fire time is the one
+the scheduler woke for, so exactly one scheduler fires each occurrence. The
+others find the trigger completed or moved on and follow the stored schedule.
+
+File triggers are served the same way. ``FileTriggerMonitor`` registers every
+active file trigger with the shared file watcher when it starts and as
+triggers are created or resumed. A waiting trigger costs one watch and one
+small coroutine, not a background task slot. A task starts only when the file
+is ready. A file trigger fails once ``timeout_seconds`` have passed since it
+was created.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from runtime.file_watch import DEFAULT_POLL_SECONDS, FileWatcher, shared_file_watcher
+from runtime.jobs import RiskLevel
+from runtime.tasks import BackgroundTask, BackgroundTaskManager
+from runtime.triggers import TriggerRecord, TriggerStatus, TriggerStore, wait_for_trigger_file
+
+logger = logging.getLogger(__name__)
+
+CATCH_UP_POLICIES = ("once", "all", "skip")
+TIMER_KINDS = ("timer", "recurring_timer")
+FILE_KINDS = ("file_exists",)
+# A fire this late still counts as on time, which covers event loop stalls and short sleeps.
+LATE_GRACE_SECONDS = 60.0
+# Cap for the ``all`` policy, so a long outage does not flood the task list.
+MAX_CATCH_UP_FIRES = 10
+
+
+@dataclass(frozen=True)
+class TimerFire:
+    trigger: TriggerRecord
+    message: str
+    # Wall-clock time this fire was due.
+    scheduled_for: float
+    # True when the fire was missed and is being caught up.
+    missed: bool = False
+
+    @property
+    def recurring(self) -> bool:
+        return self.trigger.kind == "recurring_timer"
+
+
+class TriggerScheduler:
+    """Fires timer and recurring triggers from one heap on the event loop."""
+
+    def __init__(
+        self,
+        store: TriggerStore,
+        on_fire: Callable[[TimerFire], object],
+        *,
+        catch_up: str = "once",
+    ):
+        self.store = store
+        self.on_fire = on_fire
+        self.catch_up = catch_up if catch_up in CATCH_UP_POLICIES else "once"
+        self._heap: list[tuple[float, int, str]] = []
+        # Current deadline per trigger; heap entries that do not match it are stale.
+        self._due: dict[str, float] = {}
+        self._sequence = itertools.count()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Reload active reminders and start the scheduler on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._unsubscribe = self.store.subscribe(self._changed)
+        for trigger in self.store.list_triggers_by_kind(TIMER_KINDS, status=TriggerStatus.ACTIVE):
+            self._schedule(trigger)
+        self._task = self._loop.create_task(self._run(), name="eyra-trigger-scheduler")
+
+    async def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            # wait_for can drop a cancellation that lands as the wake event fires (Python < 3.12),
+            # so _run also exits once it is no longer the scheduler's task.
+            if self._wake is not None:
+                self._wake.set()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def pending(self) -> list[tuple[float, str]]:
+        """``(deadline, trigger id)`` for every scheduled reminder, soonest first."""
+        return sorted((due, trigger_id) for trigger_id, due in self._due.items())
+
+    def _changed(self, record: TriggerRecord) -> None:
+        # Store updates can come from any thread; scheduling happens on the loop.
+        loop = self._loop
+        if loop is None or record.kind not in TIMER_KINDS:
+            return
+        try:
+            loop.call_soon_threadsafe(self._apply_change, record)
+        except RuntimeError:
+            pass
+
+    def _apply_change(self, record: TriggerRecord) -> None:
+        if record.status == TriggerStatus.ACTIVE:
+            self._schedule(record)
+        else:
+            self._due.pop(record.id, None)
+        if self._wake is not None:
+            self._wake.set()
+
+    def _schedule(self, trigger: TriggerRecord) -> None:
+        due = _fire_time(trigger)
+        if due <= 0:
+            self.store.mark_failed(trigger.id, "Reminder trigger has no fire time.")
+            return
+        if self._due.get(trigger.id) == due:
+            return
+        self._due[trigger.id] = due
+        heapq.heappush(self._heap, (due, next(self._sequence), trigger.id))
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        while self._task is asyncio.current_task():
+            self._wake.clear()
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                due, _sequence, trigger_id = heapq.heappop(self._heap)
+                if self._due.get(trigger_id) != due:
+                    continue
+                del self._due[trigger_id]
+                try:
+                    self._fire(trigger_id, due, now)
+                except Exception:
+                    logger.exception("Trigger %s failed to fire", trigger_id)
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, trigger_id: str, due: float, now: float) -> None:
+        trigger = self.store.get_trigger(trigger_id)
+        if trigger is None or trigger.status != TriggerStatus.ACTIVE:
+            return
+        if _fire_time(trigger) != due:
+            # Another scheduler on this store already fired it, or the heap entry is stale.
+            self._schedule(trigger)
+            return
+        message = str(trigger.action.get("message", "")).strip()
+        if trigger.action.get("type") != "notify" or not message:
+            self.store.mark_failed(trigger_id, "Reminder trigger action is not supported.")
+            return
+        missed = now - due > LATE_GRACE_SECONDS
+
+        if trigger.kind == "timer":
+            if missed and self.catch_up == "skip":
+                self.store.mark_failed(trigger_id, "Reminder was missed while Eyra was not running.", expected=trigger)
+                return
+            # Only the scheduler whose update lands fires; the others see the trigger already completed.
+            if self.store.mark_completed(trigger_id, expected=trigger) is not None:
+                self.on_fire(TimerFire(trigger, message, due, missed))
+            return
+
+        interval = float(trigger.condition.get("interval_seconds", 0.0))
+        if interval <= 0:
+            self.store.mark_failed(trigger_id, "Recurring reminder trigger action is not supported.")
+            return
+        # Occurrences due by now, counting the one that woke the scheduler.
+        elapsed = math.floor((now - due) / interval) + 1
+        next_fire_at = due + elapsed * interval
+        if not missed:
+            fires = [due]
+        elif self.catch_up == "all":
+            fires = [due + step * interval for step in range(max(0, elapsed - MAX_CATCH_UP_FIRES), elapsed)]
+        elif self.catch_up == "once":
+            fires = [due + (elapsed - 1) * interval]
+        else:
+            fires = []
+        updated = self.store.record_recurring_fire(
+            trigger_id,
+            last_fire_at=now if fires else None,
+            next_fire_at=next_fire_at,
+            fires=len(fires),
+            expected=trigger,
+        )
+        if updated is None:
+            # Another scheduler recorded this fire; follow the schedule it stored.
+            current = self.store.get_trigger(trigger_id)
+            if current is not None and current.status == TriggerStatus.ACTIVE:
+                self._schedule(current)
+            return
+        for scheduled_for in fires:
+            self.on_fire(TimerFire(updated, message, scheduled_for, missed))
+
+
+def _fire_time(trigger: TriggerRecord) -> float:
+    key = "next_fire_at" if trigger.kind == "recurring_timer" else "fire_at"
+    try:
+        return float(trigger.condition.get(key, 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class FileTriggerMonitor:
+    """Waits for every active file trigger on the shared watcher and reports the ready ones."""
+
+    def __init__(
+        self,
+        store: TriggerStore,
+        on_ready: Callable[[TriggerRecord], object],
+        *,
+        watcher: FileWatcher | None = None,
+        timeout_seconds: float = 300.0,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+    ):
+        self.store = store
+        self.on_ready = on_ready
+        self.watcher = watcher
+        self.timeout_seconds = max(1.0, timeout_seconds)
+        self.poll_seconds = max(0.01, poll_seconds)
+        self._waits: dict[str, asyncio.Task] = {}
+        # Triggers handed to on_ready; they are not watched again while they stay active.
+        self._fired: set[str] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Watch every active file trigger and follow the store for new and resumed ones."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        if self.watcher is None:
+            self.watcher = shared_file_watcher()
+        self._unsubscribe = self.store.subscribe(self._changed)
+        for trigger in self.store.list_triggers_by_kind(FILE_KINDS, status=TriggerStatus.ACTIVE):
+            self._watch(trigger)
+
+    async def stop(self) -> None:
+        """Stop watching; triggers stay active in the store and are reloaded on the next start."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._loop = None
+        waits = list(self._waits.values())
+        self._waits.clear()
+        for task in waits:
+            task.cancel()
+        await asyncio.gather(*waits, return_exceptions=True)
+
+    def pending(self) -> list[str]:
+        """Ids of the file triggers being watched."""
+        return sorted(self._waits)
+
+    def _changed(self, record: TriggerRecord) -> None:
+        loop = self._loop
+        if loop is None or record.kind not in FILE_KINDS:
+            return
+        try:
+            loop.call_soon_threadsafe(self._apply_change, record)
+        except RuntimeError:
+            pass
+
+    def _apply_change(self, record: TriggerRecord) -> None:
+        if record.status == TriggerStatus.ACTIVE:
+            self._watch(record)
+        else:
+            # Paused and cancelled triggers are handled by the running wait; finished ones may fire again if resumed.
+            self._fired.discard(record.id)
+
+    def _watch(self, trigger: TriggerRecord) -> None:
+        if self._loop is None or trigger.id in self._waits or trigger.id in self._fired:
+            return
+        source = str(trigger.condition.get("path", ""))
+        if not source:
+            self.store.mark_failed(trigger.id, "File trigger has no path.")
+            return
+        self._waits[trigger.id] = self._loop.create_task(self._wait(trigger, source), name=f"eyra-trigger-{trigger.id}")
+
+    async def _wait(self, trigger: TriggerRecord, source: str) -> None:
+        try:
+            remaining = trigger.created_at + self.timeout_seconds - time.time()
+            outcome = "timeout"
+            if remaining > 0:
+                outcome = await wait_for_trigger_file(
+                    self.store,
+                    self.watcher,
+                    trigger.id,
+                    source,
+                    timeout_seconds=remaining,
+                    poll_seconds=self.poll_seconds,
+                    cancelled=lambda: False,
+                    progress=lambda message: logger.debug("Trigger %s: %s", trigger.id, message),
+                )
+            if outcome == "timeout":
+                self.store.mark_failed(trigger.id, f"Trigger timed out after {int(self.timeout_seconds)} seconds.")
+            elif outcome == "ready":
+                self._fired.add(trigger.id)
+                self.on_ready(self.store.get_trigger(trigger.id) or trigger)
+        except Exception:
+            logger.exception("File trigger %s failed", trigger.id)
+        finally:
+            if self._waits.get(trigger.id) is asyncio.current_task():
+                del self._waits[trigger.id]
+
+
+def start_reminder_task(task_manager: BackgroundTaskManager, fire: TimerFire) -> BackgroundTask:
+    """Start the short task that reports one reminder fire."""
+    label = "Recurring reminder" if fire.recurring else "Reminder"
+    suffix = " (missed while Eyra was not running)" if fire.missed else ""
+
+    async def worker(task: BackgroundTask) -> str:
+        task.mark_progress(f"{label} fired: {fire.message}{suffix}")
+        return f"{label}: {fire.message}{suffix}"
+
+    return task_manager.create_task(
+        title=fire.trigger.title,
+        original_request=fire.trigger.original_request,
+        worker=worker,
+        used_tools=False,
+        normalized_task_spec={
+            "task_type": "trigger.timer.fire",
+            "trigger_id": fire.trigger.id,
+            "message": fire.message,
+            "scheduled_for": fire.scheduled_for,
+            "missed": fire.missed,
+        },
+        risk_level=RiskLevel.READ_ONLY,
+    )
+
+
+def format_interval(seconds: float) -> str:
+    """``30 minutes``-style text for a recurring reminder interval."""
+    count, unit = seconds, "second"
+    for name, size in (("hour", 3600), ("minute", 60)):
+        if seconds >= size and seconds % size == 0:
+            count, unit = seconds / size, name
+            break
+    return f"{count:g} {unit}{'' if count == 1 else 's'}"
@@ -8,11 +8,15 @@ import sqlite3
 import threading
 import time
 import uuid
+from collections.abc import Callable
 from contextlib import suppress
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from runtime.file_watch import FileWatcher
 
 
 class TriggerStatus(str, Enum):
@@ -41,6 +45,61 @@ async def wait_for_file_ready(path: str | Path, *, settle_seconds: float = 0.05,
     return False
 
 
+async def wait_for_trigger_file(
+    store: TriggerStore,
+    watcher: FileWatcher,
+    trigger_id: str,
+    path: str,
+    *,
+    timeout_seconds: float,
+    poll_seconds: float,
+    cancelled: Callable[[], bool],
+    progress: Callable[[str], None],
+) -> str:
+    """Wait until a file trigger's path is ready to act on.
+
+    Returns ``"ready"``, ``"cancelled"``, or ``"timeout"``. The wait sleeps on
+    the shared watcher and on the store's change notifications, so a pause,
+    resume, or cancel takes effect at once without re-reading the store.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    paused = False
+    with watcher.watch(path, poll_seconds=poll_seconds) as watch:
+
+        def changed(record: TriggerRecord) -> None:
+            if record.id == trigger_id:
+                watch.wake()
+
+        unsubscribe = store.subscribe(changed)
+        try:
+            while (remaining := deadline - loop.time()) > 0:
+                if cancelled():
+                    store.mark_cancelled(trigger_id)
+                    return "cancelled"
+                current = store.get_trigger(trigger_id)
+                if current is None:
+                    raise RuntimeError("Trigger was deleted.")
+                if current.status == TriggerStatus.CANCELLED:
+                    return "cancelled"
+                if current.status == TriggerStatus.PAUSED:
+                    if not paused:
+                        progress(f"Paused trigger {trigger_id}")
+                        paused = True
+                    # File events are ignored until the trigger is resumed.
+                    await watch.wait(remaining)
+                    continue
+                if paused:
+                    paused = False
+                    progress(f"Waiting for {path}")
+                    watch.rearm()
+                if await watch.wait(remaining):
+                    return "ready"
+        finally:
+            unsubscribe()
+    return "timeout"
+
+
 @dataclass
 class TriggerRecord:
     """Persisted local trigger metadata."""
@@ -69,8 +128,20 @@ class TriggerStore:
         with suppress(OSError):
             self.path.chmod(0o600)
         self._lock = threading.RLock()
+        self._listeners: list[Callable[[TriggerRecord], None]] = []
         self._migrate()
 
+    def subscribe(self, listener: Callable[[TriggerRecord], None]) -> Callable[[], None]:
+        """Call ``listener`` with every trigger this store updates; returns the unsubscribe function."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock, suppress(ValueError):
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
     def create_file_exists_trigger(
         self,
         *,
@@ -102,6 +173,7 @@ class TriggerStore:
                 self._trigger_values(record),
             )
             self._conn.commit()
+        self._notify(record)
         return record
 
     def create_timer_trigger(
@@ -135,6 +207,7 @@ class TriggerStore:
                 self._trigger_values(record),
             )
             self._conn.commit()
+        self._notify(record)
         return record
 
     def create_recurring_timer_trigger(
@@ -173,16 +246,33 @@ class TriggerStore:
                 self._trigger_values(record),
             )
             self._conn.commit()
+        self._notify(record)
         return record
 
-    def record_recurring_fire(self, trigger_id: str, *, last_fire_at: float, next_fire_at: float) -> TriggerRecord | None:
-        record = self.get_trigger(trigger_id)
+    def record_recurring_fire(
+        self,
+        trigger_id: str,
+        *,
+        last_fire_at: float | None,
+        next_fire_at: float,
+        fires: int = 1,
+        expected: TriggerRecord | None = None,
+    ) -> TriggerRecord | None:
+        """Move a recurring trigger to ``next_fire_at`` after ``fires`` fires; 0 records skipped fires.
+
+        With ``expected``, the update only applies while the stored trigger
+        still has that record's status and condition, so when several
+        schedulers share a store only one of them records a given fire.
+        Returns None when another writer got there first.
+        """
+        record = expected or self.get_trigger(trigger_id)
         if record is None:
             return None
         condition = dict(record.condition)
-        condition["last_fire_at"] = float(last_fire_at)
+        if last_fire_at is not None:
+            condition["last_fire_at"] = float(last_fire_at)
         condition["next_fire_at"] = float(next_fire_at)
-        condition["fire_count"] = int(condition.get("fire_count", 0)) + 1
+        condition["fire_count"] = int(condition.get("fire_count", 0)) + fires
         updated = TriggerRecord(
             **{
                 **record.__dict__,
@@ -190,17 +280,9 @@ class TriggerStore:
                 "updated_at": time.time(),
             }
         )
-        with self._lock:
-            self._conn.execute(
-                """
-                UPDATE triggers SET
-                    title = ?, kind = ?, status = ?, condition = ?, action = ?, original_request = ?,
-                    created_at = ?, updated_at = ?, completed_at = ?, last_error = ?
-                WHERE id = ?
-                """,
-                (*self._trigger_values(updated)[1:], updated.id),
-            )
-            self._conn.commit()
+        if not self._save(updated, expected):
+            return None
+        self._notify(updated)
         return updated
 
     def get_trigger(self, trigger_id: str) -> TriggerRecord | None:
@@ -216,8 +298,26 @@ class TriggerStore:
             ).fetchall()
         return [self._trigger_from_row(row) for row in rows]
 
-    def mark_completed(self, trigger_id: str) -> TriggerRecord | None:
-        return self._update_status(trigger_id, TriggerStatus.COMPLETED)
+    def list_triggers_by_kind(
+        self,
+        kinds: tuple[str, ...],
+        *,
+        status: TriggerStatus | None = None,
+    ) -> list[TriggerRecord]:
+        if not kinds:
+            return []
+        placeholders = ", ".join("?" for _ in kinds)
+        sql = f"SELECT * FROM triggers WHERE kind IN ({placeholders})"
+        params: list[Any] = list(kinds)
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status.value)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY created_at ASC", params).fetchall()
+        return [self._trigger_from_row(row) for row in rows]
+
+    def mark_completed(self, trigger_id: str, *, expected: TriggerRecord | None = None) -> TriggerRecord | None:
+        return self._update_status(trigger_id, TriggerStatus.COMPLETED, expected=expected)
 
     def mark_cancelled(self, trigger_id: str) -> TriggerRecord | None:
         return self._update_status(trigger_id, TriggerStatus.CANCELLED)
@@ -228,8 +328,8 @@ class TriggerStore:
     def mark_active(self, trigger_id: str) -> TriggerRecord | None:
         return self._update_status(trigger_id, TriggerStatus.ACTIVE)
 
-    def mark_failed(self, trigger_id: str, error: str) -> TriggerRecord | None:
-        return self._update_status(trigger_id, TriggerStatus.FAILED, last_error=error)
+    def mark_failed(self, trigger_id: str, error: str, *, expected: TriggerRecord | None = None) -> TriggerRecord | None:
+        return self._update_status(trigger_id, TriggerStatus.FAILED, last_error=error, expected=expected)
 
     def close(self) -> None:
         with self._lock:
@@ -241,8 +341,9 @@ class TriggerStore:
         status: TriggerStatus,
         *,
         last_error: str | None = None,
+        expected: TriggerRecord | None = None,
     ) -> TriggerRecord | None:
-        record = self.get_trigger(trigger_id)
+        record = expected or self.get_trigger(trigger_id)
         if record is None:
             return None
         completed_at = record.completed_at
@@ -259,18 +360,33 @@ class TriggerStore:
                 "last_error": last_error,
             }
         )
+        if not self._save(updated, expected):
+            return None
+        self._notify(updated)
+        return updated
+
+    def _save(self, updated: TriggerRecord, expected: TriggerRecord | None = None) -> bool:
+        """Write ``updated``; with ``expected``, only if the stored status and condition still match it."""
+        sql = """
+            UPDATE triggers SET
+                title = ?, kind = ?, status = ?, condition = ?, action = ?, original_request = ?,
+                created_at = ?, updated_at = ?, completed_at = ?, last_error = ?
+            WHERE id = ?
+        """
+        params: tuple[Any, ...] = (*self._trigger_values(updated)[1:], updated.id)
+        if expected is not None:
+            sql += " AND status = ? AND condition = ?"
+            params += (expected.status.value, self._dump(expected.condition))
         with self._lock:
-            self._conn.execute(
-                """
-                UPDATE triggers SET
-                    title = ?, kind = ?, status = ?, condition = ?, action = ?, original_request = ?,
-                    created_at = ?, updated_at = ?, completed_at = ?, last_error = ?
-                WHERE id = ?
-                """,
-                (*self._trigger_values(updated)[1:], updated.id),
-            )
+            changed = self._conn.execute(sql, params).rowcount
             self._conn.commit()
-        return updated
+        return changed > 0
+
+    def _notify(self, record: TriggerRecord) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(record)
 
     def _migrate(self) -> None:
         with self._lock:
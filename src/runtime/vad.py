@@ -0,0 +1,186 @@
+"""
+Voice Activity Detection
+
+Silero VAD without torch. ``SileroOnnxModel`` runs the ONNX graph shipped in
+the ``silero-vad`` package through ``onnxruntime`` directly, with the
+recurrent state and audio context held in NumPy arrays. It scores one frame
+at a time (512 samples at 16 kHz, 256 at 8 kHz) and carries state and the
+last 64 samples (32 at 8 kHz) between calls, the same way silero's own
+``OnnxWrapper`` does. The model file is found without importing the
+``silero_vad`` package, because importing it loads torch.
+
+``VADIterator`` turns frame probabilities into ``start``/``end`` events with
+silero's hysteresis. Speech starts once a frame reaches ``threshold``. It
+ends once frames stay below ``threshold - 0.15`` for
+``min_silence_duration_ms``. Event positions are padded by ``speech_pad_ms``.
+
+``VOICE_VAD_BACKEND=torch`` scores frames with silero's torch-based wrapper
+instead, behind the same iterator. Only that backend imports torch.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VAD_BACKENDS = ("onnxruntime", "torch")
+SUPPORTED_SAMPLE_RATES = (8000, 16000)
+# Speech has ended once probabilities drop this far below the start threshold.
+END_THRESHOLD_GAP = 0.15
+
+
+class VADModel(Protocol):
+    def __call__(self, frame: np.ndarray, sr: int) -> float: ...
+
+    def reset_states(self) -> None: ...
+
+
+def silero_model_path() -> Path:
+    """Path of the ONNX model in the installed ``silero-vad`` package, found without importing it."""
+    spec = importlib.util.find_spec("silero_vad")
+    if spec is None or not spec.submodule_search_locations:
+        raise RuntimeError("silero-vad is not installed.")
+    path = Path(next(iter(spec.submodule_search_locations))) / "data" / "silero_vad.onnx"
+    if not path.is_file():
+        raise RuntimeError(f"Silero VAD model not found at {path}.")
+    return path
+
+
+class SileroOnnxModel:
+    """Silero VAD graph run by ``onnxruntime``, one frame per call."""
+
+    def __init__(self, path: str | Path | None = None, *, session=None):
+        if session is None:
+            import onnxruntime
+
+            options = onnxruntime.SessionOptions()
+            # Real-time scoring of one small frame; extra threads only contend with capture and the event loop.
+            options.inter_op_num_threads = 1
+            options.intra_op_num_threads = 1
+            session = onnxruntime.InferenceSession(
+                str(path or silero_model_path()),
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+        self.session = session
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._sr = np.array(0, dtype=np.int64)
+        # Context followed by the current frame, reused for every call at one sample rate.
+        self._input = np.zeros((1, 0), dtype=np.float32)
+
+    def reset_states(self) -> None:
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._input.fill(0.0)
+
+    def __call__(self, frame: np.ndarray, sr: int) -> float:
+        """Speech probability of one float32 frame scaled to [-1, 1]."""
+        frame = np.asarray(frame, dtype=np.float32).reshape(-1)
+        if sr != 16000 and sr % 16000 == 0:
+            frame = frame[:: sr // 16000]
+            sr = 16000
+        if sr not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError(f"Supported sampling rates: {SUPPORTED_SAMPLE_RATES} (or a multiple of 16000)")
+        samples, context = (512, 64) if sr == 16000 else (256, 32)
+        if len(frame) != samples:
+            raise ValueError(f"Provided number of samples is {len(frame)} (Supported values: 256 for 8000, 512 for 16000)")
+        if sr != int(self._sr):
+            self._sr = np.array(sr, dtype=np.int64)
+            self._input = np.zeros((1, context + samples), dtype=np.float32)
+            self.reset_states()
+
+        self._input[0, context:] = frame
+        output, self._state = self.session.run(None, {"input": self._input, "state": self._state, "sr": self._sr})
+        self._input[0, :context] = self._input[0, -context:]
+        return float(output[0, 0])
+
+
+class _TorchSileroModel:
+    """silero-vad's own torch-based wrapper, for ``VOICE_VAD_BACKEND=torch``."""
+
+    def __init__(self):
+        import torch
+        from silero_vad import load_silero_vad
+
+        # Limit torch to one thread, for the same reason the ONNX session runs on one.
+        torch.set_num_threads(1)
+        self._torch = torch
+        self._model = load_silero_vad(onnx=True)
+
+    def reset_states(self) -> None:
+        self._model.reset_states()
+
+    def __call__(self, frame: np.ndarray, sr: int) -> float:
+        with self._torch.no_grad():
+            return float(self._model(self._torch.from_numpy(np.asarray(frame, dtype=np.float32)), sr).item())
+
+
+def load_vad_model(backend: str = "onnxruntime") -> VADModel:
+    """Load Silero VAD for ``backend``; unknown names use ``onnxruntime``."""
+    if backend not in VAD_BACKENDS:
+        logger.warning("Unknown VAD backend %r; using onnxruntime", backend)
+        backend = "onnxruntime"
+    if backend == "torch":
+        return _TorchSileroModel()
+    return SileroOnnxModel()
+
+
+class VADIterator:
+    """Streaming speech start/end detection over a VAD model, matching silero's ``VADIterator``."""
+
+    def __init__(
+        self,
+        model: VADModel,
+        threshold: float = 0.5,
+        sampling_rate: int = 16000,
+        min_silence_duration_ms: int = 100,
+        speech_pad_ms: int = 30,
+    ):
+        if sampling_rate not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError(f"VADIterator does not support sampling rates other than {SUPPORTED_SAMPLE_RATES}")
+        self.model = model
+        self.threshold = threshold
+        self.sampling_rate = sampling_rate
+        self.min_silence_samples = sampling_rate * min_silence_duration_ms / 1000
+        self.speech_pad_samples = sampling_rate * speech_pad_ms / 1000
+        self.reset_states()
+
+    def reset_states(self) -> None:
+        self.model.reset_states()
+        self.triggered = False
+        # Sample position where the current run of silence began; 0 while none is pending.
+        self.temp_end = 0
+        self.current_sample = 0
+
+    def __call__(self, frame: np.ndarray, return_seconds: bool = False) -> dict[str, int | float] | None:
+        window = frame.shape[-1]
+        self.current_sample += window
+        probability = self.model(frame, self.sampling_rate)
+
+        if probability >= self.threshold and self.temp_end:
+            self.temp_end = 0
+
+        if probability >= self.threshold and not self.triggered:
+            self.triggered = True
+            start = max(0, self.current_sample - self.speech_pad_samples - window)
+            return {"start": self._position(start, return_seconds)}
+
+        if probability < self.threshold - END_THRESHOLD_GAP and self.triggered:
+            if not self.temp_end:
+                self.temp_end = self.current_sample
+            if self.current_sample - self.temp_end < self.min_silence_samples:
+                return None
+            end = self.temp_end + self.speech_pad_samples - window
+            self.temp_end = 0
+            self.triggered = False
+            return {"end": self._position(end, return_seconds)}
+
+        return None
+
+    def _position(self, sample: float, return_seconds: bool) -> int | float:
+        return round(sample / self.sampling_rate, 1) if return_seconds else int(sample)
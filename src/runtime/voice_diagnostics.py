@@ -17,7 +17,8 @@ from typing import Any
 import numpy as np
 import sounddevice as sd
 
-from runtime.voice_input import CHANNELS, DTYPE, FRAME_SAMPLES, SAMPLE_RATE, SOCKET_PATH, VoiceInput, _int16_to_float32
+from runtime.voice_input import CHANNELS, DTYPE, FRAME_SAMPLES, SAMPLE_RATE, VoiceInput, _int16_to_float32
+from runtime.whisper_client import SOCKET_PATH, format_stats, shared_whisper_client
 from utils.settings import Settings
 
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
@@ -306,6 +307,7 @@ class VoiceDiagnostics:
                 wh_bin=self.wh_bin,
                 input_device=self.device_selector or None,
                 sample_rate=self.sample_rate,
+                vad_backend=str(getattr(self.settings, "VOICE_VAD_BACKEND", "onnxruntime") or "onnxruntime"),
             )
             vad = voice_input._new_vad_iterator()
             frame_samples = int(FRAME_SAMPLES * (self.sample_rate / SAMPLE_RATE))
@@ -336,6 +338,12 @@ class VoiceDiagnostics:
             return report
         report.add("local_whisper_binary", "passed", self.wh_bin)
         report.add("local_whisper_socket", "passed" if SOCKET_PATH.exists() else "failed", str(SOCKET_PATH))
+        client = shared_whisper_client(self.wh_bin)
+        report.add(
+            "local_whisper_client",
+            "failed" if client.breaker.state == "open" else "passed",
+            format_stats(client.snapshot()),
+        )
 
         try:
             status = subprocess.run([self.wh_bin, "status"], capture_output=True, text=True, timeout=3)
@@ -421,6 +429,7 @@ class VoiceDiagnostics:
                 wh_bin=self.wh_bin,
                 input_device=self.device_selector or None,
                 sample_rate=self.sample_rate,
+                vad_backend=str(getattr(self.settings, "VOICE_VAD_BACKEND", "onnxruntime") or "onnxruntime"),
             )
             if challenge:
                 audio = await asyncio.to_thread(voice_input._record, interrupt_on_speech)
@@ -432,15 +441,7 @@ class VoiceDiagnostics:
                 if audio is None or len(audio) == 0:
                     text = None
                 else:
-                    wav_path = await asyncio.to_thread(voice_input._save_wav, audio, self.sample_rate)
-                    if wav_path:
-                        try:
-                            text = await voice_input._transcribe(wav_path)
-                        finally:
-                            with contextlib.suppress(Exception):
-                                Path(wav_path).unlink()
-                    else:
-                        text = None
+                    text = await voice_input._transcribe(audio)
             else:
                 text = await voice_input.listen(on_speech_start=interrupt_on_speech)
         finally:
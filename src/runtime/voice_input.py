@@ -1,32 +1,37 @@
 """Smart voice input with Silero VAD and Local Whisper transcription.
 
-Records from the microphone using sounddevice. Each 32ms frame (512 samples
-at 16 kHz) is scored by Silero's neural voice activity detector running as
-an ONNX model. The VADIterator uses hysteresis-based thresholds to emit
-discrete speech_start and speech_end events, avoiding the per-frame boolean
-noise of older detectors.
+Records from the microphone through a sounddevice callback that fills a
+preallocated ring buffer (see ``runtime.mic_capture``). Each 32ms frame (512
+samples at 16 kHz) is scored in place by Silero's neural voice activity
+detector, an ONNX model run by onnxruntime without torch (see ``runtime.vad``).
+The VADIterator uses hysteresis-based thresholds to emit discrete
+speech_start and speech_end events, avoiding the per-frame boolean noise of
+older detectors.
 
 Recording starts silently, waits for a speech_start event, captures until
-speech_end, then sends the audio to Local Whisper for transcription.
+speech_end, then sends the captured PCM to Local Whisper for transcription
+(inline over its socket, see ``runtime.whisper_client``).
+
+With streaming enabled, the utterance is also cut into segments at pauses
+inside speech (once a segment is at least ``stream_chunk_ms`` long) and each
+segment is transcribed while the user keeps talking. The rolling partial
+transcript is reported as segments finish, and at speech_end only the last
+segment is still left to decode.
 """
 
 from __future__ import annotations
 
 import asyncio
-import collections
-import json
 import logging
-import os
-import tempfile
 import threading
-import wave
-from collections.abc import Callable
-from pathlib import Path
+from collections.abc import Awaitable, Callable
 
 import numpy as np
 import sounddevice as sd
-import torch
-from silero_vad import VADIterator, load_silero_vad
+
+from runtime.mic_capture import MicCapture
+from runtime.vad import VADIterator, load_vad_model
+from runtime.whisper_client import AudioPayload, LocalWhisperError, shared_whisper_client
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +43,13 @@ FRAME_MS = 32  # 512 / 16000 * 1000
 
 # Frames of audio to keep before speech onset (captures the attack)
 _LOOKBACK_FRAMES = 5
-
-
-SOCKET_PATH = Path.home() / ".whisper" / "cmd.sock"
-
-# Limit torch to one thread — we do real-time inference on the audio thread
-# and don't want contention with sounddevice or the event loop.
-torch.set_num_threads(1)
+# A streaming segment with no pause is cut anyway at this multiple of the chunk length.
+_MAX_SEGMENT_CHUNKS = 2
+# Capture ring headroom beyond the longest recording, for when VAD scoring falls behind the microphone.
+_CAPTURE_SLACK_FRAMES = 32
+# How often a waiting recording checks for cancellation, and how long without audio counts as a dead stream.
+_CAPTURE_POLL_SECONDS = 0.25
+_CAPTURE_STALL_SECONDS = 5.0
 
 
 def _normalize_input_device(input_device: str | int | None) -> str | int | None:
@@ -59,17 +64,18 @@ def _normalize_input_device(input_device: str | int | None) -> str | int | None:
     return input_device
 
 
-def _int16_to_float32(frame: np.ndarray) -> torch.Tensor:
-    """Convert int16 PCM to float32 tensor normalized to [-1, 1]."""
-    return torch.from_numpy(frame.astype(np.float32) / 32768.0)
+def _int16_to_float32(frame: np.ndarray) -> np.ndarray:
+    """Convert int16 PCM to float32 normalized to [-1, 1]."""
+    return frame.astype(np.float32) / 32768.0
 
 
 class VoiceInput:
     """Records from microphone with Silero VAD, transcribes via Local Whisper.
 
-    Only captures audio that matters: a small lookback buffer before speech
-    onset, the speech itself, and a short tail of trailing silence. Pre-speech
-    silence is discarded, keeping memory usage proportional to speech duration.
+    Only returns audio that matters: a small lookback before speech onset, the
+    speech itself, and a short tail of trailing silence. Capture memory is one
+    ring buffer sized by ``max_duration_s``, allocated once and reused by
+    every recording.
     """
 
     def __init__(
@@ -81,6 +87,8 @@ class VoiceInput:
         wh_bin: str | None = None,
         input_device: str | int | None = None,
         sample_rate: int = SAMPLE_RATE,
+        stream_chunk_ms: int = 0,
+        vad_backend: str = "onnxruntime",
     ):
         """Initialize voice input.
 
@@ -94,21 +102,35 @@ class VoiceInput:
             wh_bin: Resolved path to the wh binary. Falls back to "wh" on PATH.
             input_device: Optional sounddevice device index or name.
             sample_rate: Capture sample rate. Silero's default path expects 16 kHz.
+            stream_chunk_ms: Minimum speech per streaming segment (ms). 0 turns
+                streaming off and transcribes the whole utterance at the end.
+            vad_backend: "onnxruntime" runs Silero without torch; "torch" uses
+                silero-vad's own torch-based wrapper.
         """
         self._sample_rate = int(sample_rate)
         self._frame_samples = int(FRAME_SAMPLES * (self._sample_rate / SAMPLE_RATE))
         self._frame_ms = self._frame_samples / self._sample_rate * 1000
         self.min_speech_frames = int(min_speech_ms / self._frame_ms)
         self.max_frames = int(max_duration_s * 1000 / self._frame_ms)
-        self._model = load_silero_vad(onnx=True)
+        self.stream_chunk_frames = max(0, int(stream_chunk_ms / self._frame_ms))
+        self._model = load_vad_model(vad_backend)
         self._threshold = threshold
         self._silence_duration_ms = silence_duration_ms
         self._wh_bin = wh_bin or "wh"
+        self._whisper = shared_whisper_client(self._wh_bin)
         self._input_device = _normalize_input_device(input_device)
         self._cancel = threading.Event()
+        self._capture = MicCapture(
+            sample_rate=self._sample_rate,
+            frame_samples=self._frame_samples,
+            capacity_frames=self.max_frames + _CAPTURE_SLACK_FRAMES,
+            device=self._input_device,
+            channels=CHANNELS,
+            dtype=DTYPE,
+        )
 
         # Warm up ONNX model to avoid first-inference latency
-        self._model(torch.zeros(self._frame_samples), self._sample_rate)
+        self._model(np.zeros(self._frame_samples, dtype=np.float32), self._sample_rate)
 
     def _new_vad_iterator(self) -> VADIterator:
         """Create a fresh VADIterator for a recording session."""
@@ -124,69 +146,105 @@ class VoiceInput:
         """Cancel an in-progress recording. Thread-safe."""
         self._cancel.set()
 
-    async def listen(self, on_speech_start: Callable[[], None] | None = None) -> str | None:
-        """Record until speech ends, transcribe, return text. None on silence/cancel."""
-        audio = await asyncio.to_thread(self._record, on_speech_start)
-        if audio is None or len(audio) == 0:
-            return None
+    @property
+    def streaming(self) -> bool:
+        return self.stream_chunk_frames > 0
 
-        wav_path = await asyncio.to_thread(self._save_wav, audio, self._sample_rate)
-        if not wav_path:
-            return None
+    async def listen(
+        self,
+        on_speech_start: Callable[[], None] | None = None,
+        on_partial: Callable[[str], None] | None = None,
+    ) -> str | None:
+        """Record until speech ends, transcribe, return text. None on silence/cancel.
+
+        When streaming, ``on_partial`` receives the transcript so far each time
+        a segment finishes decoding.
+        """
+        if not self.streaming:
+            audio = await asyncio.to_thread(self._record, on_speech_start)
+            if audio is None or len(audio) == 0:
+                return None
+            return await self._transcribe(audio)
+
+        loop = asyncio.get_running_loop()
+        transcript = _StreamingTranscript(self._transcribe, on_partial)
+
+        def on_segment(segment: np.ndarray) -> None:
+            loop.call_soon_threadsafe(transcript.add, segment)
 
         try:
-            return await self._transcribe(wav_path)
-        finally:
-            try:
-                Path(wav_path).unlink()
-            except Exception:
-                pass
+            audio = await asyncio.to_thread(self._record, on_speech_start, on_segment)
+        except BaseException:
+            await transcript.cancel()
+            raise
+        if audio is None or len(audio) == 0:
+            await transcript.cancel()
+            return None
+        return await transcript.finish()
 
     # ── Recording with Silero VAD ─────────────────────────────────────────
 
-    def _record(self, on_speech_start: Callable[[], None] | None = None) -> np.ndarray | None:
+    def _record(
+        self,
+        on_speech_start: Callable[[], None] | None = None,
+        on_segment: Callable[[np.ndarray], None] | None = None,
+    ) -> np.ndarray | None:
         """Synchronous mic recording with Silero neural voice activity detection.
 
         Driven by VADIterator events:
           WAITING (collecting lookback) → speech_start → RECORDING → speech_end → done
 
+        Frames are read from the capture ring by index and scaled into one
+        reusable float32 buffer for scoring. The utterance and each streaming segment are copied out of
+        the ring in one slice.
+
         Silero's VADIterator uses hysteresis (threshold - 0.15 for end detection)
         and configurable min_silence_duration_ms, producing stable end-of-speech
         detection without manual silence counting.
+
+        When ``on_segment`` is given and streaming is on, consecutive segments
+        of the utterance are passed to it as they are cut, the last one just
+        before a successful return. Together they cover the returned audio.
         """
         self._cancel.clear()
         vad = self._new_vad_iterator()
-
-        lookback: collections.deque[np.ndarray] = collections.deque(maxlen=_LOOKBACK_FRAMES)
-        speech_frames: list[np.ndarray] = []
+        capture = self._capture
+        capture.reset()
 
         speech_started = False
         speech_frame_count = 0
         speech_start_reported = False
+        # Ring frame indexes: the first frame lookback may use, the utterance start, and the next segment start.
+        lookback_floor = 0
+        utterance_start = 0
+        segment_start = 0
+        index = -1
+        chunk_frames = self.stream_chunk_frames if on_segment is not None else 0
 
         try:
-            with sd.InputStream(
-                samplerate=self._sample_rate,
-                device=self._input_device,
-                channels=CHANNELS,
-                dtype=DTYPE,
-                blocksize=self._frame_samples,
-            ) as stream:
-                for _ in range(self.max_frames):
+            with capture.stream():
+                frames = 0
+                stalled = 0.0
+                while frames < self.max_frames:
                     if self._cancel.is_set():
                         return None
-
-                    data, _overflowed = stream.read(self._frame_samples)
-                    frame = data[:, 0] if data.ndim > 1 else data.flatten()
-
-                    chunk = _int16_to_float32(frame)
-                    event = vad(chunk, return_seconds=False)
+                    next_index = capture.next(timeout=_CAPTURE_POLL_SECONDS)
+                    if next_index is None:
+                        stalled += _CAPTURE_POLL_SECONDS
+                        if stalled >= _CAPTURE_STALL_SECONDS:
+                            logger.error("Microphone stopped delivering audio")
+                            return None
+                        continue
+                    index = next_index
+                    frames += 1
+                    stalled = 0.0
+
+                    event = vad(capture.vad_frame(index), return_seconds=False)
 
                     if event is not None and "start" in event:
                         if not speech_started:
                             speech_started = True
-                            speech_frames.extend(lookback)
-                            lookback.clear()
+                            utterance_start = segment_start = max(lookback_floor, index - _LOOKBACK_FRAMES)
                             logger.debug("Speech onset detected")
                             if on_speech_start is not None and not speech_start_reported:
                                 speech_start_reported = True
@@ -195,22 +253,27 @@ class VoiceInput:
                                 except Exception as e:
                                     logger.debug("Speech-start callback failed: %s", e)
 
-                    if speech_started:
-                        speech_frames.append(frame.copy())
-                        speech_frame_count += 1
-
-                        if event is not None and "end" in event:
-                            if speech_frame_count >= self.min_speech_frames:
-                                logger.debug("Speech ended: %d frames", speech_frame_count)
-                                break
-                            # Too short, false trigger — reset
-                            speech_started = False
-                            speech_frames.clear()
-                            speech_frame_count = 0
-                            speech_start_reported = False
-                            vad.reset_states()
-                    else:
-                        lookback.append(frame.copy())
+                    if not speech_started:
+                        continue
+                    speech_frame_count += 1
+
+                    if event is not None and "end" in event:
+                        if speech_frame_count >= self.min_speech_frames:
+                            logger.debug("Speech ended: %d frames", speech_frame_count)
+                            break
+                        # Too short, false trigger — reset
+                        speech_started = False
+                        speech_frame_count = 0
+                        speech_start_reported = False
+                        lookback_floor = index + 1
+                        vad.reset_states()
+                    elif chunk_frames and speech_frame_count >= self.min_speech_frames:
+                        pending = index + 1 - segment_start
+                        # Silero sets temp_end while it sees a pause that is not yet long enough to end speech.
+                        paused = bool(getattr(vad, "temp_end", 0))
+                        if pending >= chunk_frames * _MAX_SEGMENT_CHUNKS or (pending >= chunk_frames and paused):
+                            self._emit_segment(on_segment, capture.extract(segment_start, index + 1))
+                            segment_start = index + 1
 
         except sd.PortAudioError as e:
             logger.error("Microphone error: %s", e)
@@ -219,81 +282,85 @@ class VoiceInput:
             logger.error("Recording error: %s", e)
             return None
 
+        if capture.overflows or capture.dropped:
+            logger.debug("Voice capture lost audio: %d overflowed blocks, %d skipped frames", capture.overflows, capture.dropped)
         if not speech_started or speech_frame_count < self.min_speech_frames:
             return None
 
-        return np.concatenate(speech_frames)
-
-    # ── WAV export ────────────────────────────────────────────────────────
+        if chunk_frames and segment_start <= index:
+            self._emit_segment(on_segment, capture.extract(segment_start, index + 1))
+        return capture.extract(utterance_start, index + 1)
 
     @staticmethod
-    def _save_wav(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> str | None:
+    def _emit_segment(on_segment: Callable[[np.ndarray], None], segment: np.ndarray) -> None:
         try:
-            fd, path = tempfile.mkstemp(suffix=".wav")
-            os.close(fd)
-            with wave.open(path, "wb") as wf:
-                wf.setnchannels(CHANNELS)
-                wf.setsampwidth(2)  # int16 = 2 bytes
-                wf.setframerate(sample_rate)
-                wf.writeframes(audio.tobytes())
-            return path
+            on_segment(segment)
         except Exception as e:
-            logger.error("Failed to save WAV: %s", e)
-            return None
+            logger.debug("Streaming segment callback failed: %s", e)
 
     # ── Transcription via Local Whisper ───────────────────────────────────
 
-    async def _transcribe(self, wav_path: str) -> str | None:
-        """Transcribe audio file via Local Whisper. Socket first, CLI fallback."""
-        try:
-            return await self._transcribe_socket(wav_path)
-        except Exception as e:
-            logger.debug("Socket transcription failed (%s), falling back to CLI", e)
-            return await self._transcribe_cli(wav_path)
-
-    async def _transcribe_socket(self, wav_path: str) -> str | None:
-        """Send audio to Local Whisper via its Unix command socket."""
-        if not SOCKET_PATH.exists():
-            raise FileNotFoundError(f"Socket not found: {SOCKET_PATH}")
-        reader, writer = await asyncio.open_unix_connection(str(SOCKET_PATH))
+    async def _transcribe(self, audio: np.ndarray) -> str | None:
+        """Transcribe captured PCM via Local Whisper. Socket first, CLI fallback."""
+        payload = AudioPayload.pcm(audio.astype(np.int16, copy=False).tobytes(), self._sample_rate, CHANNELS)
         try:
-            request = {"type": "transcribe", "path": wav_path, "raw": False}
-            writer.write((json.dumps(request) + "\n").encode())
-            await writer.drain()
-
-            while True:
-                line = await asyncio.wait_for(reader.readline(), timeout=30)
-                if not line:
-                    return None
-                msg = json.loads(line.decode())
-                if msg["type"] == "done":
-                    text = msg.get("text", "").strip()
-                    return text if text else None
-                elif msg["type"] == "error":
-                    raise RuntimeError(msg.get("message", "Transcription error"))
-                # "started" → keep waiting
-        finally:
-            writer.close()
-            await writer.wait_closed()
-
-    async def _transcribe_cli(self, wav_path: str) -> str | None:
-        """Fallback: transcribe via wh CLI subprocess."""
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                self._wh_bin, "transcribe", wav_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=30)
-            if proc.returncode != 0:
-                err = stderr.decode().strip() if stderr else ""
-                logger.debug("wh transcribe failed: %s", err)
-                return None
-            text = stdout.decode().strip()
-            return text if text else None
-        except asyncio.TimeoutError:
-            logger.debug("wh transcribe timed out")
+            text = await self._whisper.transcribe(payload)
+        except LocalWhisperError as e:
+            logger.debug("wh transcribe failed: %s", e)
             return None
         except Exception as e:
             logger.debug("wh transcribe error: %s", e)
             return None
+        return text or None
+
+
+class _StreamingTranscript:
+    """Transcribes streaming segments one at a time, in the order they were cut."""
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray], Awaitable[str | None]],
+        on_partial: Callable[[str], None] | None = None,
+    ):
+        self._transcribe = transcribe
+        self._on_partial = on_partial
+        self._queue: asyncio.Queue[np.ndarray | None] = asyncio.Queue()
+        self._parts: list[str] = []
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def text(self) -> str:
+        return " ".join(self._parts)
+
+    def add(self, segment: np.ndarray) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name="voice-streaming-transcript")
+        self._queue.put_nowait(segment)
+
+    async def finish(self) -> str | None:
+        """Wait for every queued segment and return the joined transcript."""
+        if self._worker is not None:
+            self._queue.put_nowait(None)
+            await self._worker
+        return self.text or None
+
+    async def cancel(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while (segment := await self._queue.get()) is not None:
+            try:
+                text = await self._transcribe(segment)
+            except Exception as e:
+                logger.debug("Streaming segment transcription failed: %s", e)
+                continue
+            if not text:
+                continue
+            self._parts.append(text)
+            if self._on_partial is not None:
+                try:
+                    self._on_partial(self.text)
+                except Exception as e:
+                    logger.debug("Partial transcript callback failed: %s", e)
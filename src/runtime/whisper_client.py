@@ -0,0 +1,665 @@
+"""
+Local Whisper Client
+
+Async client for Local Whisper's Unix command socket. One client per process
+(``shared_whisper_client``) serves microphone input, voice diagnostics and the
+Web UI. Audio goes over the socket inline: one JSON header line that names the
+format and the payload length in ``bytes``, then the payload itself. No
+temporary file is written.
+
+Each event loop keeps one connection open and reuses it. Requests are
+pipelined on it: a request is written as soon as it is ready, and replies are
+matched to requests in the order they were sent. When the connection drops,
+requests the server had not started yet are sent once more on a new
+connection. A server that closes the connection after every reply is detected
+and then gets one connection per request.
+
+A server that does not accept inline audio answers the header with an error
+(or closes the connection) before it reports ``started``. The client then
+remembers that and sends a path instead. On Linux the path points at an
+anonymous memory file (memfd) that the server opens through ``/proc``;
+elsewhere it is a temporary file that is removed after the reply. The same
+path is given to ``wh transcribe`` when the socket is unavailable.
+
+A circuit breaker picks between socket and CLI. After ``BREAKER_FAILURES``
+transport failures in a row the socket is skipped for
+``BREAKER_RESET_SECONDS``, then a single request tries it again. An error
+reply from the server is not a transport failure and is raised as is, so one
+bad recording does not send the next one to the CLI.
+
+Latency histograms per transport and error counts are written to
+``STATS_PATH``, where ``eyra doctor`` reads them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import wave
+import weakref
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = Path.home() / ".whisper" / "cmd.sock"
+STATS_PATH = Path.home() / ".local" / "share" / "eyra" / "local-whisper-stats.json"
+DEFAULT_TIMEOUT_SECONDS = 30.0
+PCM_FORMAT = "pcm_s16le"
+# Transport failures in a row that open the circuit, and how long it stays open.
+BREAKER_FAILURES = 3
+BREAKER_RESET_SECONDS = 30.0
+# Upper bounds, in seconds, of the latency histogram buckets; slower requests land in ``+Inf``.
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+# Minimum seconds between two writes of the stats file.
+STATS_SAVE_SECONDS = 10.0
+# Transcripts of long recordings can be far longer than asyncio's default 64 KiB line limit.
+_LINE_LIMIT = 16 * 1024 * 1024
+
+
+class LocalWhisperError(RuntimeError):
+    """Local Whisper could not transcribe the audio."""
+
+
+class _InlineRejected(Exception):
+    """The server refused an inline payload before starting to transcribe it."""
+
+
+class _ServerError(Exception):
+    """An ``error`` reply; ``started`` tells whether the server had begun transcribing."""
+
+    def __init__(self, message: str, started: bool):
+        super().__init__(message)
+        self.started = started
+
+
+class _ConnectionLost(Exception):
+    """The connection closed before the request was answered."""
+
+    def __init__(self, started: bool, fresh: bool):
+        super().__init__("Local Whisper closed the connection.")
+        self.started = started
+        # True when this was the first request on the connection.
+        self.fresh = fresh
+
+
+@dataclass(frozen=True)
+class AudioPayload:
+    data: bytes
+    # ``pcm_s16le`` for raw microphone samples, otherwise a container such as ``wav`` or ``webm``.
+    format: str
+    sample_rate: int = 0
+    channels: int = 0
+
+    @classmethod
+    def pcm(cls, samples: bytes, sample_rate: int, channels: int = 1) -> AudioPayload:
+        return cls(bytes(samples), PCM_FORMAT, sample_rate, channels)
+
+    @property
+    def suffix(self) -> str:
+        return ".wav" if self.format == PCM_FORMAT else f".{self.format}"
+
+    def file_bytes(self) -> bytes:
+        """The payload as a self-describing file; raw PCM gets a WAV header."""
+        if self.format == PCM_FORMAT:
+            return wav_bytes(self.data, self.sample_rate, self.channels)
+        return self.data
+
+    def header(self, *, raw: bool) -> dict:
+        header = {"type": "transcribe", "raw": raw, "format": self.format, "bytes": len(self.data)}
+        if self.format == PCM_FORMAT:
+            header.update(sample_rate=self.sample_rate, channels=self.channels)
+        return header
+
+
+def wav_bytes(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """16-bit PCM wrapped in an in-memory WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+@contextmanager
+def audio_file(payload: AudioPayload) -> Iterator[str]:
+    """A path another local process can read the payload from, valid inside the block."""
+    data = payload.file_bytes()
+    memfd_create = getattr(os, "memfd_create", None)
+    if memfd_create is not None and Path(f"/proc/{os.getpid()}/fd").is_dir():
+        fd = memfd_create("eyra-audio")
+        try:
+            _write_all(fd, data)
+            yield f"/proc/{os.getpid()}/fd/{fd}"
+        finally:
+            os.close(fd)
+        return
+    fd, path = tempfile.mkstemp(suffix=payload.suffix)
+    try:
+        _write_all(fd, data)
+        os.close(fd)
+        fd = -1
+        yield path
+    finally:
+        if fd >= 0:
+            os.close(fd)
+        with suppress(OSError):
+            os.unlink(path)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+class CircuitBreaker:
+    """Closed until ``failure_threshold`` failures in a row, then open for ``reset_seconds``."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURES,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        # True while the one request allowed through a half-open circuit is running.
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or self._clock() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether the next request may use the socket; a half-open circuit lets one through."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or self._clock() - self._opened_at < self.reset_seconds:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial = False
+
+    def release(self) -> None:
+        """End a trial that finished without a verdict, e.g. because it was cancelled."""
+        with self._lock:
+            self._trial = False
+
+
+class LatencyHistogram:
+    """Request latencies counted into fixed buckets."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if seconds <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        labels = [f"{bound:g}" for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "totalSeconds": round(self.total, 3),
+            "maxSeconds": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+def histogram_quantile(histogram: dict[str, Any], q: float) -> float | None:
+    """Upper bound of the bucket holding quantile ``q`` of a ``LatencyHistogram.to_dict``."""
+    count = int(histogram.get("count") or 0)
+    if count <= 0:
+        return None
+    target = max(1, round(q * count))
+    seen = 0
+    for label, bucket in histogram.get("buckets", {}).items():
+        seen += int(bucket)
+        if seen >= target:
+            return float(histogram.get("maxSeconds") or 0.0) if label == "+Inf" else float(label)
+    return float(histogram.get("maxSeconds") or 0.0)
+
+
+class WhisperStats:
+    """Latency per transport and error counts for one client, saved for ``eyra doctor``."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.latency = {"socket": LatencyHistogram(), "cli": LatencyHistogram()}
+        self.errors: Counter[str] = Counter()
+        self.reconnects = 0
+        self._saved_at = 0.0
+
+    @property
+    def empty(self) -> bool:
+        with self._lock:
+            return not self.errors and not any(histogram.count for histogram in self.latency.values())
+
+    def observe(self, transport: str, seconds: float) -> None:
+        with self._lock:
+            self.latency[transport].observe(seconds)
+
+    def error(self, kind: str) -> None:
+        with self._lock:
+            self.errors[kind] += 1
+
+    def reconnected(self) -> None:
+        with self._lock:
+            self.reconnects += 1
+
+    def snapshot(self, **extra: Any) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "updatedAt": time.time(),
+                "pid": os.getpid(),
+                "latency": {name: histogram.to_dict() for name, histogram in self.latency.items()},
+                "errors": dict(sorted(self.errors.items())),
+                "reconnects": self.reconnects,
+                **extra,
+            }
+
+    def save(self, snapshot: dict[str, Any], *, force: bool = False) -> None:
+        """Write ``snapshot`` to ``path``, at most every ``STATS_SAVE_SECONDS`` unless forced."""
+        if self.path is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._saved_at and now - self._saved_at < STATS_SAVE_SECONDS:
+                return
+            self._saved_at = now
+        partial = self.path.with_name(f".{self.path.name}.{os.getpid()}.partial")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial.write_text(json.dumps(snapshot, sort_keys=True))
+            os.replace(partial, self.path)
+        except OSError as e:
+            logger.debug("Could not save Local Whisper stats: %s", e)
+
+
+def load_stats(path: str | Path | None = None) -> dict[str, Any] | None:
+    """The last saved client stats, or None when no transcription has been recorded."""
+    try:
+        data = json.loads(Path(path or STATS_PATH).expanduser().read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def format_stats(stats: dict[str, Any]) -> str:
+    """One-line summary such as ``socket 12 requests, p50 ≤0.5 s, p95 ≤2 s; circuit closed``."""
+    parts = []
+    for transport, label in (("socket", "socket"), ("cli", "CLI")):
+        histogram = stats.get("latency", {}).get(transport, {})
+        count = int(histogram.get("count") or 0)
+        if not count:
+            continue
+        p50, p95 = histogram_quantile(histogram, 0.5), histogram_quantile(histogram, 0.95)
+        parts.append(f"{label} {count} request{'' if count == 1 else 's'}, p50 ≤{p50:g} s, p95 ≤{p95:g} s")
+    if not parts:
+        parts.append("no transcriptions yet")
+    errors = stats.get("errors") or {}
+    if errors:
+        parts.append("errors: " + ", ".join(f"{kind.replace('_', ' ')} {count}" for kind, count in errors.items()))
+    if stats.get("reconnects"):
+        parts.append(f"{stats['reconnects']} reconnect{'' if stats['reconnects'] == 1 else 's'}")
+    parts.append(f"circuit {str(stats.get('circuit', 'closed')).replace('_', '-')}")
+    return "; ".join(parts)
+
+
+class _Pending:
+    __slots__ = ("future", "started", "fresh")
+
+    def __init__(self, future: asyncio.Future, fresh: bool):
+        self.future = future
+        self.started = False
+        self.fresh = fresh
+
+
+class _Connection:
+    """One socket connection; replies are routed to requests in the order they were sent."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._pending: deque[_Pending] = deque()
+        self.sent = 0
+        self.answered = 0
+        self.closed = False
+        # True when the server, rather than this client, ended the connection.
+        self.server_closed = False
+        self._task = asyncio.get_running_loop().create_task(self._read(), name="eyra-local-whisper-reader")
+
+    @classmethod
+    async def open(cls, socket_path: Path) -> _Connection:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=_LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def request(self, header: dict, body: bytes, timeout: float) -> str:
+        if self.closed:
+            raise _ConnectionLost(started=False, fresh=False)
+        pending = _Pending(asyncio.get_running_loop().create_future(), fresh=self.sent == 0)
+        # Nobody awaits a request abandoned by a cancelled caller; keep its outcome from being logged.
+        pending.future.add_done_callback(_consume)
+        self.sent += 1
+        self._pending.append(pending)
+        self._writer.write((json.dumps(header) + "\n").encode())
+        if body:
+            self._writer.write(body)
+        try:
+            await self._writer.drain()
+            return await asyncio.wait_for(pending.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            # The server is stuck or far behind; later requests should not queue behind it.
+            self.close()
+            raise
+        except OSError:
+            self.close()
+            raise _ConnectionLost(pending.started, pending.fresh) from None
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._task.cancel()
+        self._fail_pending()
+        self._writer.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        with suppress(Exception):
+            await self._writer.wait_closed()
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line.decode())
+                if not self._pending:
+                    continue
+                head = self._pending[0]
+                kind = msg.get("type")
+                if kind == "started":
+                    head.started = True
+                elif kind in ("done", "error"):
+                    self._pending.popleft()
+                    self.answered += 1
+                    if head.future.done():
+                        continue
+                    if kind == "done":
+                        head.future.set_result(str(msg.get("text", "")).strip())
+                    else:
+                        head.future.set_exception(_ServerError(msg.get("message", "Transcription error"), head.started))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("Local Whisper connection failed: %s", e)
+        finally:
+            self.server_closed = not self.closed
+            self.closed = True
+            self._fail_pending()
+            self._writer.close()
+
+    def _fail_pending(self) -> None:
+        while self._pending:
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.set_exception(_ConnectionLost(pending.started, pending.fresh))
+
+
+def _consume(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class LocalWhisperClient:
+    """Transcribes audio through Local Whisper: socket first, ``wh transcribe`` fallback."""
+
+    def __init__(
+        self,
+        wh_bin: str | None = None,
+        *,
+        socket_path: str | Path | None = None,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        breaker: CircuitBreaker | None = None,
+        stats_path: str | Path | None = None,
+    ):
+        self.wh_bin = wh_bin
+        # None follows the module-level SOCKET_PATH.
+        self.socket_path = Path(socket_path) if socket_path is not None else None
+        self.timeout_seconds = timeout_seconds
+        # Whether the server takes inline audio; None until the first reply says.
+        self.inline: bool | None = None
+        # Set once the server has shown that it closes the connection after each reply.
+        self.single_shot = False
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = WhisperStats(Path(stats_path).expanduser() if stats_path is not None else None)
+        # Connections are bound to the event loop that opened them.
+        self._lock = threading.Lock()
+        self._connections: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[Path, _Connection]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._opening: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def transcribe(self, payload: AudioPayload, *, raw: bool = False, timeout: float | None = None) -> str:
+        """Transcript text, empty when no speech was found. Raises ``LocalWhisperError``."""
+        # With no CLI to fall back to, the socket is worth trying even while the circuit is open.
+        if not self.wh_bin or self.breaker.allow():
+            started = time.monotonic()
+            verdict = False
+            try:
+                text = await self.transcribe_socket(payload, raw=raw, timeout=timeout)
+            except LocalWhisperError:
+                # The server answered, so the socket works.
+                self.breaker.record_success()
+                verdict = True
+                self.stats.error("server_error")
+                self._save_stats()
+                raise
+            except (OSError, asyncio.TimeoutError, _ConnectionLost) as e:
+                self.breaker.record_failure()
+                verdict = True
+                self.stats.error(_error_kind(e))
+                self._save_stats()
+                if not self.wh_bin:
+                    raise LocalWhisperError("wh is not installed or not on PATH.") from e
+                logger.debug("Socket transcription failed (%s), falling back to CLI", e)
+            else:
+                self.breaker.record_success()
+                verdict = True
+                self.stats.observe("socket", time.monotonic() - started)
+                self._save_stats()
+                return text
+            finally:
+                if not verdict:
+                    self.breaker.release()
+        started = time.monotonic()
+        try:
+            text = await self.transcribe_cli(payload, raw=raw, timeout=timeout)
+        except LocalWhisperError:
+            self.stats.error("cli_error")
+            self._save_stats()
+            raise
+        self.stats.observe("cli", time.monotonic() - started)
+        self._save_stats()
+        return text
+
+    async def transcribe_socket(self, payload: AudioPayload, *, raw: bool = False, timeout: float | None = None) -> str:
+        socket_path = self.socket_path or SOCKET_PATH
+        if not socket_path.exists():
+            raise FileNotFoundError(f"Socket not found: {socket_path}")
+        timeout = timeout or self.timeout_seconds
+        if self.inline is not False:
+            try:
+                text = await self._send(socket_path, payload.header(raw=raw), payload.data, timeout)
+            except _InlineRejected:
+                logger.info("Local Whisper does not accept inline audio; sending a file path instead")
+                self.inline = False
+            else:
+                self.inline = True
+                return text
+        with audio_file(payload) as path:
+            return await self._send(socket_path, {"type": "transcribe", "path": path, "raw": raw}, b"", timeout)
+
+    async def transcribe_cli(self, payload: AudioPayload, *, raw: bool = False, timeout: float | None = None) -> str:
+        if not self.wh_bin:
+            raise LocalWhisperError("wh is not installed or not on PATH.")
+        with audio_file(payload) as path:
+            args = [self.wh_bin, "transcribe", path, *(["--raw"] if raw else [])]
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout or self.timeout_seconds)
+            except asyncio.TimeoutError:
+                with suppress(ProcessLookupError):
+                    proc.kill()
+                raise LocalWhisperError("wh transcribe timed out.") from None
+        if proc.returncode != 0:
+            message = (stderr or b"").decode().strip() or (stdout or b"").decode().strip()
+            raise LocalWhisperError(message or "transcription failed")
+        return (stdout or b"").decode().strip()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Stats as saved for ``eyra doctor``, with the current circuit state."""
+        return self.stats.snapshot(circuit=self.breaker.state, inline=self.inline, singleShot=self.single_shot)
+
+    async def aclose(self) -> None:
+        """Close this event loop's connection and save the stats."""
+        with self._lock:
+            entry = self._connections.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+        if not self.stats.empty:
+            self.stats.save(self.snapshot(), force=True)
+
+    def _save_stats(self) -> None:
+        if self.stats.path is not None:
+            self.stats.save(self.snapshot())
+
+    async def _send(self, socket_path: Path, header: dict, body: bytes, timeout: float) -> str:
+        # A request the server never started is safe to send again, once, on a new connection.
+        for attempt in range(2):
+            connection = await self._connection(socket_path)
+            try:
+                return await connection.request(header, body, timeout)
+            except _ServerError as e:
+                if body and not e.started and self.inline is None:
+                    # The server may read the payload that follows as further requests.
+                    connection.close()
+                    raise _InlineRejected(str(e)) from None
+                raise LocalWhisperError(str(e)) from None
+            except _ConnectionLost as e:
+                if body and e.fresh and not e.started and self.inline is None:
+                    raise _InlineRejected() from None
+                if e.started or e.fresh or attempt:
+                    raise
+                self._learn_single_shot(connection)
+            finally:
+                if self.single_shot:
+                    connection.close()
+        raise AssertionError("unreachable")
+
+    def _learn_single_shot(self, connection: _Connection) -> bool:
+        """True when ``connection`` was closed by the server right after its first reply."""
+        if not connection.server_closed or connection.answered != 1:
+            return False
+        if not self.single_shot:
+            logger.info("Local Whisper closes the connection after each reply; not reusing connections")
+            self.single_shot = True
+        return True
+
+    async def _connection(self, socket_path: Path) -> _Connection:
+        if self.single_shot:
+            return await _Connection.open(socket_path)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            opening = self._opening.setdefault(loop, asyncio.Lock())
+        async with opening:
+            with self._lock:
+                path, connection = self._connections.get(loop, (None, None))
+            if connection is not None and path == socket_path and not connection.closed:
+                return connection
+            if connection is not None:
+                connection.close()
+                if self._learn_single_shot(connection):
+                    return await _Connection.open(socket_path)
+                self.stats.reconnected()
+            connection = await _Connection.open(socket_path)
+            with self._lock:
+                self._connections[loop] = (socket_path, connection)
+            return connection
+
+
+def _error_kind(error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, _ConnectionLost):
+        return "connection_lost"
+    if isinstance(error, FileNotFoundError):
+        return "socket_missing"
+    return "connect_failed"
+
+
+_shared_client: LocalWhisperClient | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_whisper_client(wh_bin: str | None = None) -> LocalWhisperClient:
+    """The process-wide client; a resolved ``wh_bin`` replaces an unknown one."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = LocalWhisperClient(wh_bin, stats_path=STATS_PATH)
+        elif wh_bin and not _shared_client.wh_bin:
+            _shared_client.wh_bin = wh_bin
+        return _shared_client
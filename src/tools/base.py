@@ -21,6 +21,7 @@ class BaseTool(ABC):
     description: str
     parameters: dict  # JSON Schema for function parameters
     costly: bool = False  # If True, only available on Complex tier (e.g. screenshot sends an image)
+    max_concurrency: int = 0  # Parallel calls of this tool per model round; 0 means the round's limit
     tool_metadata: ToolMetadata | None = None
 
     @abstractmethod
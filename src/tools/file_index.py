@@ -0,0 +1,372 @@
+"""
+Local File Index
+
+An on-disk SQLite index of the files under FILESYSTEM_ALLOWED_PATHS. It keeps
+path, size, and mtime for every entry and the text of small non-binary files
+in an FTS5 trigram table, so literal substring searches and recent-file
+lookups answer from the index instead of walking and reading the tree.
+
+The index is kept current by mtime scans: a search rescans its root at most
+once every ``rescan_seconds`` and only re-reads files whose size or mtime
+changed. The first scan of a root reads every file, so ``search_files`` runs it
+in the background with ``scan_in_background`` and searches the tree directly
+until ``ready`` reports the root indexed. Files are walked and read outside
+the index lock; the lock is held only while rows are written. Folder listings
+rescan one directory only when its own mtime changed. Hidden entries and
+symlinks are skipped, like ``rg``. When SQLite lacks FTS5 the text is stored
+in a plain table and searched with ``instr``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAX_INDEXED_FILE_BYTES = 2_000_000
+_BINARY_SNIFF_BYTES = 8192
+# The trigram tokenizer can only match queries of at least three characters.
+_TRIGRAM_MIN_QUERY = 3
+
+
+@dataclass(frozen=True)
+class IndexedEntry:
+    path: Path
+    is_dir: bool
+    size: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class _Stat:
+    path: str
+    parent: str
+    name: str
+    is_dir: bool
+    size: int
+    mtime_ns: int
+
+
+def _subtree_bounds(root: Path) -> tuple[str, str]:
+    """Half-open string range covering every path strictly below ``root``."""
+    prefix = str(root).rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _read_text(path: str, size: int) -> str | None:
+    """Return the file's text, or None for binary, oversized, or unreadable files."""
+    if size > MAX_INDEXED_FILE_BYTES:
+        return None
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except OSError:
+        return None
+    if b"\0" in data[:_BINARY_SNIFF_BYTES]:
+        return None
+    return data.decode("utf-8", errors="ignore")
+
+
+class FileIndex:
+    """SQLite-backed index of local files for search and folder lookups."""
+
+    def __init__(self, path: str | Path, roots: tuple[Path, ...], *, rescan_seconds: float = 60.0):
+        self.path = Path(path).expanduser()
+        self.roots = tuple(Path(root).expanduser().resolve() for root in roots)
+        self.rescan_seconds = max(0.0, rescan_seconds)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with suppress(OSError):
+            self.path.chmod(0o600)
+        self._lock = threading.RLock()
+        self._scanned_at: dict[Path, float] = {}
+        # Roots with a background scan running; guarded by _lock.
+        self._scanning: set[Path] = set()
+        self.fts = False
+        self._migrate()
+
+    def covers(self, path: Path) -> bool:
+        return any(path == root or root in path.parents for root in self.roots)
+
+    def ready(self, root: Path) -> bool:
+        """Whether ``root`` has been scanned in full at least once."""
+        root = root.resolve()
+        with self._lock:
+            return any(root == scanned or scanned in root.parents for scanned in self._scanned_at)
+
+    def scan_in_background(self, root: Path) -> None:
+        """Start the first scan of the indexed root that covers ``root`` on a daemon thread."""
+        root = root.resolve()
+        target = next((indexed for indexed in self.roots if indexed == root or indexed in root.parents), root)
+        with self._lock:
+            if target in self._scanning:
+                return
+            self._scanning.add(target)
+        threading.Thread(target=self._background_refresh, args=(target,), name="eyra-file-index-scan", daemon=True).start()
+
+    def search(self, root: Path, query: str, limit: int) -> list[str]:
+        """Literal, case-sensitive line search under ``root``, formatted as ``path:line: text``."""
+        root = root.resolve()
+        self._ensure_fresh(root)
+        low, high = _subtree_bounds(root)
+        if self.fts and len(query) >= _TRIGRAM_MIN_QUERY:
+            # Trigram matching is case-insensitive; the line check below restores exact case.
+            sql = (
+                "SELECT e.path, t.body FROM entry_text t JOIN entries e ON e.id = t.rowid "
+                "WHERE entry_text MATCH ? AND e.path >= ? AND e.path < ? ORDER BY e.path"
+            )
+            params: tuple = ('"' + query.replace('"', '""') + '"', low, high)
+        else:
+            sql = (
+                "SELECT e.path, t.body FROM entry_text t JOIN entries e ON e.id = t.rowid "
+                "WHERE instr(t.body, ?) > 0 AND e.path >= ? AND e.path < ? ORDER BY e.path"
+            )
+            params = (query, low, high)
+        matches: list[str] = []
+        with self._lock:
+            for path, body in self._conn.execute(sql, params):
+                for number, line in enumerate(body.splitlines(), 1):
+                    if query in line:
+                        matches.append(f"{path}:{number}: {line}")
+                        if len(matches) >= limit:
+                            return matches
+        return matches
+
+    def list_folder(self, folder: Path) -> list[IndexedEntry] | None:
+        """Direct children of ``folder``, or None when the folder is not indexed or missing.
+
+        The folder is rescanned only when its own mtime changed, which covers
+        files being added, removed, or renamed in it.
+        """
+        folder = folder.expanduser().resolve()
+        if not self.covers(folder):
+            return None
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns FROM folders WHERE path = ?", (str(folder),)).fetchone()
+        if row is None or row[0] != mtime_ns:
+            self._scan(folder, recursive=False)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, is_dir, size, mtime_ns FROM entries WHERE parent = ?",
+                (str(folder),),
+            ).fetchall()
+        return [IndexedEntry(Path(path), bool(is_dir), size, mtime) for path, is_dir, size, mtime in rows]
+
+    def recent_files(self, folder: Path, limit: int = 10) -> list[IndexedEntry] | None:
+        """Files directly in ``folder``, newest first."""
+        entries = self.list_folder(folder)
+        if entries is None:
+            return None
+        files = [entry for entry in entries if not entry.is_dir]
+        files.sort(key=lambda entry: (entry.mtime_ns, entry.path.name.lower()), reverse=True)
+        return files[:limit]
+
+    def refresh(self, root: Path | None = None) -> dict[str, int]:
+        """Rescan ``root`` (or every indexed root) now and return change counts."""
+        totals = {"scanned": 0, "updated": 0, "removed": 0}
+        for target in (root.resolve(),) if root else self.roots:
+            if not target.is_dir():
+                continue
+            started = time.monotonic()
+            stats = self._scan(target, recursive=True)
+            with self._lock:
+                self._scanned_at[target] = started
+            for key, value in stats.items():
+                totals[key] += value
+        return totals
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _background_refresh(self, root: Path) -> None:
+        try:
+            stats = self.refresh(root)
+            logger.info("File index scanned %s: %d entries", root, stats["scanned"])
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("File index scan of %s failed: %s", root, e)
+        finally:
+            with self._lock:
+                self._scanning.discard(root)
+
+    def _ensure_fresh(self, root: Path) -> None:
+        now = time.monotonic()
+        with self._lock:
+            scanned_at = list(self._scanned_at.items())
+        for scanned, at in scanned_at:
+            if (root == scanned or scanned in root.parents) and now - at < self.rescan_seconds:
+                return
+        self.refresh(root)
+
+    def _scan(self, root: Path, *, recursive: bool) -> dict[str, int]:
+        seen: list[_Stat] = []
+        folders: list[tuple[str, int]] = []
+        pending = [str(root)]
+        while pending:
+            directory = pending.pop()
+            try:
+                folders.append((directory, os.stat(directory).st_mtime_ns))
+                with os.scandir(directory) as children:
+                    for child in children:
+                        if child.name.startswith(".") or child.is_symlink():
+                            continue
+                        try:
+                            stat = child.stat(follow_symlinks=False)
+                            is_dir = child.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        seen.append(_Stat(child.path, directory, child.name, is_dir, stat.st_size, stat.st_mtime_ns))
+                        if is_dir and recursive:
+                            pending.append(child.path)
+            except OSError as e:
+                logger.debug("File index skipped %s: %s", directory, e)
+        with self._lock:
+            known = self._known(root, recursive=recursive)
+        # Read new and changed files before taking the lock for the writes.
+        texts = {
+            entry.path: _read_text(entry.path, entry.size)
+            for entry in seen
+            if not entry.is_dir and known.get(entry.path, (None,))[1:] != (entry.size, entry.mtime_ns)
+        }
+        with self._lock:
+            return self._apply(root, seen, folders, texts, recursive=recursive)
+
+    def _known(self, root: Path, *, recursive: bool) -> dict[str, tuple[int, int, int]]:
+        """Indexed ``path -> (id, size, mtime_ns)`` under ``root``, or directly in it."""
+        low, high = _subtree_bounds(root)
+        if recursive:
+            rows = self._conn.execute(
+                "SELECT id, path, size, mtime_ns FROM entries WHERE path >= ? AND path < ?",
+                (low, high),
+            )
+        else:
+            rows = self._conn.execute("SELECT id, path, size, mtime_ns FROM entries WHERE parent = ?", (str(root),))
+        return {path: (entry_id, size, mtime) for entry_id, path, size, mtime in rows}
+
+    def _apply(
+        self,
+        root: Path,
+        seen: list[_Stat],
+        folders: list[tuple[str, int]],
+        texts: dict[str, str | None],
+        *,
+        recursive: bool,
+    ) -> dict[str, int]:
+        # Read again under the lock, in case another scan wrote rows since the texts were read.
+        known = self._known(root, recursive=recursive)
+        updated = 0
+        with self._conn:
+            for entry in seen:
+                previous = known.pop(entry.path, None)
+                if previous is not None and previous[1:] == (entry.size, entry.mtime_ns):
+                    continue
+                updated += 1
+                self._upsert(entry, previous[0] if previous else None, texts)
+            for path, (entry_id, _size, _mtime) in known.items():
+                self._remove(path, entry_id)
+            self._conn.executemany(
+                "INSERT INTO folders (path, mtime_ns) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+                folders,
+            )
+        return {"scanned": len(seen), "updated": updated, "removed": len(known)}
+
+    def _upsert(self, entry: _Stat, entry_id: int | None, texts: dict[str, str | None]) -> None:
+        values = (entry.parent, entry.name, int(entry.is_dir), entry.size, entry.mtime_ns)
+        if entry_id is None:
+            cursor = self._conn.execute(
+                "INSERT INTO entries (path, parent, name, is_dir, size, mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                (entry.path, *values),
+            )
+            entry_id = cursor.lastrowid
+        else:
+            self._conn.execute(
+                "UPDATE entries SET parent = ?, name = ?, is_dir = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                (*values, entry_id),
+            )
+            self._conn.execute("DELETE FROM entry_text WHERE rowid = ?", (entry_id,))
+        if entry.is_dir:
+            text = None
+        elif entry.path in texts:
+            text = texts[entry.path]
+        else:
+            text = _read_text(entry.path, entry.size)
+        if text:
+            self._conn.execute("INSERT INTO entry_text (rowid, body) VALUES (?, ?)", (entry_id, text))
+
+    def _remove(self, path: str, entry_id: int) -> None:
+        self._conn.execute("DELETE FROM entry_text WHERE rowid = ?", (entry_id,))
+        self._conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+        # A removed directory takes its indexed subtree with it.
+        low, high = _subtree_bounds(Path(path))
+        self._conn.execute(
+            "DELETE FROM entry_text WHERE rowid IN (SELECT id FROM entries WHERE path >= ? AND path < ?)",
+            (low, high),
+        )
+        self._conn.execute("DELETE FROM entries WHERE path >= ? AND path < ?", (low, high))
+        self._conn.execute("DELETE FROM folders WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+
+    def _migrate(self) -> None:
+        with self._lock:
+            self._conn.executescript(
+                """
+                PRAGMA journal_mode = WAL;
+                PRAGMA busy_timeout = 30000;
+                PRAGMA user_version = 1;
+
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    is_dir INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_entries_parent ON entries(parent);
+
+                CREATE TABLE IF NOT EXISTS folders (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL
+                );
+                """
+            )
+            try:
+                self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS entry_text USING fts5(body, tokenize='trigram')")
+                self.fts = True
+            except sqlite3.OperationalError:
+                logger.info("SQLite FTS5 trigram tokenizer unavailable; file index search will scan stored text")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS entry_text (rowid INTEGER PRIMARY KEY, body TEXT NOT NULL)")
+            self._conn.commit()
+
+
+_INDEXES: dict[tuple[Path, tuple[Path, ...]], FileIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def open_file_index(path: str | Path, roots: tuple[Path, ...], *, rescan_seconds: float = 60.0) -> FileIndex:
+    """Return the process-wide index for ``path`` and ``roots``, creating it on first use.
+
+    Registries with different allowed roots get separate indexes over the same
+    database file. None is closed while the process runs, since a registry
+    built earlier may still be searching it.
+    """
+    resolved = Path(path).expanduser().resolve()
+    key = (resolved, tuple(Path(root).expanduser().resolve() for root in roots))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = FileIndex(resolved, roots, rescan_seconds=rescan_seconds)
+        return index
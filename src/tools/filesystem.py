@@ -4,9 +4,14 @@ import asyncio
 import difflib
 import hashlib
 import logging
+import mmap
 import shutil
+import threading
 import uuid
 import zipfile
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 from pathlib import Path
 
 from tools.approval import GLOBAL_APPROVAL_MANAGER, ApprovalManager, approval_required_message
@@ -81,12 +86,84 @@ def _approval_or_result(
     return ToolResult(content=approval_required_message(approval))
 
 
+class _LineIndex:
+    """Sparse line index: the newline count before each fixed-size block of a file.
+
+    Finding the start of line N bisects to its block and scans at most one
+    block, so seeking costs the same anywhere in the file.
+    """
+
+    BLOCK = 64 * 1024
+
+    def __init__(self, mm: mmap.mmap, size: int):
+        self.lines_before = array("Q")
+        newlines = 0
+        for start in range(0, size, self.BLOCK):
+            self.lines_before.append(newlines)
+            newlines += mm[start : start + self.BLOCK].count(b"\n")
+        ends_open = size > 0 and mm[size - 1 : size] != b"\n"
+        self.total_lines = newlines + (1 if ends_open else 0)
+
+    def line_start(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset where 1-based ``line`` starts."""
+        skip = line - 1
+        if skip <= 0:
+            return 0
+        block = max(0, bisect_left(self.lines_before, skip) - 1)
+        position = block * self.BLOCK
+        for _ in range(skip - self.lines_before[block]):
+            position = mm.find(b"\n", position) + 1
+        return position
+
+
+_LINE_INDEX_CACHE: OrderedDict[tuple[str, int, int], _LineIndex] = OrderedDict()
+_LINE_INDEX_CACHE_SIZE = 16
+_LINE_INDEX_LOCK = threading.Lock()
+
+
+def _line_index(path: Path, stat, mm: mmap.mmap) -> _LineIndex:
+    """Line index for ``path``, cached per (path, mtime, size)."""
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _LINE_INDEX_LOCK:
+        index = _LINE_INDEX_CACHE.get(key)
+        if index is not None:
+            _LINE_INDEX_CACHE.move_to_end(key)
+            return index
+    index = _LineIndex(mm, stat.st_size)
+    with _LINE_INDEX_LOCK:
+        _LINE_INDEX_CACHE[key] = index
+        while len(_LINE_INDEX_CACHE) > _LINE_INDEX_CACHE_SIZE:
+            _LINE_INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def _decode_slice(data: bytes, cut_start: bool, cut_end: bool) -> str | None:
+    """Decode UTF-8 text, allowing a character split by a range boundary; None means binary."""
+    if b"\x00" in data:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    if cut_start:
+        # Skip continuation bytes left over from a character that started before the range.
+        data = data[next((i for i, byte in enumerate(data[:3]) if byte & 0xC0 != 0x80), 0) :]
+    for trim in range(4 if cut_end else 1):
+        try:
+            return data[: len(data) - trim].decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
 class ReadFileTool(BaseTool):
     name = "read_file"
     description = (
         "Read the text content of a file on the user's computer. "
         "Call this when the user asks to open, view, or inspect a file. "
-        'Example: {"path": "~/notes.txt"}'
+        "Returns at most 64KB; for larger files read a byte range (offset/length), "
+        "a line range (start_line/end_line), or the last lines (tail_lines). "
+        'Example: {"path": "~/notes.txt"} or {"path": "/tmp/app.log", "tail_lines": 100}'
     )
     parameters = {
         "type": "object",
@@ -95,6 +172,11 @@ class ReadFileTool(BaseTool):
                 "type": "string",
                 "description": "Absolute or ~ path to the file. Example: '~/notes.txt', '/tmp/data.csv'.",
             },
+            "offset": {"type": "integer", "minimum": 0, "description": "Byte offset to start reading at."},
+            "length": {"type": "integer", "minimum": 1, "description": "Bytes to read from offset (max 64000)."},
+            "start_line": {"type": "integer", "minimum": 1, "description": "First line to read, 1-based."},
+            "end_line": {"type": "integer", "minimum": 1, "description": "Last line to read, inclusive."},
+            "tail_lines": {"type": "integer", "minimum": 1, "description": "Read the last N lines."},
         },
         "required": ["path"],
     }
@@ -104,33 +186,118 @@ class ReadFileTool(BaseTool):
         self._roots = allowed_roots or _DEFAULT_ALLOWED_ROOTS
         self._default_path = default_path.expanduser().resolve() if default_path else None
 
-    async def execute(self, path: str = "", **_) -> ToolResult:
+    async def execute(
+        self,
+        path: str = "",
+        offset: int | None = None,
+        length: int | None = None,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        tail_lines: int | None = None,
+        **_,
+    ) -> ToolResult:
         try:
-            return await asyncio.to_thread(self._run, path)
+            return await asyncio.to_thread(
+                self._run,
+                path,
+                offset=offset,
+                length=length,
+                start_line=start_line,
+                end_line=end_line,
+                tail_lines=tail_lines,
+            )
         except PermissionError as e:
             return ToolResult(content=str(e))
         except Exception as e:
             logger.error("read_file failed: %s", e, exc_info=True)
             return ToolResult(content=f"Filesystem error: {e}")
 
-    def _run(self, path: str) -> ToolResult:
+    def _run(
+        self,
+        path: str,
+        *,
+        offset: int | None = None,
+        length: int | None = None,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        tail_lines: int | None = None,
+    ) -> ToolResult:
         p = _resolve(path, self._roots, self._default_path)
         if not p.is_file():
             return ToolResult(content=f"Not a file: {p}")
-        size = p.stat().st_size
-        truncated = size > _MAX_READ_BYTES
-        with open(p, "rb") as f:
-            data = f.read(_MAX_READ_BYTES)
-        if b"\x00" in data:
-            return ToolResult(content=f"Cannot read {p.name}: file appears to be binary, not text.")
-        try:
-            text = data.decode("utf-8")
-        except UnicodeDecodeError:
-            return ToolResult(content=f"Cannot read {p.name}: file appears to be binary, not text.")
+        stat = p.stat()
+        size = stat.st_size
         header = f"File: {p} ({_human_size(size)})"
-        if truncated:
-            header += f" (showing first {_MAX_READ_BYTES // 1000}KB)"
-        return ToolResult(content=f"{header}\n\n{text}")
+        ranged = any(value is not None for value in (offset, length, start_line, end_line, tail_lines))
+        if not ranged or size == 0:
+            with open(p, "rb") as f:
+                data = f.read(_MAX_READ_BYTES)
+            text = _decode_slice(data, False, size > _MAX_READ_BYTES)
+            if text is None:
+                return ToolResult(content=f"Cannot read {p.name}: file appears to be binary, not text.")
+            if size > _MAX_READ_BYTES:
+                header += f" (showing first {_MAX_READ_BYTES // 1000}KB)"
+            return ToolResult(content=f"{header}\n\n{text}")
+
+        with open(p, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if b"\x00" in mm[: min(size, 8192)]:
+                return ToolResult(content=f"Cannot read {p.name}: file appears to be binary, not text.")
+            if tail_lines is not None:
+                start, end, label = self._tail_range(mm, size, max(1, int(tail_lines)))
+            elif start_line is not None or end_line is not None:
+                start, end, label = self._line_range(p, stat, mm, start_line, end_line)
+            else:
+                start = min(max(0, int(offset or 0)), size)
+                end = min(size, start + max(1, int(length or _MAX_READ_BYTES)))
+                label = None
+            clipped = end - start > _MAX_READ_BYTES
+            if clipped and tail_lines is not None:
+                # A tail keeps the end of the file, starting at the first whole line that fits.
+                start = end - _MAX_READ_BYTES
+                newline = mm.find(b"\n", start, end)
+                if newline != -1 and newline + 1 < end:
+                    start = newline + 1
+            else:
+                end = min(end, start + _MAX_READ_BYTES)
+            data = mm[start:end]
+            if clipped and tail_lines is not None:
+                shown = data.count(b"\n") + (not data.endswith(b"\n"))
+                label = f"last {shown} lines"
+        text = _decode_slice(data, start > 0, end < size)
+        if text is None:
+            return ToolResult(content=f"Cannot read {p.name}: file appears to be binary, not text.")
+        header += f" (showing {label or f'bytes {start}-{end} of {size}'}"
+        if clipped and tail_lines is not None:
+            header += f", clipped to the last {_MAX_READ_BYTES // 1000}KB"
+        elif clipped:
+            header += f", clipped to {_MAX_READ_BYTES // 1000}KB"
+        return ToolResult(content=f"{header})\n\n{text}")
+
+    @staticmethod
+    def _tail_range(mm: mmap.mmap, size: int, lines: int) -> tuple[int, int, str]:
+        position = size - 1 if mm[size - 1 : size] == b"\n" else size
+        for _ in range(lines):
+            position = mm.rfind(b"\n", 0, position)
+            if position == -1:
+                break
+        return position + 1, size, f"last {lines} lines"
+
+    @staticmethod
+    def _line_range(
+        p: Path,
+        stat,
+        mm: mmap.mmap,
+        start_line: int | None,
+        end_line: int | None,
+    ) -> tuple[int, int, str]:
+        index = _line_index(p, stat, mm)
+        first = max(1, int(start_line or 1))
+        last = min(index.total_lines, int(end_line) if end_line is not None else index.total_lines)
+        if first > last:
+            return 0, 0, f"lines {first}-{first - 1} of {index.total_lines}"
+        start = index.line_start(mm, first)
+        end = index.line_start(mm, last + 1) if last < index.total_lines else stat.st_size
+        return start, end, f"lines {first}-{last} of {index.total_lines}"
 
 
 class WriteFileTool(BaseTool):
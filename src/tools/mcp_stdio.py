@@ -1,17 +1,22 @@
 """Minimal stdio MCP bridge for opt-in local tool servers."""
 
 import asyncio
-import contextlib
 import json
 from pathlib import Path
 from typing import Any
 
+from runtime.mcp_session import McpSessionPool, StdioMcpSession, server_key
 from tools.approval import GLOBAL_APPROVAL_MANAGER, ApprovalManager, approval_required_message
 from tools.base import BaseTool, ToolResult
 
 _DEFAULT_TIMEOUT = 20
+_DEFAULT_KEEPALIVE_SECONDS = 120
+_DEFAULT_MAX_IN_FLIGHT = 4
 _OUTPUT_LIMIT = 4000
 
+# Pooled MCP servers per event loop, keyed by server name and launch config.
+_SESSIONS: "McpSessionPool[_McpSession]" = McpSessionPool()
+
 
 def _clip(text: str, limit: int = _OUTPUT_LIMIT) -> str:
     if len(text) <= limit:
@@ -28,113 +33,61 @@ def _load_config(path: Path) -> dict[str, Any]:
     return data
 
 
-class _McpSession:
-    def __init__(self, server: dict[str, Any], timeout: int = _DEFAULT_TIMEOUT):
-        self.server = server
-        self.timeout = timeout
-        self.proc: asyncio.subprocess.Process | None = None
-        self._next_id = 1
-
-    async def __aenter__(self):
-        command = self.server.get("command")
-        args = self.server.get("args", [])
-        if not command:
-            raise ValueError("MCP server command is missing.")
-        env = None
-        if self.server.get("env"):
-            import os
-
-            env = {**os.environ, **{str(k): str(v) for k, v in self.server["env"].items()}}
-        try:
-            self.proc = await asyncio.create_subprocess_exec(
-                str(command),
-                *[str(arg) for arg in args],
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
-            )
-            await self.request(
-                "initialize",
-                {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {"name": "eyra", "version": "1"},
-                },
-            )
-            await self.notify("notifications/initialized", {})
-            return self
-        except Exception:
-            await self._close_process()
-            raise
-
-    async def __aexit__(self, *_):
-        await self._close_process()
-
-    async def _close_process(self) -> None:
-        proc = self.proc
-        if proc is None:
-            return
-        if proc.stdin is not None:
-            with contextlib.suppress(Exception):
-                proc.stdin.close()
-            with contextlib.suppress(Exception):
-                await proc.stdin.wait_closed()
-        if proc.returncode is None:
-            try:
-                await asyncio.wait_for(proc.wait(), timeout=0.2)
-            except asyncio.TimeoutError:
-                proc.terminate()
-                try:
-                    await asyncio.wait_for(proc.wait(), timeout=2)
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    await proc.wait()
-        self.proc = None
-
-    async def notify(self, method: str, params: dict[str, Any]) -> None:
-        await self._write({"jsonrpc": "2.0", "method": method, "params": params})
-
-    async def request(self, method: str, params: dict[str, Any] | None = None) -> Any:
-        msg_id = self._next_id
-        self._next_id += 1
-        await self._write({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params or {}})
-        while True:
-            response = await asyncio.wait_for(self._read(), timeout=self.timeout)
-            if response.get("id") != msg_id:
-                continue
-            if "error" in response:
-                raise RuntimeError(json.dumps(response["error"]))
-            return response.get("result")
-
-    async def _write(self, payload: dict[str, Any]) -> None:
-        if not self.proc or not self.proc.stdin:
-            raise RuntimeError("MCP process is not running.")
-        raw = json.dumps(payload, separators=(",", ":")).encode()
-        self.proc.stdin.write(f"Content-Length: {len(raw)}\r\n\r\n".encode() + raw)
-        await self.proc.stdin.drain()
-
-    async def _read(self) -> dict[str, Any]:
-        if not self.proc or not self.proc.stdout:
-            raise RuntimeError("MCP process is not running.")
-        headers: dict[str, str] = {}
-        while True:
-            line = await self.proc.stdout.readline()
-            if not line:
-                stderr = ""
-                if self.proc.stderr:
-                    try:
-                        stderr = (await asyncio.wait_for(self.proc.stderr.read(), timeout=0.1)).decode(errors="replace")
-                    except asyncio.TimeoutError:
-                        pass
-                raise RuntimeError(f"MCP server exited before responding. {stderr}".strip())
-            if line in (b"\r\n", b"\n"):
-                break
-            key, value = line.decode().split(":", 1)
-            headers[key.lower()] = value.strip()
-        length = int(headers.get("content-length", "0"))
-        body = await self.proc.stdout.readexactly(length)
-        return json.loads(body)
+class _McpSession(StdioMcpSession):
+    """Shared tool server session that caches ``tools/list``.
+
+    The cached result is kept until the server sends
+    ``notifications/tools/list_changed`` or its process goes away.
+    """
+
+    def __init__(
+        self,
+        server: dict[str, Any],
+        timeout: int | float = _DEFAULT_TIMEOUT,
+        keepalive_seconds: float = _DEFAULT_KEEPALIVE_SECONDS,
+        max_in_flight: int = _DEFAULT_MAX_IN_FLIGHT,
+    ):
+        super().__init__(server, timeout=timeout, idle_seconds=keepalive_seconds, max_in_flight=max_in_flight)
+        self.tools_list_refreshes = 0
+        self._tools: dict[str, Any] | None = None
+
+    async def list_tools(self, *, timeout: int | float | None = None) -> dict[str, Any]:
+        if self._tools is None or not self._is_running():
+            result = await self.request("tools/list", timeout=timeout)
+            self._tools = result if isinstance(result, dict) else {"tools": []}
+            self.tools_list_refreshes += 1
+        return self._tools
+
+    def _notification(self, method: str, params: dict[str, Any]) -> None:
+        if method == "notifications/tools/list_changed":
+            self._tools = None
+
+    def _process_closed(self) -> None:
+        self._tools = None
+
+
+async def _shared_session(
+    name: str,
+    server: dict[str, Any],
+    *,
+    timeout: int | float,
+    keepalive_seconds: float,
+    max_in_flight: int,
+) -> _McpSession:
+    session = await _SESSIONS.session(
+        (name, *server_key(server)),
+        lambda: _McpSession(server, timeout=timeout, keepalive_seconds=keepalive_seconds, max_in_flight=max_in_flight),
+        # A changed config for the same server name replaces the old process.
+        replaces=lambda key: key[0] == name,
+    )
+    session.timeout = timeout
+    session.idle_seconds = keepalive_seconds
+    return session
+
+
+async def close_mcp_sessions() -> None:
+    """Stop every pooled MCP server started on the running event loop."""
+    await _SESSIONS.close()
 
 
 class ListMcpTools(BaseTool):
@@ -147,15 +100,22 @@ class ListMcpTools(BaseTool):
     }
     costly = True
 
-    def __init__(self, config_path: str | Path, timeout: int | float = _DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        config_path: str | Path,
+        timeout: int | float = _DEFAULT_TIMEOUT,
+        keepalive_seconds: float = _DEFAULT_KEEPALIVE_SECONDS,
+        max_in_flight: int = _DEFAULT_MAX_IN_FLIGHT,
+    ):
         self.config_path = Path(config_path).expanduser()
         self.timeout = timeout
+        self.keepalive_seconds = keepalive_seconds
+        self.max_in_flight = max_in_flight
 
     async def execute(self, server: str = "", **_) -> ToolResult:
         try:
-            server_config = self._server_config(server)
-            async with _McpSession(server_config, timeout=self.timeout) as session:
-                result = await session.request("tools/list")
+            session = await self._session(server)
+            result = await session.list_tools(timeout=self.timeout)
         except asyncio.TimeoutError:
             return ToolResult(content="MCP error: server timed out.")
         except Exception as e:
@@ -169,6 +129,15 @@ class ListMcpTools(BaseTool):
             raise ValueError(f"MCP server is not configured: {server}")
         return servers[server]
 
+    async def _session(self, server: str) -> _McpSession:
+        return await _shared_session(
+            server,
+            self._server_config(server),
+            timeout=self.timeout,
+            keepalive_seconds=self.keepalive_seconds,
+            max_in_flight=self.max_in_flight,
+        )
+
 
 class CallMcpTool(ListMcpTools):
     name = "call_mcp_tool"
@@ -191,8 +160,15 @@ class CallMcpTool(ListMcpTools):
         config_path: str | Path,
         timeout: int | float = _DEFAULT_TIMEOUT,
         approval_manager: ApprovalManager | None = None,
+        keepalive_seconds: float = _DEFAULT_KEEPALIVE_SECONDS,
+        max_in_flight: int = _DEFAULT_MAX_IN_FLIGHT,
     ):
-        super().__init__(config_path=config_path, timeout=timeout)
+        super().__init__(
+            config_path=config_path,
+            timeout=timeout,
+            keepalive_seconds=keepalive_seconds,
+            max_in_flight=max_in_flight,
+        )
         self._approvals = approval_manager or GLOBAL_APPROVAL_MANAGER
 
     async def execute(
@@ -209,9 +185,12 @@ class CallMcpTool(ListMcpTools):
             approval = self._approvals.request(self.name, "MCP tool call", details)
             return ToolResult(content=approval_required_message(approval))
         try:
-            server_config = self._server_config(server)
-            async with _McpSession(server_config, timeout=self.timeout) as session:
-                result = await session.request("tools/call", {"name": tool, "arguments": arguments or {}})
+            session = await self._session(server)
+            result = await session.request(
+                "tools/call",
+                {"name": tool, "arguments": arguments or {}},
+                timeout=self.timeout,
+            )
         except asyncio.TimeoutError:
             return ToolResult(content="MCP error: server timed out.")
         except Exception as e:
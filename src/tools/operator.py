@@ -18,7 +18,10 @@ from runtime.capabilities import build_capability_snapshot
 from runtime.external_agents import AgentAdapterRegistry, AgentJobSpec
 from tools.approval import GLOBAL_APPROVAL_MANAGER, ApprovalManager, approval_required_message
 from tools.base import BaseTool, ToolResult
+from tools.file_index import FileIndex
 from tools.filesystem import _resolve
+from tools.text_search import search_text
+from utils.redaction import Redactor, bearer_rule, openai_key_rule, secret_assignment_rule
 from utils.settings import Settings
 
 _MAX_OUTPUT = 12_000
@@ -42,6 +45,11 @@ _DANGEROUS_TOKENS = {
     "shutdown",
     "reboot",
 }
+_OUTPUT_REDACTOR = Redactor((
+    openai_key_rule(20, "[redacted]", ignore_case=True),
+    secret_assignment_rule(r"[A-Za-z0-9_\-./+=]{8,}", "{1}{2}[redacted]"),
+    bearer_rule(16, "[redacted]", ignore_case=True),
+))
 
 
 def _clip(text: str, limit: int = _MAX_OUTPUT) -> str:
@@ -59,15 +67,7 @@ def _json(data: object) -> ToolResult:
 
 
 def _redact(text: str) -> str:
-    patterns = [
-        r"sk-[A-Za-z0-9_\-]{20,}",
-        r"(api[_-]?key|token|secret|password)([\"'\s:=]+)[A-Za-z0-9_\-./+=]{8,}",
-        r"Bearer\s+[A-Za-z0-9_\-./+=]{16,}",
-    ]
-    redacted = text
-    for pattern in patterns:
-        redacted = re.sub(pattern, lambda m: m.group(1) + m.group(2) + "[redacted]" if m.lastindex else "[redacted]", redacted, flags=re.I)
-    return redacted
+    return _OUTPUT_REDACTOR.redact(text)
 
 
 def _redact_path_for_approval(path: Path) -> str:
@@ -335,7 +335,10 @@ class FileInfoTool(BaseTool):
 
 class SearchFilesTool(BaseTool):
     name = "search_files"
-    description = "Search text files under an allowed root. Uses rg when available, with a Python fallback."
+    description = (
+        "Search text files under an allowed root. Uses the local file index when enabled, "
+        "otherwise rg when available, with a Python fallback."
+    )
     parameters = {
         "type": "object",
         "properties": {
@@ -345,10 +348,20 @@ class SearchFilesTool(BaseTool):
         },
         "required": ["query"],
     }
+    max_concurrency = 1
 
-    def __init__(self, allowed_roots: tuple[Path, ...], default_path: Path):
+    def __init__(
+        self,
+        allowed_roots: tuple[Path, ...],
+        default_path: Path,
+        file_index: FileIndex | None = None,
+        deadline_seconds: float = 24.0,
+    ):
         self._roots = tuple(_as_default_path(root) for root in allowed_roots)
         self._default_path = _as_default_path(default_path)
+        self._file_index = file_index
+        # The Python fallback stops here and returns partial results, ahead of the tool timeout.
+        self._deadline_seconds = deadline_seconds
 
     async def execute(self, root: str = "", query: str = "", limit: int = 50, **_) -> ToolResult:
         if not query:
@@ -360,10 +373,19 @@ class SearchFilesTool(BaseTool):
         if not search_root.is_dir():
             return ToolResult(content=f"Not a directory: {search_root}")
         limit = max(1, min(int(limit or 50), 200))
+        if self._file_index is not None and self._file_index.covers(search_root):
+            if self._file_index.ready(search_root):
+                return await asyncio.to_thread(self._index_search, search_root, query, limit)
+            # The first scan reads every file; search the tree directly until it finishes.
+            self._file_index.scan_in_background(search_root)
         if shutil.which("rg"):
             return await asyncio.to_thread(self._rg, search_root, query, limit)
         return await asyncio.to_thread(self._python_search, search_root, query, limit)
 
+    def _index_search(self, root: Path, query: str, limit: int) -> ToolResult:
+        matches = self._file_index.search(root, query, limit)
+        return ToolResult(content=_clip("\n".join(matches)) if matches else "No matches.")
+
     def _rg(self, root: Path, query: str, limit: int) -> ToolResult:
         completed = subprocess.run(
             ["rg", "--fixed-strings", "--line-number", "--max-count", str(limit), query, str(root)],
@@ -376,22 +398,11 @@ class SearchFilesTool(BaseTool):
         return ToolResult(content=_clip(completed.stdout.strip() or "No matches."))
 
     def _python_search(self, root: Path, query: str, limit: int) -> ToolResult:
-        matches: list[str] = []
-        for path in root.rglob("*"):
-            if len(matches) >= limit:
-                break
-            if not path.is_file():
-                continue
-            try:
-                text = path.read_text(errors="ignore")
-            except OSError:
-                continue
-            for idx, line in enumerate(text.splitlines(), 1):
-                if query in line:
-                    matches.append(f"{path}:{idx}: {line}")
-                    if len(matches) >= limit:
-                        break
-        return ToolResult(content="\n".join(matches) if matches else "No matches.")
+        outcome = search_text(root, query, limit, deadline_seconds=self._deadline_seconds)
+        content = _clip("\n".join(outcome.matches)) if outcome.matches else "No matches."
+        if outcome.truncated:
+            content += f"\n[truncated: search stopped after {self._deadline_seconds:g}s; results are partial]"
+        return ToolResult(content=content)
 
 
 class ExtractScreenTextTool(BaseTool):
@@ -402,6 +413,7 @@ class ExtractScreenTextTool(BaseTool):
     )
     parameters = {"type": "object", "properties": {}}
     costly = True
+    max_concurrency = 1
 
     def __init__(self, ocr_command: str = ""):
         self.ocr_command = ocr_command.strip()
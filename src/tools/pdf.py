@@ -1,10 +1,25 @@
-"""Local-only PDF text extraction tool."""
+"""Local-only PDF text extraction tool.
+
+Extracted page text is cached per (path, size, mtime). Pages are extracted
+lazily and in order, and extraction stops once the caller's character budget
+is met, so reading the start of a long PDF never parses the rest of it.
+Callers that will read a whole document, such as the PDF summary pass, can ask
+for long uncached page runs to be extracted in a process pool, a few pages per
+worker. Each worker keeps its parsed reader, so later batches skip re-parsing.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from tools.base import BaseTool, ToolResult
@@ -13,6 +28,11 @@ from tools.filesystem import _DEFAULT_ALLOWED_ROOTS, _human_size, _resolve
 logger = logging.getLogger(__name__)
 
 _MAX_PDF_TEXT_CHARS = 80_000
+_CACHED_DOCUMENTS = 8
+# Uncached runs at least this long are extracted in the process pool when the caller asks for it.
+_POOL_MIN_PAGES = 24
+_POOL_BATCH_PAGES = 8
+_POOL_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
 
 
 def _decode_pdf_string(raw: str) -> str:
@@ -38,11 +58,186 @@ def _fallback_extract_text(pdf_bytes: bytes) -> tuple[list[str], int]:
     return parts, page_count
 
 
+# Worker processes only: parsed readers keyed like PdfTextCache documents.
+_worker_readers: OrderedDict[tuple[str, int, int], object] = OrderedDict()
+_WORKER_CACHED_READERS = 2
+
+
+def _init_worker() -> None:
+    """Process-pool initializer: import pypdf up front and start with no cached readers."""
+    import pypdf  # noqa: F401
+
+    _worker_readers.clear()
+
+
+def _extract_page_batch(key: tuple[str, int, int], first: int, last: int) -> list[str]:
+    """Process-pool worker: extract pages ``first``..``last`` (1-based, inclusive)."""
+    reader = _worker_readers.get(key)
+    if reader is None:
+        from pypdf import PdfReader
+
+        reader = _worker_readers[key] = PdfReader(key[0])
+        while len(_worker_readers) > _WORKER_CACHED_READERS:
+            _worker_readers.popitem(last=False)
+    else:
+        _worker_readers.move_to_end(key)
+    return [(reader.pages[index - 1].extract_text() or "").strip() for index in range(first, last + 1)]
+
+
+@dataclass
+class _PdfDocument:
+    key: tuple[str, int, int]
+    page_count: int
+    reader: object | None
+    pages: dict[int, str] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class PdfTextCache:
+    """Lazily extracted page text for recently read PDFs, keyed by (path, size, mtime)."""
+
+    def __init__(self, max_documents: int = _CACHED_DOCUMENTS):
+        self._documents: OrderedDict[tuple[str, int, int], _PdfDocument] = OrderedDict()
+        self._max_documents = max_documents
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def document(self, path: Path) -> _PdfDocument:
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                return document
+        document = self._open(path, key)
+        with self._lock:
+            self._documents[key] = document
+            while len(self._documents) > self._max_documents:
+                self._documents.popitem(last=False)
+        return document
+
+    def pages(
+        self,
+        path: Path,
+        first: int = 1,
+        last: int | None = None,
+        *,
+        parallel: bool = False,
+    ) -> Iterator[tuple[int, str]]:
+        """Yield (page number, text) in order, extracting only pages the caller consumes.
+
+        Pass ``parallel`` only when the whole range will be read: long uncached
+        runs are then extracted in the process pool.
+        """
+        document = self.document(path)
+        last = document.page_count if last is None else min(last, document.page_count)
+        index = max(1, first)
+        while index <= last:
+            with document.lock:
+                cached = document.pages.get(index)
+            if cached is None:
+                run_end = index
+                with document.lock:
+                    while run_end < last and run_end + 1 not in document.pages:
+                        run_end += 1
+                if parallel and document.reader is not None and run_end - index + 1 >= _POOL_MIN_PAGES:
+                    yield from self._pool_pages(document, index, run_end)
+                    index = run_end + 1
+                    continue
+                cached = self._extract(document, index)
+            yield index, cached
+            index += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+
+    def _open(self, path: Path, key: tuple[str, int, int]) -> _PdfDocument:
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            parts, page_count = _fallback_extract_text(path.read_bytes())
+            return _PdfDocument(key, page_count, None, {1: "\n".join(parts)})
+        reader = PdfReader(str(path))
+        return _PdfDocument(key, len(reader.pages), reader)
+
+    def _extract(self, document: _PdfDocument, index: int) -> str:
+        with document.lock:
+            if index in document.pages:
+                return document.pages[index]
+            text = ""
+            if document.reader is not None:
+                text = (document.reader.pages[index - 1].extract_text() or "").strip()
+            document.pages[index] = text
+            return text
+
+    def _pool_pages(self, document: _PdfDocument, first: int, last: int) -> Iterator[tuple[int, str]]:
+        """Extract a page run in worker processes, keeping only a few batches in flight.
+
+        The first batch is extracted here while the workers start on the next
+        ones. Batches are yielded in page order; when the consumer stops early
+        the batches it never asked for are cancelled.
+        """
+        head_end = min(last, first + _POOL_BATCH_PAGES - 1)
+        batches = [
+            (start, min(last, start + _POOL_BATCH_PAGES - 1)) for start in range(head_end + 1, last + 1, _POOL_BATCH_PAGES)
+        ]
+        in_flight: list[tuple[int, int, Future]] = []
+        pool = self._executor()
+
+        def submit() -> None:
+            while batches and len(in_flight) < _POOL_WORKERS + 1:
+                start, end = batches.pop(0)
+                in_flight.append((start, end, pool.submit(_extract_page_batch, document.key, start, end)))
+
+        try:
+            submit()
+            for index in range(first, head_end + 1):
+                yield index, self._extract(document, index)
+            while in_flight:
+                start, end, future = in_flight.pop(0)
+                texts = future.result()
+                with document.lock:
+                    for offset, text in enumerate(texts):
+                        document.pages[start + offset] = text
+                for offset, text in enumerate(texts):
+                    yield start + offset, text
+                submit()
+        finally:
+            for _start, _end, future in in_flight:
+                future.cancel()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: the caller runs on a worker thread, where fork is unsafe. Spawned
+                # workers import the entry module, so main.py keeps the runtime out of its imports.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+
+PDF_TEXT_CACHE = PdfTextCache()
+
+
+def pdf_header_path(content: str) -> Path | None:
+    """Resolved PDF path from a read_pdf result header, or None for error results."""
+    first_line = content.split("\n", 1)[0]
+    if not first_line.startswith("PDF: ") or " (" not in first_line:
+        return None
+    return Path(first_line[len("PDF: ") :].rsplit(" (", 1)[0])
+
+
 class ReadPdfTool(BaseTool):
     name = "read_pdf"
     description = (
         "Extract text from a local PDF inside the filesystem sandbox. "
-        "Use this for reading or summarizing PDFs. It is local-only and does not perform OCR."
+        "Use this for reading or summarizing PDFs. It is local-only and does not perform OCR. "
+        "For long PDFs, pass start_page/end_page to read a page range."
     )
     parameters = {
         "type": "object",
@@ -52,25 +247,41 @@ class ReadPdfTool(BaseTool):
                 "type": "integer",
                 "description": "Maximum extracted characters to return. Default 80000.",
             },
+            "start_page": {"type": "integer", "minimum": 1, "description": "First page to read, 1-based."},
+            "end_page": {"type": "integer", "minimum": 1, "description": "Last page to read, inclusive."},
         },
         "required": ["path"],
     }
     costly = False
+    max_concurrency = 1
 
-    def __init__(self, allowed_roots: tuple[Path, ...] = (), default_path: Path | None = None):
+    def __init__(
+        self,
+        allowed_roots: tuple[Path, ...] = (),
+        default_path: Path | None = None,
+        cache: PdfTextCache | None = None,
+    ):
         self._roots = allowed_roots or _DEFAULT_ALLOWED_ROOTS
         self._default_path = default_path.expanduser().resolve() if default_path else None
+        self._cache = cache or PDF_TEXT_CACHE
 
-    async def execute(self, path: str = "", max_chars: int = _MAX_PDF_TEXT_CHARS, **_) -> ToolResult:
+    async def execute(
+        self,
+        path: str = "",
+        max_chars: int = _MAX_PDF_TEXT_CHARS,
+        start_page: int | None = None,
+        end_page: int | None = None,
+        **_,
+    ) -> ToolResult:
         try:
-            return await asyncio.to_thread(self._run, path, max_chars)
+            return await asyncio.to_thread(self._run, path, max_chars, start_page, end_page)
         except PermissionError as e:
             return ToolResult(content=str(e))
         except Exception as e:
             logger.error("read_pdf failed: %s", e, exc_info=True)
             return ToolResult(content=f"PDF error: {e}")
 
-    def _run(self, path: str, max_chars: int) -> ToolResult:
+    def _run(self, path: str, max_chars: int, start_page: int | None = None, end_page: int | None = None) -> ToolResult:
         p = _resolve(path, self._roots, self._default_path)
         if not p.is_file():
             return ToolResult(content=f"Not a file: {p}")
@@ -79,28 +290,29 @@ class ReadPdfTool(BaseTool):
 
         max_chars = max(1000, min(int(max_chars or _MAX_PDF_TEXT_CHARS), _MAX_PDF_TEXT_CHARS))
         size = p.stat().st_size
+        first = max(1, int(start_page or 1))
         pages: list[str] = []
-        page_count = 0
+        length = 0
+        truncated = False
 
         try:
-            from pypdf import PdfReader
-
-            reader = PdfReader(str(p))
-            page_count = len(reader.pages)
-            for index, page in enumerate(reader.pages, start=1):
-                extracted = page.extract_text() or ""
-                extracted = extracted.strip()
-                if extracted:
-                    pages.append(f"[Page {index}]\n{extracted}")
-        except ImportError:
-            parts, page_count = _fallback_extract_text(p.read_bytes())
-            if parts:
-                pages.append("[Page 1]\n" + "\n".join(parts))
+            page_count = self._cache.document(p).page_count
+            last = min(page_count, int(end_page)) if end_page else page_count
+            for index, extracted in self._cache.pages(p, first, last):
+                if not extracted:
+                    continue
+                if length >= max_chars:
+                    truncated = True
+                    break
+                pages.append(f"[Page {index}]\n{extracted}")
+                length += len(pages[-1]) + 2
         except Exception as e:
             return ToolResult(content=f"Could not read PDF {p.name}: {e}")
 
         body = "\n\n".join(pages).strip()
         header = f"PDF: {p} ({_human_size(size)})\nPages: {page_count}"
+        if start_page or end_page:
+            header += f"\nShowing pages {first}-{last}"
         if not body:
             return ToolResult(
                 content=(
@@ -108,8 +320,7 @@ class ReadPdfTool(BaseTool):
                     "This PDF may be scanned or image-only. Eyra does not use online OCR silently."
                 )
             )
-        truncated = len(body) > max_chars
-        if truncated:
+        if truncated or len(body) > max_chars:
             body = body[:max_chars].rstrip()
             header += f"\nShowing first {max_chars} characters"
         return ToolResult(content=f"{header}\n\n{body}")
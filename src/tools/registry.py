@@ -1,5 +1,7 @@
 """Tool registry for managing and dispatching tool calls."""
 
+import asyncio
+import contextlib
 import json
 import logging
 
@@ -77,3 +79,52 @@ class ToolRegistry:
         except Exception as e:
             logger.error("Tool '%s' failed: %s", name, e, exc_info=True)
             return ToolResult(content=f"Tool error: {e}")
+
+    async def execute_calls(
+        self,
+        calls: list[tuple[str, str]],
+        *,
+        timeout_seconds: int | float = 30,
+        max_parallel: int = 1,
+    ) -> list[ToolResult]:
+        """Execute one model round of tool calls and return results in call order.
+
+        Consecutive read-only calls run concurrently, bounded by ``max_parallel``
+        and each tool's ``max_concurrency``. Mutating, approval-gated, networked,
+        and unknown tools wait for every earlier call and run alone, so side
+        effects keep the order the model asked for.
+        """
+        from runtime.routing.tool_policy import is_parallel_safe, metadata_for_tool
+
+        results: list[ToolResult | None] = [None] * len(calls)
+        round_slots = asyncio.Semaphore(max(1, int(max_parallel)))
+        tool_slots: dict[str, asyncio.Semaphore] = {}
+        batch: list[asyncio.Task] = []
+
+        async def run(index: int, name: str, arguments: str, slots: list[asyncio.Semaphore]) -> None:
+            async with contextlib.AsyncExitStack() as stack:
+                for slot in slots:
+                    await stack.enter_async_context(slot)
+                results[index] = await self._execute_with_timeout(name, arguments, timeout_seconds)
+
+        for index, (name, arguments) in enumerate(calls):
+            tool = self._tools.get(name)
+            if max_parallel > 1 and tool is not None and is_parallel_safe(metadata_for_tool(tool)):
+                limit = tool.max_concurrency or max_parallel
+                slot = tool_slots.setdefault(name, asyncio.Semaphore(max(1, limit)))
+                batch.append(asyncio.create_task(run(index, name, arguments, [round_slots, slot])))
+                continue
+            if batch:
+                await asyncio.gather(*batch)
+                batch = []
+            await run(index, name, arguments, [])
+        if batch:
+            await asyncio.gather(*batch)
+        return [result for result in results if result is not None]
+
+    async def _execute_with_timeout(self, name: str, arguments: str, timeout_seconds: int | float) -> ToolResult:
+        try:
+            return await asyncio.wait_for(self.execute(name, arguments), timeout=max(1, timeout_seconds))
+        except asyncio.TimeoutError:
+            logger.error("Tool '%s' timed out after %ss", name, timeout_seconds)
+            return ToolResult(content=f"Tool '{name}' timed out after {timeout_seconds} seconds.")
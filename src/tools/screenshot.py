@@ -51,6 +51,7 @@ class ScreenshotTool(BaseTool):
     )
     parameters = {"type": "object", "properties": {}, "required": []}
     costly = True
+    max_concurrency = 1
 
     async def execute(self, **kwargs) -> ToolResult:
         try:
@@ -0,0 +1,178 @@
+"""
+Text Search
+
+Bounded, streaming literal search used by ``search_files`` when ``rg`` is not
+installed. Files are read in fixed-size chunks, so memory stays flat no matter
+how large a file is, and a match that straddles two chunks is still found.
+Files whose first block contains a NUL byte are treated as binary and skipped.
+Directories fan out to a thread pool, and a global deadline stops the search
+with partial results instead of letting the tool time out.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 1 << 20
+_SNIFF_BYTES = 8192
+# A line longer than this is searched in pieces and reported as an excerpt.
+_MAX_LINE_BYTES = 1 << 20
+_EXCERPT_BYTES = 200
+_MAX_REPORTED_LINE_CHARS = 1000
+DEFAULT_WORKERS = min(8, os.cpu_count() or 2)
+
+
+@dataclass
+class SearchOutcome:
+    # ``path:line: text`` entries, sorted by path and line.
+    matches: list[str] = field(default_factory=list)
+    # True when the deadline stopped the search before it finished.
+    truncated: bool = False
+
+
+class _Search:
+    def __init__(self, needle: bytes, limit: int, deadline: float):
+        self.needle = needle
+        self.limit = limit
+        self.deadline = deadline
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.hits: list[tuple[str, int, str]] = []
+        self.truncated = False
+
+    def expired(self) -> bool:
+        if not self.stop.is_set() and time.monotonic() >= self.deadline:
+            self.truncated = True
+            self.stop.set()
+        return self.stop.is_set()
+
+    def add(self, path: str, line_number: int, line: bytes) -> bool:
+        """Record one match; False once the limit is reached."""
+        text = line.decode("utf-8", errors="replace").rstrip("\r")
+        if len(text) > _MAX_REPORTED_LINE_CHARS:
+            text = text[:_MAX_REPORTED_LINE_CHARS] + "..."
+        with self.lock:
+            if self.stop.is_set() or len(self.hits) >= self.limit:
+                return False
+            self.hits.append((path, line_number, text))
+            if len(self.hits) >= self.limit:
+                self.stop.set()
+                return False
+        return True
+
+
+def search_text(
+    root: Path,
+    query: str,
+    limit: int,
+    *,
+    deadline_seconds: float,
+    workers: int = DEFAULT_WORKERS,
+) -> SearchOutcome:
+    """Find lines containing ``query`` under ``root``; results are sorted by path and line."""
+    if not query or "\n" in query:
+        return SearchOutcome()
+    search = _Search(query.encode("utf-8"), limit, time.monotonic() + max(0.0, deadline_seconds))
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="search-files")
+    try:
+        pending: set[Future] = {executor.submit(_search_directory, search, str(root))}
+        while pending and not search.expired():
+            timeout = max(0.0, search.deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                for directory in future.result():
+                    if not search.stop.is_set():
+                        pending.add(executor.submit(_search_directory, search, directory))
+    finally:
+        search.stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    with search.lock:
+        hits = sorted(search.hits)
+    return SearchOutcome([f"{path}:{number}: {text}" for path, number, text in hits], search.truncated)
+
+
+def _search_directory(search: _Search, directory: str) -> list[str]:
+    """Search the files directly in ``directory`` and return its subdirectories."""
+    subdirectories: list[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            children = sorted(entries, key=lambda entry: entry.name)
+    except OSError as e:
+        logger.debug("search_files skipped %s: %s", directory, e)
+        return subdirectories
+    for entry in children:
+        if search.expired():
+            break
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file():
+                _search_file(search, entry.path)
+        except OSError as e:
+            logger.debug("search_files skipped %s: %s", entry.path, e)
+    return subdirectories
+
+
+def _search_file(search: _Search, path: str) -> None:
+    needle = search.needle
+    with open(path, "rb") as handle:
+        block = handle.read(CHUNK_BYTES)
+        if b"\0" in block[:_SNIFF_BYTES]:
+            return
+        line_number = 1  # line that data[0] belongs to
+        carry = b""
+        # Set when carry holds only the tail of an overlong line, and once that line is reported.
+        partial_line = line_reported = False
+        while block:
+            if search.expired():
+                return
+            data = carry + block if carry else block
+            block = handle.read(CHUNK_BYTES)
+            end = data.rfind(b"\n") + 1 if block else len(data)
+            if end == 0:
+                carry = data
+                if len(data) > _MAX_LINE_BYTES:
+                    # Search all of the overlong line except a tail a later match could start in.
+                    cut = len(data) - (len(needle) - 1)
+                    hit = -1 if line_reported else data.find(needle)
+                    if hit != -1:
+                        line_reported = True
+                        if not search.add(path, line_number, _excerpt(data, hit, len(needle))):
+                            return
+                    carry, partial_line = data[cut:], True
+                continue
+            counted = 0
+            position = 0
+            while (hit := data.find(needle, position, end)) != -1:
+                line_start = data.rfind(b"\n", 0, hit) + 1
+                line_end = data.find(b"\n", hit, end)
+                line_end = end if line_end == -1 else line_end
+                line_number += data.count(b"\n", counted, line_start)
+                counted = line_start
+                position = line_end + 1
+                if line_start == 0 and line_reported:
+                    continue
+                if (line_start == 0 and partial_line) or line_end - line_start > _MAX_LINE_BYTES:
+                    line = _excerpt(data, hit, len(needle))
+                else:
+                    line = data[line_start:line_end]
+                if not search.add(path, line_number, line):
+                    return
+            line_number += data.count(b"\n", counted, end)
+            carry = data[end:]
+            partial_line = line_reported = False
+
+
+def _excerpt(data: bytes, hit: int, length: int) -> bytes:
+    start = max(0, hit - _EXCERPT_BYTES)
+    line_start = data.rfind(b"\n", start, hit) + 1
+    line_end = data.find(b"\n", hit + length, hit + length + _EXCERPT_BYTES)
+    return data[max(start, line_start) : line_end if line_end != -1 else hit + length + _EXCERPT_BYTES]
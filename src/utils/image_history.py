@@ -2,9 +2,22 @@
 Message history management utilities.
 Handles message history cleanup and maintenance.
 Strips base64 image payloads from older messages so text-only
-requests don't accidentally resend large multipart content.
+requests don't accidentally resend large multipart content, and fits
+the history into a token budget when the caller knows the model's window.
 """
 
+from typing import Callable
+
+from utils.token_budget import estimate_message_tokens
+
+# Tool outputs at or below this size stay verbatim even in compacted turns.
+TOOL_OUTPUT_COMPACT_CHARS = 600
+_TOOL_EXCERPT_CHARS = 400
+
+# Returns a cached summary for a tool output, or None to use the excerpt.
+ToolSummarizer = Callable[[str], str | None]
+
+
 def _strip_image_content(msg: dict) -> dict:
     """Replace multipart image messages with their text-only portion."""
     content = msg.get("content")
@@ -17,12 +30,122 @@ def _strip_image_content(msg: dict) -> dict:
     return {**msg, "content": text or "[image]"}
 
 
-def manage_message_history(messages: list[dict], max_turns: int = 10, max_messages: int | None = None) -> list[dict]:
+def compact_tool_output(content: str, max_chars: int = _TOOL_EXCERPT_CHARS) -> str:
+    """Deterministic stand-in for a long tool output: its opening and an omission note."""
+    head = content[:max_chars].rstrip()
+    return f"{head}\n[Earlier tool output compacted: {len(content) - len(head)} more characters omitted.]"
+
+
+def _compact_message(msg: dict, summarize: ToolSummarizer | None) -> dict:
+    content = msg.get("content")
+    if msg.get("role") != "tool" or not isinstance(content, str) or len(content) <= TOOL_OUTPUT_COMPACT_CHARS:
+        return msg
+    summary = summarize(content) if summarize else None
+    if summary:
+        return {**msg, "content": f"[Summary of earlier tool output]\n{summary}"}
+    return {**msg, "content": compact_tool_output(content)}
+
+
+def _split_turns(messages: list[dict]) -> list[list[dict]]:
+    """Group messages into turns; each user message starts a new turn."""
+    turns: list[list[dict]] = []
+    for msg in messages:
+        if msg.get("role") == "user" or not turns:
+            turns.append([])
+        turns[-1].append(msg)
+    return turns
+
+
+def _round_up(index: int, block: int, limit: int) -> int:
+    return min(limit, -(-index // block) * block)
+
+
+def _fit_token_budget(
+    messages: list[dict],
+    token_budget: int,
+    block_turns: int,
+    summarize: ToolSummarizer | None,
+) -> list[dict]:
+    """Keep the newest turns whole, compact older tool outputs, then drop what still does not fit."""
+    turns = _split_turns(messages)
+    newest = len(turns) - 1
+    remaining = token_budget - sum(estimate_message_tokens(m) for m in turns[newest])
+    whole_from = kept_from = newest
+    compacted: dict[int, list[dict]] = {}
+    for index in range(newest - 1, -1, -1):
+        if whole_from == index + 1:
+            cost = sum(estimate_message_tokens(m) for m in turns[index])
+            if cost <= remaining:
+                remaining -= cost
+                whole_from = kept_from = index
+                continue
+        compacted[index] = [_compact_message(m, summarize) for m in turns[index]]
+        cost = sum(estimate_message_tokens(m) for m in compacted[index])
+        if cost > remaining:
+            break
+        remaining -= cost
+        kept_from = index
+
+    block = max(1, block_turns)
+    if block > 1:
+        # Move both boundaries only once per block so the prompt prefix stays stable between blocks.
+        # Rounding up drops or compacts more, so the result still fits the budget.
+        kept_from = _round_up(kept_from, block, newest)
+        whole_from = max(kept_from, _round_up(whole_from, block, newest))
+
+    kept: list[dict] = []
+    for index in range(kept_from, newest + 1):
+        if index < whole_from:
+            kept.extend(compacted.get(index) or [_compact_message(m, summarize) for m in turns[index]])
+        else:
+            kept.extend(turns[index])
+    return kept
+
+
+def _strip_older_images(messages: list[dict]) -> list[dict]:
+    """Strip image payloads from everything except the final message."""
+    if not messages:
+        return []
+    cleaned = [_strip_image_content(m) for m in messages[:-1]]
+    cleaned.append(messages[-1])
+    return cleaned
+
+
+def _trim_by_turns(messages: list[dict], max_turns: int, block_turns: int) -> list[dict]:
+    # Count only user and plain-assistant messages as "turns"
+    _TURN_ROLES = {"user", "assistant"}
+    turn_indexes = [i for i, msg in enumerate(messages) if msg.get("role", "") in _TURN_ROLES]
+    excess = len(turn_indexes) - max_turns
+    cut_index = 0
+    if excess > 0:
+        block = max(1, min(block_turns, max_turns))
+        dropped = -(-excess // block) * block
+        cut_index = turn_indexes[dropped - 1] + 1
+    return list(messages[cut_index:])
+
+
+def manage_message_history(
+    messages: list[dict],
+    max_turns: int = 10,
+    max_messages: int | None = None,
+    block_turns: int = 1,
+    token_budget: int | None = None,
+    summarize: ToolSummarizer | None = None,
+) -> list[dict]:
     """
     Return a trimmed, cleaned copy of the message history.
 
-    - Keeps at most *max_turns* user/assistant turn pairs plus their
-      associated tool messages (tool call results, image messages).
+    - Without *token_budget*, keeps at most *max_turns* user/assistant
+      turn pairs plus their associated tool messages (tool call results,
+      image messages).
+    - With *token_budget*, keeps the newest turns whole while they fit,
+      replaces long tool outputs in older turns with a cached *summarize*
+      result or a short excerpt, and drops the oldest turns that still
+      do not fit. The newest turn is always kept.
+    - Drops or compacts old turns *block_turns* at a time, counted from
+      the start of the conversation, so the kept window (and the prompt
+      prefix the backend can cache) only moves once every *block_turns*
+      turns.
     - Strips base64 image payloads from all but the last message
       (the last message may intentionally carry an image for the
       current request).
@@ -34,22 +157,6 @@ def manage_message_history(messages: list[dict], max_turns: int = 10, max_messag
     if not messages:
         return []
 
-    # Count only user and plain-assistant messages as "turns"
-    _TURN_ROLES = {"user", "assistant"}
-    turn_count = 0
-    cut_index = 0
-    for i in range(len(messages) - 1, -1, -1):
-        role = messages[i].get("role", "")
-        if role in _TURN_ROLES:
-            turn_count += 1
-            if turn_count > max_turns:
-                cut_index = i + 1
-                break
-
-    recent = list(messages[cut_index:])
-
-    # Strip image payloads from everything except the final message
-    cleaned = [_strip_image_content(m) for m in recent[:-1]] if recent else []
-    if recent:
-        cleaned.append(recent[-1])
-    return cleaned
+    if token_budget is None:
+        return _strip_older_images(_trim_by_turns(messages, max_turns, block_turns))
+    return _fit_token_budget(_strip_older_images(messages), token_budget, block_turns, summarize)
@@ -51,6 +51,7 @@ class MockAIClient(BaseAIClient):
         max_tool_rounds: int = 5,
         require_tools: bool = False,
         allowed_tool_names: set[str] | frozenset[str] | None = None,
+        max_parallel_tools: int = 1,
     ) -> AsyncGenerator[str, None]:
         content = "This is a mock response."
         yield content
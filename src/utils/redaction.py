@@ -0,0 +1,196 @@
+"""
+Redaction Engine
+
+Compiled secret and local-path redaction shared by semantic history,
+connector output, and operator tool output. Each surface composes the rules
+(and replacement markers) it has always used.
+
+Rules run in order, each over the output of the rules before it, exactly
+like the separate ``re.sub`` calls they replace. Order matters: secret rules
+come before path rules, so a path that runs into ``password: ...`` cannot
+swallow the keyword and leave the value in clear text. What makes the engine
+cheap is skipping work, not merging patterns. Text that contains none of the
+rules' trigger substrings is returned untouched without running any pattern,
+and a rule whose triggers are absent is not run at all.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+# Characters kept unscanned at the end of a stream buffer so a secret split
+# across chunks is still seen whole.
+STREAM_OVERLAP_CHARS = 512
+
+
+@dataclass(frozen=True)
+class RedactionRule:
+    """One pattern and its replacement.
+
+    ``replacement`` is a ``str.format`` template over the rule's groups,
+    numbered from 1, so ``"{1}{2}[REDACTED]"`` keeps a key and separator.
+    ``triggers`` are lowercase substrings at least one of which must appear
+    in any text the pattern can match.
+    """
+
+    name: str
+    pattern: str
+    replacement: str
+    triggers: tuple[str, ...]
+
+
+_SECRET_KEYWORDS = r"(?i:api[_-]?key|token|secret|password)"
+_SECRET_TRIGGERS = ("key", "token", "secret", "password")
+
+
+def secret_assignment_rule(value: str, replacement: str = "{1}{2}[REDACTED]") -> RedactionRule:
+    """``api_key=...``, ``"token": "..."``, ``password: ...`` with the given value pattern."""
+    return RedactionRule(
+        "secret_assignment",
+        rf"({_SECRET_KEYWORDS})([\"'\s:=]+){value}",
+        replacement,
+        _SECRET_TRIGGERS,
+    )
+
+
+def _case(pattern: str, ignore_case: bool) -> str:
+    return f"(?i:{pattern})" if ignore_case else pattern
+
+
+def openai_key_rule(min_chars: int, replacement: str = "[REDACTED]", ignore_case: bool = False) -> RedactionRule:
+    pattern = _case(rf"sk-[A-Za-z0-9_-]{{{min_chars},}}", ignore_case)
+    return RedactionRule("openai_key", pattern, replacement, ("sk-",))
+
+
+def bearer_rule(min_chars: int, replacement: str = "[REDACTED]", ignore_case: bool = False) -> RedactionRule:
+    pattern = _case(rf"Bearer\s+[A-Za-z0-9_\-./+=]{{{min_chars},}}", ignore_case)
+    return RedactionRule("bearer", pattern, replacement, ("bearer",))
+
+
+def token_query_rule() -> RedactionRule:
+    return RedactionRule("token_query", r"((?i:token=))[^&\s]+", "{1}[REDACTED]", ("token=",))
+
+
+def home_path_rule(stop: str = r"/\s,}\"'") -> RedactionRule:
+    return RedactionRule("home_path", rf"/Users/[^{stop}]+", "~/[user]", ("/users/",))
+
+
+def temp_path_rule(var_prefix: str = "/var/") -> RedactionRule:
+    return RedactionRule(
+        "temp_path",
+        rf"(?:/private)?{re.escape(var_prefix)}[^\s,}}\"']+|/tmp/[^\s,}}\"']+",
+        "~/[temp]",
+        (var_prefix, "/tmp/"),
+    )
+
+
+class _CompiledRule:
+    def __init__(self, rule: RedactionRule):
+        self.rule = rule
+        self.pattern = re.compile(rule.pattern)
+
+    def applies(self, lowered: str) -> bool:
+        return any(trigger in lowered for trigger in self.rule.triggers)
+
+    def replace(self, match: re.Match) -> str:
+        if not self.pattern.groups:
+            return self.rule.replacement
+        return self.rule.replacement.format("", *match.groups(""))
+
+
+class Redactor:
+    """Apply rules in order, skipping text and rules their triggers rule out."""
+
+    def __init__(self, rules: Iterable[RedactionRule]):
+        self.rules = tuple(rules)
+        self._compiled = tuple(_CompiledRule(rule) for rule in self.rules)
+        self._triggers = tuple(sorted({trigger for rule in self.rules for trigger in rule.triggers}))
+
+    def might_match(self, text: str) -> bool:
+        """Cheap prefilter: False means no rule can match ``text``."""
+        lowered = text.lower()
+        return any(trigger in lowered for trigger in self._triggers)
+
+    def redact(self, text: str) -> str:
+        if not text or not self.might_match(text):
+            return text
+        lowered = text.lower()
+        for compiled in self._compiled:
+            if not compiled.applies(lowered):
+                continue
+            redacted = compiled.pattern.sub(compiled.replace, text)
+            if redacted != text:
+                text, lowered = redacted, redacted.lower()
+        return text
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Redact an iterable of text chunks, yielding redacted text as it becomes safe to emit."""
+        stream = RedactionStream(self)
+        for chunk in chunks:
+            out = stream.feed(chunk)
+            if out:
+                yield out
+        tail = stream.finish()
+        if tail:
+            yield tail
+
+    def safe_cut(self, text: str, target: int, window: int) -> int:
+        """The last position at or before ``target`` that no rule's match spans.
+
+        Only matches starting within ``window`` characters of ``target``, from
+        a whitespace boundary, are considered.
+        """
+        lowered = text.lower()
+        start = max(0, target - window)
+        if start:
+            # Start at a token boundary so a match is never picked up from its middle.
+            start = max(text.rfind(" ", 0, start), text.rfind("\n", 0, start)) + 1
+        cut = target
+        moved = True
+        while moved and cut > 0:
+            moved = False
+            for compiled in self._compiled:
+                if not compiled.applies(lowered):
+                    continue
+                for match in compiled.pattern.finditer(text, start):
+                    if match.start() >= cut:
+                        break
+                    if match.end() > cut or (match.end() == cut and cut < len(text)):
+                        cut = match.start()
+                        moved = True
+                        break
+        return cut
+
+
+class RedactionStream:
+    """Incremental redaction for large outputs that arrive in chunks.
+
+    Text is held back until at least ``overlap`` characters follow it, and the
+    buffer is only cut where no rule's match spans the cut, so the streamed
+    result equals redacting the whole text at once unless a single secret
+    assignment spans more than ``overlap`` characters.
+    """
+
+    def __init__(self, redactor: Redactor, overlap: int = STREAM_OVERLAP_CHARS):
+        self._redactor = redactor
+        self._overlap = max(1, overlap)
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        if len(self._buffer) < 4 * self._overlap:
+            return ""
+        target = len(self._buffer) - self._overlap
+        if not self._redactor.might_match(self._buffer):
+            out, self._buffer = self._buffer[:target], self._buffer[target:]
+            return out
+        # Cut before any match that reaches past the target, so it is redacted whole with what follows.
+        cut = self._redactor.safe_cut(self._buffer, target, self._overlap)
+        out, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._redactor.redact(out)
+
+    def finish(self) -> str:
+        out, self._buffer = self._redactor.redact(self._buffer), ""
+        return out
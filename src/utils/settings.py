@@ -34,12 +34,23 @@ class Settings:
     VOICE_SILENCE_MS: int = 1500
     # Voice input: Silero VAD threshold (0.0-1.0). Higher = stricter.
     VOICE_VAD_THRESHOLD: float = 0.15
+    # Voice input: Silero VAD runtime; "onnxruntime" needs no torch, "torch" uses silero-vad's own wrapper.
+    VOICE_VAD_BACKEND: str = "onnxruntime"
     # Voice input: absolute recording cap in seconds for one utterance.
     VOICE_MAX_DURATION_SECONDS: int = 300
+    # Voice input: transcribe speech in segments while the user is still talking.
+    VOICE_STREAMING_ENABLED: bool = False
+    # Voice input: minimum speech per streaming segment (ms); segments are cut at pauses.
+    VOICE_STREAMING_CHUNK_MS: int = 2000
     # Filesystem tool: comma-separated list of allowed root paths (~ expanded)
     FILESYSTEM_ALLOWED_PATHS: str = "~/Documents,~/Desktop,~/Downloads,/tmp"
     # Filesystem tool: default working directory for the model (~ expanded)
     FILESYSTEM_DEFAULT_PATH: str = "~/Documents"
+    # Local SQLite index of the allowed paths for search_files and named-folder lookups.
+    FILE_INDEX_ENABLED: bool = False
+    FILE_INDEX_PATH: str = "~/.local/share/eyra/file_index.sqlite3"
+    # Minimum seconds between mtime rescans of a searched root.
+    FILE_INDEX_RESCAN_SECONDS: float = 60.0
     # Network-backed tools (weather and browser) are opt-in so the default runtime stays local.
     NETWORK_TOOLS_ENABLED: bool = False
     # Background task coordinator.
@@ -49,12 +60,21 @@ class Settings:
     TASK_TIMEOUT_SECONDS: int = 300
     MAX_WORKER_TOOL_STEPS: int = 8
     TOOL_TIMEOUT_SECONDS: int = 30
+    # Read-only tool calls from one model round that may run at the same time. 1 runs them in order.
+    MAX_PARALLEL_TOOL_CALLS: int = 4
     MODEL_CONCURRENCY: int = 1
     TASK_STATUS_UPDATES: bool = True
     JOB_STORE_PATH: str = "~/.local/share/eyra/jobs.sqlite3"
+    # Job log and ledger rows past these limits move to compressed archive segments; 0 disables a limit.
+    JOB_RETENTION_DAYS: float = 30.0
+    JOB_LOG_MAX_PER_JOB: int = 2000
+    JOB_STORE_MAX_MB: int = 256
+    JOB_ARCHIVE_PATH: str = "~/.local/share/eyra/job-archive"
     TRIGGER_STORE_PATH: str = "~/.local/share/eyra/triggers.sqlite3"
     TRIGGER_CHECK_INTERVAL_SECONDS: float = 0.5
     TRIGGER_TIMEOUT_SECONDS: int = 300
+    # What to do with reminder fires missed while Eyra was not running: once, all, or skip.
+    TRIGGER_CATCH_UP: str = "once"
     # OS/operator tools are powerful and therefore opt-in. They stay local.
     OS_TOOLS_ENABLED: bool = False
     # Optional local OCR command for screen text extraction. It must read PNG bytes from stdin.
@@ -74,6 +94,10 @@ class Settings:
     # MCP bridges are opt-in and disabled by default.
     MCP_TOOLS_ENABLED: bool = False
     MCP_CONFIG_PATH: str = "~/.config/eyra/mcp.json"
+    # Pooled MCP servers stay running this long after their last request.
+    MCP_KEEPALIVE_SECONDS: int = 120
+    # Concurrent requests per MCP server; a few more may wait, the rest fail fast.
+    MCP_MAX_IN_FLIGHT: int = 4
     # Local durable memory is first-class and enabled by default. It uses the
     # mcp-prose-memory stdio server underneath, but Eyra owns the compact policy.
     MEMORY_ENABLED: bool = True
@@ -82,6 +106,8 @@ class Settings:
     MEMORY_PATH: str = "~/.mcp-prose-memory/memory.json"
     MEMORY_MCP_COMMAND: str = "mcp-prose-memory"
     MEMORY_MCP_ARGS: str = ""
+    # Seconds an unused memory MCP server stays running before it is stopped.
+    MEMORY_MCP_IDLE_SECONDS: int = 300
     MEMORY_CONTEXT_MAX_CHARS: int = 1500
     MEMORY_FACT_MAX_CHARS: int = 220
     MEMORY_SECTION_MAX_FACTS: int = 30
@@ -107,6 +133,16 @@ class Settings:
     REALTIME_ALLOWED_TOOLS: str = ""
     # Complexity-based model tiers. When disabled, all requests use MODEL after policy routing.
     COMPLEXITY_ROUTING_ENABLED: bool = False
+    # Keep the prompt prefix byte-stable across turns so the backend can reuse its KV cache:
+    # memory facts are snapshotted per session and old history is dropped in blocks of turns.
+    PROMPT_PREFIX_STABLE: bool = False
+    PROMPT_HISTORY_BLOCK_TURNS: int = 4
+    # Upper bound on the model context window Eyra budgets for; the backend's reported window wins when smaller.
+    CONTEXT_WINDOW_TOKENS: int = 8192
+    # Share of the context window conversation history may use. Older tool outputs are compacted first.
+    HISTORY_CONTEXT_SHARE: float = 0.5
+    # Summarize long tool outputs in old turns with SIMPLE_MODEL in the background.
+    HISTORY_TOOL_SUMMARIES: bool = False
     ROUTING_DEBUG: bool = False
     HANDS_FREE_MODE: bool = False
 
@@ -140,6 +176,12 @@ class Settings:
             except ValueError:
                 raise ValueError(f"Invalid integer for {key}: '{raw}'. Check your .env file.")
 
+        def _choice(key: str, default: str, choices: tuple[str, ...]) -> str:
+            raw = _getenv(key, default).strip().lower()
+            if raw not in choices:
+                raise ValueError(f"Invalid value for {key}: '{raw}'. Use one of: {', '.join(choices)}.")
+            return raw
+
         def _float_range(key: str, default: str, lo: float, hi: float) -> float:
             raw = _getenv(key, default)
             try:
@@ -168,9 +210,15 @@ class Settings:
             VOICE_DIAGNOSTIC_SAVE_AUDIO=_bool("VOICE_DIAGNOSTIC_SAVE_AUDIO", "false"),
             VOICE_SILENCE_MS=_int("VOICE_SILENCE_MS", "1500"),
             VOICE_VAD_THRESHOLD=_float_range("VOICE_VAD_THRESHOLD", "0.15", 0.0, 1.0),
+            VOICE_VAD_BACKEND=_choice("VOICE_VAD_BACKEND", "onnxruntime", ("onnxruntime", "torch")),
             VOICE_MAX_DURATION_SECONDS=_int("VOICE_MAX_DURATION_SECONDS", "300"),
+            VOICE_STREAMING_ENABLED=_bool("VOICE_STREAMING_ENABLED", "false"),
+            VOICE_STREAMING_CHUNK_MS=_int("VOICE_STREAMING_CHUNK_MS", "2000"),
             FILESYSTEM_ALLOWED_PATHS=_getenv("FILESYSTEM_ALLOWED_PATHS", "~/Documents,~/Desktop,~/Downloads,/tmp"),
             FILESYSTEM_DEFAULT_PATH=_getenv("FILESYSTEM_DEFAULT_PATH", "~/Documents"),
+            FILE_INDEX_ENABLED=_bool("FILE_INDEX_ENABLED", "false"),
+            FILE_INDEX_PATH=_getenv("FILE_INDEX_PATH", "~/.local/share/eyra/file_index.sqlite3"),
+            FILE_INDEX_RESCAN_SECONDS=_float_range("FILE_INDEX_RESCAN_SECONDS", "60", 0.0, 86400.0),
             NETWORK_TOOLS_ENABLED=_bool("NETWORK_TOOLS_ENABLED", "false"),
             BACKGROUND_TASKS_ENABLED=_bool("BACKGROUND_TASKS_ENABLED", "true"),
             MAX_BACKGROUND_TASKS=_int("MAX_BACKGROUND_TASKS", "2"),
@@ -178,12 +226,18 @@ class Settings:
             TASK_TIMEOUT_SECONDS=_int("TASK_TIMEOUT_SECONDS", "300"),
             MAX_WORKER_TOOL_STEPS=_int("MAX_WORKER_TOOL_STEPS", "8"),
             TOOL_TIMEOUT_SECONDS=_int("TOOL_TIMEOUT_SECONDS", "30"),
+            MAX_PARALLEL_TOOL_CALLS=_int("MAX_PARALLEL_TOOL_CALLS", "4"),
             MODEL_CONCURRENCY=_int("MODEL_CONCURRENCY", "1"),
             TASK_STATUS_UPDATES=_bool("TASK_STATUS_UPDATES", "true"),
             JOB_STORE_PATH=_getenv("JOB_STORE_PATH", "~/.local/share/eyra/jobs.sqlite3"),
+            JOB_RETENTION_DAYS=_float_range("JOB_RETENTION_DAYS", "30", 0.0, 36500.0),
+            JOB_LOG_MAX_PER_JOB=_int("JOB_LOG_MAX_PER_JOB", "2000"),
+            JOB_STORE_MAX_MB=_int("JOB_STORE_MAX_MB", "256"),
+            JOB_ARCHIVE_PATH=_getenv("JOB_ARCHIVE_PATH", "~/.local/share/eyra/job-archive"),
             TRIGGER_STORE_PATH=_getenv("TRIGGER_STORE_PATH", "~/.local/share/eyra/triggers.sqlite3"),
             TRIGGER_CHECK_INTERVAL_SECONDS=_float_range("TRIGGER_CHECK_INTERVAL_SECONDS", "0.5", 0.01, 60.0),
             TRIGGER_TIMEOUT_SECONDS=_int("TRIGGER_TIMEOUT_SECONDS", "300"),
+            TRIGGER_CATCH_UP=_choice("TRIGGER_CATCH_UP", "once", ("once", "all", "skip")),
             OS_TOOLS_ENABLED=_bool("OS_TOOLS_ENABLED", "false"),
             SCREEN_OCR_COMMAND=_getenv("SCREEN_OCR_COMMAND", ""),
             AGENT_TOOLS_ENABLED=_bool("AGENT_TOOLS_ENABLED", "false"),
@@ -201,12 +255,15 @@ class Settings:
             CONNECTORS_ALLOW_PYTHON_MODULE=_bool("CONNECTORS_ALLOW_PYTHON_MODULE", "false"),
             MCP_TOOLS_ENABLED=_bool("MCP_TOOLS_ENABLED", "false"),
             MCP_CONFIG_PATH=_getenv("MCP_CONFIG_PATH", "~/.config/eyra/mcp.json"),
+            MCP_KEEPALIVE_SECONDS=_int("MCP_KEEPALIVE_SECONDS", "120"),
+            MCP_MAX_IN_FLIGHT=_int("MCP_MAX_IN_FLIGHT", "4"),
             MEMORY_ENABLED=_bool("MEMORY_ENABLED", "true"),
             MEMORY_PROVIDER=_getenv("MEMORY_PROVIDER", "mcp-prose-memory"),
             MEMORY_AUTO_SAVE_ENABLED=_bool("MEMORY_AUTO_SAVE_ENABLED", "true"),
             MEMORY_PATH=_getenv("MEMORY_PATH", "~/.mcp-prose-memory/memory.json"),
             MEMORY_MCP_COMMAND=_getenv("MEMORY_MCP_COMMAND", "mcp-prose-memory"),
             MEMORY_MCP_ARGS=_getenv("MEMORY_MCP_ARGS", ""),
+            MEMORY_MCP_IDLE_SECONDS=_int("MEMORY_MCP_IDLE_SECONDS", "300"),
             MEMORY_CONTEXT_MAX_CHARS=_int("MEMORY_CONTEXT_MAX_CHARS", "1500"),
             MEMORY_FACT_MAX_CHARS=_int("MEMORY_FACT_MAX_CHARS", "220"),
             MEMORY_SECTION_MAX_FACTS=_int("MEMORY_SECTION_MAX_FACTS", "30"),
@@ -229,6 +286,11 @@ class Settings:
             REALTIME_TOOLS_ENABLED=_bool("REALTIME_TOOLS_ENABLED", "false"),
             REALTIME_ALLOWED_TOOLS=_getenv("REALTIME_ALLOWED_TOOLS", ""),
             COMPLEXITY_ROUTING_ENABLED=_bool("COMPLEXITY_ROUTING_ENABLED", "false"),
+            PROMPT_PREFIX_STABLE=_bool("PROMPT_PREFIX_STABLE", "false"),
+            PROMPT_HISTORY_BLOCK_TURNS=_int("PROMPT_HISTORY_BLOCK_TURNS", "4"),
+            CONTEXT_WINDOW_TOKENS=_int("CONTEXT_WINDOW_TOKENS", "8192"),
+            HISTORY_CONTEXT_SHARE=_float_range("HISTORY_CONTEXT_SHARE", "0.5", 0.05, 0.95),
+            HISTORY_TOOL_SUMMARIES=_bool("HISTORY_TOOL_SUMMARIES", "false"),
             ROUTING_DEBUG=_bool("ROUTING_DEBUG", "false"),
             HANDS_FREE_MODE=_bool("HANDS_FREE_MODE", "false"),
         )
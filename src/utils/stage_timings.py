@@ -0,0 +1,57 @@
+"""
+Stage Timings
+
+Per-turn latency breakdown for the request path. The message handler owns a
+StageTimings for each turn and publishes it through a context variable so the
+AI client can mark when the completion stream connects without every client
+signature growing a timing parameter.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Callable
+
+TURN_STAGES = ("route", "context", "connect", "first_token")
+
+_CURRENT_TIMINGS: ContextVar["StageTimings | None"] = ContextVar("eyra_stage_timings", default=None)
+
+
+class StageTimings:
+    """Record how long each stage of one turn took, in seconds."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._started = clock()
+        self._marks: dict[str, float] = {}
+        self.durations: dict[str, float] = {}
+
+    def start(self, stage: str) -> None:
+        self._marks[stage] = self._clock()
+
+    def stop(self, stage: str) -> None:
+        """Close a stage; stages never started are measured from the turn start. Only the first stop counts."""
+        if stage in self.durations:
+            return
+        self.durations[stage] = self._clock() - self._marks.get(stage, self._started)
+
+    def summary(self) -> str:
+        parts = []
+        for stage in TURN_STAGES:
+            value = self.durations.get(stage)
+            parts.append(f"{stage}=" + (f"{value * 1000:.1f}ms" if value is not None else "-"))
+        return " ".join(parts)
+
+
+def use_stage_timings(timings: StageTimings | None) -> None:
+    _CURRENT_TIMINGS.set(timings)
+
+
+def current_stage_timings() -> StageTimings | None:
+    return _CURRENT_TIMINGS.get()
+
+
+def mark_stage(stage: str) -> None:
+    """Stop a stage on the current turn's timings, if a turn is being timed."""
+    timings = _CURRENT_TIMINGS.get()
+    if timings is not None:
+        timings.stop(stage)
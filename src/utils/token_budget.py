@@ -0,0 +1,35 @@
+"""
+Token Budget
+
+Cheap token estimates for prompt budgeting. No tokenizer runs; local models
+average close to four characters per token for English text and code.
+"""
+
+CHARS_PER_TOKEN = 4
+# Role markers and separators the chat template adds around each message.
+MESSAGE_OVERHEAD_TOKENS = 4
+# Rough cost of one attached image; only the newest message keeps its image.
+IMAGE_TOKENS = 768
+
+
+def estimate_tokens(chars: int) -> int:
+    return -(-chars // CHARS_PER_TOKEN) if chars > 0 else 0
+
+
+def estimate_message_tokens(message: dict) -> int:
+    """Estimate the prompt tokens one chat message costs, including tool calls and images."""
+    content = message.get("content")
+    chars = 0
+    images = 0
+    if isinstance(content, str):
+        chars += len(content)
+    elif isinstance(content, list):
+        for item in content:
+            if item.get("type") == "text":
+                chars += len(item.get("text", ""))
+            else:
+                images += 1
+    for call in message.get("tool_calls") or []:
+        function = call.get("function") or {}
+        chars += len(function.get("name", "")) + len(str(function.get("arguments", "")))
+    return MESSAGE_OVERHEAD_TOKENS + estimate_tokens(chars) + images * IMAGE_TOKENS
@@ -12,7 +12,6 @@ import secrets
 import shutil
 import socketserver
 import subprocess
-import tempfile
 import threading
 import time
 import urllib.error
@@ -25,7 +24,7 @@ from pathlib import Path
 from typing import Any
 
 from chat.complexity_scorer import ComplexityScorer
-from chat.message_handler import process_task_stream
+from chat.message_handler import process_task_stream, routing_started
 from chat.session_state import InteractionStyle, QualityMode
 from runtime.capabilities import build_capability_snapshot, format_capability_answer
 from runtime.coding_jobs import approval_id_from_text, parse_coding_job_request
@@ -42,9 +41,13 @@ from runtime.intents import (
     should_background_task,
     task_title,
 )
-from runtime.jobs import DurableJobStore, RiskLevel
+from runtime.job_retention import RetentionPolicy
+from runtime.jobs import DurableJobStore, JobSummary, RiskLevel
+from runtime.memory.cache import MEMORY_CONTEXT_CACHE
+from runtime.memory.mcp_client import close_memory_sessions
 from runtime.memory.service import MemoryService
 from runtime.models import PreflightResult
+from runtime.pdf_summary import pdf_chunk_chars, summarize_pdf
 from runtime.preflight import PreflightManager
 from runtime.routing.model_registry import worker_model_settings
 from runtime.routing.router import RuntimeRouter
@@ -53,14 +56,20 @@ from runtime.routing.types import RequestEnvelope, RequestSource, RoutingDecisio
 from runtime.shared import RuntimeSharedState
 from runtime.tasks import BackgroundTask, BackgroundTaskManager, TaskStatus
 from runtime.tooling import build_tool_registry
-from runtime.triggers import TriggerStatus, TriggerStore, wait_for_file_ready
+from runtime.trigger_scheduler import FileTriggerMonitor, TriggerScheduler, format_interval, start_reminder_task
+from runtime.triggers import TriggerRecord, TriggerStatus, TriggerStore
 from runtime.vision import analyze_screen, vision_model_name
+from runtime.whisper_client import AudioPayload, LocalWhisperClient, shared_whisper_client
 from tools.approval import ApprovalManager
 from tools.browser import BrowserSession
+from tools.mcp_stdio import close_mcp_sessions
+from tools.pdf import pdf_header_path
 from tools.system_info import format_system_info_for_query
 from utils.settings import Settings
 
 _LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+# Browser recordings can be minutes long; microphone turns keep the client's shorter default.
+_LOCAL_AUDIO_TIMEOUT_SECONDS = 180.0
 _SAFE_REALTIME_TOOLS = {"get_current_time", "discover_capabilities"}
 _WEB_TOKEN_QUERY_RE = re.compile(r"(?i)(token=)[^&\s]+")
 _WEB_SECRET_RE = re.compile(r"(?i)(api[_-]?key|secret|password|token)([=:]\s*)([^\s,}]+)")
@@ -211,6 +220,19 @@ def _task_payload(task: BackgroundTask) -> dict[str, Any]:
     }
 
 
+def _job_summary_payload(job: JobSummary) -> dict[str, Any]:
+    return {
+        "id": job.id,
+        "title": _redact_api_value(job.title),
+        "status": job.status.value,
+        "sourceFrontend": job.source_frontend,
+        "priority": job.priority,
+        "createdAt": job.created_at,
+        "updatedAt": job.updated_at,
+        "completedAt": job.completed_at,
+    }
+
+
 def _trigger_payload(trigger) -> dict[str, Any]:
     return {
         "id": trigger.id,
@@ -265,7 +287,7 @@ class WebAssistantRuntime:
                 browser_session=self.browser_session,
                 approval_manager=self.approvals,
             )
-            self.job_store = DurableJobStore(settings.JOB_STORE_PATH)
+            self.job_store = DurableJobStore(settings.JOB_STORE_PATH, retention=RetentionPolicy.from_settings(settings))
             self.trigger_store = TriggerStore(settings.TRIGGER_STORE_PATH)
             self.task_manager = BackgroundTaskManager(
                 max_concurrent=max(1, int(settings.MAX_BACKGROUND_TASKS)),
@@ -292,14 +314,42 @@ class WebAssistantRuntime:
             models_ready=settings.all_model_names,
             screen_capture_available=bool(shutil.which("screencapture")),
         )
+        # The runtime that owns the trigger store runs its reminders and file triggers; a shared store is
+        # served by its owner.
+        self._trigger_scheduler = (
+            TriggerScheduler(
+                self.trigger_store,
+                lambda fire: start_reminder_task(self.task_manager, fire),
+                catch_up=settings.TRIGGER_CATCH_UP,
+            )
+            if self._owns_components
+            else None
+        )
+        self._file_triggers = (
+            FileTriggerMonitor(
+                self.trigger_store,
+                self._start_file_trigger_task,
+                timeout_seconds=float(settings.TRIGGER_TIMEOUT_SECONDS),
+                poll_seconds=float(settings.TRIGGER_CHECK_INTERVAL_SECONDS),
+            )
+            if self._owns_components
+            else None
+        )
         self._loop = asyncio.new_event_loop()
         self._thread = threading.Thread(target=self._run_loop, name="eyra-web-runtime", daemon=True)
         self._thread.start()
+        self._loop.call_soon_threadsafe(self._start_trigger_scheduler)
 
     def _run_loop(self) -> None:
         asyncio.set_event_loop(self._loop)
         self._loop.run_forever()
 
+    def _start_trigger_scheduler(self) -> None:
+        if self._trigger_scheduler is not None:
+            self._trigger_scheduler.start()
+        if self._file_triggers is not None:
+            self._file_triggers.start()
+
     def run_sync(self, coro, timeout: float = 30.0):
         future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         return future.result(timeout=timeout)
@@ -458,14 +508,10 @@ class WebAssistantRuntime:
         user_message: dict | None = None,
     ) -> str:
         interaction = InteractionStyle.VOICE if voice_mode in ("local", "realtime") else InteractionStyle.TEXT
-        routing_decision = await self._route_decision(
-            text,
-            voice_mode=voice_mode,
-            interaction=interaction,
-            is_worker=False,
-        )
         chunks: list[str] = []
-        async with self.model_semaphore:
+        # Routed while waiting for a model slot and reading instructions and memory.
+        routing = self._route_decision(text, voice_mode=voice_mode, interaction=interaction, is_worker=False)
+        async with routing_started(routing) as routing_decision, self.model_semaphore:
             async for chunk in process_task_stream(
                 text_content=text,
                 complexity_scorer=self.scorer,
@@ -673,23 +719,9 @@ class WebAssistantRuntime:
                 action={"type": "notify", "message": message},
                 original_request=text,
             )
-            task = self.task_manager.create_task(
-                title=trigger.title,
-                original_request=text,
-                worker=lambda task: self._run_recurring_timer_trigger(task, trigger.id),
-                used_tools=False,
-                normalized_task_spec={
-                    "task_type": "trigger.timer.recurring_reminder",
-                    "trigger_id": trigger.id,
-                    "message": message,
-                    "interval_seconds": interval_seconds,
-                    "next_fire_at": next_fire_at,
-                },
-                risk_level=RiskLevel.READ_ONLY,
-            )
+            self._start_trigger_scheduler()
             return {
-                "reply": f"Recurring reminder {trigger.id} created as task {task.id}",
-                "taskId": task.id,
+                "reply": f"Recurring reminder {trigger.id} repeats every {format_interval(interval_seconds)}",
                 "triggerId": trigger.id,
             }
 
@@ -710,20 +742,11 @@ class WebAssistantRuntime:
                 action={"type": "notify", "message": message},
                 original_request=text,
             )
-            task = self.task_manager.create_task(
-                title=trigger.title,
-                original_request=text,
-                worker=lambda task: self._run_timer_trigger(task, trigger.id),
-                used_tools=False,
-                normalized_task_spec={
-                    "task_type": "trigger.timer.reminder",
-                    "trigger_id": trigger.id,
-                    "message": message,
-                    "fire_at": fire_at,
-                },
-                risk_level=RiskLevel.READ_ONLY,
-            )
-            return {"reply": f"Reminder {trigger.id} created as task {task.id}", "taskId": task.id, "triggerId": trigger.id}
+            self._start_trigger_scheduler()
+            return {
+                "reply": f"Reminder {trigger.id} set for {time.strftime('%H:%M:%S', time.localtime(fire_at))}",
+                "triggerId": trigger.id,
+            }
 
         trigger_match = re.fullmatch(
             r"when\s+(?P<name>.+?)\s+appears\s+in\s+(?:my\s+)?(?P<src>desktop|documents|downloads|tmp|/tmp),?"
@@ -743,94 +766,24 @@ class WebAssistantRuntime:
             action={"type": "file.move", "destination": destination},
             original_request=text,
         )
-        task = self.task_manager.create_task(
+        self._start_trigger_scheduler()
+        return {"reply": f"Trigger {trigger.id} is watching {source}", "triggerId": trigger.id}
+
+    def _start_file_trigger_task(self, trigger: TriggerRecord) -> None:
+        self.task_manager.create_task(
             title=trigger.title,
-            original_request=text,
-            worker=lambda task: self._run_file_exists_trigger(task, trigger.id),
+            original_request=trigger.original_request,
+            worker=lambda task: self._run_file_trigger_action(task, trigger.id),
             required_filesystem=True,
             used_tools=True,
         )
-        return {"reply": f"Trigger {trigger.id} created as task {task.id}", "taskId": task.id, "triggerId": trigger.id}
 
-    async def _run_timer_trigger(self, task: BackgroundTask, trigger_id: str) -> str:
-        trigger = self.trigger_store.get_trigger(trigger_id)
-        if trigger is None:
-            return "Trigger was not found."
-        fire_at = float(trigger.condition.get("fire_at", 0.0))
-        message = str(trigger.action.get("message", "")).strip()
-        if trigger.action.get("type") != "notify" or not message or fire_at <= 0:
-            error = "Reminder trigger action is not supported."
-            self.trigger_store.mark_failed(trigger_id, error)
-            raise RuntimeError(error)
-
-        interval_seconds = max(0.01, float(self.settings.TRIGGER_CHECK_INTERVAL_SECONDS))
-        task.mark_progress(f"Waiting for reminder {trigger_id}")
-        while time.time() < fire_at:
-            if task.cancellation_requested:
-                self.trigger_store.mark_cancelled(trigger_id)
-                return "Reminder cancelled."
-            current = self.trigger_store.get_trigger(trigger_id)
-            if current is None:
-                raise RuntimeError("Reminder trigger was deleted.")
-            if current.status == TriggerStatus.CANCELLED:
-                return "Reminder cancelled."
-            if current.status == TriggerStatus.PAUSED:
-                task.mark_progress(f"Paused reminder {trigger_id}")
-                await asyncio.sleep(interval_seconds)
-                continue
-            await asyncio.sleep(min(interval_seconds, max(0.0, fire_at - time.time())))
-
-        current = self.trigger_store.get_trigger(trigger_id)
-        if current is not None and current.status == TriggerStatus.CANCELLED:
-            return "Reminder cancelled."
-        self.trigger_store.mark_completed(trigger_id)
-        task.mark_progress(f"Reminder fired: {message}")
-        return f"Reminder: {message}"
-
-    async def _run_recurring_timer_trigger(self, task: BackgroundTask, trigger_id: str) -> str:
-        trigger = self.trigger_store.get_trigger(trigger_id)
-        if trigger is None:
-            return "Trigger was not found."
-        message = str(trigger.action.get("message", "")).strip()
-        interval_seconds = float(trigger.condition.get("interval_seconds", 0.0))
-        next_fire_at = float(trigger.condition.get("next_fire_at", 0.0))
-        if trigger.action.get("type") != "notify" or not message or interval_seconds <= 0 or next_fire_at <= 0:
-            error = "Recurring reminder trigger action is not supported."
-            self.trigger_store.mark_failed(trigger_id, error)
-            raise RuntimeError(error)
-
-        check_interval = max(0.01, float(self.settings.TRIGGER_CHECK_INTERVAL_SECONDS))
-        timeout_seconds = max(interval_seconds, float(self.settings.TRIGGER_TIMEOUT_SECONDS))
-        deadline = time.monotonic() + timeout_seconds
-        task.mark_progress(f"Waiting for recurring reminder {trigger_id}")
-        while time.monotonic() < deadline:
-            if task.cancellation_requested:
-                self.trigger_store.mark_cancelled(trigger_id)
-                return "Recurring reminder cancelled."
-            current = self.trigger_store.get_trigger(trigger_id)
-            if current is None:
-                raise RuntimeError("Recurring reminder trigger was deleted.")
-            if current.status == TriggerStatus.CANCELLED:
-                return "Recurring reminder cancelled."
-            if current.status == TriggerStatus.PAUSED:
-                task.mark_progress(f"Paused recurring reminder {trigger_id}")
-                await asyncio.sleep(check_interval)
-                continue
-            next_fire_at = float(current.condition.get("next_fire_at", next_fire_at))
-            if time.time() >= next_fire_at:
-                fired_at = time.time()
-                next_fire_at = fired_at + interval_seconds
-                self.trigger_store.record_recurring_fire(trigger_id, last_fire_at=fired_at, next_fire_at=next_fire_at)
-                task.mark_progress(f"Recurring reminder fired: {message}")
-            await asyncio.sleep(min(check_interval, max(0.0, next_fire_at - time.time())))
-
-        self.trigger_store.mark_cancelled(trigger_id)
-        return "Recurring reminder reached its local timeout and stopped."
-
-    async def _run_file_exists_trigger(self, task: BackgroundTask, trigger_id: str) -> str:
+    async def _run_file_trigger_action(self, task: BackgroundTask, trigger_id: str) -> str:
         trigger = self.trigger_store.get_trigger(trigger_id)
         if trigger is None:
             return "Trigger was not found."
+        if trigger.status != TriggerStatus.ACTIVE:
+            return f"Trigger is {trigger.status.value}."
         source = str(trigger.condition.get("path", ""))
         destination = str(trigger.action.get("destination", ""))
         if trigger.action.get("type") != "file.move" or not source or not destination:
@@ -838,59 +791,34 @@ class WebAssistantRuntime:
             self.trigger_store.mark_failed(trigger_id, message)
             raise RuntimeError(message)
 
-        timeout_seconds = max(1.0, float(self.settings.TRIGGER_TIMEOUT_SECONDS))
-        interval_seconds = max(0.01, float(self.settings.TRIGGER_CHECK_INTERVAL_SECONDS))
-        deadline = asyncio.get_running_loop().time() + timeout_seconds
-        task.mark_progress(f"Waiting for {source}")
+        task.mark_progress(f"Moving {source}")
         try:
-            while asyncio.get_running_loop().time() < deadline:
-                if task.cancellation_requested:
-                    self.trigger_store.mark_cancelled(trigger_id)
-                    return "Trigger cancelled."
-                current = self.trigger_store.get_trigger(trigger_id)
-                if current is None:
-                    raise RuntimeError("Trigger was deleted.")
-                if current.status == TriggerStatus.CANCELLED:
-                    return "Trigger cancelled."
-                if current.status == TriggerStatus.PAUSED:
-                    task.mark_progress(f"Paused trigger {trigger_id}")
-                    await asyncio.sleep(interval_seconds)
-                    continue
-                if Path(source).expanduser().exists():
-                    if not await wait_for_file_ready(source, settle_seconds=interval_seconds):
-                        await asyncio.sleep(interval_seconds)
-                        continue
-                    moved = await self.registry.execute(
-                        "move_path",
-                        json.dumps({"source": source, "destination": destination, "overwrite": False}),
-                    )
-                    success = moved.content.startswith("Moved:")
-                    self.job_store.record_operation(
-                        job_id=task.id,
-                        user_request=trigger.original_request,
-                        normalized_action={"type": "trigger.file.move", "trigger_id": trigger.id},
-                        capability="filesystem.trigger",
-                        target=destination,
-                        before_state={"source": source, "destination": destination},
-                        after_state={"source": source, "destination": destination},
-                        risk_level=RiskLevel.LOW_RISK_CHANGE,
-                        success=success,
-                        undo={"type": "file.move", "source": destination, "destination": source} if success else {},
-                        error=None if success else moved.content,
-                    )
-                    if success:
-                        self.trigger_store.mark_completed(trigger_id)
-                        return moved.content
-                    self.trigger_store.mark_failed(trigger_id, moved.content)
-                    raise RuntimeError(moved.content)
-                await asyncio.sleep(interval_seconds)
+            moved = await self.registry.execute(
+                "move_path",
+                json.dumps({"source": source, "destination": destination, "overwrite": False}),
+            )
         except asyncio.CancelledError:
             self.trigger_store.mark_cancelled(trigger_id)
             raise
-
-        message = f"Trigger timed out after {int(timeout_seconds)} seconds."
-        self.trigger_store.mark_failed(trigger_id, message)
-        raise RuntimeError(message)
+        success = moved.content.startswith("Moved:")
+        self.job_store.record_operation(
+            job_id=task.id,
+            user_request=trigger.original_request,
+            normalized_action={"type": "trigger.file.move", "trigger_id": trigger.id},
+            capability="filesystem.trigger",
+            target=destination,
+            before_state={"source": source, "destination": destination},
+            after_state={"source": source, "destination": destination},
+            risk_level=RiskLevel.LOW_RISK_CHANGE,
+            success=success,
+            undo={"type": "file.move", "source": destination, "destination": source} if success else {},
+            error=None if success else moved.content,
+        )
+        if success:
+            self.trigger_store.mark_completed(trigger_id)
+            return moved.content
+        self.trigger_store.mark_failed(trigger_id, moved.content)
+        raise RuntimeError(moved.content)
 
     @staticmethod
     def _path_in_named_folder(folder: str, name: str) -> str:
@@ -913,31 +841,45 @@ class WebAssistantRuntime:
         ):
             return extracted.content
 
+        resolved = pdf_header_path(extracted.content)
+        if resolved is None:
+            return extracted.content
+
         task.mark_progress("Summarizing extracted PDF text")
         interaction = InteractionStyle.VOICE if voice_mode in ("local", "realtime") else InteractionStyle.TEXT
         worker_settings = worker_model_settings(self.settings)
-        prompt = (
-            "Summarize the PDF for the user's request. Be concise, factual, and do not ask for a follow-up. "
-            "If the user asked for a focus area, answer that focus directly.\n\n"
-            f"User request: {text}\n\n"
-            f"Extracted local PDF text:\n{extracted.content[:50000]}"
-        )
-        chunks: list[str] = []
-        async with self.model_semaphore:
-            async for chunk in process_task_stream(
-                text_content=prompt,
-                complexity_scorer=self.scorer,
-                settings=worker_settings,
-                messages=[{"role": "user", "content": prompt}],
-                quality_mode=QualityMode.BALANCED,
-                interaction_style=interaction,
-                tool_registry=None,
-                require_tools=False,
-            ):
-                chunks.append(chunk)
-                if len("".join(chunks)) > 120 and task.progress_summary == "Summarizing extracted PDF text":
-                    task.mark_progress("Preparing final answer")
-        return "".join(chunks).strip() or "The PDF text was extracted locally, but there was not enough readable text to summarize."
+
+        async def complete(prompt: str) -> str:
+            chunks: list[str] = []
+            async with self.model_semaphore:
+                async for chunk in process_task_stream(
+                    text_content=prompt,
+                    complexity_scorer=self.scorer,
+                    settings=worker_settings,
+                    messages=[{"role": "user", "content": prompt}],
+                    quality_mode=QualityMode.BALANCED,
+                    interaction_style=interaction,
+                    tool_registry=None,
+                    require_tools=False,
+                    raise_errors=True,
+                ):
+                    chunks.append(chunk)
+            return "".join(chunks)
+
+        try:
+            result = await summarize_pdf(
+                resolved,
+                text,
+                complete,
+                model=worker_settings.MODEL,
+                chunk_chars=pdf_chunk_chars(worker_settings),
+                concurrency=int(self.settings.MODEL_CONCURRENCY),
+                progress=task.mark_progress,
+            )
+        except Exception:
+            # process_task_stream has logged the backend failure.
+            return "The PDF text was extracted locally, but the model could not summarize it. Please try again."
+        return result or "The PDF text was extracted locally, but there was not enough readable text to summarize."
 
     async def route_last(self) -> dict[str, Any]:
         trace = self.last_route_trace
@@ -982,6 +924,7 @@ class WebAssistantRuntime:
             return {"result": f"Memory {action}.", "memory": await self.memory_service.status()}
         if action == "reload":
             self.memory_service = MemoryService(self.settings)
+            self.memory_service.reload_context()
             return {"result": "Memory reloaded.", "memory": await self.memory_service.status()}
         return {"error": "Unsupported memory action."}
 
@@ -1075,6 +1018,13 @@ class WebAssistantRuntime:
     async def list_tasks(self) -> dict[str, Any]:
         return {"tasks": [_task_payload(task) for task in self.task_manager.list_tasks(include_recent=True)]}
 
+    async def list_jobs(self, limit: int = 50, cursor: str | None = None) -> dict[str, Any]:
+        try:
+            page = self.job_store.list_job_summaries(limit=max(1, min(limit, 200)), cursor=cursor)
+        except ValueError as e:
+            return {"error": str(e), "status": "bad_request"}
+        return {"jobs": [_job_summary_payload(job) for job in page.items], "nextCursor": page.next_cursor}
+
     async def list_triggers(self) -> dict[str, Any]:
         return {"triggers": [_trigger_payload(trigger) for trigger in self.trigger_store.list_triggers()]}
 
@@ -1212,9 +1162,15 @@ class WebAssistantRuntime:
                     subscriber.put_nowait(payload)
 
     async def shutdown(self) -> None:
+        await close_memory_sessions()
+        await close_mcp_sessions()
         if self._owns_components:
             await self.task_manager.shutdown()
             await self.browser_session.close()
+            if self._trigger_scheduler is not None:
+                await self._trigger_scheduler.stop()
+            if self._file_triggers is not None:
+                await self._file_triggers.stop()
             self.trigger_store.close()
             self.job_store.close()
 
@@ -1878,6 +1834,18 @@ class _EyraWebHandler(BaseHTTPRequestHandler):
                 return
             self._send_json(200, self.runtime.run_sync(self.runtime.support_diagnostics()))
             return
+        if parsed.path == "/api/jobs":
+            if not self._authorized():
+                return
+            query = urllib.parse.parse_qs(parsed.query)
+            try:
+                limit = int(query.get("limit", ["50"])[0])
+            except ValueError:
+                self._send_json(400, {"error": "limit must be a number."})
+                return
+            payload = self.runtime.run_sync(self.runtime.list_jobs(limit, query.get("cursor", [""])[0] or None))
+            self._send_json(400 if payload.get("status") == "bad_request" else 200, payload)
+            return
         job_logs_match = re.fullmatch(r"/api/job/([^/]+)/logs", parsed.path)
         if job_logs_match:
             if not self._authorized():
@@ -2049,7 +2017,12 @@ class _EyraWebHandler(BaseHTTPRequestHandler):
             if not payload:
                 self._send_json(400, {"error": "No audio was received."})
                 return
-            transcript = transcribe_local_audio(payload)
+            try:
+                transcript = self.runtime.run_sync(
+                    transcribe_local_audio(payload, self.headers.get("Content-Type", "")), timeout=190
+                )
+            except Exception:
+                transcript = "Local Whisper error: transcription timed out."
             if transcript.startswith("Local Whisper error:"):
                 self._send_json(500, {"error": transcript})
                 return
@@ -2306,36 +2279,28 @@ async def call_realtime_tool(settings: Settings, payload: dict[str, Any]) -> str
     return result.content
 
 
-def transcribe_local_audio(audio: bytes) -> str:
-    wh = resolve_wh_bin()
-    if not wh:
-        return "Local Whisper error: wh is not installed or not on PATH."
-    temp_path = ""
+async def transcribe_local_audio(audio: bytes, content_type: str = "") -> str:
+    client = _local_whisper_client()
+    payload = AudioPayload(audio, _audio_format(content_type))
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp:
-            temp.write(audio)
-            temp_path = temp.name
-        completed = subprocess.run(
-            [wh, "transcribe", temp_path, "--raw"],
-            capture_output=True,
-            text=True,
-            timeout=180,
-            check=False,
-        )
-        if completed.returncode != 0:
-            return "Local Whisper error: " + (completed.stderr.strip() or completed.stdout.strip() or "transcription failed")
-        transcript = completed.stdout.strip()
-        return transcript or "Local Whisper error: no speech was detected."
+        transcript = await client.transcribe(payload, raw=True, timeout=_LOCAL_AUDIO_TIMEOUT_SECONDS)
     except Exception as e:
         return f"Local Whisper error: {e}"
-    finally:
-        if temp_path:
-            try:
-                import os
+    return transcript or "Local Whisper error: no speech was detected."
+
+
+def _local_whisper_client() -> LocalWhisperClient:
+    """The process-wide Local Whisper client, with ``wh`` resolved for its CLI fallback."""
+    client = shared_whisper_client()
+    return client if client.wh_bin else shared_whisper_client(resolve_wh_bin())
+
 
-                os.unlink(temp_path)
-            except OSError:
-                pass
+def _audio_format(content_type: str) -> str:
+    """Container name from a browser recording's MIME type, e.g. ``audio/webm;codecs=opus``."""
+    subtype = content_type.split(";", 1)[0].strip().lower().partition("/")[2]
+    if subtype in {"", "octet-stream"} or not subtype.replace("-", "").isalnum():
+        return "webm"
+    return {"mpeg": "mp3", "x-wav": "wav", "wave": "wav"}.get(subtype, subtype)
 
 
 def resolve_wh_bin() -> str | None:
@@ -2448,6 +2413,8 @@ def run_web_server(settings: Settings, preflight: PreflightResult | None = None)
         return
     print(f"Eyra web UI: http://{settings.WEB_UI_HOST}:{settings.WEB_UI_PORT}")
     print(f"Eyra web UI runtime: {runtime.runtime_scope}")
+    if settings.MEMORY_ENABLED:
+        MEMORY_CONTEXT_CACHE.persist_stats()
     if web_auth_required(settings):
         print(f"Eyra web UI token URL: http://{settings.WEB_UI_HOST}:{settings.WEB_UI_PORT}/?token={web_session_token}")
     try:
@@ -2457,6 +2424,7 @@ def run_web_server(settings: Settings, preflight: PreflightResult | None = None)
     finally:
         server.server_close()
         runtime.close()
+        MEMORY_CONTEXT_CACHE.save_stats(force=True)
 
 
 def run() -> None:
@@ -1,12 +1,15 @@
 """Tests for local runtime context snapshots."""
 
+import copy
 import os
 import sys
 
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from runtime.context import build_context_snapshot, format_context_answer
-from runtime.history import SemanticHistory, semantic_history_to_protocol_context
+from runtime.history import SemanticHistory, sanitize_semantic_entries, semantic_history_to_protocol_context
 from runtime.jobs import DurableJobStore, RiskLevel
 from runtime.models import LiveRuntimeState
 from utils.settings import Settings
@@ -145,3 +148,87 @@ def test_semantic_history_clear_removes_tool_id_mapping():
 
     assert history.to_list() == []
     assert history.tool_name_by_id == {}
+
+
+def _counting(monkeypatch, name):
+    import runtime.history.store as store
+
+    calls = []
+    original = getattr(store, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(store, name, wrapper)
+    return calls
+
+
+def test_semantic_history_rebuild_reuses_redacted_turns(monkeypatch):
+    messages = [
+        {"role": "user", "content": "open /Users/example/a.txt"},
+        {"role": "assistant", "content": "Done."},
+        {"role": "user", "content": "token=secret-token"},
+    ]
+    history = SemanticHistory()
+    for message in messages:
+        history.append_from_protocol(message)
+    calls = _counting(monkeypatch, "semantic_turn_from_protocol")
+
+    inserted = {"role": "assistant", "content": "Inserted reply"}
+    messages.insert(2, inserted)
+    history.rebuild_from_protocol(messages)
+
+    assert calls == [(inserted,)]
+    assert [entry["content"] for entry in history.to_list()] == [
+        "open ~/[user]/a.txt",
+        "Done.",
+        "Inserted reply",
+        "token=[REDACTED]",
+    ]
+
+
+def test_semantic_history_insert_of_tool_call_relabels_later_tool_result():
+    tool_result = {"role": "tool", "tool_call_id": "call_1", "content": "clipboard text"}
+    history = SemanticHistory()
+    history.append_from_protocol(tool_result)
+    assert history.to_list()[0]["content"] == "[tool result omitted]"
+
+    call = {"role": "assistant", "content": None, "tool_calls": [{"id": "call_1", "function": {"name": "read_clipboard"}}]}
+    history.rebuild_from_protocol([call, tool_result])
+
+    assert history.to_list()[1]["content"] == "[read_clipboard result omitted]"
+
+
+def test_semantic_snapshots_are_shared_until_the_log_changes():
+    history = SemanticHistory()
+    history.append_from_protocol({"role": "user", "content": "hello"})
+
+    first = history.snapshot()
+    assert history.snapshot() is first
+    assert history.recent(6)[0] is first[0]
+    with pytest.raises(TypeError):
+        history.recent(6)[0]["content"] = "changed"
+    editable = copy.deepcopy(history.recent(6)[0])
+    editable["content"] = "changed"
+
+    history.append_from_protocol({"role": "assistant", "content": "hi"})
+
+    assert history.snapshot() is not first
+    assert history.snapshot()[0] is first[0]
+    assert first[0]["content"] == "hello"
+
+
+def test_semantic_readers_do_not_redact_logged_entries_twice(monkeypatch):
+    history = SemanticHistory()
+    history.append_from_protocol({"role": "user", "content": "Read /Users/example/notes.txt"})
+    history.append_from_protocol({"role": "assistant", "content": "It lists chores."})
+    first_sanitized = sanitize_semantic_entries(history.recent(6))
+    first_context = semantic_history_to_protocol_context(history.recent(6))
+    calls = _counting(monkeypatch, "redact_semantic_text")
+
+    assert sanitize_semantic_entries(history.recent(6)) == first_sanitized
+    assert semantic_history_to_protocol_context(history.recent(6)) == first_context
+    assert calls == []
+    assert first_context[0]["content"] == "Read ~/[user]/notes.txt"
+
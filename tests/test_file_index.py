@@ -0,0 +1,140 @@
+"""Tests for the local file index behind search_files and named-folder lookups."""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tools.file_index import FileIndex, open_file_index
+from tools.operator import SearchFilesTool
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _index(tmp_path, root, **kwargs):
+    return FileIndex(tmp_path / "index.sqlite3", (root,), **kwargs)
+
+
+def _touch(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_search_matches_literal_case_sensitive_lines(tmp_path):
+    root = tmp_path / "docs"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("Alpha beta\nalpha gamma\n")
+    (root / "sub" / "b.md").write_text("nothing\nsee alpha here")
+    index = _index(tmp_path, root)
+
+    assert index.search(root, "alpha", 10) == [
+        f"{root / 'a.txt'}:2: alpha gamma",
+        f"{root / 'sub' / 'b.md'}:2: see alpha here",
+    ]
+    assert index.search(root / "sub", "alpha", 10) == [f"{root / 'sub' / 'b.md'}:2: see alpha here"]
+    assert index.search(root, "al", 1) == [f"{root / 'a.txt'}:2: alpha gamma"]
+
+
+def test_binary_hidden_and_oversized_files_are_not_indexed(tmp_path):
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "image.bin").write_bytes(b"needle\0")
+    (root / ".hidden.txt").write_text("needle")
+    (root / "big.txt").write_text("needle" * 4)
+    (root / "small.txt").write_text("needle")
+    index = _index(tmp_path, root)
+
+    with patch("tools.file_index.MAX_INDEXED_FILE_BYTES", 10):
+        assert index.search(root, "needle", 10) == [f"{root / 'small.txt'}:1: needle"]
+    assert sorted(entry.path.name for entry in index.list_folder(root)) == ["big.txt", "image.bin", "small.txt"]
+
+
+def test_rescan_picks_up_changed_and_removed_files(tmp_path):
+    root = tmp_path / "docs"
+    root.mkdir()
+    note = root / "note.txt"
+    note.write_text("old text")
+    gone = root / "gone.txt"
+    gone.write_text("old text too")
+    index = _index(tmp_path, root, rescan_seconds=0)
+    assert len(index.search(root, "old", 10)) == 2
+
+    note.write_text("new text")
+    _touch(note, 2_000_000_000_000_000_000)
+    gone.unlink()
+
+    assert index.search(root, "old", 10) == []
+    assert index.search(root, "new", 10) == [f"{note}:1: new text"]
+    assert index.refresh(root) == {"scanned": 1, "updated": 0, "removed": 0}
+
+
+def test_searches_within_rescan_interval_reuse_the_index(tmp_path):
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "a.txt").write_text("first")
+    index = _index(tmp_path, root, rescan_seconds=3600)
+    index.search(root, "first", 10)
+
+    with patch.object(index, "_scan", side_effect=AssertionError("rescanned")):
+        assert index.search(root, "first", 10) == [f"{root / 'a.txt'}:1: first"]
+
+
+def test_recent_files_rescan_only_when_the_folder_changes(tmp_path):
+    root = tmp_path / "Downloads"
+    root.mkdir()
+    (root / "old.pdf").write_bytes(b"%PDF")
+    _touch(root / "old.pdf", 1_000_000_000)
+    (root / "folder").mkdir()
+    index = _index(tmp_path, root)
+
+    assert [entry.path.name for entry in index.recent_files(root)] == ["old.pdf"]
+    with patch.object(index, "_scan", side_effect=AssertionError("rescanned")):
+        assert [entry.path.name for entry in index.recent_files(root)] == ["old.pdf"]
+
+    (root / "new.pdf").write_bytes(b"%PDF")
+    _touch(root, 3_000_000_000)
+
+    assert [entry.path.name for entry in index.recent_files(root)] == ["new.pdf", "old.pdf"]
+    assert sorted(entry.path.name for entry in index.list_folder(root)) == ["folder", "new.pdf", "old.pdf"]
+    assert index.list_folder(tmp_path / "elsewhere") is None
+
+
+def test_search_files_tool_scans_in_the_background_then_answers_from_the_index(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha beta")
+    index = FileIndex(tmp_path / ".index.sqlite3", (tmp_path,))
+    tool = SearchFilesTool(allowed_roots=(tmp_path,), default_path=tmp_path, file_index=index)
+    expected = f"{tmp_path / 'a.txt'}:1: alpha beta"
+
+    with patch("tools.operator.shutil.which", return_value=None):
+        assert _run(tool.execute(root=str(tmp_path), query="alpha", limit=5)).content == expected
+    deadline = time.monotonic() + 5
+    while not index.ready(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.ready(tmp_path)
+
+    with patch("tools.operator.shutil.which", side_effect=AssertionError("rg used")):
+        result = _run(tool.execute(root=str(tmp_path), query="alpha", limit=5))
+
+    assert result.content == expected
+
+
+def test_opening_the_index_with_other_roots_keeps_the_first_one_usable(tmp_path):
+    docs = tmp_path / "docs"
+    notes = tmp_path / "notes"
+    docs.mkdir()
+    notes.mkdir()
+    (docs / "a.txt").write_text("alpha in docs")
+    (notes / "b.txt").write_text("alpha in notes")
+    database = tmp_path / "shared.sqlite3"
+
+    first = open_file_index(database, (docs,))
+    second = open_file_index(database, (notes,))
+
+    assert second is not first
+    assert open_file_index(database, (docs,)) is first
+    assert first.search(docs, "alpha", 5) == [f"{docs / 'a.txt'}:1: alpha in docs"]
+    assert second.search(notes, "alpha", 5) == [f"{notes / 'b.txt'}:1: alpha in notes"]
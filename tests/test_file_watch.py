@@ -0,0 +1,113 @@
+"""Tests for the shared file watcher behind file-exists triggers."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from runtime.file_watch import FileWatcher
+
+BACKENDS = [pytest.param(True, id="inotify"), pytest.param(False, id="polling")]
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_watch_reports_a_file_written_after_registration(tmp_path, use_inotify):
+    watcher = FileWatcher(use_inotify=use_inotify)
+    target = tmp_path / "report.pdf"
+
+    async def scenario():
+        with watcher.watch(target, poll_seconds=0.02) as watch:
+            assert await watch.wait(0.1) is False
+            target.write_bytes(b"%PDF-1.4")
+            started = time.monotonic()
+            ready = await watch.wait(5)
+            return ready, time.monotonic() - started
+
+    try:
+        ready, elapsed = _run(scenario())
+    finally:
+        watcher.close()
+
+    assert ready is True
+    assert elapsed < 1.0
+
+
+def test_inotify_fires_on_close_without_waiting_for_the_poll_interval(tmp_path):
+    watcher = FileWatcher()
+    if watcher.backend != "inotify":
+        watcher.close()
+        pytest.skip("inotify is not available")
+    target = tmp_path / "a.txt"
+
+    async def scenario():
+        with watcher.watch(target, poll_seconds=30) as watch:
+            target.write_text("done")
+            return await watch.wait(2)
+
+    try:
+        assert _run(scenario()) is True
+    finally:
+        watcher.close()
+
+
+def test_many_paths_share_one_directory_watch_and_thread(tmp_path):
+    watcher = FileWatcher()
+    targets = [tmp_path / f"f{number}.txt" for number in range(200)]
+
+    async def scenario():
+        watches = [watcher.watch(target, poll_seconds=0.02) for target in targets]
+        targets[137].write_text("hit")
+        outcomes = await asyncio.gather(*(watch.wait(1.0) for watch in watches))
+        for watch in watches:
+            watch.close()
+        return outcomes
+
+    try:
+        outcomes = _run(scenario())
+        assert [index for index, ready in enumerate(outcomes) if ready] == [137]
+        assert len(watcher._directories) <= 1
+        assert watcher.watched_paths() == []
+    finally:
+        watcher.close()
+
+
+def test_missing_directory_is_polled_until_it_appears(tmp_path):
+    watcher = FileWatcher()
+    target = tmp_path / "later" / "file.txt"
+
+    async def scenario():
+        with watcher.watch(target, poll_seconds=0.02) as watch:
+            target.parent.mkdir()
+            target.write_text("x")
+            return await watch.wait(5)
+
+    try:
+        assert _run(scenario()) is True
+    finally:
+        watcher.close()
+
+
+def test_wake_returns_false_without_a_file(tmp_path):
+    watcher = FileWatcher()
+
+    async def scenario():
+        with watcher.watch(tmp_path / "never.txt") as watch:
+            asyncio.get_running_loop().call_later(0.05, watch.wake)
+            started = time.monotonic()
+            return await watch.wait(5), time.monotonic() - started
+
+    try:
+        ready, elapsed = _run(scenario())
+    finally:
+        watcher.close()
+
+    assert ready is False
+    assert elapsed < 1.0
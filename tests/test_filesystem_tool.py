@@ -150,6 +150,61 @@ class TestReadFileTool:
                 assert "\x00" not in r.content
         _run(run())
 
+    def _log(self, d, count=5000):
+        path = Path(d) / "app.log"
+        path.write_text("".join(f"line {n} é\n" for n in range(1, count + 1)))
+        return path
+
+    def test_read_line_range_tail_and_byte_range(self, tmp_path):
+        path = self._log(tmp_path)
+        tool = ReadFileTool(allowed_roots=(tmp_path,))
+        size = path.stat().st_size
+
+        lines = _run(tool.execute(path=str(path), start_line=4000, end_line=4001)).content
+        tail = _run(tool.execute(path=str(path), tail_lines=2)).content
+        first = _run(tool.execute(path=str(path), offset=0, length=8)).content
+
+        assert lines == f"File: {path} (62.4 KB) (showing lines 4000-4001 of 5000)\n\nline 4000 é\nline 4001 é\n"
+        assert tail.endswith("(showing last 2 lines)\n\nline 4999 é\nline 5000 é\n")
+        # The range ends inside the two-byte "é"; the split character is dropped, not reported as binary.
+        assert first == f"File: {path} (62.4 KB) (showing bytes 0-8 of {size})\n\nline 1 "
+
+    def test_clipped_tail_keeps_the_end_of_the_file(self, tmp_path):
+        path = self._log(tmp_path, count=20000)
+
+        r = _run(ReadFileTool(allowed_roots=(tmp_path,)).execute(path=str(path), tail_lines=10000)).content
+        header, text = r.split("\n\n", 1)
+        lines = text.splitlines()
+
+        assert text.endswith("line 20000 é\n")
+        assert lines[0] == f"line {20001 - len(lines)} é"
+        assert header.endswith(f"(showing last {len(lines)} lines, clipped to the last 64KB)")
+        assert len(text.encode()) <= 64000
+
+    def test_line_seek_uses_cached_sparse_index(self, tmp_path):
+        from tools import filesystem
+
+        path = self._log(tmp_path)
+        tool = ReadFileTool(allowed_roots=(tmp_path,))
+        filesystem._LINE_INDEX_CACHE.clear()
+
+        with patch.object(filesystem._LineIndex, "BLOCK", 100):
+            for line in (1, 2, 99, 1234, 5000):
+                r = _run(tool.execute(path=str(path), start_line=line, end_line=line))
+                assert r.content.endswith(f"\n\nline {line} é\n")
+        assert len(filesystem._LINE_INDEX_CACHE) == 1
+
+        path.write_text("changed\n")
+        r = _run(tool.execute(path=str(path), start_line=1, end_line=1))
+        assert r.content.endswith("(showing lines 1-1 of 1)\n\nchanged\n")
+
+    def test_default_read_header_is_unchanged_for_large_files(self, tmp_path):
+        path = self._log(tmp_path, count=20000)
+
+        r = _run(ReadFileTool(allowed_roots=(tmp_path,)).execute(path=str(path)))
+
+        assert r.content.startswith(f"File: {path} (262.6 KB) (showing first 64KB)\n\nline 1 é\n")
+
 
 class TestWriteFileTool:
     def test_write_and_read(self):
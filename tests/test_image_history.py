@@ -6,6 +6,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from utils.image_history import _strip_image_content, manage_message_history
+from utils.token_budget import estimate_message_tokens
 
 
 class TestStripImageContent:
@@ -49,6 +50,17 @@ class TestManageMessageHistory:
         assert len(result) == 5
         assert result[-1]["content"] == "msg 19"
 
+    def test_block_trimming_keeps_window_stable_between_blocks(self):
+        msgs = [{"role": "user", "content": f"msg {i}"} for i in range(15)]
+        windows = [
+            manage_message_history(msgs[:count], max_turns=10, block_turns=4)[0]["content"]
+            for count in range(11, 15)
+        ]
+        assert windows == ["msg 4"] * 4
+        trimmed = manage_message_history(msgs, max_turns=10, block_turns=4)
+        assert trimmed[0]["content"] == "msg 8"
+        assert len(trimmed) == 7
+
     def test_strips_images_from_older_messages(self):
         image_msg = {
             "role": "user",
@@ -92,3 +104,56 @@ class TestManageMessageHistory:
         manage_message_history(msgs)
         # Original should still have the image payload
         assert isinstance(msgs[0]["content"], list)
+
+
+class TestTokenBudgetHistory:
+    def test_small_turns_beyond_turn_cap_are_kept_when_they_fit(self):
+        msgs = [{"role": "user", "content": f"msg {i}"} for i in range(30)]
+
+        result = manage_message_history(msgs, token_budget=4000)
+
+        assert len(result) == 30
+
+    def test_old_large_tool_output_is_compacted_and_newest_turn_kept_whole(self):
+        pdf = "page text " * 8000
+        msgs = [
+            {"role": "user", "content": "read the pdf"},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": "1", "function": {"name": "read_pdf", "arguments": "{}"}}]},
+            {"role": "tool", "tool_call_id": "1", "content": pdf},
+            {"role": "assistant", "content": "It is a report."},
+            {"role": "user", "content": "thanks"},
+            {"role": "assistant", "content": "Welcome."},
+            {"role": "user", "content": "what was it about?"},
+        ]
+
+        result = manage_message_history(msgs, token_budget=1000)
+
+        assert len(result) == len(msgs)
+        assert "more characters omitted" in result[2]["content"]
+        assert result[-3:] == msgs[-3:]
+        assert sum(estimate_message_tokens(m) for m in result) <= 1000
+
+    def test_cached_summary_replaces_compacted_tool_output(self):
+        msgs = [
+            {"role": "user", "content": "list files"},
+            {"role": "tool", "tool_call_id": "1", "content": "file.txt\n" * 2000},
+            {"role": "user", "content": "next"},
+        ]
+
+        result = manage_message_history(msgs, token_budget=300, summarize=lambda _content: "2000 text files.")
+
+        assert result[1]["content"].endswith("2000 text files.")
+
+    def test_oldest_turns_dropped_when_compaction_is_not_enough(self):
+        msgs = [{"role": "user", "content": "x" * 400} for _ in range(10)]
+
+        result = manage_message_history(msgs, token_budget=350)
+
+        assert 1 <= len(result) < 10
+        assert result[-1] is msgs[-1]
+
+    def test_newest_turn_survives_a_budget_it_exceeds(self):
+        msgs = [{"role": "user", "content": "old"}, {"role": "user", "content": "y" * 10000}]
+
+        assert manage_message_history(msgs, token_budget=100) == [msgs[-1]]
+
@@ -2,10 +2,16 @@
 
 import asyncio
 import os
+import sqlite3
 import sys
+import threading
+import time
+
+import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+from runtime.job_retention import JobArchive, JobCompactor, RetentionPolicy
 from runtime.jobs import DurableJobStore, JobStatus, RiskLevel
 from runtime.tasks import BackgroundTaskManager, TaskStatus
 from utils.settings import Settings
@@ -150,9 +156,292 @@ def test_background_task_manager_persists_compatibility_task_rows(tmp_path):
     assert task.status == TaskStatus.COMPLETED
 
 
+def _committed_status(db_path, job_id):
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def test_job_store_groups_queued_writes_into_one_transaction(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3", batch_seconds=0.2)
+    batches = []
+    commit = store._writer._commit
+    store._writer._commit = lambda batch: batches.append(len(batch)) or commit(batch)
+
+    job = store.create_job(title="Batch", original_user_input="batch", source_frontend="terminal")
+    entries = [store.record_log(job.id, f"step {n}") for n in range(50)]
+    store.flush()
+
+    assert batches == [51]
+    assert [entry.id for entry in entries] == list(range(1, 51))
+    assert [log.message for log in store.list_logs(job.id)] == [f"step {n}" for n in range(50)]
+    store.close()
+
+
+def test_queued_job_updates_are_visible_before_commit(tmp_path):
+    db_path = tmp_path / "eyra-jobs.sqlite3"
+    store = DurableJobStore(db_path, batch_seconds=60)
+    job = store.create_job(title="Pending", original_user_input="pending", source_frontend="terminal")
+    store.flush()
+
+    store.update_job(job.id, status=JobStatus.RUNNING, current_step="Working")
+
+    assert store.get_job(job.id).current_step == "Working"
+    assert _committed_status(db_path, job.id) == "queued"
+    store.close()
+    assert _committed_status(db_path, job.id) == "running"
+
+
+def test_terminal_job_updates_are_committed_before_returning(tmp_path):
+    db_path = tmp_path / "eyra-jobs.sqlite3"
+    store = DurableJobStore(db_path, batch_seconds=60)
+    job = store.create_job(title="Finish", original_user_input="finish", source_frontend="terminal")
+
+    store.update_job(job.id, status=JobStatus.COMPLETED, final_result="done")
+
+    assert _committed_status(db_path, job.id) == "completed"
+    store.close()
+
+
+def test_failed_write_does_not_drop_the_rest_of_its_batch(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3", batch_seconds=0.2)
+    job = store.create_job(title="Original", original_user_input="one", source_frontend="terminal")
+    store.record_log(job.id, "before")
+    store.create_job(id=job.id, title="Duplicate", original_user_input="two", source_frontend="terminal")
+    store.record_log(job.id, "after")
+
+    assert [log.message for log in store.list_logs(job.id)] == ["before", "after"]
+    assert store.list_jobs()[0].title == "Original"
+    store.close()
+
+
+def _age_logs(store, job_id, seconds):
+    store.flush()
+    with store._conn:
+        store._conn.execute("UPDATE job_logs SET timestamp = timestamp - ? WHERE job_id = ?", (seconds, job_id))
+
+
+def _ledger_entry(store, job_id, target):
+    return store.record_operation(
+        job_id=job_id,
+        user_request="move",
+        normalized_action={"type": "file.move"},
+        capability="filesystem.move",
+        target=target,
+        before_state={},
+        after_state={},
+        risk_level=RiskLevel.LOW_RISK_CHANGE,
+        success=True,
+    )
+
+
+def test_compaction_archives_rows_older_than_the_age_limit(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    archive = JobArchive(tmp_path / "archive")
+    old = store.create_job(title="Old", original_user_input="old", source_frontend="terminal")
+    new = store.create_job(title="New", original_user_input="new", source_frontend="terminal")
+    store.record_log(old.id, "ancient progress")
+    _ledger_entry(store, old.id, "/tmp/a.txt")
+    store.record_log(new.id, "fresh progress")
+    store.flush()
+    _age_logs(store, old.id, 40 * 86400)
+    with store._conn:
+        store._conn.execute("UPDATE operation_ledger SET timestamp = timestamp - ?", (40 * 86400,))
+
+    result = store.compact(RetentionPolicy(max_age_days=30, max_logs_per_job=0, max_bytes=0), archive)
+
+    assert (result.archived_logs, result.archived_operations, result.more) == (1, 1, False)
+    assert store.list_logs(old.id) == []
+    assert store.list_operations(old.id) == []
+    assert [log.message for log in store.list_logs(new.id)] == ["fresh progress"]
+    assert [row["message"] for row in archive.search(kind="log")] == ["ancient progress"]
+    assert archive.search(kind="operation", job_id=old.id)[0]["target"] == "/tmp/a.txt"
+    store.close()
+
+
+def test_compaction_keeps_the_newest_logs_per_job(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    archive = JobArchive(tmp_path / "archive")
+    job = store.create_job(title="Chatty", original_user_input="chatty", source_frontend="terminal")
+    for number in range(15):
+        store.record_log(job.id, f"line {number}")
+    policy = RetentionPolicy(max_age_days=0, max_logs_per_job=10, max_bytes=0)
+
+    first = store.compact(policy, archive, max_rows=3)
+    second = store.compact(policy, archive, max_rows=3)
+
+    assert (first.archived_logs, first.more, second.archived_logs, second.more) == (3, True, 2, False)
+    assert [log.message for log in store.list_logs(job.id)] == [f"line {n}" for n in range(5, 15)]
+    assert [row["message"] for row in archive.search(job_id=job.id)] == [f"line {n}" for n in range(5)]
+    assert len(archive.segments()) == 2
+    store.close()
+
+
+def test_compaction_archives_oldest_rows_while_over_the_size_budget(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    archive = JobArchive(tmp_path / "archive")
+    job = store.create_job(title="Big", original_user_input="big", source_frontend="terminal")
+    for number in range(400):
+        store.record_log(job.id, f"{number:04d} " + "x" * 2000)
+    store.flush()
+    budget = store._live_bytes() // 2
+
+    while store.compact(RetentionPolicy(max_age_days=0, max_logs_per_job=0, max_bytes=budget), archive).more:
+        pass
+
+    remaining = [log.message[:4] for log in store.list_logs(job.id, limit=1000)]
+    assert store._live_bytes() <= budget
+    assert remaining and remaining == sorted(remaining)
+    assert archive.search(job_id=job.id, limit=1)[0]["message"][:4] == f"{int(remaining[0]) - 1:04d}"
+    store.close()
+
+
+def test_archive_search_skips_rows_archived_twice(tmp_path):
+    archive = JobArchive(tmp_path / "archive")
+    row = {"kind": "log", "id": 7, "job_id": "j1", "timestamp": 1.0, "level": "info", "message": "Moved file"}
+    archive.append([row])
+    archive.append([row, {**row, "id": 8, "message": "Verified"}])
+
+    assert [entry["id"] for entry in archive.search()] == [7, 8]
+    assert [entry["id"] for entry in archive.search(text="verified")] == [8]
+    assert [entry["id"] for entry in archive.search(limit=1)] == [8]
+
+
+def test_old_stores_switch_to_incremental_vacuum_only_when_asked(tmp_path):
+    db_path = tmp_path / "eyra-jobs.sqlite3"
+    legacy = sqlite3.connect(db_path)
+    legacy.execute("CREATE TABLE placeholder (id INTEGER)")
+    legacy.commit()
+    legacy.close()
+    store = DurableJobStore(db_path)
+    assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    store.compact(RetentionPolicy(), JobArchive(tmp_path / "archive"))
+    assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    assert store.convert_to_incremental_vacuum() is True
+    assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert store.convert_to_incremental_vacuum() is False
+    assert DurableJobStore(tmp_path / "fresh.sqlite3")._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    store.close()
+
+
+def test_compaction_writes_the_archive_without_holding_the_store_lock(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    job = store.create_job(title="Chatty", original_user_input="chatty", source_frontend="terminal")
+    for number in range(5):
+        store.record_log(job.id, f"line {number}")
+    archive = JobArchive(tmp_path / "archive")
+    real_append = archive.append
+    seen = {}
+
+    def append(records):
+        reader = threading.Thread(target=lambda: seen.setdefault("logs", store.list_logs(job.id)))
+        reader.start()
+        reader.join(timeout=2)
+        return real_append(records)
+
+    archive.append = append
+    result = store.compact(RetentionPolicy(max_age_days=0, max_logs_per_job=2, max_bytes=0), archive)
+
+    assert result.archived_logs == 3
+    assert len(seen["logs"]) == 5
+    assert [log.message for log in store.list_logs(job.id)] == ["line 3", "line 4"]
+    store.close()
+
+
+def test_background_compactor_runs_once_the_store_is_idle(tmp_path):
+    policy = RetentionPolicy(max_age_days=0, max_logs_per_job=1, max_bytes=0, archive_path=str(tmp_path / "archive"))
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    job = store.create_job(title="Idle", original_user_input="idle", source_frontend="terminal")
+    store.record_log(job.id, "first")
+    store.record_log(job.id, "second")
+    compactor = JobCompactor(store, policy, idle_seconds=0.05, interval_seconds=60)
+    compactor.start()
+
+    deadline = time.monotonic() + 5
+    while not compactor.archive.segments() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    compactor.stop()
+
+    assert [log.message for log in store.list_logs(job.id)] == ["second"]
+    store.close()
+
+
 def test_settings_loads_job_store_path_from_env(monkeypatch):
     monkeypatch.setenv("JOB_STORE_PATH", "/tmp/custom-eyra-jobs.sqlite3")
 
     settings = Settings.load_from_env()
 
     assert settings.JOB_STORE_PATH == "/tmp/custom-eyra-jobs.sqlite3"
+
+
+def test_job_summaries_page_by_keyset_without_gaps_or_repeats(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    created = [
+        store.create_job(title=f"Job {number}", original_user_input="x", source_frontend="terminal")
+        for number in range(7)
+    ]
+    store.flush()
+    with store._conn:
+        # Equal timestamps exercise the id tie-breaker.
+        store._conn.execute("UPDATE jobs SET updated_at = 100.0")
+
+    seen, cursor = [], None
+    while True:
+        page = store.list_job_summaries(limit=3, cursor=cursor)
+        seen.extend(job.id for job in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == sorted((job.id for job in created), reverse=True)
+    store.close()
+
+
+def test_job_summaries_read_only_the_covering_index(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    job = store.create_job(title="Queued", original_user_input="x", source_frontend="web")
+
+    summary = store.list_job_summaries(limit=5).items[0]
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id, title, status, source_frontend, priority, created_at, updated_at, "
+        "completed_at FROM jobs WHERE (updated_at, id) < (?, ?) ORDER BY updated_at DESC, id DESC LIMIT ?",
+        (1.0, "j", 5),
+    ).fetchall()
+
+    assert (summary.id, summary.title, summary.status) == (job.id, "Queued", JobStatus.QUEUED)
+    assert "COVERING INDEX idx_jobs_summary" in plan[0][3]
+    store.close()
+
+
+def test_operation_summaries_decode_json_lazily_and_page_newest_first(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+    job = store.create_job(title="Moves", original_user_input="x", source_frontend="terminal")
+    entries = [_ledger_entry(store, job.id, f"/tmp/{number}.txt") for number in range(5)]
+    store.flush()
+    with store._conn:
+        for number, entry in enumerate(entries):
+            store._conn.execute("UPDATE operation_ledger SET timestamp = ? WHERE id = ?", (100.0 + number, entry.id))
+
+    first = store.list_operation_summaries(limit=2)
+    rest = store.list_operation_summaries(limit=10, cursor=first.next_cursor)
+    summary = first.items[0]
+
+    assert [entry.id for entry in first.items + rest.items] == [entry.id for entry in reversed(entries)]
+    assert rest.next_cursor is None
+    assert "normalized_action" not in vars(summary)
+    assert summary.normalized_action == {"type": "file.move"}
+    assert summary.undo == {}
+    store.close()
+
+
+def test_job_summaries_reject_a_malformed_cursor(tmp_path):
+    store = DurableJobStore(tmp_path / "eyra-jobs.sqlite3")
+
+    with pytest.raises(ValueError, match="cursor"):
+        store.list_job_summaries(cursor="not-a-cursor")
+    store.close()
@@ -1,6 +1,8 @@
 """Tests for the Eyra entry point."""
 
+import json
 import os
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch
@@ -41,6 +43,17 @@ class TestLogPath:
                 assert get_log_file_path() == Path("/Users/example/Library/Logs/Eyra/eyra.log")
 
 
+class TestEntryModule:
+    def test_importing_main_does_not_load_the_runtime(self):
+        # Spawned PDF extraction workers import the entry module.
+        src = os.path.join(os.path.dirname(__file__), "..", "src")
+        probe = "import sys, main; print(sorted(m for m in ('runtime.live_session', 'sounddevice') if m in sys.modules))"
+
+        result = subprocess.run([sys.executable, "-c", probe], cwd=src, capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
+
+
 class TestCliSupportCommands:
     def test_safe_settings_report_flags_without_secret_values(self):
         settings = Settings(API_KEY="secret-value", OPENAI_API_KEY="sk-secret-value")
@@ -271,6 +284,48 @@ class TestCliSupportCommands:
         assert "App log:" in result.message
         assert "Do not share" in result.message
 
+    def test_jobs_archive_searches_archived_rows(self, monkeypatch, tmp_path, capsys):
+        from runtime.job_retention import JobArchive
+
+        monkeypatch.setenv("JOB_ARCHIVE_PATH", str(tmp_path / "archive"))
+        JobArchive(tmp_path / "archive").append(
+            [{"kind": "log", "id": 1, "job_id": "j1", "timestamp": 1.0, "level": "info", "message": "Moved report.pdf"}]
+        )
+
+        exit_code = cli(["jobs", "--json", "archive", "--grep", "report"])
+        payload = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 0
+        assert [row["message"] for row in payload["rows"]] == ["Moved report.pdf"]
+
+    def test_memory_reload_signals_the_running_eyra(self, monkeypatch, tmp_path, capsys):
+        marker = tmp_path / "memory-reload"
+        monkeypatch.setattr("runtime.memory.cache.RELOAD_PATH", marker)
+
+        exit_code = cli(["memory", "--json", "reload"])
+        payload = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 0
+        assert payload["memory"] == {"reload": True}
+        assert marker.read_text().split()[1] == str(os.getpid())
+
+    def test_memory_status_reports_cache_stats_saved_by_the_running_eyra(self, monkeypatch, tmp_path, capsys):
+        stats_path = tmp_path / "memory-cache-stats.json"
+        stats_path.write_text(json.dumps({"hits": 7, "misses": 2, "updatedAt": 0, "pid": 4242}))
+        monkeypatch.setattr("runtime.memory.cache.STATS_PATH", stats_path)
+
+        async def fake_status(self):
+            return {"ready": True, "enabled": True, "path": str(tmp_path / "memory.json")}
+
+        monkeypatch.setattr("runtime.cli.MemoryService.status", fake_status)
+
+        exit_code = cli(["memory", "status"])
+        output = capsys.readouterr().out
+
+        assert exit_code == 0
+        assert "Context cache (Eyra pid 4242" in output
+        assert "7 hits, 2 misses" in output
+
     def test_menu_bar_source_checkout_resource_is_discovered(self, monkeypatch, tmp_path):
         repo = tmp_path / "repo"
         package = repo / "apps" / "EyraMenuBar"
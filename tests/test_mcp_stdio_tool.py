@@ -245,3 +245,163 @@ class TestMcpStdioTools:
 
         assert len(result.content) < 5000
         assert "truncated" in result.content.lower()
+
+
+def _stateful_mcp_server(tmp_path):
+    script = tmp_path / "stateful_mcp.py"
+    script.write_text(
+        textwrap.dedent(
+            r'''
+            #!/usr/bin/env python3
+            import json
+            import os
+            import sys
+            import threading
+            import time
+
+            lock = threading.Lock()
+            version = {"tools": 1}
+
+            def read_msg():
+                headers = {}
+                while True:
+                    line = sys.stdin.buffer.readline()
+                    if not line:
+                        return None
+                    if line in (b"\r\n", b"\n"):
+                        break
+                    key, value = line.decode().split(":", 1)
+                    headers[key.lower()] = value.strip()
+                return json.loads(sys.stdin.buffer.read(int(headers["content-length"])))
+
+            def write_msg(payload):
+                raw = json.dumps(payload).encode()
+                with lock:
+                    sys.stdout.buffer.write(f"Content-Length: {len(raw)}\r\n\r\n".encode() + raw)
+                    sys.stdout.buffer.flush()
+
+            def reply(msg_id, text):
+                write_msg({"jsonrpc": "2.0", "id": msg_id, "result": {"content": [{"type": "text", "text": text}]}})
+
+            def slow(msg_id, seconds):
+                time.sleep(seconds)
+                reply(msg_id, "slow done")
+
+            while True:
+                msg = read_msg()
+                if msg is None:
+                    break
+                if "id" not in msg:
+                    continue
+                method = msg.get("method")
+                if method == "initialize":
+                    write_msg({"jsonrpc": "2.0", "id": msg["id"], "result": {"protocolVersion": "2024-11-05", "capabilities": {"tools": {"listChanged": True}}, "serverInfo": {"name": "stateful", "version": "1"}}})
+                elif method == "tools/list":
+                    write_msg({"jsonrpc": "2.0", "id": msg["id"], "result": {"tools": [{"name": f"tool_v{version['tools']}"}]}})
+                elif method == "tools/call":
+                    name = msg["params"]["name"]
+                    if name == "pid":
+                        reply(msg["id"], str(os.getpid()))
+                    elif name == "change":
+                        version["tools"] += 1
+                        write_msg({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+                        reply(msg["id"], "changed")
+                    elif name == "slow":
+                        threading.Thread(target=slow, args=(msg["id"], msg["params"]["arguments"]["seconds"])).start()
+            '''
+        )
+    )
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    return script
+
+
+async def _approved_call(tool, manager, name, arguments):
+    await tool.execute(server="fake", tool=name, arguments=arguments)
+    approval_id = manager.list_pending()[-1].id
+    manager.approve(approval_id)
+    return await tool.execute(server="fake", tool=name, arguments=arguments, approval_id=approval_id)
+
+
+class TestMcpConnectionPool:
+    def test_calls_reuse_one_server_process(self, tmp_path):
+        config = _config(tmp_path, _stateful_mcp_server(tmp_path))
+        manager = ApprovalManager()
+        tool = CallMcpTool(config_path=config, approval_manager=manager)
+
+        async def scenario():
+            first = await _approved_call(tool, manager, "pid", {})
+            second = await _approved_call(tool, manager, "pid", {})
+            return first.content, second.content
+
+        first, second = _run(scenario())
+
+        assert first.isdigit()
+        assert first == second
+
+    def test_tools_list_is_cached_until_server_reports_a_change(self, tmp_path):
+        config = _config(tmp_path, _stateful_mcp_server(tmp_path))
+        manager = ApprovalManager()
+        lister = ListMcpTools(config_path=config)
+        caller = CallMcpTool(config_path=config, approval_manager=manager)
+
+        async def scenario():
+            first = json.loads((await lister.execute(server="fake")).content)
+            cached = json.loads((await lister.execute(server="fake")).content)
+            await _approved_call(caller, manager, "change", {})
+            await asyncio.sleep(0.05)
+            refreshed = json.loads((await lister.execute(server="fake")).content)
+            session = await lister._session("fake")
+            return first, cached, refreshed, session.tools_list_refreshes
+
+        first, cached, refreshed, refreshes = _run(scenario())
+
+        assert first["tools"][0]["name"] == "tool_v1"
+        assert cached == first
+        assert refreshed["tools"][0]["name"] == "tool_v2"
+        assert refreshes == 2
+
+    def test_concurrent_requests_are_multiplexed_by_id(self, tmp_path):
+        config = _config(tmp_path, _stateful_mcp_server(tmp_path))
+        lister = ListMcpTools(config_path=config)
+
+        async def scenario():
+            session = await lister._session("fake")
+            started = asyncio.get_running_loop().time()
+            results = await asyncio.gather(
+                *(session.request("tools/call", {"name": "slow", "arguments": {"seconds": 0.4}}) for _ in range(3))
+            )
+            return results, asyncio.get_running_loop().time() - started
+
+        results, elapsed = _run(scenario())
+
+        assert [item["content"][0]["text"] for item in results] == ["slow done"] * 3
+        assert elapsed < 1.0
+
+    def test_backpressure_rejects_requests_beyond_the_wait_queue(self, tmp_path):
+        config = _config(tmp_path, _stateful_mcp_server(tmp_path))
+        lister = ListMcpTools(config_path=config, max_in_flight=1)
+
+        async def scenario():
+            session = await lister._session("fake")
+            return await asyncio.gather(
+                *(session.request("tools/call", {"name": "slow", "arguments": {"seconds": 0.1}}) for _ in range(6)),
+                return_exceptions=True,
+            )
+
+        results = _run(scenario())
+
+        busy = [item for item in results if isinstance(item, RuntimeError)]
+        assert len(busy) == 1
+        assert "busy" in str(busy[0])
+
+    def test_idle_server_stops_after_keepalive(self, tmp_path):
+        config = _config(tmp_path, _stateful_mcp_server(tmp_path))
+        lister = ListMcpTools(config_path=config, keepalive_seconds=0)
+
+        async def scenario():
+            await lister.execute(server="fake")
+            session = await lister._session("fake")
+            await asyncio.sleep(0.5)
+            return session.proc
+
+        assert _run(scenario()) is None
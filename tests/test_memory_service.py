@@ -1,11 +1,14 @@
 import asyncio
+import json
 import os
 import sys
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from chat.complexity_scorer import ComplexityScorer
 from chat.message_handler import process_task_stream
+from runtime.memory.cache import MEMORY_CONTEXT_CACHE, MemoryContextCache, load_stats, request_reload
 from runtime.memory.service import MemoryService
 from tools.registry import ToolRegistry
 from utils.settings import Settings
@@ -260,3 +263,189 @@ def test_process_task_stream_loads_compact_instruction_files(monkeypatch, tmp_pa
 
 async def _collect(stream):
     return [chunk async for chunk in stream]
+
+
+def test_memory_calls_reuse_one_persistent_server(tmp_path):
+    settings = _memory_settings(tmp_path)
+
+    async def scenario():
+        service = MemoryService(settings)
+        await service.client.call_tool("memory_context")
+        first = service.client.connection_status()
+        results = await asyncio.gather(*(MemoryService(settings).client.call_tool("memory_context") for _ in range(5)))
+        second = service.client.connection_status()
+        return first, results, second
+
+    first, results, second = _run(scenario())
+
+    assert first["state"] == "ready"
+    assert first["pid"] is not None
+    assert second["pid"] == first["pid"]
+    assert second["requests"] == 6
+    assert all("No memories stored yet" in result for result in results)
+
+
+def test_memory_server_restarts_after_crash(tmp_path):
+    settings = _memory_settings(tmp_path)
+
+    async def scenario():
+        service = MemoryService(settings)
+        await service.client.call_tool("memory_context")
+        before = service.client.connection_status()
+        os.kill(before["pid"], 9)
+        await asyncio.sleep(0.2)
+        crashed = service.client.connection_status()
+        summary = await service.client.call_tool("memory_context")
+        return before, crashed, summary, service.client.connection_status()
+
+    before, crashed, summary, after = _run(scenario())
+
+    assert crashed["state"] == "crashed"
+    assert "No memories stored yet" in summary
+    assert after["state"] == "ready"
+    assert after["restarts"] == 1
+    assert after["pid"] != before["pid"]
+
+
+def test_memory_server_stops_after_idle_timeout(tmp_path):
+    settings = _memory_settings(tmp_path, MEMORY_MCP_IDLE_SECONDS=0)
+
+    async def scenario():
+        service = MemoryService(settings)
+        await service.show()
+        await asyncio.sleep(0.5)
+        return service.client.connection_status()
+
+    status = _run(scenario())
+
+    assert status["state"] == "stopped"
+    assert status["pid"] is None
+    assert status["idleShutdowns"] == 1
+
+
+def test_memory_status_exposes_connection_health(tmp_path):
+    settings = _memory_settings(tmp_path)
+
+    status = _run(MemoryService(settings).status())
+
+    assert status["connection"]["state"] == "ready"
+    assert status["connection"]["idleTimeoutSeconds"] == 300
+
+
+def test_memory_context_is_cached_until_eyra_writes(tmp_path):
+    settings = _memory_settings(tmp_path)
+    MEMORY_CONTEXT_CACHE.clear()
+
+    async def scenario():
+        service = MemoryService(settings)
+        first = await service.memory_context_messages()
+        second = await service.memory_context_messages()
+        requests_before_write = service.client.connection_status()["requests"]
+        await service.remember("I prefer cached memory tests")
+        third = await service.memory_context_messages()
+        return first, second, requests_before_write, third
+
+    first, second, requests_before_write, third = _run(scenario())
+
+    assert first == second == []
+    assert requests_before_write == 1
+    assert "prefer_cached_memory_tests" in third[0]["content"]
+    stats = MEMORY_CONTEXT_CACHE.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["invalidations"] == 1
+
+
+def test_memory_context_cache_notices_external_file_changes(tmp_path):
+    settings = _memory_settings(tmp_path)
+    MEMORY_CONTEXT_CACHE.clear()
+    memory_file = tmp_path / "memory.json"
+
+    async def scenario():
+        service = MemoryService(settings)
+        before = await service.show()
+        memory_file.write_text(json.dumps({"sections": {"user_preferences": [{"key": "edited", "value": "by hand"}]}}))
+        after = await service.show()
+        return before, after
+
+    before, after = _run(scenario())
+
+    assert "No memories stored yet" in before
+    assert "edited: by hand" in after
+    assert MEMORY_CONTEXT_CACHE.stats()["hits"] == 0
+
+
+def test_memory_context_cache_is_keyed_by_budget(tmp_path):
+    settings = _memory_settings(tmp_path)
+    MEMORY_CONTEXT_CACHE.clear()
+
+    async def scenario():
+        service = MemoryService(settings)
+        await service.show(max_chars=200)
+        await service.show(max_chars=400)
+        await service.show(max_chars=200)
+
+    _run(scenario())
+
+    assert MEMORY_CONTEXT_CACHE.stats()["hits"] == 1
+    assert MEMORY_CONTEXT_CACHE.stats()["misses"] == 2
+    assert "contextCache" in _run(MemoryService(settings).status())
+
+
+def test_pinned_memory_context_holds_session_snapshot_until_reload(tmp_path):
+    settings = _memory_settings(tmp_path)
+    MEMORY_CONTEXT_CACHE.clear()
+
+    async def scenario():
+        service = MemoryService(settings)
+        await service.remember("I prefer pinned memory snapshots")
+        first = await service.memory_context_messages(pinned=True)
+        await service.remember("I prefer tea over coffee")
+        second = await service.memory_context_messages(pinned=True)
+        service.reload_context()
+        third = await service.memory_context_messages(pinned=True)
+        return first, second, third
+
+    first, second, third = _run(scenario())
+
+    assert first == second
+    assert "tea" not in second[0]["content"]
+    assert "tea" in third[0]["content"]
+    assert MEMORY_CONTEXT_CACHE.stats()["pinned"] == 1
+
+
+def test_running_cache_saves_stats_for_the_cli(tmp_path):
+    stats_path = tmp_path / "memory-cache-stats.json"
+    cache = MemoryContextCache()
+    cache.persist_stats(stats_path)
+    memory_file = tmp_path / "memory.json"
+    memory_file.write_text("{}")
+
+    _, token = cache.lookup(("k",), memory_file)
+    cache.store(("k",), token, "context")
+    cache.lookup(("k",), memory_file)
+    cache.save_stats(force=True)
+
+    saved = load_stats(stats_path)
+    assert (saved["hits"], saved["misses"], saved["pid"]) == (1, 1, os.getpid())
+    assert load_stats(tmp_path / "missing.json") is None
+
+
+def test_reload_request_reaches_a_cache_in_another_process(tmp_path):
+    marker = tmp_path / "memory-reload"
+    memory_file = tmp_path / "memory.json"
+    memory_file.write_text("{}")
+    running = MemoryContextCache()
+    with patch("runtime.memory.cache.RELOAD_PATH", marker):
+        _, token = running.lookup(("k",), memory_file)
+        running.store(("k",), token, "context")
+        running.pin(("k",), "snapshot")
+
+        request_reload()
+        assert running.pinned(("k",)) is None
+        assert running.lookup(("k",), memory_file)[0] is None
+        # The same marker is not applied twice.
+        running.pin(("k",), "fresh")
+        assert running.pinned(("k",)) == "fresh"
+        request_reload()
+        assert running.pinned(("k",)) is None
@@ -1,20 +1,26 @@
 """Tests for message routing and response context construction."""
 
 import asyncio
+import logging
 import os
 import sys
 
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from chat.complexity_scorer import ComplexityScorer
-from chat.message_handler import process_task_stream
+from chat.message_handler import process_task_stream, routing_started
+from chat.prompt_prefix import PROMPT_PREFIX_TRACKER, PromptPrefixTracker
 from chat.session_state import InteractionStyle, QualityMode
+from chat.tool_summaries import ToolOutputSummaries
 from runtime.models import PreflightResult
 from runtime.routing.router import RuntimeRouter
 from runtime.routing.types import RequestEnvelope, RequestSource
 from runtime.tooling import build_tool_registry
 from tools.registry import ToolRegistry
 from utils.settings import Settings
+from utils.stage_timings import mark_stage
 
 
 def _run(coro):
@@ -37,6 +43,31 @@ class _RecordingClient:
         yield "ok"
 
 
+class _ConnectingClient(_RecordingClient):
+    async def generate_completion_stream(self, messages, **kwargs):
+        self.messages = messages
+        mark_stage("connect")
+        yield "ok"
+
+
+class _GatedScorer(ComplexityScorer):
+    """Scorer that only finishes once the memory context fetch has started."""
+
+    def __init__(self, memory_started: asyncio.Event):
+        super().__init__()
+        self.memory_started = memory_started
+
+    async def score_complexity(self, text, messages=None):
+        await asyncio.wait_for(self.memory_started.wait(), timeout=2)
+        return await super().score_complexity(text, messages=messages)
+
+
+class _FailingClient:
+    async def generate_completion_stream(self, messages, **kwargs):
+        raise ConnectionError("backend down")
+        yield ""
+
+
 class _NoToolClient:
     async def stream_with_tools(self, messages, **kwargs):
         if kwargs.get("require_tools"):
@@ -214,6 +245,204 @@ class TestProcessTaskStream:
         assert client.calls[-1]["allowed_tool_names"] == frozenset()
         assert client.calls[-1]["require_tools"] is False
 
+    def test_context_is_built_while_routing(self, monkeypatch):
+        client = _RecordingClient()
+        monkeypatch.setattr("chat.message_handler.get_ai_client", lambda *_, **__: client)
+
+        async def scenario():
+            memory_started = asyncio.Event()
+
+            async def memory_context(_service, **_kwargs):
+                memory_started.set()
+                return [{"role": "system", "content": "memory facts"}]
+
+            monkeypatch.setattr("chat.message_handler.MemoryService.memory_context_messages", memory_context)
+            settings = Settings(USE_MOCK_CLIENT=True, COMPLEXITY_ROUTING_ENABLED=True)
+            return await _collect(process_task_stream(
+                "hi",
+                complexity_scorer=_GatedScorer(memory_started),
+                settings=settings,
+                messages=[{"role": "user", "content": "hi"}],
+            ))
+
+        assert _run(scenario()) == ["ok"]
+        assert any(msg["content"] == "memory facts" for msg in client.messages)
+
+    def test_routing_coroutine_from_the_caller_runs_while_context_is_built(self, monkeypatch):
+        client = _RecordingClient()
+        monkeypatch.setattr("chat.message_handler.get_ai_client", lambda *_, **__: client)
+        settings = Settings(USE_MOCK_CLIENT=True, MODEL="main")
+        preflight = PreflightResult(backend_reachable=True, models_ready=settings.all_model_names)
+        envelope = RequestEnvelope(
+            text="hi",
+            source=RequestSource.TEST,
+            interaction_style=InteractionStyle.TEXT,
+            quality_mode=QualityMode.BALANCED,
+            messages=[],
+            current_goal=None,
+            is_worker=False,
+            settings=settings,
+            preflight=preflight,
+        )
+
+        async def scenario():
+            memory_started = asyncio.Event()
+
+            async def memory_context(_service, **_kwargs):
+                memory_started.set()
+                return [{"role": "system", "content": "memory facts"}]
+
+            async def route():
+                await asyncio.wait_for(memory_started.wait(), timeout=2)
+                return await RuntimeRouter(ComplexityScorer()).route(envelope)
+
+            monkeypatch.setattr("chat.message_handler.MemoryService.memory_context_messages", memory_context)
+            return await _collect(process_task_stream(
+                "hi",
+                complexity_scorer=ComplexityScorer(),
+                settings=settings,
+                messages=[{"role": "user", "content": "hi"}],
+                routing_decision=route(),
+            ))
+
+        assert _run(scenario()) == ["ok"]
+        assert any(msg["content"] == "memory facts" for msg in client.messages)
+
+    def test_stage_timings_are_logged_at_first_token(self, monkeypatch, caplog):
+        client = _ConnectingClient()
+        monkeypatch.setattr("chat.message_handler.get_ai_client", lambda *_, **__: client)
+        caplog.set_level(logging.INFO, logger="chat.message_handler")
+
+        _run(_collect(process_task_stream(
+            "hi",
+            complexity_scorer=ComplexityScorer(),
+            settings=Settings(USE_MOCK_CLIENT=True, MODEL="main", COMPLEXITY_ROUTING_ENABLED=False),
+            messages=[{"role": "user", "content": "hi"}],
+        )))
+
+        line = next(record.getMessage() for record in caplog.records if "Turn timings" in record.getMessage())
+        assert "model=main" in line
+        for stage in ("route=", "context=", "connect=", "first_token="):
+            assert stage in line
+        assert "connect=-" not in line
+
+    def test_backend_failure_is_an_apology_or_raised_for_callers_that_keep_the_reply(self, monkeypatch):
+        monkeypatch.setattr("chat.message_handler.get_ai_client", lambda *_, **__: _FailingClient())
+        settings = Settings(USE_MOCK_CLIENT=True, MODEL="main", COMPLEXITY_ROUTING_ENABLED=False)
+
+        def stream(**kwargs):
+            return _collect(process_task_stream("hi", complexity_scorer=ComplexityScorer(), settings=settings, **kwargs))
+
+        assert _run(stream()) == ["Something went wrong. Please try again."]
+        with pytest.raises(ConnectionError, match="backend down"):
+            _run(stream(raise_errors=True))
+
+    def test_stable_prefix_mode_reuses_previous_prompt_prefix(self, monkeypatch):
+        client = _RecordingClient()
+        monkeypatch.setattr("chat.message_handler.get_ai_client", lambda *_, **__: client)
+        PROMPT_PREFIX_TRACKER.clear()
+        settings = Settings(USE_MOCK_CLIENT=True, MODEL="main", PROMPT_PREFIX_STABLE=True)
+        history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i}"} for i in range(25)]
+
+        prompts = []
+        for count in (23, 25):
+            _run(_collect(process_task_stream(
+                "next",
+                complexity_scorer=ComplexityScorer(),
+                settings=settings,
+                messages=history[:count],
+            )))
+            prompts.append(client.messages)
+
+        assert prompts[1][: len(prompts[0])] == prompts[0]
+        stats = PROMPT_PREFIX_TRACKER.stats()
+        assert stats["turns"] == 2
+        assert 0 < stats["lastReusedTokens"] < stats["lastPromptTokens"]
+
+
+def test_routing_runs_while_the_caller_waits_for_a_model_slot():
+    async def scenario():
+        semaphore = asyncio.Semaphore(1)
+        routed = asyncio.Event()
+
+        async def route():
+            routed.set()
+            return "decision"
+
+        await semaphore.acquire()
+        asyncio.get_running_loop().call_later(0.05, semaphore.release)
+        async with routing_started(route()) as routing, semaphore:
+            assert routed.is_set()
+            return await routing
+
+    assert _run(scenario()) == "decision"
+
+
+def test_routing_is_cancelled_when_the_turn_ends_early(caplog):
+    async def scenario():
+        started = asyncio.Event()
+
+        async def route():
+            started.set()
+            await asyncio.sleep(10)
+
+        with pytest.raises(RuntimeError):
+            async with routing_started(route()) as routing:
+                await started.wait()
+                raise RuntimeError("model backend is down")
+        await asyncio.sleep(0)
+        return routing
+
+    assert _run(scenario()).cancelled()
+
+    async def failing_turn():
+        async def route():
+            raise ValueError("router failed")
+
+        async with routing_started(route()) as routing:
+            await asyncio.sleep(0)
+        return routing
+
+    with caplog.at_level(logging.ERROR, logger="asyncio"):
+        assert isinstance(_run(failing_turn()).exception(), ValueError)
+    assert "never retrieved" not in caplog.text
+
+
+def test_prompt_prefix_tracker_counts_shared_prefix_per_model():
+    tracker = PromptPrefixTracker()
+    system = {"role": "system", "content": "x" * 400}
+
+    assert tracker.observe("main", [system, {"role": "user", "content": "a"}])[0] == 0
+    reused, total = tracker.observe("main", [system, {"role": "user", "content": "b"}])
+    assert reused >= 100
+    assert total > reused
+    assert tracker.observe("other", [system])[0] == 0
+
+
+def test_tool_output_summary_is_generated_in_background_and_cached():
+    class _SummaryClient:
+        def __init__(self):
+            self.calls = []
+
+        async def generate_completion(self, messages, **kwargs):
+            self.calls.append(kwargs["model_name"])
+            return {"content": "  Forty files,\n mostly logs. "}
+
+    client = _SummaryClient()
+    summaries = ToolOutputSummaries()
+
+    async def scenario():
+        first = summaries.lookup("long output", lambda: client, "simple")
+        again = summaries.lookup("long output", lambda: client, "simple")
+        await summaries.wait_pending()
+        return first, again, summaries.lookup("long output", lambda: client, "simple")
+
+    first, again, cached = _run(scenario())
+
+    assert first is None and again is None
+    assert cached == "Forty files, mostly logs."
+    assert client.calls == ["simple"]
+
 
 async def _collect(stream):
     return [chunk async for chunk in stream]
@@ -0,0 +1,98 @@
+"""Tests for the callback-driven microphone capture ring."""
+
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from runtime.mic_capture import FrameRing, MicCapture
+
+
+def _frames(first: int, count: int, samples: int) -> np.ndarray:
+    """Blocks whose n-th frame is filled with the value n."""
+    return np.repeat(np.arange(first, first + count, dtype=np.int16), samples)
+
+
+def test_blocks_of_any_size_land_in_frames_across_the_wrap():
+    ring = FrameRing(capacity=4, frame_samples=3)
+
+    data = _frames(1, 6, 3)
+    for block in np.split(data, [2, 7, 11]):
+        ring.write(block)
+
+    assert ring.frames_written == 6
+    assert ring.frame(5).tolist() == [6, 6, 6]
+    # Frames 3-5 wrap around the end of the ring and come back as one slice.
+    np.testing.assert_array_equal(ring.extract(3, 6), _frames(4, 3, 3))
+
+
+def test_extract_leaves_out_frames_that_were_overwritten():
+    ring = FrameRing(capacity=4, frame_samples=2)
+    ring.write(_frames(1, 10, 2))
+
+    np.testing.assert_array_equal(ring.extract(0, 10), _frames(7, 4, 2))
+    # Half of frame 11 is in, so frame 7 is partly overwritten and left out too.
+    ring.write(np.array([11], dtype=np.int16))
+    np.testing.assert_array_equal(ring.extract(0, 10), _frames(8, 3, 2))
+
+
+def test_vad_frame_is_scaled_into_one_reusable_buffer():
+    capture = MicCapture(sample_rate=16000, frame_samples=4, capacity_frames=8)
+    capture._callback(np.array([[16384], [-32768], [0], [8192]], dtype=np.int16), 4, None, None)
+    capture._callback(np.full((4, 1), 16384, dtype=np.int16), 4, None, None)
+
+    frame = capture.vad_frame(capture.next(timeout=0))
+    assert frame.dtype == np.float32
+    assert frame.tolist() == [0.5, -1.0, 0.0, 0.25]
+
+    second = capture.vad_frame(capture.next(timeout=0))
+    assert second is frame and frame.tolist() == [0.5] * 4
+    assert capture.ring.scaled.nbytes == 4 * 4
+    assert capture.next(timeout=0) is None
+
+
+def test_reset_starts_the_same_ring_over():
+    capture = MicCapture(sample_rate=16000, frame_samples=2, capacity_frames=8)
+    samples = capture.ring.samples
+    capture._callback(_frames(1, 20, 2).reshape(-1, 1), 40, None, True)
+    capture.next(timeout=0)
+
+    capture.reset()
+    capture._callback(_frames(5, 1, 2).reshape(-1, 1), 2, None, None)
+
+    assert (capture.next(timeout=0), capture.dropped, capture.overflows) == (0, 0, 0)
+    assert capture.ring.samples is samples
+    np.testing.assert_array_equal(capture.extract(0, 1), [5, 5])
+
+
+def test_reader_that_falls_behind_skips_to_the_oldest_safe_frame():
+    capture = MicCapture(sample_rate=16000, frame_samples=2, capacity_frames=8)
+    capture._callback(_frames(1, 20, 2).reshape(-1, 1), 40, None, True)
+
+    index = capture.next(timeout=0)
+
+    assert index == capture.ring.oldest == 14
+    assert capture.frame(index).tolist() == [15, 15]
+    assert capture.dropped == 14
+    assert capture.overflows == 1
+
+
+def test_writing_frames_allocates_no_sample_memory():
+    capture = MicCapture(sample_rate=16000, frame_samples=512, capacity_frames=64)
+    block = np.ones((512, 1), dtype=np.int16)
+    capture._callback(block, 512, None, None)
+
+    tracemalloc.start()
+    try:
+        for _ in range(200):
+            capture._callback(block, 512, None, None)
+            capture.vad_frame(capture.next(timeout=0))
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # One frame of samples is 1 KiB as int16 and 2 KiB as float32; nothing close to that is allocated.
+    assert peak < 1024
@@ -95,3 +95,11 @@ class TestModelRegistry:
         assert settings.MODEL == "worker"
         assert settings.SIMPLE_MODEL == "worker"
         assert settings.MODERATE_MODEL == "worker"
+
+    def test_context_length_is_reported_window_capped_by_setting(self):
+        preflight = PreflightResult(models_ready=["main", "small"], model_context_lengths={"main": 131072, "small": 4096})
+        registry = ModelRegistry(Settings(MODEL="main", CONTEXT_WINDOW_TOKENS=8192), preflight)
+
+        assert registry.context_length("main") == 8192
+        assert registry.context_length("small") == 4096
+        assert registry.context_length("unknown") == 8192
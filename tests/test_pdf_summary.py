@@ -0,0 +1,150 @@
+"""Tests for map-reduce summaries of long PDFs."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from runtime.pdf_summary import PdfSummaryCache, chunk_pages, summarize_pdf
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class _Pages:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def pages(self, path, first=1, last=None, *, parallel=False):
+        self.parallel = parallel
+        yield from enumerate(self.texts, 1)
+
+
+class _Model:
+    def __init__(self, delay=0.0):
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+        self.delay = delay
+
+    async def __call__(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if prompt.startswith("Summarize this part"):
+            return "part summary " + prompt.split("\n\n", 1)[1].split(":", 1)[0]
+        if prompt.startswith("Merge"):
+            return "merged summary"
+        return "final answer"
+
+
+def _summarize(texts, model, cache, **kwargs):
+    return _run(
+        summarize_pdf(
+            Path("/tmp/doc.pdf"),
+            "Summarize this report",
+            model,
+            model="worker",
+            chunk_chars=kwargs.pop("chunk_chars", 1000),
+            pages=_Pages(texts),
+            cache=cache,
+            **kwargs,
+        )
+    )
+
+
+def test_chunks_group_pages_and_split_long_pages():
+    chunks = list(chunk_pages([(1, "a" * 300), (2, ""), (3, "b" * 300), (4, "c" * 2500)], 1000))
+
+    assert [(chunk.first_page, chunk.last_page) for chunk in chunks] == [(1, 3), (4, 4), (4, 4), (4, 4)]
+    assert all(len(chunk.text) <= 1000 for chunk in chunks)
+    assert chunks[2].text.startswith("[Page 4, continued]\n")
+
+
+def test_short_pdf_is_answered_in_one_pass():
+    model = _Model()
+
+    result = _summarize(["Short page."], model, PdfSummaryCache())
+
+    assert result == "final answer"
+    assert len(model.prompts) == 1
+    assert "User request: Summarize this report" in model.prompts[0]
+    assert "[Page 1]\nShort page." in model.prompts[0]
+
+
+def test_long_pdf_is_summarized_in_parallel_parts_then_merged():
+    model = _Model(delay=0.01)
+    progress = []
+
+    result = _summarize(["x" * 900] * 12, model, PdfSummaryCache(), concurrency=3, progress=progress.append)
+
+    chunk_prompts = [p for p in model.prompts if p.startswith("Summarize this part")]
+    final = model.prompts[-1]
+    assert result == "final answer"
+    assert len(chunk_prompts) == 12
+    assert model.peak == 3
+    assert "Summaries of the PDF's parts, in page order" in final
+    assert "Summarized 12 of 12 PDF parts" in progress
+    assert progress[-1] == "Preparing final answer"
+
+
+def test_merge_rounds_run_until_summaries_fit_one_prompt():
+    model = _Model()
+
+    _summarize(["x" * 900] * 40, model, PdfSummaryCache(), chunk_chars=1000)
+
+    merges = [p for p in model.prompts if p.startswith("Merge")]
+    final = model.prompts[-1]
+    assert merges
+    assert all(len(p) < 1400 for p in merges)
+    assert "Pages 1-" in final or "Page 1" in final
+    assert len(final.split("Summaries of the PDF's parts, in page order:\n", 1)[1]) <= 1000
+
+
+def test_follow_up_questions_reuse_cached_part_summaries():
+    cache = PdfSummaryCache()
+    texts = ["y" * 900] * 6
+    _summarize(texts, _Model(), cache)
+    model = _Model()
+
+    result = _summarize(texts, model, cache)
+
+    assert result == "final answer"
+    assert len(model.prompts) == 1
+    assert model.prompts[0].startswith("Summarize the PDF for the user's request")
+
+
+def test_empty_part_summary_falls_back_to_an_excerpt_and_is_not_cached():
+    cache = PdfSummaryCache()
+    prompts = []
+
+    async def model(prompt):
+        prompts.append(prompt)
+        return "answer" if prompt.startswith("Summarize the PDF") else ""
+
+    assert _summarize(["first " * 150, "second " * 150], model, cache) == "answer"
+    assert "[Page 1]\nfirst first" in prompts[-1]
+    assert cache.get(cache.key("worker", prompts[0])) is None
+
+
+def test_failed_part_summary_is_raised_and_not_cached():
+    cache = PdfSummaryCache()
+    prompts = []
+
+    async def model(prompt):
+        prompts.append(prompt)
+        if "[Page 2]" in prompt:
+            raise ConnectionError("backend down")
+        return "part summary"
+
+    with pytest.raises(ConnectionError):
+        _summarize(["first " * 150, "second " * 150], model, cache)
+
+    assert all(cache.get(cache.key("worker", prompt)) is None for prompt in prompts if "[Page 2]" in prompt)
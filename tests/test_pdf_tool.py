@@ -5,10 +5,11 @@ import os
 import sys
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from tools.pdf import ReadPdfTool
+from tools.pdf import PdfTextCache, ReadPdfTool, _extract_page_batch, _init_worker, _worker_readers
 
 
 def _run(coro):
@@ -16,15 +17,27 @@ def _run(coro):
 
 
 def _minimal_pdf(path: Path, text: str) -> None:
-    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-    stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET"
+    _pdf_pages(path, [text])
+
+
+def _pdf_pages(path: Path, texts: list[str]) -> None:
+    """Write a PDF with one Helvetica text line per page."""
+    count = len(texts)
+    kids = " ".join(f"{4 + 2 * index} 0 R" for index in range(count))
     objects = [
         "1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n",
-        "2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n",
-        "3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >> endobj\n",
-        "4 0 obj << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> endobj\n",
-        f"5 0 obj << /Length {len(stream.encode())} >> stream\n{stream}\nendstream endobj\n",
+        f"2 0 obj << /Type /Pages /Kids [{kids}] /Count {count} >> endobj\n",
+        "3 0 obj << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> endobj\n",
     ]
+    for index, text in enumerate(texts):
+        page, contents = 4 + 2 * index, 5 + 2 * index
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET"
+        objects.append(
+            f"{page} 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {contents} 0 R >> endobj\n"
+        )
+        objects.append(f"{contents} 0 obj << /Length {len(stream.encode())} >> stream\n{stream}\nendstream endobj\n")
     content = "%PDF-1.4\n"
     offsets = [0]
     for obj in objects:
@@ -72,3 +85,110 @@ class TestReadPdfTool:
             assert "Access denied" in result.content
 
         _run(run())
+
+
+class TestPdfTextCache:
+    def _counting(self, cache):
+        calls = []
+        original = cache._extract
+
+        def extract(document, index):
+            if index not in document.pages:
+                calls.append(index)
+            return original(document, index)
+
+        return calls, patch.object(cache, "_extract", side_effect=extract)
+
+    def test_repeat_reads_reuse_extracted_pages(self, tmp_path):
+        pdf = tmp_path / "report.pdf"
+        _pdf_pages(pdf, [f"Page body {n}" for n in range(1, 4)])
+        cache = PdfTextCache()
+        tool = ReadPdfTool(allowed_roots=(tmp_path,), cache=cache)
+        calls, patched = self._counting(cache)
+
+        with patched:
+            first = _run(tool.execute(path=str(pdf)))
+            second = _run(tool.execute(path=str(pdf)))
+
+        assert first.content == second.content
+        assert "[Page 3]\nPage body 3" in first.content
+        assert calls == [1, 2, 3]
+
+    def test_extraction_stops_at_the_character_budget(self, tmp_path):
+        pdf = tmp_path / "long.pdf"
+        _pdf_pages(pdf, ["x" * 600 for _ in range(10)])
+        cache = PdfTextCache()
+        calls, patched = self._counting(cache)
+
+        with patched:
+            result = _run(ReadPdfTool(allowed_roots=(tmp_path,), cache=cache).execute(path=str(pdf), max_chars=1000))
+
+        assert "Pages: 10" in result.content
+        assert "Showing first 1000 characters" in result.content
+        assert calls == [1, 2, 3]
+
+    def test_page_range_reads_only_the_requested_pages(self, tmp_path):
+        pdf = tmp_path / "range.pdf"
+        _pdf_pages(pdf, [f"Section {n}" for n in range(1, 7)])
+        cache = PdfTextCache()
+        calls, patched = self._counting(cache)
+
+        with patched:
+            result = _run(
+                ReadPdfTool(allowed_roots=(tmp_path,), cache=cache).execute(path=str(pdf), start_page=3, end_page=4)
+            )
+
+        assert "Pages: 6\nShowing pages 3-4" in result.content
+        assert "Section 3" in result.content and "Section 4" in result.content
+        assert "Section 2" not in result.content and "Section 5" not in result.content
+        assert calls == [3, 4]
+
+    def test_changed_file_is_extracted_again(self, tmp_path):
+        pdf = tmp_path / "draft.pdf"
+        _pdf_pages(pdf, ["old wording"])
+        tool = ReadPdfTool(allowed_roots=(tmp_path,), cache=PdfTextCache())
+        assert "old wording" in _run(tool.execute(path=str(pdf))).content
+
+        _pdf_pages(pdf, ["new wording here"])
+        os.utime(pdf, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+
+        assert "new wording here" in _run(tool.execute(path=str(pdf))).content
+
+    def test_large_runs_extract_in_the_process_pool_when_the_caller_reads_everything(self, tmp_path):
+        pdf = tmp_path / "book.pdf"
+        texts = [f"Chapter {n}" for n in range(1, 12)]
+        _pdf_pages(pdf, texts)
+        cache = PdfTextCache()
+        calls, patched = self._counting(cache)
+
+        with patched, patch("tools.pdf._POOL_MIN_PAGES", 4), patch("tools.pdf._POOL_BATCH_PAGES", 3):
+            pages = list(cache.pages(pdf, parallel=True))
+
+        assert pages == list(enumerate(texts, 1))
+        assert cache.document(pdf).pages == dict(enumerate(texts, 1))
+        # The first batch is extracted in-process while the workers start.
+        assert calls == [1, 2, 3]
+
+    def test_reading_a_long_pdf_never_starts_the_process_pool(self, tmp_path):
+        pdf = tmp_path / "book.pdf"
+        _pdf_pages(pdf, ["x" * 600 for _ in range(30)])
+        cache = PdfTextCache()
+
+        with patch("tools.pdf._POOL_MIN_PAGES", 4), patch("tools.pdf._POOL_BATCH_PAGES", 3):
+            result = _run(ReadPdfTool(allowed_roots=(tmp_path,), cache=cache).execute(path=str(pdf), max_chars=1000))
+
+        assert "Showing first 1000 characters" in result.content
+        assert cache._pool is None
+        assert sorted(cache.document(pdf).pages) == [1, 2, 3]
+
+    def test_pool_workers_parse_each_pdf_once(self, tmp_path):
+        pdf = tmp_path / "book.pdf"
+        _pdf_pages(pdf, [f"Chapter {n}" for n in range(1, 7)])
+        key = (str(pdf), 1, 1)
+        _init_worker()
+
+        assert _extract_page_batch(key, 1, 3) == ["Chapter 1", "Chapter 2", "Chapter 3"]
+        reader = _worker_readers[key]
+        assert _extract_page_batch(key, 4, 6) == ["Chapter 4", "Chapter 5", "Chapter 6"]
+        assert _worker_readers[key] is reader
+        _init_worker()
@@ -9,7 +9,7 @@ import numpy as np
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from runtime.preflight import PreflightManager
+from runtime.preflight import PreflightManager, _context_length_from_show
 from utils.settings import Settings
 
 
@@ -45,7 +45,10 @@ class _OllamaCompatibleClient:
 
     async def post(self, url: str, json: dict):
         if url.endswith("/api/show"):
-            return _Response(200, {"capabilities": ["completion", "vision"]})
+            return _Response(200, {
+                "capabilities": ["completion", "vision"],
+                "model_info": {"gemma3.context_length": 131072},
+            })
         return _Response(404)
 
 
@@ -83,6 +86,19 @@ class TestPreflightBackend:
         assert preflight.models_missing == []
         assert "lacks native tool calling" in capsys.readouterr().out
 
+    def test_ollama_show_records_context_length(self):
+        settings = Settings(LIVE_LISTENING_ENABLED=False, LIVE_SPEECH_ENABLED=False)
+        with patch("runtime.preflight.httpx.AsyncClient", _OllamaCompatibleClient):
+            preflight = _run(PreflightManager(settings).run())
+
+        assert preflight.model_context_lengths == {"gemma4:e4b": 131072}
+
+    def test_context_length_prefers_modelfile_num_ctx(self):
+        info = {"parameters": "stop <end>\nnum_ctx 16384", "model_info": {"llama.context_length": 131072}}
+
+        assert _context_length_from_show(info) == 16384
+        assert _context_length_from_show({"model_info": {}}) is None
+
     def test_mock_client_bypasses_backend_and_models(self):
         settings = Settings(USE_MOCK_CLIENT=True, LIVE_LISTENING_ENABLED=False, LIVE_SPEECH_ENABLED=False)
         manager = PreflightManager(settings)
@@ -458,7 +458,7 @@ class TestSpeechController:
         ctrl, state = self._make_controller()
         state.listening_enabled = True
 
-        with patch("runtime.voice_input.load_silero_vad", side_effect=RuntimeError("vad unavailable")):
+        with patch("runtime.voice_input.load_vad_model", side_effect=RuntimeError("vad unavailable")):
             result = _run(ctrl.listen())
 
         assert result is None
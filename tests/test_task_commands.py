@@ -95,6 +95,14 @@ def _session_with_fs(
     return session
 
 
+async def _first_task(session: LiveSession):
+    for _ in range(300):
+        if tasks := session.task_manager.list_tasks(include_recent=True):
+            return tasks[0]
+        await asyncio.sleep(0.01)
+    raise AssertionError("no task was started")
+
+
 class TestTaskCommands:
     def test_tasks_command_is_handled_locally(self, capsys):
         session = _session()
@@ -702,9 +710,10 @@ class TestTaskCommands:
             destination = tmp_path / "Documents" / "eyra-trigger.txt"
 
             await session._handle_user_input("When eyra-trigger.txt appears in my Downloads, move it to Documents.")
-            task = session.task_manager.list_tasks(include_recent=True)[0]
             source.write_text("trigger me")
+            task = await _first_task(session)
             await session.task_manager.wait_for_task(task.id)
+            await session._file_triggers.stop()
             return session, source, destination, task
 
         session, source, destination, task = _run(run())
@@ -723,11 +732,14 @@ class TestTaskCommands:
             destination = tmp_path / "Documents" / "eyra-trigger-wait.txt"
 
             await session._handle_user_input("When eyra-trigger-wait.txt appears in my Downloads, move it to Documents.")
-            task = session.task_manager.list_tasks(include_recent=True)[0]
             await asyncio.sleep(0.05)
-            assert task.status in {TaskStatus.QUEUED, TaskStatus.RUNNING}
+            # A waiting trigger is a watch, not a background task holding a slot.
+            assert session.task_manager.list_tasks(include_recent=True) == []
+            assert session._file_triggers.pending() == [session.trigger_store.list_triggers()[0].id]
             source.write_text("trigger me later")
+            task = await _first_task(session)
             await session.task_manager.wait_for_task(task.id)
+            await session._file_triggers.stop()
             return source, destination, task
 
         source, destination, task = _run(run())
@@ -783,14 +795,16 @@ class TestTaskCommands:
                 "When eyra-paused-trigger.txt appears in my Downloads, move it to Documents."
             )
             trigger = session.trigger_store.list_triggers()[0]
-            task = session.task_manager.list_tasks(include_recent=True)[0]
             await session._handle_command(f"/trigger pause {trigger.id}")
             source.write_text("wait")
             await asyncio.sleep(0.05)
             assert not destination.exists()
+            assert session.task_manager.list_tasks(include_recent=True) == []
 
             await session._handle_command(f"/trigger resume {trigger.id}")
+            task = await _first_task(session)
             await session.task_manager.wait_for_task(task.id)
+            await session._file_triggers.stop()
             return source, destination, task
 
         source, destination, task = _run(run())
@@ -805,8 +819,13 @@ class TestTaskCommands:
 
             await session._handle_user_input("Remind me in 0.01 seconds to stretch.")
             trigger = session.trigger_store.list_triggers()[0]
+            for _ in range(300):
+                if session.task_manager.list_tasks(include_recent=True):
+                    break
+                await asyncio.sleep(0.01)
             task = session.task_manager.list_tasks(include_recent=True)[0]
             await session.task_manager.wait_for_task(task.id)
+            await session._trigger_scheduler.stop()
             return session, trigger, task
 
         session, trigger, task = _run(run())
@@ -825,16 +844,19 @@ class TestTaskCommands:
 
             await session._handle_user_input("Remind me in 1 second to stretch.")
             trigger = session.trigger_store.list_triggers()[0]
-            task = session.task_manager.list_tasks(include_recent=True)[0]
+            # A pending reminder waits in the scheduler, not in a task slot.
+            assert session.task_manager.list_tasks(include_recent=True) == []
             await session._handle_command(f"/trigger cancel {trigger.id}")
-            await session.task_manager.wait_for_task(task.id)
-            return session, trigger, task
+            await asyncio.sleep(0.01)
+            pending = session._trigger_scheduler.pending()
+            await session._trigger_scheduler.stop()
+            return session, trigger, pending
 
-        session, trigger, task = _run(run())
+        session, trigger, pending = _run(run())
 
         assert session.trigger_store.get_trigger(trigger.id).status == TriggerStatus.CANCELLED
-        assert task.status == TaskStatus.COMPLETED
-        assert task.final_result == "Reminder cancelled."
+        assert pending == []
+        assert session.task_manager.list_tasks(include_recent=True) == []
 
     def test_recurring_reminder_runs_until_cancelled(self, tmp_path, capsys):
         async def run():
@@ -842,17 +864,19 @@ class TestTaskCommands:
 
             await session._handle_user_input("Every 0.01 seconds remind me to stretch.")
             trigger = session.trigger_store.list_triggers()[0]
-            task = session.task_manager.list_tasks(include_recent=True)[0]
             for _ in range(50):
                 restored = session.trigger_store.get_trigger(trigger.id)
                 if restored.condition.get("fire_count", 0) >= 2:
                     break
                 await asyncio.sleep(0.01)
             await session._handle_command(f"/trigger cancel {trigger.id}")
-            await session.task_manager.wait_for_task(task.id)
-            return session, trigger, task
+            tasks = session.task_manager.list_tasks(include_recent=True)
+            for task in tasks:
+                await session.task_manager.wait_for_task(task.id)
+            await session._trigger_scheduler.stop()
+            return session, trigger, tasks
 
-        session, trigger, task = _run(run())
+        session, trigger, tasks = _run(run())
         out = capsys.readouterr().out
         restored = session.trigger_store.get_trigger(trigger.id)
 
@@ -860,8 +884,8 @@ class TestTaskCommands:
         assert trigger.kind == "recurring_timer"
         assert restored.condition["fire_count"] >= 2
         assert restored.status == TriggerStatus.CANCELLED
-        assert task.status == TaskStatus.COMPLETED
-        assert task.final_result == "Recurring reminder cancelled."
+        assert len(tasks) >= 2
+        assert {task.final_result for task in tasks} == {"Recurring reminder: stretch"}
 
     def test_coding_job_request_is_refused_when_agent_tools_are_disabled(self, tmp_path, capsys):
         session = _session_with_fs(tmp_path, agent_tools=False)
@@ -0,0 +1,81 @@
+"""Tests for the streaming Python search fallback behind search_files."""
+
+import asyncio
+import os
+import random
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tools.operator import SearchFilesTool
+from tools.text_search import search_text
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _naive(root, query):
+    matches = []
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        for number, line in enumerate(path.read_text().splitlines(), 1):
+            if query in line:
+                matches.append(f"{path}:{number}: {line}")
+    return matches
+
+
+def test_chunked_search_matches_whole_file_search_across_chunk_boundaries(tmp_path):
+    rng = random.Random(3)
+    for number in range(6):
+        lines = ["".join(rng.choice("abcxyz \t") for _ in range(rng.randint(0, 30))) for _ in range(40)]
+        (tmp_path / f"f{number}.txt").write_text("\n".join(lines) + ("\n" if number % 2 else ""))
+
+    for chunk in (1, 2, 5, 16, 4096):
+        with patch("tools.text_search.CHUNK_BYTES", chunk):
+            outcome = search_text(tmp_path, "xy", 10_000, deadline_seconds=30, workers=3)
+        assert outcome.matches == _naive(tmp_path, "xy")
+        assert not outcome.truncated
+
+
+def test_binary_files_are_skipped_and_subdirectories_searched(tmp_path):
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    (tmp_path / "blob.bin").write_bytes(b"needle\0needle")
+    (tmp_path / "nested" / "deeper" / "notes.txt").write_text("one\nthe needle\n")
+
+    outcome = search_text(tmp_path, "needle", 10, deadline_seconds=30)
+
+    assert outcome.matches == [f"{tmp_path / 'nested' / 'deeper' / 'notes.txt'}:2: the needle"]
+
+
+def test_overlong_line_is_reported_once_as_an_excerpt(tmp_path):
+    path = tmp_path / "huge.log"
+    path.write_text("x" * 5000 + "needle" + "y" * 5000 + "needle" + "z" * 5000 + "\nafter needle\n")
+
+    with patch("tools.text_search.CHUNK_BYTES", 1024), patch("tools.text_search._MAX_LINE_BYTES", 2048):
+        outcome = search_text(tmp_path, "needle", 10, deadline_seconds=30)
+
+    assert len(outcome.matches) == 2
+    first, second = outcome.matches
+    assert first.startswith(f"{path}:1: ") and "needle" in first and len(first) < 1000
+    assert second == f"{path}:2: after needle"
+
+
+def test_limit_stops_the_search(tmp_path):
+    for number in range(20):
+        (tmp_path / f"f{number:02d}.txt").write_text("hit\nhit\n")
+
+    outcome = search_text(tmp_path, "hit", 5, deadline_seconds=30, workers=4)
+
+    assert len(outcome.matches) == 5
+    assert not outcome.truncated
+
+
+def test_deadline_returns_partial_results_with_truncated_marker(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha")
+    tool = SearchFilesTool(allowed_roots=(tmp_path,), default_path=tmp_path, deadline_seconds=0)
+
+    with patch("tools.operator.shutil.which", return_value=None):
+        result = _run(tool.execute(root=str(tmp_path), query="alpha"))
+
+    assert result.content.endswith("[truncated: search stopped after 0s; results are partial]")
@@ -282,3 +282,13 @@ class TestToolPolicy:
         assert metadata["run_command"].capabilities >= frozenset({Capability.OS_AUTOMATION, Capability.SHELL})
         assert metadata["call_mcp_tool"].requires_approval is True
         assert metadata["run_agent_task"].capabilities == frozenset({Capability.AGENT_DELEGATION})
+
+    def test_only_local_read_tools_are_parallel_safe(self):
+        metadata = build_tool_registry(Settings(OS_TOOLS_ENABLED=True, NETWORK_TOOLS_ENABLED=True)).metadata_by_name()
+
+        assert policy.is_parallel_safe(metadata["get_current_time"]) is True
+        assert policy.is_parallel_safe(metadata["read_file"]) is True
+        assert policy.is_parallel_safe(metadata["write_file"]) is False
+        assert policy.is_parallel_safe(metadata["move_to_trash"]) is False
+        assert policy.is_parallel_safe(metadata["run_command"]) is False
+        assert policy.is_parallel_safe(metadata["fetch_url"]) is False
@@ -10,7 +10,14 @@ from unittest.mock import AsyncMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from clients.ai_client import AIClient, _is_tools_unsupported_error, _parse_text_tool_calls
+from clients.ai_client import (
+    THINK_END,
+    THINK_START,
+    AIClient,
+    StreamCleaner,
+    _is_tools_unsupported_error,
+    _parse_text_tool_calls,
+)
 from tools.base import BaseTool, ToolResult
 from tools.registry import ToolRegistry
 from tools.screenshot import ScreenshotTool
@@ -48,6 +55,28 @@ class _ClockTool(BaseTool):
         return ToolResult(content="time ok")
 
 
+class _TimedTool(BaseTool):
+    description = "Test tool that records when it runs"
+    parameters = {"type": "object", "properties": {}, "required": []}
+
+    def __init__(self, name, events, delay=0.1, max_concurrency=0):
+        self.name = name
+        self.events = events
+        self.delay = delay
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.peak = 0
+
+    async def execute(self, **kwargs) -> ToolResult:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.events.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        self.events.append(("end", self.name))
+        self.running -= 1
+        return ToolResult(content=f"{self.name} ok")
+
+
 class _FakeStream:
     def __init__(self, chunks):
         self._chunks = list(chunks)
@@ -140,6 +169,80 @@ class TestToolRegistry:
         registry = ToolRegistry()
         assert registry.to_openai_tools() == []
 
+    def test_execute_calls_runs_read_only_tools_concurrently_in_call_order(self):
+        events = []
+        registry = ToolRegistry()
+        registry.register(_TimedTool("get_system_info", events, delay=0.3))
+        registry.register(_TimedTool("get_current_time", events, delay=0.2))
+
+        async def scenario():
+            started = asyncio.get_running_loop().time()
+            results = await registry.execute_calls(
+                [("get_system_info", "{}"), ("get_current_time", "{}")],
+                max_parallel=4,
+            )
+            return results, asyncio.get_running_loop().time() - started
+
+        results, elapsed = _run(scenario())
+
+        assert [result.content for result in results] == ["get_system_info ok", "get_current_time ok"]
+        # Run one after the other, the two tools take 0.5 s.
+        assert elapsed < 0.45
+        assert events.index(("start", "get_current_time")) < events.index(("end", "get_system_info"))
+
+    def test_execute_calls_keeps_mutating_tools_in_order(self):
+        events = []
+        registry = ToolRegistry()
+        registry.register(_TimedTool("get_current_time", events, delay=0.1))
+        registry.register(_TimedTool("write_file", events, delay=0.05))
+        registry.register(_TimedTool("get_system_info", events, delay=0.05))
+
+        results = _run(registry.execute_calls(
+            [("get_current_time", "{}"), ("write_file", "{}"), ("get_system_info", "{}")],
+            max_parallel=4,
+        ))
+
+        assert [result.content for result in results] == ["get_current_time ok", "write_file ok", "get_system_info ok"]
+        assert events == [
+            ("start", "get_current_time"),
+            ("end", "get_current_time"),
+            ("start", "write_file"),
+            ("end", "write_file"),
+            ("start", "get_system_info"),
+            ("end", "get_system_info"),
+        ]
+
+    def test_execute_calls_respects_per_tool_concurrency_cap(self):
+        events = []
+        tool = _TimedTool("get_current_time", events, delay=0.05, max_concurrency=1)
+        registry = ToolRegistry()
+        registry.register(tool)
+
+        results = _run(registry.execute_calls([("get_current_time", "{}")] * 3, max_parallel=4))
+
+        assert len(results) == 3
+        assert tool.peak == 1
+
+    def test_execute_calls_is_sequential_when_parallelism_is_off(self):
+        events = []
+        first = _TimedTool("get_system_info", events, delay=0.05)
+        registry = ToolRegistry()
+        registry.register(first)
+        registry.register(_TimedTool("get_current_time", events, delay=0.05))
+
+        _run(registry.execute_calls([("get_system_info", "{}"), ("get_current_time", "{}")], max_parallel=1))
+
+        assert first.peak == 1
+        assert events[1] == ("end", "get_system_info")
+
+    def test_execute_calls_times_out_each_call(self):
+        registry = ToolRegistry()
+        registry.register(_TimedTool("get_current_time", [], delay=2))
+
+        results = _run(registry.execute_calls([("get_current_time", "{}")], timeout_seconds=1))
+
+        assert "timed out after 1 seconds" in results[0].content
+
 
 class TestScreenshotTool:
     def test_openai_schema(self):
@@ -174,6 +277,43 @@ class TestScreenshotTool:
         assert "Screenshot captured" in result.content
 
 
+class TestStreamCleaner:
+    _TEXT = "a<think>plan<|im_end|> it</think>answer<|endoftext|> done<|end|>"
+    _CLEAN = f"a{THINK_START}plan it{THINK_END}answer done"
+
+    def _stream(self, text, size):
+        cleaner = StreamCleaner()
+        parts = [cleaner.feed(text[i : i + size]) for i in range(0, len(text), size)]
+        return "".join(parts) + cleaner.flush()
+
+    def test_tags_and_tokens_split_across_any_chunk_size(self):
+        for size in range(1, len(self._TEXT) + 1):
+            assert self._stream(self._TEXT, size) == self._CLEAN
+
+    def test_only_a_possible_marker_prefix_is_held_back(self):
+        cleaner = StreamCleaner()
+
+        assert cleaner.feed("hello") == "hello"
+        assert cleaner.feed(" <thi") == " "
+        assert cleaner.feed("ng>") == "<thing>"
+        assert cleaner.feed("a < b") == "a < b"
+
+    def test_unclosed_think_block_is_closed_on_flush(self):
+        cleaner = StreamCleaner()
+
+        assert cleaner.feed("<think>partial") == f"{THINK_START}partial"
+        assert cleaner.flush() == THINK_END
+
+    def test_generate_completion_drops_think_content(self):
+        completions = _FakeCompletions([["<thi", "nk>hidden</th", "ink>visible", "<|im_end|>"]])
+        client = AIClient(Settings(API_KEY="test"))
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        result = _run(client.generate_completion([{"role": "user", "content": "hi"}]))
+
+        assert result == {"content": "visible"}
+
+
 class TestTextToolCallParser:
     """Tests for _parse_text_tool_calls — recovery of text-format tool calls from Ollama bug #14745."""
 
@@ -324,6 +464,32 @@ class TestTextToolCallRecovery:
         assert "Use <function=example>" in "".join(chunks)
         assert clock.calls == 0
 
+    def test_parallel_tool_results_keep_model_call_order(self):
+        events = []
+        registry = ToolRegistry()
+        registry.register(_TimedTool("get_system_info", events, delay=0.2))
+        registry.register(_TimedTool("get_current_time", events, delay=0.01))
+        completions = _FakeCompletions([
+            ['<function=get_system_info>{}</function><function=get_current_time>{}</function>'],
+            ["done"],
+        ])
+        client = AIClient(Settings(API_KEY="test"))
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        messages = [{"role": "user", "content": "system info and time"}]
+
+        chunks = _run(_collect(client.stream_with_tools(
+            messages,
+            tools=registry,
+            allowed_tool_names={"get_system_info", "get_current_time"},
+            max_parallel_tools=4,
+        )))
+
+        tool_messages = [message for message in messages if message["role"] == "tool"]
+        assert "".join(chunks) == "done"
+        assert [message["tool_call_id"] for message in tool_messages] == ["text_0", "text_1"]
+        assert [message["content"] for message in tool_messages] == ["get_system_info ok", "get_current_time ok"]
+        assert events[1] == ("start", "get_current_time")
+
 
 class TestSemanticHistory:
     def test_semantic_history_omits_raw_tool_arguments_paths_and_secrets(self):
@@ -0,0 +1,391 @@
+"""Tests for the central reminder scheduler and the file trigger monitor."""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from runtime.file_watch import FileWatcher
+from runtime.tasks import BackgroundTaskManager, TaskStatus
+from runtime.trigger_scheduler import (
+    MAX_CATCH_UP_FIRES,
+    FileTriggerMonitor,
+    TriggerScheduler,
+    format_interval,
+    start_reminder_task,
+)
+from runtime.triggers import TriggerStatus, TriggerStore
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _reminder(store, fire_at, message="stretch"):
+    return store.create_timer_trigger(
+        title=f"Reminder: {message}",
+        fire_at=fire_at,
+        action={"type": "notify", "message": message},
+        original_request=f"Remind me to {message}",
+    )
+
+
+def _recurring(store, next_fire_at, interval=60.0):
+    return store.create_recurring_timer_trigger(
+        title="Recurring reminder: drink water",
+        interval_seconds=interval,
+        next_fire_at=next_fire_at,
+        action={"type": "notify", "message": "drink water"},
+        original_request="Every minute remind me to drink water",
+    )
+
+
+async def _until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+def test_reminders_fire_in_deadline_order_from_one_scheduler(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    fired = []
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, fired.append)
+        scheduler.start()
+        later = _reminder(store, time.time() + 0.6, "later")
+        sooner = _reminder(store, time.time() + 0.3, "sooner")
+        # Store notifications reach the scheduler on the next loop iteration.
+        await asyncio.sleep(0)
+        pending = [trigger_id for _due, trigger_id in scheduler.pending()]
+        await _until(lambda: len(fired) == 2)
+        await scheduler.stop()
+        return pending, later, sooner
+
+    pending, later, sooner = _run(scenario())
+
+    assert pending == [sooner.id, later.id]
+    assert [fire.message for fire in fired] == ["sooner", "later"]
+    assert not any(fire.missed for fire in fired)
+    assert store.get_trigger(later.id).status == TriggerStatus.COMPLETED
+    store.close()
+
+
+def test_pending_reminders_take_no_task_slot(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+
+    async def scenario():
+        manager = BackgroundTaskManager(max_concurrent=1)
+        scheduler = TriggerScheduler(store, lambda fire: start_reminder_task(manager, fire))
+        scheduler.start()
+        _reminder(store, time.time() + 3600)
+        _recurring(store, time.time() + 3600)
+
+        async def work(_task):
+            return "done"
+
+        task = manager.create_task("Real work", "work", work)
+        await asyncio.wait_for(manager.wait_for_task(task.id), 2)
+        await scheduler.stop()
+        return manager, task
+
+    manager, task = _run(scenario())
+
+    assert task.status == TaskStatus.COMPLETED
+    assert [row.title for row in manager.list_tasks()] == ["Real work"]
+    store.close()
+
+
+def test_fired_reminder_starts_a_short_task(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+
+    async def scenario():
+        manager = BackgroundTaskManager(max_concurrent=1)
+        scheduler = TriggerScheduler(store, lambda fire: start_reminder_task(manager, fire))
+        scheduler.start()
+        _reminder(store, time.time() + 0.01)
+        await _until(lambda: bool(manager.list_tasks()))
+        task = manager.list_tasks()[0]
+        await manager.wait_for_task(task.id)
+        await scheduler.stop()
+        return task
+
+    task = _run(scenario())
+
+    assert task.status == TaskStatus.COMPLETED
+    assert task.final_result == "Reminder: stretch"
+    store.close()
+
+
+def test_active_reminders_are_reloaded_after_a_restart(tmp_path):
+    path = tmp_path / "triggers.sqlite3"
+    first = TriggerStore(path)
+    trigger = _reminder(first, time.time() + 0.05)
+    first.close()
+    store = TriggerStore(path)
+    fired = []
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, fired.append)
+        scheduler.start()
+        await _until(lambda: fired)
+        await scheduler.stop()
+
+    _run(scenario())
+
+    assert fired[0].trigger.id == trigger.id
+    store.close()
+
+
+def test_paused_reminder_does_not_fire_until_resumed(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    fired = []
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, fired.append)
+        scheduler.start()
+        trigger = _reminder(store, time.time() + 0.05)
+        store.mark_paused(trigger.id)
+        await asyncio.sleep(0.15)
+        assert fired == []
+        store.mark_active(trigger.id)
+        await _until(lambda: fired)
+        await scheduler.stop()
+
+    _run(scenario())
+
+    assert len(fired) == 1
+    store.close()
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected_fires"),
+    [("once", 1), ("all", MAX_CATCH_UP_FIRES), ("skip", 0)],
+)
+def test_missed_recurring_fires_follow_the_catch_up_policy(tmp_path, policy, expected_fires):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    # Thirty missed one-minute slots, as if Eyra had been closed for half an hour.
+    trigger = _recurring(store, time.time() - 30 * 60 + 30)
+    fired = []
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, fired.append, catch_up=policy)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    _run(scenario())
+    restored = store.get_trigger(trigger.id)
+
+    assert len(fired) == expected_fires
+    assert all(fire.missed for fire in fired)
+    assert restored.status == TriggerStatus.ACTIVE
+    assert restored.condition["fire_count"] == expected_fires
+    assert time.time() < restored.condition["next_fire_at"] <= time.time() + 60
+    store.close()
+
+
+def test_missed_one_time_reminder_fails_when_catch_up_is_skip(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    trigger = _reminder(store, time.time() - 3600)
+    fired = []
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, fired.append, catch_up="skip")
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    _run(scenario())
+
+    assert fired == []
+    assert store.get_trigger(trigger.id).status == TriggerStatus.FAILED
+    store.close()
+
+
+def test_stop_returns_even_if_the_cancellation_is_lost(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    real_wait_for = asyncio.wait_for
+
+    async def lossy_wait_for(awaitable, timeout):
+        # Python < 3.12 returns normally when the wake event fires as the task is cancelled.
+        try:
+            return await real_wait_for(awaitable, timeout)
+        except asyncio.CancelledError:
+            return None
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, lambda _fire: None)
+        with patch("runtime.trigger_scheduler.asyncio.wait_for", lossy_wait_for):
+            scheduler.start()
+            await asyncio.sleep(0.01)
+            await real_wait_for(scheduler.stop(), 2)
+        return scheduler
+
+    assert not _run(scenario()).running
+    store.close()
+
+
+def test_schedulers_sharing_a_store_fire_each_reminder_once(tmp_path):
+    path = tmp_path / "triggers.sqlite3"
+    stores = [TriggerStore(path), TriggerStore(path)]
+    reminder = _reminder(stores[0], time.time() + 0.05)
+    recurring = _recurring(stores[0], time.time() + 0.05, interval=0.1)
+    fired = []
+
+    async def scenario():
+        schedulers = [TriggerScheduler(store, fired.append) for store in stores]
+        for scheduler in schedulers:
+            scheduler.start()
+        await asyncio.sleep(0.5)
+        for scheduler in schedulers:
+            await scheduler.stop()
+
+    _run(scenario())
+
+    reminder_fires = [fire for fire in fired if fire.trigger.id == reminder.id]
+    recurring_fires = sorted(fire.scheduled_for for fire in fired if fire.trigger.id == recurring.id)
+    assert len(reminder_fires) == 1
+    assert recurring_fires and len(recurring_fires) == len(set(recurring_fires))
+    assert stores[0].get_trigger(recurring.id).condition["fire_count"] == len(recurring_fires)
+    for store in stores:
+        store.close()
+
+
+def test_stale_deadline_follows_the_stored_fire_time(tmp_path):
+    path = tmp_path / "triggers.sqlite3"
+    store = TriggerStore(path)
+    other = TriggerStore(path)
+    trigger = _recurring(store, time.time() + 0.05, interval=60)
+    fired = []
+
+    async def scenario():
+        scheduler = TriggerScheduler(store, fired.append)
+        scheduler.start()
+        # Another process records the fire; this scheduler is not notified.
+        other.record_recurring_fire(trigger.id, last_fire_at=time.time(), next_fire_at=time.time() + 60)
+        await asyncio.sleep(0.2)
+        pending = scheduler.pending()
+        await scheduler.stop()
+        return pending
+
+    pending = _run(scenario())
+
+    assert fired == []
+    assert [trigger_id for _due, trigger_id in pending] == [trigger.id]
+    assert pending[0][0] == store.get_trigger(trigger.id).condition["next_fire_at"]
+    other.close()
+    store.close()
+
+
+def test_format_interval_uses_the_largest_whole_unit():
+    assert [format_interval(value) for value in (1, 30, 60, 90, 3600, 5400)] == [
+        "1 second",
+        "30 seconds",
+        "1 minute",
+        "90 seconds",
+        "1 hour",
+        "90 minutes",
+    ]
+
+
+def _file_trigger(store, path):
+    return store.create_file_exists_trigger(
+        title=f"Move {path.name} when it appears",
+        source_path=str(path),
+        action={"type": "file.move", "destination": str(path.with_suffix(".moved"))},
+        original_request=f"When {path.name} appears, move it",
+    )
+
+
+def test_waiting_file_triggers_take_no_task_slot_and_start_a_task_when_ready(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    watcher = FileWatcher(settle_seconds=0.01)
+
+    async def scenario():
+        manager = BackgroundTaskManager(max_concurrent=1)
+
+        async def move(_task):
+            return "moved"
+
+        monitor = FileTriggerMonitor(
+            store,
+            lambda trigger: manager.create_task(trigger.title, trigger.original_request, move),
+            watcher=watcher,
+            poll_seconds=0.01,
+        )
+        monitor.start()
+        triggers = [_file_trigger(store, tmp_path / f"file-{index}.txt") for index in range(5)]
+        await _until(lambda: len(monitor.pending()) == 5)
+        assert manager.list_tasks() == []
+
+        (tmp_path / "file-2.txt").write_text("ready")
+        await _until(lambda: bool(manager.list_tasks()))
+        task = manager.list_tasks()[0]
+        await manager.wait_for_task(task.id)
+        pending = monitor.pending()
+        await monitor.stop()
+        return triggers, task, pending
+
+    triggers, task, pending = _run(scenario())
+
+    assert task.title == triggers[2].title and task.status == TaskStatus.COMPLETED
+    assert pending == sorted(trigger.id for index, trigger in enumerate(triggers) if index != 2)
+    assert all(store.get_trigger(trigger.id).status == TriggerStatus.ACTIVE for trigger in triggers)
+    watcher.close()
+    store.close()
+
+
+def test_active_file_triggers_are_reloaded_after_a_restart(tmp_path):
+    path = tmp_path / "triggers.sqlite3"
+    first = TriggerStore(path)
+    waiting = _file_trigger(first, tmp_path / "report.pdf")
+    cancelled = _file_trigger(first, tmp_path / "old.pdf")
+    first.mark_cancelled(cancelled.id)
+    first.close()
+    store = TriggerStore(path)
+    watcher = FileWatcher(settle_seconds=0.01)
+    ready = []
+
+    async def scenario():
+        monitor = FileTriggerMonitor(store, ready.append, watcher=watcher, poll_seconds=0.01)
+        monitor.start()
+        pending = monitor.pending()
+        (tmp_path / "report.pdf").write_text("pdf")
+        (tmp_path / "old.pdf").write_text("pdf")
+        await _until(lambda: ready)
+        await monitor.stop()
+        return pending
+
+    assert _run(scenario()) == [waiting.id]
+    assert [trigger.id for trigger in ready] == [waiting.id]
+    watcher.close()
+    store.close()
+
+
+def test_file_trigger_fails_once_its_timeout_has_passed_since_creation(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    watcher = FileWatcher(settle_seconds=0.01)
+    trigger = _file_trigger(store, tmp_path / "never.txt")
+
+    async def scenario():
+        monitor = FileTriggerMonitor(store, lambda _trigger: None, watcher=watcher, timeout_seconds=1.0)
+        with patch("runtime.trigger_scheduler.time.time", return_value=trigger.created_at + 5):
+            monitor.start()
+            await _until(lambda: not monitor.pending())
+        await monitor.stop()
+
+    _run(scenario())
+
+    restored = store.get_trigger(trigger.id)
+    assert restored.status == TriggerStatus.FAILED
+    assert "timed out after 1 seconds" in restored.last_error
+    watcher.close()
+    store.close()
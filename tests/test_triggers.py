@@ -8,7 +8,8 @@ from types import SimpleNamespace
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from runtime.triggers import TriggerStatus, TriggerStore, wait_for_file_ready
+from runtime.file_watch import FileWatcher
+from runtime.triggers import TriggerStatus, TriggerStore, wait_for_file_ready, wait_for_trigger_file
 
 
 def _run(coro):
@@ -191,3 +192,93 @@ def test_trigger_store_updates_recurring_fire_state(tmp_path):
     assert restored.condition["next_fire_at"] == 1294.5
     assert restored.status == TriggerStatus.ACTIVE
     store.close()
+
+
+def test_trigger_store_notifies_subscribers_of_updates(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    trigger = store.create_timer_trigger(
+        title="Remind",
+        fire_at=123.0,
+        action={"type": "notify", "message": "stretch"},
+        original_request="Remind me",
+    )
+    seen = []
+    unsubscribe = store.subscribe(lambda record: seen.append(record.status))
+
+    store.mark_paused(trigger.id)
+    unsubscribe()
+    store.mark_active(trigger.id)
+
+    assert seen == [TriggerStatus.PAUSED]
+    store.close()
+
+
+def test_wait_for_trigger_file_ignores_the_file_while_paused(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    watcher = FileWatcher()
+    source = tmp_path / "a.txt"
+    trigger = store.create_file_exists_trigger(
+        title="Move a",
+        source_path=str(source),
+        action={"type": "file.move", "destination": str(tmp_path / "b.txt")},
+        original_request="When a.txt appears, move it.",
+    )
+    store.mark_paused(trigger.id)
+    progress = []
+
+    async def scenario():
+        waiting = asyncio.ensure_future(
+            wait_for_trigger_file(
+                store,
+                watcher,
+                trigger.id,
+                str(source),
+                timeout_seconds=5,
+                poll_seconds=0.02,
+                cancelled=lambda: False,
+                progress=progress.append,
+            )
+        )
+        source.write_text("x")
+        await asyncio.sleep(0.3)
+        assert not waiting.done()
+        store.mark_active(trigger.id)
+        return await asyncio.wait_for(waiting, 5)
+
+    try:
+        assert _run(scenario()) == "ready"
+    finally:
+        watcher.close()
+        store.close()
+    assert progress[0] == f"Paused trigger {trigger.id}"
+
+
+def test_wait_for_trigger_file_returns_cancelled_when_the_trigger_is_cancelled(tmp_path):
+    store = TriggerStore(tmp_path / "triggers.sqlite3")
+    watcher = FileWatcher()
+    trigger = store.create_file_exists_trigger(
+        title="Move a",
+        source_path=str(tmp_path / "a.txt"),
+        action={"type": "file.move", "destination": str(tmp_path / "b.txt")},
+        original_request="When a.txt appears, move it.",
+    )
+
+    async def scenario():
+        asyncio.get_running_loop().call_later(0.05, store.mark_cancelled, trigger.id)
+        return await wait_for_trigger_file(
+            store,
+            watcher,
+            trigger.id,
+            str(tmp_path / "a.txt"),
+            timeout_seconds=30,
+            poll_seconds=0.5,
+            cancelled=lambda: False,
+            progress=lambda _message: None,
+        )
+
+    try:
+        assert _run(asyncio.wait_for(scenario(), 5)) == "cancelled"
+    finally:
+        watcher.close()
+        store.close()
+
@@ -0,0 +1,152 @@
+"""Tests for the torch-free Silero VAD backend and its start/end hysteresis."""
+
+import importlib.util
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from runtime.vad import SileroOnnxModel, VADIterator, load_vad_model, silero_model_path
+
+
+class _ScriptedModel:
+    """VAD model stand-in that returns one scripted probability per frame."""
+
+    def __init__(self, probabilities):
+        self.probabilities = list(probabilities)
+        self.resets = 0
+
+    def __call__(self, frame, sr):
+        return self.probabilities.pop(0)
+
+    def reset_states(self):
+        self.resets += 1
+
+
+def _events(probabilities, **kwargs):
+    vad = VADIterator(_ScriptedModel(probabilities), **kwargs)
+    frame = np.zeros(512, dtype=np.float32)
+    return [(index, event) for index in range(len(probabilities)) if (event := vad(frame)) is not None]
+
+
+def test_speech_starts_at_threshold_and_ends_after_enough_silence():
+    # Silence is timed from the end of the first quiet frame; 100 ms is 1600 samples, so four more frames.
+    events = _events([0.1, 0.5, 0.9, 0.2, 0.2, 0.2, 0.2, 0.1], threshold=0.5, speech_pad_ms=30)
+
+    assert events == [(1, {"start": 512 - 480}), (7, {"end": 2048 + 480 - 512})]
+
+
+def test_probabilities_inside_the_hysteresis_band_keep_speech_going():
+    # 0.4 is below the 0.5 start threshold but above the 0.35 end threshold.
+    events = _events([0.9] + [0.4] * 10, threshold=0.5)
+
+    assert events == [(0, {"start": 0})]
+
+
+def test_speech_in_the_middle_of_a_pause_restarts_the_silence_count():
+    vad = VADIterator(_ScriptedModel([0.9, 0.1, 0.1, 0.9, 0.1, 0.1, 0.1]), min_silence_duration_ms=100)
+    frame = np.zeros(512, dtype=np.float32)
+
+    results = [vad(frame) for _ in range(3)]
+    assert results == [{"start": 0}, None, None]
+    assert vad.temp_end == 1024
+    assert vad(frame) is None
+    assert vad.temp_end == 0 and vad.triggered
+    assert [vad(frame) for _ in range(3)] == [None, None, None]
+
+
+def test_positions_in_seconds_and_reset_clears_the_model_state():
+    model = _ScriptedModel([0.1] * 30 + [0.9, 0.9])
+    vad = VADIterator(model, sampling_rate=16000, speech_pad_ms=50)
+    frame = np.zeros(512, dtype=np.float32)
+
+    assert [vad(frame, return_seconds=True) for _ in range(31)][-1] == {"start": 0.9}
+    vad.reset_states()
+
+    assert (vad.triggered, vad.temp_end, vad.current_sample, model.resets) == (False, 0, 0, 2)
+    assert vad(frame) == {"start": 0}
+
+
+def test_unsupported_sample_rate_is_rejected():
+    with pytest.raises(ValueError, match="sampling rates"):
+        VADIterator(_ScriptedModel([]), sampling_rate=44100)
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.inputs = []
+
+    def run(self, _outputs, feeds):
+        self.inputs.append({name: np.array(value) for name, value in feeds.items()})
+        return np.array([[0.75]], dtype=np.float32), feeds["state"] + 1.0
+
+
+def test_onnx_model_carries_context_and_state_between_frames():
+    session = _RecordingSession()
+    model = SileroOnnxModel(session=session)
+    first = np.arange(512, dtype=np.float32)
+
+    assert model(first, 16000) == 0.75
+    model(first + 1000, 16000)
+
+    initial, second = session.inputs
+    assert initial["input"].shape == (1, 576)
+    assert not initial["input"][0, :64].any() and not initial["state"].any()
+    np.testing.assert_array_equal(second["input"][0, :64], first[-64:])
+    np.testing.assert_array_equal(second["input"][0, 64:], first + 1000)
+    assert (second["state"] == 1.0).all() and int(second["sr"]) == 16000
+
+    model.reset_states()
+    model(first, 16000)
+    assert not session.inputs[-1]["input"][0, :64].any() and not session.inputs[-1]["state"].any()
+
+
+def test_onnx_model_decimates_multiples_of_16k_and_checks_frame_size():
+    session = _RecordingSession()
+    model = SileroOnnxModel(session=session)
+
+    model(np.arange(1536, dtype=np.float32), 48000)
+    np.testing.assert_array_equal(session.inputs[0]["input"][0, 64:], np.arange(0, 1536, 3))
+
+    model(np.zeros(256, dtype=np.float32), 8000)
+    assert session.inputs[1]["input"].shape == (1, 288) and int(session.inputs[1]["sr"]) == 8000
+    with pytest.raises(ValueError, match="number of samples"):
+        model(np.zeros(500, dtype=np.float32), 16000)
+
+
+def test_model_path_is_found_without_importing_silero(tmp_path):
+    package = tmp_path / "silero_vad"
+    (package / "data").mkdir(parents=True)
+    (package / "__init__.py").write_text("raise AssertionError('package was imported')\n")
+    (package / "data" / "silero_vad.onnx").write_bytes(b"onnx")
+
+    with patch.object(sys, "path", [str(tmp_path), *sys.path]), patch.dict(sys.modules):
+        sys.modules.pop("silero_vad", None)
+        assert silero_model_path() == package / "data" / "silero_vad.onnx"
+        assert "silero_vad" not in sys.modules
+
+
+def test_unknown_backend_falls_back_to_onnxruntime():
+    with patch("runtime.vad.SileroOnnxModel", return_value=SimpleNamespace()) as onnx_model:
+        load_vad_model("tensorflow")
+
+    onnx_model.assert_called_once_with()
+
+
+@pytest.mark.skipif(
+    not (importlib.util.find_spec("onnxruntime") and importlib.util.find_spec("silero_vad")),
+    reason="onnxruntime and silero-vad are not installed",
+)
+def test_real_model_scores_silence_low_without_importing_torch():
+    already_loaded = "torch" in sys.modules
+    model = load_vad_model("onnxruntime")
+    vad = VADIterator(model, threshold=0.5)
+
+    assert all(vad(np.zeros(512, dtype=np.float32)) is None for _ in range(20))
+    assert model(np.zeros(512, dtype=np.float32), 16000) < 0.1
+    assert already_loaded or "torch" not in sys.modules
@@ -31,7 +31,7 @@ def _mock_input_devices():
 
 
 def _make_vi(**kwargs):
-    with patch("runtime.voice_input.load_silero_vad") as mock_load:
+    with patch("runtime.voice_input.load_vad_model") as mock_load:
         mock_model = MagicMock()
         mock_model.return_value = MagicMock()
         mock_load.return_value = mock_model
@@ -221,10 +221,13 @@ def test_local_whisper_diagnostic_skips_transcription_when_vad_skipped():
                     diagnostics.run_microphone_checks()
 
     with patch("runtime.voice_diagnostics.subprocess.run", side_effect=fake_run):
-        report = diagnostics.run_local_whisper_checks()
+        with patch("runtime.whisper_client._shared_client", None):
+            report = diagnostics.run_local_whisper_checks()
 
     assert report.check("transcription_returns_text").status == "skipped"
     assert "No detected speech" in report.check("transcription_returns_text").reason
+    assert report.check("local_whisper_client").status == "passed"
+    assert report.check("local_whisper_client").reason == "no transcriptions yet; circuit closed"
 
 
 def test_synthetic_barge_in_probe_passes_when_audio_interrupts_tts():
@@ -279,11 +282,7 @@ def test_human_barge_in_probe_passes_only_with_challenge_phrase():
                 on_speech_start()
             return np.ones(FRAME_SAMPLES, dtype=np.int16)
 
-        @staticmethod
-        def _save_wav(_audio, _sample_rate):
-            return "/tmp/fake.wav"
-
-        async def _transcribe(self, _wav_path):
+        async def _transcribe(self, _audio):
             return "noise then human microphone release test now"
 
     settings = Settings(VOICE_DEBUG_RECORD_SECONDS=1, VOICE_INPUT_DEVICE="Test Mic")
@@ -321,11 +320,7 @@ def test_human_barge_in_probe_rejects_text_without_challenge_phrase():
                 on_speech_start()
             return np.ones(FRAME_SAMPLES, dtype=np.int16)
 
-        @staticmethod
-        def _save_wav(_audio, _sample_rate):
-            return "/tmp/fake.wav"
-
-        async def _transcribe(self, _wav_path):
+        async def _transcribe(self, _audio):
             return "this is eyra barge in diagnostic start speaking now"
 
     settings = Settings(VOICE_DEBUG_RECORD_SECONDS=1, VOICE_INPUT_DEVICE="Test Mic")
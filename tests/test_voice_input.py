@@ -1,12 +1,18 @@
 """Tests for the smart voice input module (Silero VAD)."""
 
 import asyncio
+import json
 import os
 import sys
+import tempfile
+import threading
+import time
 import wave
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
+import pytest
 import sounddevice as sd
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -24,6 +30,14 @@ def _run(coro):
     return asyncio.run(coro)
 
 
+@pytest.fixture(autouse=True)
+def _fresh_whisper_client(tmp_path):
+    """VoiceInput uses the process-wide Local Whisper client; start each test with a new one."""
+    with patch("runtime.whisper_client._shared_client", None):
+        with patch("runtime.whisper_client.STATS_PATH", tmp_path / "local-whisper-stats.json"):
+            yield
+
+
 def _mock_stream():
     """Create a mock sounddevice InputStream."""
     stream = MagicMock()
@@ -32,6 +46,50 @@ def _mock_stream():
     return stream
 
 
+def _callback_stream(read, lead: int = 2):
+    """InputStream factory that feeds ``read(samples)`` blocks to the capture callback.
+
+    The feeder stays at most ``lead`` frames ahead of the reader, the way a
+    live microphone stays just ahead of VAD scoring, so no frame is skipped.
+    """
+
+    def open_stream(**kwargs):
+        callback = kwargs["callback"]
+        capture = callback.__self__
+        samples = kwargs["blocksize"]
+        stop = threading.Event()
+
+        def feed():
+            while not stop.is_set():
+                if capture.backlog >= lead:
+                    time.sleep(0.0005)
+                    continue
+                data, overflowed = read(samples)
+                callback(data, samples, None, overflowed)
+
+        thread = threading.Thread(target=feed, daemon=True)
+        stream = _mock_stream()
+
+        def enter():
+            thread.start()
+            return stream
+
+        def exit_(*_exc):
+            stop.set()
+            thread.join()
+            return False
+
+        stream.__enter__ = MagicMock(side_effect=enter)
+        stream.__exit__ = MagicMock(side_effect=exit_)
+        return stream
+
+    return open_stream
+
+
+def _constant_stream(value: int = 0):
+    return _callback_stream(lambda samples: (np.full((samples, 1), value, dtype=np.int16), False))
+
+
 class _FakeSocketPath:
     def exists(self):
         return True
@@ -42,7 +100,7 @@ class _FakeSocketPath:
 
 def _make_vi(**kwargs):
     """Create a VoiceInput with mocked Silero model loading."""
-    with patch("runtime.voice_input.load_silero_vad") as mock_load:
+    with patch("runtime.voice_input.load_vad_model") as mock_load:
         mock_model = MagicMock()
         mock_model.return_value = MagicMock()  # warmup call
         mock_load.return_value = mock_model
@@ -75,38 +133,35 @@ class TestVoiceInputVAD:
         """VOICE_INPUT_DEVICE=0 should select device index 0, not a device named "0"."""
         vi = _make_vi(input_device="0", max_duration_s=0.3)
 
-        stream = _mock_stream()
-        stream.read = MagicMock(return_value=(np.zeros((FRAME_SAMPLES, 1), dtype=np.int16), False))
+        stream = _constant_stream()
 
         mock_vad = _mock_vad_events({})
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream) as mock_input_stream:
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream) as mock_input_stream:
             with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
                 assert vi._record() is None
 
         assert mock_input_stream.call_args.kwargs["device"] == 0
 
     def test_cancel_stops_recording(self):
-        """Setting cancel event should make _record return None."""
+        """Cancelling mid-utterance makes _record return None without waiting for speech_end."""
         vi = _make_vi()
-        vi._cancel.set()
+        stream = _constant_stream(1000)
 
-        stream = _mock_stream()
-        stream.read = MagicMock(return_value=(np.zeros((FRAME_SAMPLES, 1), dtype=np.int16), False))
-
-        mock_vad = _mock_vad_events({})
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream):
-            with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
+        vad = _ScriptedVAD({2: {"start": 2 * FRAME_SAMPLES}}, on_frame=lambda frame: vi.cancel() if frame == 10 else None)
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream):
+            with patch.object(vi, "_new_vad_iterator", return_value=vad):
                 assert vi._record() is None
 
+        assert vad.calls == 10
+
     def test_no_speech_returns_none(self):
         """When VAD never detects speech, _record returns None."""
         vi = _make_vi(max_duration_s=0.3)
 
-        stream = _mock_stream()
-        stream.read = MagicMock(return_value=(np.zeros((FRAME_SAMPLES, 1), dtype=np.int16), False))
+        stream = _constant_stream()
 
         mock_vad = _mock_vad_events({})  # never fires start
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream):
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream):
             with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
                 assert vi._record() is None
 
@@ -118,17 +173,14 @@ class TestVoiceInputVAD:
         # End must come after enough frames to meet min_speech_frames
         speech_end_frame = speech_start_frame + vi.min_speech_frames + 2
 
-        stream = _mock_stream()
-        stream.read = MagicMock(
-            return_value=(np.full((FRAME_SAMPLES, 1), 1000, dtype=np.int16), False)
-        )
+        stream = _constant_stream(1000)
 
         mock_vad = _mock_vad_events({
             speech_start_frame: {"start": speech_start_frame * FRAME_SAMPLES},
             speech_end_frame: {"end": speech_end_frame * FRAME_SAMPLES},
         })
 
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream):
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream):
             with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
                 result = vi._record()
                 assert result is not None
@@ -141,17 +193,14 @@ class TestVoiceInputVAD:
         speech_start_frame = 3
         speech_end_frame = speech_start_frame + vi.min_speech_frames + 2
 
-        stream = _mock_stream()
-        stream.read = MagicMock(
-            return_value=(np.full((FRAME_SAMPLES, 1), 1000, dtype=np.int16), False)
-        )
+        stream = _constant_stream(1000)
         mock_vad = _mock_vad_events({
             speech_start_frame: {"start": speech_start_frame * FRAME_SAMPLES},
             speech_end_frame: {"end": speech_end_frame * FRAME_SAMPLES},
         })
         on_speech_start = MagicMock()
 
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream):
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream):
             with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
                 result = vi._record(on_speech_start=on_speech_start)
 
@@ -167,17 +216,14 @@ class TestVoiceInputVAD:
         speech_count = vi.min_speech_frames + 2
         speech_end_frame = speech_start_frame + speech_count
 
-        stream = _mock_stream()
-        stream.read = MagicMock(
-            return_value=(np.full((FRAME_SAMPLES, 1), 500, dtype=np.int16), False)
-        )
+        stream = _constant_stream(500)
 
         mock_vad = _mock_vad_events({
             speech_start_frame: {"start": speech_start_frame * FRAME_SAMPLES},
             speech_end_frame: {"end": speech_end_frame * FRAME_SAMPLES},
         })
 
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream):
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream):
             with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
                 result = vi._record()
                 assert result is not None
@@ -185,6 +231,23 @@ class TestVoiceInputVAD:
                 max_expected = (_LOOKBACK_FRAMES + speech_count + 1) * FRAME_SAMPLES
                 assert len(result) <= max_expected
 
+    def test_recordings_reuse_one_capture_ring(self):
+        vi = _make_vi(min_speech_ms=60, max_duration_s=5)
+        ring = vi._capture.ring
+        speech_count = vi.min_speech_frames + 2
+
+        results = []
+        for value in (500, 700):
+            mock_vad = _mock_vad_events({3: {"start": 3 * FRAME_SAMPLES}, 3 + speech_count: {"end": 0}})
+            with patch("runtime.voice_input.sd.InputStream", side_effect=_constant_stream(value)):
+                with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
+                    results.append(vi._record())
+
+        assert vi._capture.ring is ring and len(ring.scaled) == FRAME_SAMPLES
+        # The second recording starts over at frame 0 and holds only its own audio.
+        assert len(results[1]) == len(results[0])
+        assert set(results[1].tolist()) == {700}
+
     def test_false_trigger_resets(self):
         """A speech burst shorter than min_speech_ms is ignored."""
         vi = _make_vi(min_speech_ms=150, max_duration_s=5)
@@ -205,12 +268,9 @@ class TestVoiceInputVAD:
 
         mock_vad.reset_states = MagicMock()
 
-        stream = _mock_stream()
-        stream.read = MagicMock(
-            return_value=(np.full((FRAME_SAMPLES, 1), 500, dtype=np.int16), False)
-        )
+        stream = _constant_stream(500)
 
-        with patch("runtime.voice_input.sd.InputStream", return_value=stream):
+        with patch("runtime.voice_input.sd.InputStream", side_effect=stream):
             with patch.object(vi, "_new_vad_iterator", return_value=mock_vad):
                 assert vi._record() is None
                 mock_vad.reset_states.assert_called()
@@ -225,33 +285,14 @@ class TestVoiceInputVAD:
                 assert vi._record() is None
 
 
-# ---------------------------------------------------------------------------
-# WAV export
-# ---------------------------------------------------------------------------
-
-class TestVoiceInputWAV:
-    def test_save_wav_creates_valid_file(self):
-        vi = _make_vi()
-        audio = np.random.randint(-1000, 1000, size=SAMPLE_RATE, dtype=np.int16)
-        path = vi._save_wav(audio)
-        assert path is not None
-
-        with wave.open(path, "rb") as wf:
-            assert wf.getnchannels() == CHANNELS
-            assert wf.getframerate() == SAMPLE_RATE
-            assert wf.getsampwidth() == 2
-            assert wf.getnframes() == SAMPLE_RATE
-
-        os.unlink(path)
-
-
 # ---------------------------------------------------------------------------
 # Transcription
 # ---------------------------------------------------------------------------
 
 class TestVoiceInputTranscription:
-    def test_transcribe_socket_success(self):
+    def test_transcribe_sends_pcm_inline_over_the_socket(self):
         vi = _make_vi()
+        audio = np.random.randint(-1000, 1000, size=SAMPLE_RATE, dtype=np.int16)
 
         mock_reader = AsyncMock()
         mock_writer = MagicMock()
@@ -265,33 +306,45 @@ class TestVoiceInputTranscription:
             b'{"type": "done", "text": "hello world", "success": true}\n',
         ])
 
-        with patch("runtime.voice_input.SOCKET_PATH", _FakeSocketPath()):
-            with patch("runtime.voice_input.asyncio.open_unix_connection", new_callable=AsyncMock, return_value=(mock_reader, mock_writer)):
-                assert _run(vi._transcribe_socket("/tmp/test.wav")) == "hello world"
+        with patch("runtime.whisper_client.SOCKET_PATH", _FakeSocketPath()):
+            with patch("runtime.whisper_client.asyncio.open_unix_connection", new_callable=AsyncMock, return_value=(mock_reader, mock_writer)):
+                with patch("runtime.whisper_client.audio_file", side_effect=AssertionError("no file expected")):
+                    assert _run(vi._transcribe(audio)) == "hello world"
+
+        header, body = (call.args[0] for call in mock_writer.write.call_args_list)
+        request = json.loads(header)
+        assert request["format"] == "pcm_s16le"
+        assert request["sample_rate"] == SAMPLE_RATE
+        assert request["bytes"] == len(body) == audio.nbytes
+        assert body == audio.tobytes()
 
     def test_transcribe_socket_error_falls_back_to_cli(self):
         vi = _make_vi()
+        audio = np.zeros(FRAME_SAMPLES, dtype=np.int16)
 
         mock_proc = MagicMock()
         mock_proc.returncode = 0
         mock_proc.communicate = AsyncMock(return_value=(b"hello from cli", b""))
 
-        with patch("runtime.voice_input.asyncio.open_unix_connection", side_effect=ConnectionRefusedError):
-            with patch("runtime.voice_input.asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_proc):
-                assert _run(vi._transcribe("/tmp/test.wav")) == "hello from cli"
+        with patch("runtime.whisper_client.SOCKET_PATH", _FakeSocketPath()):
+            with patch("runtime.whisper_client.asyncio.open_unix_connection", side_effect=ConnectionRefusedError):
+                with patch("runtime.whisper_client.asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_proc):
+                    assert _run(vi._transcribe(audio)) == "hello from cli"
 
     def test_cli_fallback_uses_resolved_wh_bin(self):
         """CLI transcription must use the resolved wh binary path, not bare 'wh'."""
         vi = _make_vi(wh_bin="/opt/custom/wh")
+        audio = np.zeros(FRAME_SAMPLES, dtype=np.int16)
 
         mock_proc = MagicMock()
         mock_proc.returncode = 0
         mock_proc.communicate = AsyncMock(return_value=(b"resolved path works", b""))
 
-        with patch("runtime.voice_input.asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_proc) as mock_exec:
-            assert _run(vi._transcribe_cli("/tmp/test.wav")) == "resolved path works"
-            mock_exec.assert_called_once()
-            assert mock_exec.call_args[0][0] == "/opt/custom/wh"
+        with patch("runtime.whisper_client.SOCKET_PATH", Path("/nonexistent/whisper.sock")):
+            with patch("runtime.whisper_client.asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_proc) as mock_exec:
+                assert _run(vi._transcribe(audio)) == "resolved path works"
+                mock_exec.assert_called_once()
+                assert mock_exec.call_args[0][0] == "/opt/custom/wh"
 
     def test_listen_returns_none_on_no_speech(self):
         vi = _make_vi()
@@ -305,3 +358,163 @@ class TestVoiceInputTranscription:
         with patch.object(vi, "_record", return_value=fake_audio):
             with patch.object(vi, "_transcribe", new_callable=AsyncMock, return_value="test result"):
                 assert _run(vi.listen()) == "test result"
+
+
+# ---------------------------------------------------------------------------
+# Streaming transcription
+# ---------------------------------------------------------------------------
+
+class _FakeWhisperServer:
+    """Local Whisper socket stand-in that reads the inline PCM it is asked to transcribe.
+
+    Every frame of the test audio holds its own 1-based frame number, so the
+    reply ``f<first>-<last>`` names the frames a segment covered.
+    """
+
+    def __init__(self, path: Path, events: list):
+        self.path = path
+        self.events = events
+        self.segments: list[np.ndarray] = []
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        return self
+
+    async def __aexit__(self, *_exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        request = json.loads(await reader.readline())
+        audio = np.frombuffer(await reader.readexactly(request["bytes"]), dtype=np.int16)
+        self.segments.append(audio)
+        self.events.append(("request", int(audio[0])))
+        writer.write(b'{"type": "started", "action": "transcribe"}\n')
+        text = f"f{audio[0]}-{audio[-1]}"
+        writer.write((json.dumps({"type": "done", "text": text, "success": True}) + "\n").encode())
+        await writer.drain()
+        writer.close()
+
+
+def _numbered_wav(path: Path, frames: int) -> Path:
+    """WAV fixture whose n-th 512-sample frame is filled with the value n."""
+    audio = np.repeat(np.arange(1, frames + 1, dtype=np.int16), FRAME_SAMPLES)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(CHANNELS)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(audio.tobytes())
+    return path
+
+
+def _wav_stream(path: Path, events: list, frame_delay: float = 0.0):
+    """InputStream factory that plays a WAV fixture one frame per callback."""
+    wf = wave.open(str(path), "rb")
+    count = 0
+
+    def read(samples):
+        nonlocal count
+        count += 1
+        events.append(("read", count))
+        time.sleep(frame_delay)
+        data = np.frombuffer(wf.readframes(samples), dtype=np.int16)
+        if len(data) < samples:
+            data = np.zeros(samples, dtype=np.int16)
+        return data.reshape(-1, 1), False
+
+    return _callback_stream(read)
+
+
+class _ScriptedVAD:
+    """VADIterator stand-in: events by frame, and Silero's temp_end during pauses."""
+
+    def __init__(self, events_by_frame, pause_frames=(), on_frame=None):
+        self.events_by_frame = events_by_frame
+        self.pause_frames = set(pause_frames)
+        self.on_frame = on_frame
+        self.temp_end = 0
+        self.calls = 0
+        self.reset_states = MagicMock()
+
+    def __call__(self, chunk, return_seconds=False):
+        self.calls += 1
+        self.temp_end = self.calls * FRAME_SAMPLES if self.calls in self.pause_frames else 0
+        if self.on_frame is not None:
+            self.on_frame(self.calls)
+        return self.events_by_frame.get(self.calls)
+
+
+class TestVoiceInputStreaming:
+    def _listen(self, vi, vad, wav_path, events, frame_delay=0.0):
+        partials = []
+
+        async def run():
+            with tempfile.TemporaryDirectory() as socket_dir:
+                socket_path = Path(socket_dir) / "cmd.sock"
+                async with _FakeWhisperServer(socket_path, events) as server:
+                    with patch("runtime.whisper_client.SOCKET_PATH", socket_path):
+                        with patch("runtime.voice_input.sd.InputStream", side_effect=_wav_stream(wav_path, events, frame_delay)):
+                            with patch.object(vi, "_new_vad_iterator", return_value=vad):
+                                text = await vi.listen(on_partial=partials.append)
+                return text, server.segments
+
+        text, segments = _run(run())
+        return text, segments, partials
+
+    def test_segments_are_cut_at_pauses_and_transcribed_during_speech(self, tmp_path):
+        vi = _make_vi(min_speech_ms=30, max_duration_s=5, stream_chunk_ms=8 * FRAME_SAMPLES * 1000 // SAMPLE_RATE)
+        assert vi.stream_chunk_frames == 8
+        wav_path = _numbered_wav(tmp_path / "speech.wav", 40)
+        # Speech runs from frame 3 to 35. The pause at frame 5 comes before a full chunk and is not cut.
+        vad = _ScriptedVAD({3: {"start": 3 * FRAME_SAMPLES}, 35: {"end": 35 * FRAME_SAMPLES}}, pause_frames=(5, 12, 25))
+        events: list = []
+
+        text, segments, partials = self._listen(vi, vad, wav_path, events, frame_delay=0.005)
+
+        # Frames 1-2 come from the lookback buffer before onset.
+        assert text == "f1-12 f13-25 f26-35"
+        assert partials == ["f1-12", "f1-12 f13-25", "f1-12 f13-25 f26-35"]
+        assert [len(segment) // FRAME_SAMPLES for segment in segments] == [12, 13, 10]
+        np.testing.assert_array_equal(
+            np.concatenate(segments), np.repeat(np.arange(1, 36, dtype=np.int16), FRAME_SAMPLES)
+        )
+        # The first segment was decoded while the microphone was still being read.
+        first_request = events.index(("request", 1))
+        last_read = max(index for index, event in enumerate(events) if event[0] == "read")
+        assert first_request < last_read
+
+    def test_long_segment_without_a_pause_is_cut_at_twice_the_chunk(self, tmp_path):
+        vi = _make_vi(min_speech_ms=30, max_duration_s=5, stream_chunk_ms=4 * FRAME_SAMPLES * 1000 // SAMPLE_RATE)
+        wav_path = _numbered_wav(tmp_path / "speech.wav", 30)
+        vad = _ScriptedVAD({1: {"start": FRAME_SAMPLES}, 20: {"end": 20 * FRAME_SAMPLES}})
+
+        text, segments, _partials = self._listen(vi, vad, wav_path, [])
+
+        assert text == "f1-8 f9-16 f17-20"
+        assert [len(segment) // FRAME_SAMPLES for segment in segments] == [8, 8, 4]
+
+    def test_streaming_off_sends_one_file_at_speech_end(self, tmp_path):
+        vi = _make_vi(min_speech_ms=30, max_duration_s=5)
+        wav_path = _numbered_wav(tmp_path / "speech.wav", 40)
+        vad = _ScriptedVAD({3: {"start": 3 * FRAME_SAMPLES}, 35: {"end": 35 * FRAME_SAMPLES}}, pause_frames=(12, 25))
+
+        text, segments, partials = self._listen(vi, vad, wav_path, [])
+
+        assert text == "f1-35"
+        assert len(segments) == 1
+        assert partials == []
+
+    def test_cancelled_streaming_listen_returns_none(self, tmp_path):
+        vi = _make_vi(min_speech_ms=30, max_duration_s=5, stream_chunk_ms=4 * FRAME_SAMPLES * 1000 // SAMPLE_RATE)
+        wav_path = _numbered_wav(tmp_path / "speech.wav", 40)
+        # A segment is cut at frame 6, then the user cancels while still speaking.
+        vad = _ScriptedVAD(
+            {1: {"start": FRAME_SAMPLES}},
+            pause_frames=(6,),
+            on_frame=lambda frame: vi.cancel() if frame == 20 else None,
+        )
+
+        text, _segments, _partials = self._listen(vi, vad, wav_path, [])
+
+        assert text is None
@@ -1,5 +1,6 @@
 """Tests for the built-in web UI helpers."""
 
+import asyncio
 import json
 import os
 import sys
@@ -15,10 +16,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from runtime.jobs import JobStatus
 from runtime.models import PreflightResult
 from runtime.shared import RuntimeSharedState
-from runtime.tasks import TaskStatus
+from runtime.whisper_client import load_stats
 from utils.settings import Settings
 from web.server import (
     WebAssistantRuntime,
+    _audio_format,
     _EyraWebHandler,
     build_capabilities_payload,
     build_health_payload,
@@ -27,6 +29,7 @@ from web.server import (
     render_index_html,
     run_web_server,
     speak_local_text,
+    transcribe_local_audio,
     validate_realtime_tool_token,
     validate_request_size,
     validate_web_session_token,
@@ -34,6 +37,14 @@ from web.server import (
 )
 
 
+def _first_task_id(runtime: WebAssistantRuntime) -> str:
+    for _ in range(300):
+        if tasks := runtime.run_sync(runtime.list_tasks())["tasks"]:
+            return tasks[0]["id"]
+        time.sleep(0.01)
+    raise AssertionError("no task was started")
+
+
 class TestWebServerHelpers:
     def test_health_payload_names_voice_and_tool_modes(self):
         payload = build_health_payload(Settings(WEB_UI_ENABLED=True, REALTIME_VOICE_ENABLED=False))
@@ -48,6 +59,24 @@ class TestWebServerHelpers:
         assert payload["capabilities"]["privacy"]["leavesMachineByDefault"] is False
         assert "tools" not in payload["capabilities"]
 
+    def test_local_audio_format_follows_the_browser_mime_type(self):
+        assert _audio_format("audio/webm;codecs=opus") == "webm"
+        assert _audio_format("audio/mp4") == "mp4"
+        assert _audio_format("audio/mpeg") == "mp3"
+        assert _audio_format("application/octet-stream") == "webm"
+        assert _audio_format("") == "webm"
+        assert _audio_format("audio/../x") == "webm"
+
+    def test_local_audio_transcription_reports_missing_local_whisper(self, tmp_path):
+        with patch("runtime.whisper_client.SOCKET_PATH", tmp_path / "missing.sock"):
+            with patch("web.server.resolve_wh_bin", return_value=None):
+                with patch("runtime.whisper_client._shared_client", None):
+                    with patch("runtime.whisper_client.STATS_PATH", tmp_path / "stats.json"):
+                        transcript = asyncio.run(transcribe_local_audio(b"audio", "audio/webm"))
+
+        assert transcript == "Local Whisper error: wh is not installed or not on PATH."
+        assert load_stats(tmp_path / "stats.json")["errors"] == {"socket_missing": 1}
+
     def test_health_payload_can_report_shared_runtime_scope(self):
         payload = build_health_payload(Settings(WEB_UI_ENABLED=True), runtime_scope="shared")
 
@@ -734,6 +763,29 @@ class TestWebServerHelpers:
         assert "secret-token" not in rendered
         assert "token=[REDACTED]" in rendered
 
+    def test_web_runtime_pages_job_summaries_with_a_cursor(self, tmp_path):
+        settings = Settings(
+            USE_MOCK_CLIENT=True,
+            LIVE_LISTENING_ENABLED=False,
+            LIVE_SPEECH_ENABLED=False,
+            JOB_STORE_PATH=str(tmp_path / "jobs.sqlite3"),
+        )
+        runtime = WebAssistantRuntime(settings)
+        for number in range(3):
+            runtime.job_store.create_job(title=f"Job {number}", original_user_input="x", source_frontend="web")
+
+        try:
+            first = runtime.run_sync(runtime.list_jobs(limit=2))
+            second = runtime.run_sync(runtime.list_jobs(limit=2, cursor=first["nextCursor"]))
+            invalid = runtime.run_sync(runtime.list_jobs(cursor="bogus"))
+        finally:
+            runtime.close()
+
+        assert len(first["jobs"]) == 2 and first["nextCursor"]
+        assert len(second["jobs"]) == 1 and second["nextCursor"] is None
+        assert {job["id"] for job in first["jobs"]}.isdisjoint(job["id"] for job in second["jobs"])
+        assert invalid["status"] == "bad_request"
+
     def test_web_runtime_file_appears_trigger_moves_file_when_created(self, tmp_path):
         desktop = tmp_path / "Desktop"
         downloads = tmp_path / "Downloads"
@@ -761,9 +813,10 @@ class TestWebServerHelpers:
                 runtime.handle_message("When eyra-web-trigger.txt appears in my Downloads, move it to Documents.")
             )
             source.write_text("trigger me")
-            runtime.run_sync(runtime.task_manager.wait_for_task(result["taskId"]), timeout=3)
+            task_id = _first_task_id(runtime)
+            runtime.run_sync(runtime.task_manager.wait_for_task(task_id), timeout=3)
             triggers = runtime.run_sync(runtime.list_triggers())
-            task = runtime.task_manager.get_task(result["taskId"])
+            task = runtime.task_manager.get_task(task_id)
         finally:
             runtime.close()
 
@@ -806,11 +859,12 @@ class TestWebServerHelpers:
                 runtime.handle_message("When eyra-web-trigger-no-tools.txt appears in my Downloads, move it to Documents.")
             )
             time.sleep(0.05)
-            task = runtime.task_manager.get_task(result["taskId"])
-            assert task.status in {TaskStatus.QUEUED, TaskStatus.RUNNING}
+            assert runtime.run_sync(runtime.list_tasks())["tasks"] == []
+            assert runtime._file_triggers.pending() == [result["triggerId"]]
             source.write_text("trigger me")
-            runtime.run_sync(runtime.task_manager.wait_for_task(result["taskId"]), timeout=3)
-            task = runtime.task_manager.get_task(result["taskId"])
+            task_id = _first_task_id(runtime)
+            runtime.run_sync(runtime.task_manager.wait_for_task(task_id), timeout=3)
+            task = runtime.task_manager.get_task(task_id)
         finally:
             runtime.close()
 
@@ -831,7 +885,12 @@ class TestWebServerHelpers:
 
         try:
             result = runtime.run_sync(runtime.handle_message("Remind me in 0.01 seconds to stretch."))
-            runtime.run_sync(runtime.task_manager.wait_for_task(result["taskId"]), timeout=3)
+            for _ in range(300):
+                if runtime.run_sync(runtime.list_tasks())["tasks"]:
+                    break
+                time.sleep(0.01)
+            task_id = runtime.run_sync(runtime.list_tasks())["tasks"][0]["id"]
+            runtime.run_sync(runtime.task_manager.wait_for_task(task_id), timeout=3)
             tasks = runtime.run_sync(runtime.list_tasks())
             triggers = runtime.run_sync(runtime.list_triggers())
         finally:
@@ -863,15 +922,17 @@ class TestWebServerHelpers:
                     break
                 time.sleep(0.01)
             runtime.run_sync(runtime.update_trigger(trigger_id, "cancel"))
-            runtime.run_sync(runtime.task_manager.wait_for_task(result["taskId"]), timeout=3)
+            for task in runtime.task_manager.list_tasks(include_recent=True):
+                runtime.run_sync(runtime.task_manager.wait_for_task(task.id), timeout=3)
             tasks = runtime.run_sync(runtime.list_tasks())
             triggers = runtime.run_sync(runtime.list_triggers())
         finally:
             runtime.close()
 
         assert "Recurring reminder" in result["reply"]
-        assert tasks["tasks"][0]["status"] == "completed"
-        assert tasks["tasks"][0]["result"] == "Recurring reminder cancelled."
+        assert "taskId" not in result
+        assert {task["status"] for task in tasks["tasks"]} == {"completed"}
+        assert {task["result"] for task in tasks["tasks"]} == {"Recurring reminder: stretch"}
         assert triggers["triggers"][0]["kind"] == "recurring_timer"
         assert triggers["triggers"][0]["condition"]["fire_count"] >= 2
         assert triggers["triggers"][0]["status"] == "cancelled"
@@ -0,0 +1,284 @@
+"""Tests for the Local Whisper socket client and its in-memory audio transport."""
+
+import asyncio
+import io
+import json
+import os
+import stat
+import sys
+import tempfile
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from runtime.whisper_client import (
+    AudioPayload,
+    CircuitBreaker,
+    LocalWhisperClient,
+    LocalWhisperError,
+    audio_file,
+    format_stats,
+    histogram_quantile,
+    load_stats,
+)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class _FakeWhisper:
+    """Local Whisper socket stand-in.
+
+    ``inline=False`` mimics a server that only takes paths, and
+    ``persistent=False`` one that closes the connection after every reply.
+    """
+
+    def __init__(self, path: Path, *, inline: bool = True, fail_after_start: bool = False, persistent: bool = True):
+        self.path = path
+        self.inline = inline
+        self.fail_after_start = fail_after_start
+        self.persistent = persistent
+        self.connections = 0
+        self.requests: list[dict] = []
+        self.received: list[bytes] = []
+        self._server = None
+        self._writers: set = set()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        return self
+
+    async def __aexit__(self, *_exc):
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        while line := await reader.readline():
+            request = json.loads(line)
+            self.requests.append(request)
+            if "bytes" in request:
+                if not self.inline:
+                    writer.write(b'{"type": "error", "message": "path is required"}\n')
+                    await writer.drain()
+                    break
+                data = await reader.readexactly(request["bytes"])
+            else:
+                data = Path(request["path"]).read_bytes()
+            self.received.append(data)
+            writer.write(b'{"type": "started", "action": "transcribe"}\n')
+            if self.fail_after_start:
+                writer.write(b'{"type": "error", "message": "model crashed"}\n')
+            else:
+                reply = {"type": "done", "text": f" {len(data)} bytes ", "success": True}
+                writer.write((json.dumps(reply) + "\n").encode())
+            await writer.drain()
+            if not self.persistent:
+                break
+        writer.close()
+
+
+def _transcribe_with(server_kwargs, client, payloads, raw=False, concurrent=False):
+    async def run():
+        with tempfile.TemporaryDirectory() as socket_dir:
+            async with _FakeWhisper(Path(socket_dir) / "cmd.sock", **server_kwargs) as server:
+                client.socket_path = server.path
+                try:
+                    if concurrent:
+                        texts = await asyncio.gather(*(client.transcribe(payload, raw=raw) for payload in payloads))
+                    else:
+                        texts = [await client.transcribe(payload, raw=raw) for payload in payloads]
+                finally:
+                    await client.aclose()
+                return list(texts), server
+
+    return _run(run())
+
+
+def _pcm(samples: int = 1600) -> AudioPayload:
+    return AudioPayload.pcm(bytes(range(256)) * (samples * 2 // 256), 16000)
+
+
+def test_pcm_is_sent_inline_without_a_file():
+    client = LocalWhisperClient()
+    payload = _pcm()
+
+    with patch("runtime.whisper_client.audio_file", side_effect=AssertionError("no file expected")):
+        texts, server = _transcribe_with({}, client, [payload])
+
+    assert texts == [f"{len(payload.data)} bytes"]
+    assert server.received == [payload.data]
+    assert server.requests[0] == {
+        "type": "transcribe",
+        "raw": False,
+        "format": "pcm_s16le",
+        "bytes": len(payload.data),
+        "sample_rate": 16000,
+        "channels": 1,
+    }
+    assert client.inline is True
+
+
+def test_server_without_inline_support_gets_a_readable_path_once_probed():
+    client = LocalWhisperClient()
+    payloads = [_pcm(800), _pcm(1600)]
+
+    texts, server = _transcribe_with({"inline": False}, client, payloads)
+
+    # Only the first transcription pays for the rejected inline attempt.
+    assert ["bytes" in request for request in server.requests] == [True, False, False]
+    assert client.inline is False
+    for payload, data, text in zip(payloads, server.received, texts, strict=True):
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            assert wf.getframerate() == 16000
+            assert wf.readframes(wf.getnframes()) == payload.data
+        assert text == f"{len(data)} bytes"
+
+
+def test_encoded_audio_keeps_its_container_and_raw_flag():
+    client = LocalWhisperClient()
+    payload = AudioPayload(b"webm-bytes", "webm")
+
+    texts, server = _transcribe_with({}, client, [payload], raw=True)
+
+    assert texts == ["10 bytes"]
+    assert server.requests[0] == {"type": "transcribe", "raw": True, "format": "webm", "bytes": 10}
+    assert server.received == [b"webm-bytes"]
+
+
+def test_one_connection_is_reused_and_pipelined():
+    client = LocalWhisperClient()
+    payloads = [_pcm(800), _pcm(1600), _pcm(2400)]
+
+    texts, server = _transcribe_with({}, client, payloads, concurrent=True)
+    texts += _transcribe_with({}, client, payloads[:1])[0]
+
+    # Concurrent requests share one connection, and each reply reaches the request it answers.
+    assert texts == [f"{len(payload.data)} bytes" for payload in payloads + payloads[:1]]
+    assert server.connections == 1
+    assert client.single_shot is False
+
+
+def test_server_that_closes_after_each_reply_gets_a_connection_per_request():
+    client = LocalWhisperClient()
+    payloads = [_pcm(800), _pcm(1600), _pcm(2400)]
+
+    texts, server = _transcribe_with({"persistent": False}, client, payloads, concurrent=True)
+
+    assert texts == [f"{len(payload.data)} bytes" for payload in payloads]
+    assert client.single_shot is True
+    assert len(server.received) == 3
+    assert client.stats.errors == {}
+
+
+def test_error_after_start_is_raised_without_falling_back_to_the_cli(tmp_path):
+    wh = tmp_path / "wh"
+    wh.write_text("#!/bin/sh\necho should not run\n")
+    wh.chmod(wh.stat().st_mode | stat.S_IEXEC)
+    client = LocalWhisperClient(str(wh))
+
+    with pytest.raises(LocalWhisperError, match="model crashed"):
+        _transcribe_with({"fail_after_start": True}, client, [_pcm()])
+
+    assert client.breaker.state == "closed"
+    assert client.stats.errors == {"server_error": 1}
+
+
+def test_cli_fallback_reads_the_same_audio_path(tmp_path):
+    wh = tmp_path / "wh"
+    wh.write_text('#!/bin/sh\nprintf "%s %s" "$(wc -c < "$2" | tr -d " ")" "$3"\n')
+    wh.chmod(wh.stat().st_mode | stat.S_IEXEC)
+    client = LocalWhisperClient(str(wh), socket_path=tmp_path / "missing.sock")
+    payload = AudioPayload(b"0123456789", "webm")
+
+    assert _run(client.transcribe(payload, raw=True)) == "10 --raw"
+
+
+def test_missing_socket_and_cli_reports_wh_missing(tmp_path):
+    client = LocalWhisperClient(socket_path=tmp_path / "missing.sock")
+
+    with pytest.raises(LocalWhisperError, match="wh is not installed"):
+        _run(client.transcribe(_pcm()))
+
+
+def test_audio_file_falls_back_to_a_removed_temp_file_without_memfd():
+    payload = AudioPayload(b"abc", "ogg")
+
+    with patch("runtime.whisper_client.os.memfd_create", None, create=True):
+        with audio_file(payload) as path:
+            assert path.endswith(".ogg")
+            assert Path(path).read_bytes() == b"abc"
+
+    assert not Path(path).exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="memfd is Linux-only")
+def test_audio_file_uses_memfd_on_linux():
+    with audio_file(AudioPayload(b"abc", "ogg")) as path:
+        assert path.startswith(f"/proc/{os.getpid()}/fd/")
+        assert Path(path).read_bytes() == b"abc"
+
+
+def test_circuit_breaker_opens_after_repeated_failures_and_half_opens_for_one_trial():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10.0, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == "closed"
+    breaker.record_failure()
+    assert not breaker.allow() and breaker.state == "open"
+
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_sends_audio_straight_to_the_cli(tmp_path):
+    wh = tmp_path / "wh"
+    wh.write_text('#!/bin/sh\nprintf cli\n')
+    wh.chmod(wh.stat().st_mode | stat.S_IEXEC)
+    client = LocalWhisperClient(str(wh), socket_path=tmp_path / "missing.sock", breaker=CircuitBreaker(2, 60.0))
+
+    async def run():
+        texts = [await client.transcribe(_pcm()) for _ in range(2)]
+        with patch.object(client, "transcribe_socket", side_effect=AssertionError("socket skipped while open")):
+            texts.append(await client.transcribe(_pcm()))
+        return texts
+
+    assert _run(run()) == ["cli", "cli", "cli"]
+    assert client.breaker.state == "open"
+    assert client.stats.errors == {"socket_missing": 2}
+    assert client.stats.latency["cli"].count == 3
+
+
+def test_stats_are_saved_for_doctor_and_summarized(tmp_path):
+    stats_path = tmp_path / "stats.json"
+    client = LocalWhisperClient(stats_path=stats_path)
+    client.stats.observe("socket", 0.3)
+    client.stats.observe("socket", 0.4)
+    client.stats.observe("socket", 4.0)
+    client.stats.error("timeout")
+
+    _run(client.aclose())
+    stats = load_stats(stats_path)
+
+    assert stats["latency"]["socket"]["buckets"]["0.5"] == 2
+    assert histogram_quantile(stats["latency"]["socket"], 0.5) == 0.5
+    assert histogram_quantile(stats["latency"]["socket"], 0.95) == 5.0
+    assert format_stats(stats) == "socket 3 requests, p50 ≤0.5 s, p95 ≤5 s; errors: timeout 1; circuit closed"
+    assert load_stats(tmp_path / "missing.json") is None